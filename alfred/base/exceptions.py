@@ -9,3 +9,15 @@ class AlfredMissingArgument(Exception):
     Raised when a payload is missing a required argument based on the whole context
     of the operation.
     """
+
+
+class AlfredTimeoutException(TimeoutError):
+    """
+    Raised when an operation does not complete within the given timeout.
+    """
+    def __init__(self, message="The operation timed out", pending=None, results=None):
+        self.message = message
+        # Items that did not complete and partial results, when relevant.
+        self.pending = pending or []
+        self.results = results or {}
+        super().__init__(self.message)
@@ -1,2 +1,17 @@
 from .typed import *
+from .codec import *
 from .http_client import *
+from .metrics import *
+from .rate_limiter import *
+from .request_logger import *
+from .token_manager import *
+from .multipart import *
+from .signer import *
+
+
+def __getattr__(name):
+    # The asyncio client pulls in asyncio and aiohttp: import it on first use.
+    if name == "AsyncHttpClient":
+        from .async_http_client import AsyncHttpClient  # pylint: disable=C0415
+        return AsyncHttpClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,861 @@
+# Native imports
+import asyncio
+import os
+from time import perf_counter
+from typing import Dict, Any
+from urllib.parse import urlencode
+
+# 3rd party imports
+from urllib3 import encode_multipart_formdata
+
+# aiohttp is an optional dependency that is slow to import: it is imported
+# when the first client is built. See `load_aiohttp`.
+aiohttp = None
+
+# Project imports
+from .typed import *  # pylint: disable=W0401, W0614
+from .codec import JsonCodec, get_json_codec
+from .multipart import MultipartEncoder
+from .metrics import ClientMetrics, endpoint_template
+from .rate_limiter import RateLimiter
+from .request_logger import RequestLogger
+from .signer import DEFAULT_CHUNK_SIZE, HmacSigner, is_raw_body
+from .token_manager import AsyncTokenManager
+from ..base.typed import ResponseType
+from ..base.constants import RESPONSE_TYPE_HEADER_MAPPING
+from ..base.exceptions import AlfredMissingAuthException
+from ..utils import logging
+
+__all__ = ["AsyncHttpClient"]
+
+
+def load_aiohttp():
+    """
+    Import aiohttp on first use.
+    """
+    global aiohttp  # pylint: disable=W0603
+    if aiohttp is None:
+        try:
+            import aiohttp as module  # pylint: disable=C0415
+        except ImportError as err:  # pragma: no cover - optional dependency
+            raise ImportError(
+                "AsyncHttpClient requires aiohttp. "
+                "Install it with: pip install alfred-python[async]"
+            ) from err
+        aiohttp = module
+    return aiohttp
+
+# Methods that are safe to retry, mirroring urllib3's default allow-list.
+IDEMPOTENT_METHODS = frozenset(["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE"])
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+
+class AsyncHttpClient:
+    """
+    Asyncio counterpart of `HttpClient` built on top of `aiohttp`.
+
+    A single instance can hold hundreds of in-flight requests on one event
+    loop. The underlying `aiohttp.ClientSession` is created lazily on the
+    first request, so the client can be built outside of a running loop.
+    """
+    base_url: Text
+    max_retries: int
+    timeout: float
+    auth_config: AuthConfiguration
+    auth_method: Optional[AuthMethod] = None
+    token_manager: Optional[AsyncTokenManager] = None
+    token_refresh_margin: float = 60
+    hmac_signer: Optional[HmacSigner] = None
+    response_type: ResponseType = ResponseType.JSON
+    rate_limiter: RateLimiter
+    request_logger: RequestLogger
+    metrics: Optional[ClientMetrics] = None
+    throttle_delay: float
+    throttle_threshold: int
+    throttle_delay_backoff: float = 2
+    throttle_delay_max: float = 60
+    retry_backoff_factor: float = 1
+    json_codec: JsonCodec
+
+    def __init__(
+        self,
+        base_url: Text,
+        auth_config: AuthConfiguration,
+        config: Optional[HttpConfiguration] = None,
+    ) -> None:
+        """
+        Constructor for the asyncio HTTP client.
+
+        Args:
+        - base_url: Base URL of the API.
+        - auth_config: Authentication configuration.
+        - config: HTTP client configuration. Accepts the same options as
+          `HttpClient`, plus:
+            - config.max_connections: Maximum number of simultaneous connections
+            kept by the connection pool (default: 100). Ignored when
+            `pool_connections` is False, in which case a single connection is used.
+        """
+        load_aiohttp()
+
+        self.base_url = base_url
+        self.auth_config = auth_config
+        config = config or {}
+
+        # Initialize logger
+        self.logger = logging.getLogger("alfred-python")
+        self.request_logger = RequestLogger(
+            self.logger,
+            sample_rate=config.get("log_sample_rate", 1.0),
+            max_body_size=config.get("log_max_body_size"),
+        )
+
+        # Setup metrics (if any)
+        metrics = config.get("metrics")
+        if metrics is True:
+            metrics = ClientMetrics()
+        self.metrics = metrics or None
+
+        # Setup retry strategy
+        self.max_retries = config.get("max_retries", 3)
+        if self.max_retries <= 0:
+            raise ValueError(
+                f"Max retries ({self.max_retries}) cannot be zero or less."
+            )
+
+        # Setup timeout
+        self.timeout = config.get("timeout", 5)
+        if self.timeout <= 0:
+            raise ValueError(f"Timeout ({self.timeout}) cannot be zero or less.")
+
+        # Set up response type
+        self.response_type = config.get("response_type", ResponseType.JSON)
+
+        # Validate that it's a valid response type.
+        if self.response_type not in RESPONSE_TYPE_HEADER_MAPPING.keys():
+            raise ValueError(f"Invalid response type: {self.response_type}")
+
+        # Setup JSON codec
+        self.json_codec = get_json_codec(config.get("json_codec"))
+
+        # Setup throttle delay
+        self.throttle_delay = config.get("throttle_delay", 1)
+        self.throttle_threshold = config.get("throttle_threshold", 20)
+        self.rate_limiter = RateLimiter(
+            threshold=self.throttle_threshold,
+            delay=self.throttle_delay,
+            delay_backoff=self.throttle_delay_backoff,
+            delay_max=self.throttle_delay_max,
+        )
+
+        # Setup pool connections
+        self.max_connections = 1
+        if config.get("pool_connections", True):
+            self.max_connections = config.get("max_connections", 100)
+
+        self.session: Optional["aiohttp.ClientSession"] = None
+        self.default_headers: Dict[str, str] = {}
+
+        # Setup API key (if any)
+        self.__auth_with_api_key(self.auth_config.get("api_key"))
+
+        self.token_refresh_margin = config.get("token_refresh_margin", 60)
+
+        # Setup OAuth (if any)
+        if not self.auth_method and self.auth_config.get("oauth"):
+            self.auth_method = AuthMethod.OAUTH
+            self.token_manager = AsyncTokenManager(
+                self.__fetch_token, refresh_margin=self.token_refresh_margin
+            )
+
+        # Setup HMAC
+        if not self.auth_method and self.auth_config.get("hmac"):
+            self.auth_method = AuthMethod.HMAC
+            self.hmac_signer = HmacSigner(
+                self.auth_config["hmac"].get("api_key"),
+                self.auth_config["hmac"].get("secret_key"),
+            )
+
+        if not self.auth_method:
+            raise AlfredMissingAuthException
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def __get_session(self) -> "aiohttp.ClientSession":
+        """
+        Get the underlying aiohttp session, creating it on first use.
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections)
+            self.session = aiohttp.ClientSession(
+                connector=connector, headers=self.default_headers
+            )
+        return self.session
+
+    async def close(self):
+        """
+        Close the underlying connection pool.
+        """
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    @property
+    def rate_limit(self) -> Optional[Dict[str, Any]]:
+        """
+        Rate limit reported by the last response, if any.
+        """
+        state = self.rate_limiter.state()
+        if state.get("limit") is None:
+            return None
+
+        return {
+            "limit": state.get("limit"),
+            "remaining": state.get("remaining"),
+            "reset_time": state.get("reset_time"),
+        }
+
+    @rate_limit.setter
+    def rate_limit(self, rate_limit: Optional[Dict[str, Any]]):
+        """
+        Replace the rate limit the requests are throttled against, e.g. with
+        one saved from another client. None clears it until the next response.
+        """
+        rate_limit = rate_limit or {}
+        self.rate_limiter.set_state(
+            rate_limit.get("limit"), rate_limit.get("remaining"), rate_limit.get("reset_time")
+        )
+
+    def __auth_with_api_key(self, api_key: Text):
+        """
+        Set the X-TagshelfAPI-Key header using the provided API key or a
+        default value from the environment variable.
+
+        Args:
+        - api_key: A string that represents an API key used for authentication.
+          If no value is provided, the function will attempt to retrieve the API key from
+          the environment variable.
+        """
+        key = api_key or os.getenv("ALFRED_API_KEY")
+        if not key:
+            return
+
+        self.default_headers["X-TagshelfAPI-Key"] = key
+        self.auth_method = AuthMethod.API_KEY
+
+    async def __auth_with_oauth(self, headers: Dict[str, str]):
+        """
+        Handles authentication using OAuth by obtaining an access token and
+        setting it in the HTTP headers.
+
+        Args:
+        - headers: Outgoing request headers.
+        """
+        token = await self.token_manager.get_token()
+        headers["Authorization"] = f"Bearer {token}"
+
+    @property
+    def token(self) -> Optional[Text]:
+        """
+        Current OAuth access token, if any.
+        """
+        return self.token_manager.token if self.token_manager else None
+
+    @token.setter
+    def token(self, token: Optional[Text]):
+        """
+        Use an access token obtained elsewhere, until it is rejected. None
+        drops the current token, so the next OAuth request fetches a new one.
+        """
+        if self.token_manager is None:
+            self.token_manager = AsyncTokenManager(
+                self.__fetch_token, refresh_margin=self.token_refresh_margin
+            )
+        self.token_manager.set_token(token)
+
+    async def __fetch_token(self) -> OAuthToken:
+        """
+        Get a new access token using the configured OAuth credentials.
+        """
+        username = self.auth_config.get("oauth", {}).get("username")
+        password = self.auth_config.get("oauth", {}).get("password")
+        return await self.__get_token(username, password)
+
+    async def __get_token(self, username: Text, password: Text) -> OAuthToken:
+        """
+        Get access token. Returns the token response, including `expires_in`.
+
+        Args:
+        - username: A string that represents the username used for authentication.
+        - password: A string that represents the user's password used for authentication.
+        """
+        data = {"grant_type": "password", "username": username, "password": password}
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+        parsed_resp, _ = await self.request(
+            HttpMethod.POST,
+            "/token",
+            data=data,
+            headers=headers,
+            skip_auth=True,
+        )
+        return parsed_resp
+
+    def __auth_with_hmac(self, method: Text, url: Text, body: Any, headers: Dict[str, str]):
+        """
+        Generates a HMAC-based authentication header for API requests using provided
+        API key and secret key. Returns the body to send, see `HmacSigner.sign`.
+
+        Args:
+        - method: HTTP method.
+        - url: Fully qualified URL, including the query string.
+        - body: Encoded request body.
+        - headers: Outgoing request headers.
+        """
+        headers["Authorization"], body = self.hmac_signer.sign(method, url, body)
+        return body
+
+    def __get_headers(self, headers: Optional[Dict[str, str]], has_files: bool = False) -> Dict[str, str]:
+        """
+        Get the request headers.
+
+        Args:
+        - headers: HTTP headers
+        """
+        headers = headers or {}
+        default_headers = {
+            "Accept-Charset": "utf-8",
+            "Accept": RESPONSE_TYPE_HEADER_MAPPING.get(self.response_type),
+        }
+
+        # Set default Content-Type only if it's not a file upload
+        if "Content-Type" not in headers and not has_files:
+            default_headers["Content-Type"] = "application/json"
+
+        return {**default_headers, **headers}
+
+    def __encode_body(
+        self,
+        headers: Dict[str, str],
+        data: Optional[Any],
+        files: Optional[Dict[str, Any]],
+    ) -> Any:
+        """
+        Encode the request body the same way `requests` would, so the bytes
+        that are signed are exactly the bytes that are sent. Streaming
+        multipart encoders are passed through untouched.
+
+        Args:
+        - headers: Outgoing request headers. Updated with the multipart
+          Content-Type when files are provided.
+        - data: Body data.
+        - files: Files to upload.
+        """
+        if files:
+            fields = []
+            for key, value in (data or {}).items():
+                if value is not None:
+                    fields.append((key, str(value)))
+            for key, value in files.items():
+                filename, file, content_type = value
+                content = file.read() if hasattr(file, "read") else file
+                fields.append((key, (filename, content, content_type)))
+
+            body, content_type = encode_multipart_formdata(fields)
+            headers["Content-Type"] = content_type
+            return body
+
+        if data is None:
+            return None
+
+        if isinstance(data, MultipartEncoder):
+            headers["Content-Type"] = data.content_type
+            headers["Content-Length"] = str(len(data))
+            return data
+
+        if isinstance(data, bytes):
+            return data
+
+        if isinstance(data, str):
+            return data.encode("utf-8")
+
+        if is_raw_body(data):
+            # File objects and iterators of chunks are streamed.
+            return data
+
+        if headers.get("Content-Type") == "application/json":
+            return self.json_codec.dumps(data)
+
+        return urlencode(
+            [(k, v) for k, v in data.items() if v is not None], doseq=True
+        ).encode("utf-8")
+
+    def __parse_response(self, response: "aiohttp.ClientResponse", body: bytes):
+        """
+        Parse the response based on the response type.
+
+        Args:
+        - response: HTTP response
+        - body: Raw response body
+        """
+
+        # Get the response type based on the content type header.
+        content_type = (response.headers.get("Content-Type") or "").split(";")[0]
+        reversed_response_type_header_mapping = {
+            v: k for k, v in RESPONSE_TYPE_HEADER_MAPPING.items()
+        }
+        response_type = reversed_response_type_header_mapping.get(content_type)
+
+        try:
+            charset = (response.charset or "utf-8").lower().replace("_", "-")
+            if response_type == ResponseType.JSON and charset in ("utf-8", "utf8", "ascii"):
+                return self.json_codec.loads(body)
+
+            text = body.decode(charset, errors="replace")
+            if response_type == ResponseType.XML:
+                from xml.etree import ElementTree  # pylint: disable=C0415
+                return ElementTree.fromstring(text)
+            elif response_type == ResponseType.JSON:
+                return self.json_codec.loads(text)
+            else:
+                return text
+        except Exception as e:
+            raise ValueError(f"Failed to parse response: {e}")
+
+    @staticmethod
+    async def __iter_body(body: Any):
+        """
+        Expose a streaming body (multipart encoder, file object or iterator of
+        chunks) as an async iterable, which is what aiohttp expects for bodies
+        that are produced in chunks. Chunks are read on the default executor,
+        so disk reads do not block the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if hasattr(body, "read"):
+            while True:
+                chunk = await loop.run_in_executor(None, body.read, DEFAULT_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+        else:
+            chunks = iter(body)
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+
+    @staticmethod
+    def __body_size(headers: Dict[str, str], body: Any) -> int:
+        """
+        Get the size of a request body, if known.
+        """
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            return len(body)
+        return int(headers.get("Content-Length") or 0)
+
+    @staticmethod
+    def __replayable(body: Any, position: Optional[int]) -> bool:
+        """
+        Whether a request body can be sent again: bytes, seekable files and
+        multipart encoders can, iterators of chunks cannot.
+        """
+        if body is None or isinstance(body, (bytes, bytearray, memoryview, MultipartEncoder)):
+            return True
+        return position is not None
+
+    @staticmethod
+    def __tell(body: Any) -> Optional[int]:
+        """
+        Get the position of a seekable file body, or None for other bodies.
+        """
+        if not hasattr(body, "read") or not hasattr(body, "seek"):
+            return None
+        try:
+            return body.tell()
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def __get_retry_delay(self, attempt: int, response=None) -> float:
+        """
+        Compute the delay before the next retry attempt. Honors the
+        Retry-After header when the server provides it.
+
+        Args:
+        - attempt: Number of the retry about to be performed (1-based).
+        - response: Response that triggered the retry, if any.
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+
+        if attempt <= 1:
+            return 0
+        return self.retry_backoff_factor * (2 ** (attempt - 1))
+
+    async def __send(
+        self,
+        method: HttpMethod,
+        url: Text,
+        headers: Dict[str, str],
+        body: Any,
+        timeout: float,
+        stream: bool = False,
+        endpoint: Optional[Text] = None,
+        position: Optional[int] = None,
+        start: Optional[float] = None,
+        reauthenticate: bool = False,
+    ):
+        """
+        Send the request, retrying idempotent methods on connection errors
+        and retryable status codes. Returns the response and its raw body.
+        When streaming a successful response, the body is left unread and
+        None is returned in its place.
+
+        Metrics are recorded under `endpoint`, if set and metrics are enabled.
+
+        Args:
+        - position: Position of a file body to send from, see `__tell`.
+        - start: Time the request started at, if it is a re-sent request.
+        - reauthenticate: Whether a 401 response will be re-sent with a new
+          token, in which case it is not recorded as a request of its own.
+        """
+        measured = self.metrics is not None and endpoint is not None
+        start = perf_counter() if start is None else start
+        session = self.__get_session()
+        retryable = method.value in IDEMPOTENT_METHODS and self.__replayable(body, position)
+        # Like `requests`, the timeout applies to connecting and to each read,
+        # not to the whole transfer.
+        client_timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=timeout, sock_read=timeout
+        )
+        attempt = 0
+
+        while True:
+            if position is not None:
+                body.seek(position)
+            try:
+                response = await session.request(
+                    method.value,
+                    url,
+                    headers=headers,
+                    data=body
+                    if body is None or isinstance(body, (bytes, bytearray, memoryview))
+                    else self.__iter_body(body),
+                    timeout=client_timeout,
+                )
+                content = None
+                if not stream or not response.ok:
+                    # Reading the whole body returns the connection to the pool.
+                    content = await response.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not retryable or attempt >= self.max_retries:
+                    if measured:
+                        self.metrics.record_request(
+                            method.value,
+                            endpoint,
+                            None,
+                            perf_counter() - start,
+                            self.__body_size(headers, body),
+                        )
+                    raise
+                attempt += 1
+                if measured:
+                    self.metrics.record_retry(method.value, endpoint)
+                await asyncio.sleep(self.__get_retry_delay(attempt))
+                continue
+
+            if (
+                retryable
+                and response.status in RETRY_STATUS_CODES
+                and attempt < self.max_retries
+            ):
+                attempt += 1
+                if measured:
+                    self.metrics.record_retry(method.value, endpoint)
+                await asyncio.sleep(self.__get_retry_delay(attempt, response))
+                continue
+
+            if measured and not (reauthenticate and response.status == 401):
+                self.metrics.record_request(
+                    method.value,
+                    endpoint,
+                    response.status,
+                    perf_counter() - start,
+                    self.__body_size(headers, body),
+                    len(content)
+                    if content is not None
+                    else int(response.headers.get("Content-Length") or 0),
+                )
+            return response, content
+
+    async def request(
+        self,
+        method: HttpMethod,
+        uri: Text,
+        params: Optional[Dict[str, object]] = None,
+        data: Optional[Dict[str, object]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        files: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        skip_auth: Optional[bool] = False,
+        stream: Optional[bool] = False,
+    ):
+        """
+        Makes a request to the Alfred API using the configured HTTP client.
+        Returns a tuple of (parsed response, aiohttp response). Unless streaming,
+        the body of the returned response has already been read, so
+        `await response.read()` is safe to call.
+
+        Args:
+        - method: HTTP method.
+        - uri: Fully qualified URI.
+        - params: Query string parameters.
+        - data: Body data.
+        - headers: HTTP headers.
+        - files: Files to upload.
+        - timeout: Timeout for the requests in seconds.
+        - stream: If True, the response body is not downloaded nor parsed. The
+          parsed response will be None and the caller is responsible for consuming
+          `response.content` and releasing the returned response.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        elif timeout <= 0:
+            raise ValueError(timeout)
+
+        headers = self.__get_headers(headers, has_files=bool(files))
+        url = self.base_url + uri
+        if params:
+            query = urlencode(
+                [(k, v) for k, v in params.items() if v is not None], doseq=True
+            )
+            if query:
+                url = f"{url}?{query}"
+
+        # Reading files to encode or sign them would block the event loop.
+        loop = asyncio.get_running_loop()
+        if files:
+            body = await loop.run_in_executor(None, self.__encode_body, headers, data, files)
+        else:
+            body = self.__encode_body(headers, data, files)
+
+        if not skip_auth:
+            if self.auth_method == AuthMethod.OAUTH:
+                await self.__auth_with_oauth(headers)
+
+            elif self.auth_method == AuthMethod.HMAC:
+                if body is None or isinstance(body, (bytes, bytearray, memoryview)):
+                    body = self.__auth_with_hmac(method.value, url, body, headers)
+                else:
+                    body = await loop.run_in_executor(
+                        None, self.__auth_with_hmac, method.value, url, body, headers
+                    )
+
+        throttled = await self.throttle_request()
+
+        endpoint = None
+        if self.metrics is not None:
+            endpoint = endpoint_template(uri)
+            self.metrics.record_throttle(method.value, endpoint, throttled)
+
+        # File bodies are re-sent from the same position on retries.
+        position = self.__tell(body)
+        reauthenticate = (
+            not skip_auth
+            and self.auth_method == AuthMethod.OAUTH
+            and self.__replayable(body, position)
+        )
+        start = perf_counter()
+        response, content = await self.__send(
+            method, url, headers, body, timeout, stream, endpoint, position, start, reauthenticate
+        )
+        self.rate_limiter.update(response.headers)
+        self.__log_response(method, url, headers, body, response, content)
+
+        # if the response is unauthorized, attempt to re-authenticate OAuth once.
+        if (
+            response.status == 401
+            and not skip_auth
+            and self.auth_method == AuthMethod.OAUTH
+        ):
+            # Concurrent requests rejected with the same stale token share a
+            # single refresh.
+            self.token_manager.invalidate(
+                headers.get("Authorization", "")[len("Bearer "):]
+            )
+            if reauthenticate:
+                if content is None:
+                    response.release()
+                await self.__auth_with_oauth(headers)
+                if endpoint is not None:
+                    self.metrics.record_reauthentication(method.value, endpoint)
+                response, content = await self.__send(
+                    method, url, headers, body, timeout, stream, endpoint, position, start
+                )
+                self.rate_limiter.update(response.headers)
+                self.__log_response(method, url, headers, body, response, content)
+            else:
+                self.logger.warning(
+                    "Request rejected with an expired token. Its body is an iterator that "
+                    "cannot be sent again: retry the request with a new iterator."
+                )
+
+        response.raise_for_status()
+        if content is None:
+            return None, response
+        return self.__parse_response(response, content), response
+
+    async def get(
+        self,
+        uri: Text,
+        params: Optional[Dict[str, object]] = None,
+        data: Optional[Dict[str, object]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        files: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        stream: Optional[bool] = False,
+    ):
+        """
+        Makes a GET request to the Alfred API.
+
+        Args:
+        - uri: Fully qualified URI.
+        - params: Query string parameters.
+        - data: Body data.
+        - headers: HTTP headers.
+        - files: Files to upload.
+        - timeout: Timeout for the requests in seconds.
+        - stream: If True, the response body is left unread (see `request`).
+        """
+        return await self.request(
+            HttpMethod.GET, uri, params, data, headers, files, timeout, stream=stream
+        )
+
+    async def post(
+        self,
+        uri: Text,
+        params: Optional[Dict[str, object]] = None,
+        data: Optional[Dict[str, object]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        files: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Makes a POST request to the Alfred API.
+
+        Args:
+        - uri: Fully qualified URI.
+        - params: Query string parameters.
+        - data: Body data.
+        - headers: HTTP headers.
+        - files: Files to upload.
+        - timeout: Timeout for the requests in seconds.
+        """
+        return await self.request(HttpMethod.POST, uri, params, data, headers, files, timeout)
+
+    async def put(
+        self,
+        uri: Text,
+        params: Optional[Dict[str, object]] = None,
+        data: Optional[Dict[str, object]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        files: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Makes a PUT request to the Alfred API.
+
+        Args:
+        - uri: Fully qualified URI.
+        - params: Query string parameters.
+        - data: Body data.
+        - headers: HTTP headers.
+        - files: Files to upload.
+        - timeout: Timeout for the requests in seconds.
+        """
+        return await self.request(HttpMethod.PUT, uri, params, data, headers, files, timeout)
+
+    async def delete(
+        self,
+        uri: Text,
+        params: Optional[Dict[str, object]] = None,
+        data: Optional[Dict[str, object]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        files: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Makes a DELETE request to the Alfred API.
+
+        Args:
+        - uri: Fully qualified URI.
+        - params: Query string parameters.
+        - data: Body data.
+        - headers: HTTP headers.
+        - files: Files to upload.
+        - timeout: Timeout for the requests in seconds.
+        """
+        return await self.request(
+            HttpMethod.DELETE, uri, params, data, headers, files, timeout
+        )
+
+    def should_throttle(self) -> bool:
+        """
+        Check if the client should throttle requests based on rate limiting headers.
+        """
+        return self.rate_limiter.should_throttle()
+
+    async def throttle_request(self, delay: Optional[float] = None):
+        """
+        Throttle the request by waiting as long as the rate limit requires,
+        without blocking the event loop. Returns the time waited in seconds.
+
+        Args:
+        - delay: Unused. Kept for parity with `HttpClient.throttle_request`.
+        """
+        waited: float = 0
+        while True:
+            wait, acquired = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+            if acquired:
+                break
+
+        if waited > 0:
+            self.logger.warning(
+                f"Rate limit is close to being reached. Throttled request for {waited:.2f}s."
+            )
+        return waited
+
+    def __log_response(
+        self,
+        method: HttpMethod,
+        url: Text,
+        headers: Dict[str, str],
+        body: Any,
+        response: "aiohttp.ClientResponse",
+        content: Optional[bytes],
+    ):
+        """
+        Log the details of the request and, if it failed, of the response. Does
+        nothing unless the logger is enabled for DEBUG.
+        """
+        if not self.request_logger.should_log():
+            return
+
+        self.request_logger.log_request(method.value, url, headers, body)
+        if not response.ok:
+            self.request_logger.log_response(
+                method.value,
+                url,
+                response.status,
+                response.headers.get("Content-Type"),
+                content,
+                response.charset,
+            )
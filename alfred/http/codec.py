@@ -0,0 +1,105 @@
+# Native imports
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Text, Union
+
+__all__ = ["JsonCodec", "StdlibJsonCodec", "OrjsonCodec", "get_json_codec"]
+
+
+class JsonCodec(ABC):
+    """
+    Encoder/decoder used for every JSON payload handled by the SDK: request
+    and response bodies, job metadata and upload metadata.
+
+    Subclass it to plug in another JSON library.
+    """
+    name: Text = "json"
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """
+        Serialize a value to UTF-8 encoded JSON.
+
+        Args:
+        - value: JSON-serializable value.
+        """
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, Text]) -> Any:
+        """
+        Deserialize JSON. Raises `ValueError` on invalid input.
+
+        Args:
+        - data: UTF-8 encoded JSON or JSON text.
+        """
+
+
+class StdlibJsonCodec(JsonCodec):
+    """
+    Codec based on the standard library `json` module.
+    """
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    def loads(self, data: Union[bytes, Text]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Codec based on `orjson`, which parses and serializes several times faster
+    than the standard library. Output is compact and always UTF-8.
+    """
+    name = "orjson"
+
+    def __init__(self):
+        import orjson  # pylint: disable=C0415
+
+        self.__orjson = orjson
+        # Dictionaries with non-string keys are serialized like `json.dumps` does.
+        self.__options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, value: Any) -> bytes:
+        return self.__orjson.dumps(value, option=self.__options)
+
+    def loads(self, data: Union[bytes, Text]) -> Any:
+        return self.__orjson.loads(data)
+
+
+DEFAULT_CODEC = StdlibJsonCodec()
+
+
+def get_json_codec(codec: Optional[Union[Text, JsonCodec]] = None) -> JsonCodec:
+    """
+    Resolve the `json_codec` setting of `HttpConfiguration`.
+
+    Args:
+    - codec: One of:
+        - None or "json": the standard library `json` module (default).
+        - "orjson": orjson. Raises `ImportError` if it is not installed.
+        - "auto": orjson if it is installed, the standard library otherwise.
+        - A `JsonCodec` instance, returned as is.
+    """
+    if codec is None or codec == "json":
+        return DEFAULT_CODEC
+
+    if isinstance(codec, JsonCodec):
+        return codec
+
+    if codec == "orjson":
+        try:
+            return OrjsonCodec()
+        except ImportError as err:
+            raise ImportError(
+                "The orjson codec requires orjson. Install it with: pip install orjson"
+            ) from err
+
+    if codec == "auto":
+        try:
+            return OrjsonCodec()
+        except ImportError:
+            return DEFAULT_CODEC
+
+    raise ValueError(f"Invalid JSON codec: {codec}")
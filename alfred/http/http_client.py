@@ -1,14 +1,8 @@
 # Native imports
-import base64
-import hashlib
-import hmac
 import os
-from datetime import datetime
+import threading
+from time import perf_counter
 from typing import Dict, Any
-from urllib.parse import quote
-from time import time, sleep
-from uuid import uuid4
-from xml.etree import ElementTree as ET
 
 # 3rd party imports
 from requests import Session, Request, PreparedRequest, Response
@@ -17,6 +11,12 @@ from urllib3.util.retry import Retry
 
 # Project imports
 from .typed import *  # pylint: disable=W0401, W0614
+from .codec import JsonCodec, get_json_codec
+from .metrics import ClientMetrics, endpoint_template
+from .rate_limiter import RateLimiter
+from .request_logger import RequestLogger
+from .signer import HmacSigner, is_raw_body
+from .token_manager import TokenManager
 from ..base.typed import ResponseType
 from ..base.constants import RESPONSE_TYPE_HEADER_MAPPING
 from ..base.exceptions import AlfredMissingAuthException
@@ -27,14 +27,18 @@ class HttpClient:
     base_url: Text
     max_retries: int
     timeout: float
+    pool_maxsize: int
+    json_codec: JsonCodec
     session: Session
     auth_config: AuthConfiguration
     auth_method: Optional[AuthMethod] = None
-    token: Optional[Text] = None
-    refresh_token_retry_count: int = 0
+    token_manager: Optional[TokenManager] = None
+    token_refresh_margin: float = 60
+    hmac_signer: Optional[HmacSigner] = None
     response_type: ResponseType = ResponseType.JSON
-    rate_limit: Optional[Dict[str, Any]] = None
-    __initial_throttle_delay: float
+    rate_limiter: RateLimiter
+    request_logger: RequestLogger
+    metrics: Optional[ClientMetrics] = None
     throttle_delay: float
     throttle_threshold: int
     throttle_delay_backoff: float = 2
@@ -59,10 +63,22 @@ class HttpClient:
             - config.max_retries: Maximum number of retries each request should
             attempt (default: 3).
             - config.response_type {ResponseType}: Specifies the expected format of the response data (default: JSON).
-            - config.throttle_delay: Delay in seconds to throttle requests (default: 1).
+            - config.throttle_delay: Initial delay in seconds to throttle requests when the rate
+                limit is exhausted and the server does not report when it resets (default: 1).
             - config.throttle_threshold: Percentage of rate limit remaining to throttle requests (default: 20).
                 Set to 0 to disable throttling. 20 means that if the remaining rate limit is less than 20%
-                of the total rate limit, the http client will throttle the request.
+                of the total rate limit, the http client will pace requests evenly over the rest of the
+                rate limit window. See `RateLimiter`.
+            - config.token_refresh_margin: Seconds before an OAuth access token expires at which
+                it is refreshed (default: 60).
+            - config.json_codec: JSON encoder/decoder used for request and response bodies and
+                metadata: "json" (default), "orjson", "auto" (orjson if installed) or a `JsonCodec`.
+            - config.log_sample_rate: Fraction of the requests logged at DEBUG level, between 0
+                and 1 (default: 1). Nothing is logged, nor built, below DEBUG. See `RequestLogger`.
+            - config.log_max_body_size: Maximum number of characters of each logged request or
+                response body (default: no limit).
+            - config.metrics: True, or a `ClientMetrics` instance (e.g. shared between clients),
+                to record request metrics in `self.metrics` (default: disabled).
         """
         self.base_url = base_url
         self.session = Session()
@@ -71,6 +87,17 @@ class HttpClient:
 
         # Initialize logger
         self.logger = logging.getLogger("alfred-python")
+        self.request_logger = RequestLogger(
+            self.logger,
+            sample_rate=config.get("log_sample_rate", 1.0),
+            max_body_size=config.get("log_max_body_size"),
+        )
+
+        # Setup metrics (if any)
+        metrics = config.get("metrics")
+        if metrics is True:
+            metrics = ClientMetrics()
+        self.metrics = metrics or None
 
         # Setup retry strategy
         self.max_retries = config.get("max_retries", 3)
@@ -96,10 +123,18 @@ class HttpClient:
         if self.response_type not in RESPONSE_TYPE_HEADER_MAPPING.keys():
             raise ValueError(f"Invalid response type: {self.response_type}")
 
+        # Setup JSON codec
+        self.json_codec = get_json_codec(config.get("json_codec"))
+
         # Setup throttle delay
         self.throttle_delay = config.get("throttle_delay", 1)
         self.throttle_threshold = config.get("throttle_threshold", 20)
-        self.__initial_throttle_delay = self.throttle_delay
+        self.rate_limiter = RateLimiter(
+            threshold=self.throttle_threshold,
+            delay=self.throttle_delay,
+            delay_backoff=self.throttle_delay_backoff,
+            delay_max=self.throttle_delay_max,
+        )
 
         # Setup pool connections
         pool_size = 1
@@ -108,6 +143,7 @@ class HttpClient:
             pool_size = 10
             pool_maxsize = min(32, os.cpu_count() + 4)
 
+        self.pool_maxsize = pool_maxsize
         adapter = HTTPAdapter(
             pool_maxsize=pool_maxsize,
             pool_connections=pool_size,
@@ -119,13 +155,25 @@ class HttpClient:
         # Setup API key (if any)
         self.__auth_with_api_key(self.auth_config.get("api_key"))
 
+        self.token_refresh_margin = config.get("token_refresh_margin", 60)
+
         # Setup OAuth (if any)
         if not self.auth_method and self.auth_config.get("oauth"):
             self.auth_method = AuthMethod.OAUTH
+            self.token_manager = TokenManager(
+                self.__fetch_token, refresh_margin=self.token_refresh_margin
+            )
+            # Marks the thread re-sending a request after a 401, so the
+            # response of the re-sent request is not intercepted again.
+            self.__reauth = threading.local()
 
         # Setup HMAC
         if not self.auth_method and self.auth_config.get("hmac"):
             self.auth_method = AuthMethod.HMAC
+            self.hmac_signer = HmacSigner(
+                self.auth_config["hmac"].get("api_key"),
+                self.auth_config["hmac"].get("secret_key"),
+            )
 
         if not self.auth_method:
             raise AlfredMissingAuthException
@@ -139,27 +187,55 @@ class HttpClient:
         Intercepts the response and raises an exception if the status code is not 200.
         """
         # Extract rate limit headers
-        self.rate_limit = {
-            "limit": int(response.headers.get("X-RateLimit-Limit", 0)),
-            "remaining": int(response.headers.get("X-RateLimit-Remaining", 0)),
-            "reset_time": datetime.utcfromtimestamp(
-                int(response.headers.get("X-RateLimit-Reset", 0))
-            ),
-        }
+        self.rate_limiter.update(response.headers)
 
-        # if the response is unauthorized, attempt to re-authenticate OAuth
+        # if the response is unauthorized, attempt to re-authenticate OAuth once.
         if (
             response.status_code == 401
             and self.auth_method == AuthMethod.OAUTH
-            and self.refresh_token_retry_count == 0
+            and not getattr(self.__reauth, "active", False)
         ):
-            self.refresh_token_retry_count += 1
-            self.token = None
-            self.__auth_with_oauth(response.request)
-            response = self.session.send(response.request)
-            if response.status_code != 401:
-                self.refresh_token_retry_count = 0
-            return response
+            authorization = response.request.headers.get("Authorization", "")
+            if not authorization.startswith("Bearer "):
+                # Unauthenticated request, e.g. the token request itself.
+                return None
+
+            # Concurrent requests rejected with the same stale token share a
+            # single refresh.
+            self.token_manager.invalidate(authorization[len("Bearer "):])
+            request = response.request.copy()
+            self.__auth_with_oauth(request)
+            response.close()
+            if self.metrics is not None:
+                self.metrics.record_reauthentication(
+                    request.method, self.__endpoint_template(request.url)
+                )
+
+            self.__reauth.active = True
+            try:
+                return self.session.send(request, **kwargs)
+            finally:
+                self.__reauth.active = False
+        return None
+
+    @property
+    def token(self) -> Optional[Text]:
+        """
+        Current OAuth access token, if any.
+        """
+        return self.token_manager.token if self.token_manager else None
+
+    @token.setter
+    def token(self, token: Optional[Text]):
+        """
+        Use an access token obtained elsewhere, until it is rejected. None
+        drops the current token, so the next OAuth request fetches a new one.
+        """
+        if self.token_manager is None:
+            self.token_manager = TokenManager(
+                self.__fetch_token, refresh_margin=self.token_refresh_margin
+            )
+        self.token_manager.set_token(token)
 
     def __auth_with_api_key(self, api_key: Text):
         """
@@ -186,16 +262,20 @@ class HttpClient:
         Args:
         - prepped_request: Prepared Request object.
         """
+        token = self.token_manager.get_token()
+        prepped_request.headers.update({"Authorization": f"Bearer {token}"})
+
+    def __fetch_token(self) -> OAuthToken:
+        """
+        Get a new access token using the configured OAuth credentials.
+        """
         username = self.auth_config.get("oauth", {}).get("username")
         password = self.auth_config.get("oauth", {}).get("password")
-        if not self.token:
-            self.token = self.__get_token(username, password)
-
-        prepped_request.headers.update({"Authorization": f"Bearer {self.token}"})
+        return self.__get_token(username, password)
 
-    def __get_token(self, username: Text, password: Text):
+    def __get_token(self, username: Text, password: Text) -> OAuthToken:
         """
-        Get access token.
+        Get access token. Returns the token response, including `expires_in`.
 
         Args:
         - username: A string that represents the username used for authentication.
@@ -211,8 +291,7 @@ class HttpClient:
             headers=headers,
             skip_auth=True,
         )
-        response_json = response.json()
-        return response_json.get("access_token")
+        return self.__load_json(response)
 
     def __auth_with_hmac(self, prepped_request: PreparedRequest):
         """
@@ -222,39 +301,16 @@ class HttpClient:
         Args:
         - prepped_request: Prepared Request object.
         """
-        api_key = self.auth_config.get("hmac", {}).get("api_key")
-        secret_key = self.auth_config.get("hmac", {}).get("secret_key")
-
-        nonce = str(uuid4())
-        request_uri = quote(prepped_request.url, safe="").lower()
-        request_method = prepped_request.method.upper()
-        request_timestamp = str(int(time()))
-        request_content = ""
-
-        if prepped_request.body:
-            md5_hash = hashlib.md5()
-            md5_hash.update(prepped_request.body.encode("utf-8"))
-            request_content = base64.b64encode(md5_hash.digest()).decode("utf-8")
-
-        # Prepare the signature
-        signature_raw_data = (
-            secret_key
-            + request_method
-            + request_uri
-            + request_timestamp
-            + nonce
-            + request_content
+        authorization, body = self.hmac_signer.sign(
+            prepped_request.method, prepped_request.url, prepped_request.body
         )
-        signature = signature_raw_data.encode("utf-8")
-
-        # Create HMAC signature
-        secret_byte_array = base64.b64decode(api_key)
-        hmac_signature = hmac.new(secret_byte_array, signature, hashlib.sha256).digest()
-        signature_base64 = base64.b64encode(hmac_signature).decode("utf-8")
-
-        # Prepare the Authorization header
-        hmac_key = f"amx {secret_key}:{signature_base64}:{nonce}:{request_timestamp}"
-        prepped_request.headers.update({"Authorization": hmac_key})
+        if body is not prepped_request.body:
+            # A one-shot body was consumed while hashing: send its copy, which
+            # has a known length.
+            prepped_request.headers.pop("Transfer-Encoding", None)
+            prepped_request.body = body
+            prepped_request.prepare_content_length(body)
+        prepped_request.headers.update({"Authorization": authorization})
 
     def __get_headers(self, headers: Optional[Dict[str, str]], has_files: bool = False) -> Dict[str, str]:
         """
@@ -275,8 +331,16 @@ class HttpClient:
 
         return {**default_headers, **headers}
 
-    @staticmethod
-    def __parse_response(response: Response):
+    def __load_json(self, response: Response) -> Any:
+        """
+        Decode a JSON response body with the configured codec.
+        """
+        encoding = (response.encoding or "utf-8").lower().replace("_", "-")
+        if encoding in ("utf-8", "utf8", "ascii"):
+            return self.json_codec.loads(response.content)
+        return self.json_codec.loads(response.text)
+
+    def __parse_response(self, response: Response):
         """
         Parse the response based on the response type.
 
@@ -293,9 +357,11 @@ class HttpClient:
 
         try:
             if response_type == ResponseType.XML:
-                return ET.fromstring(response.text)
+                # Imported on first use, as most clients never parse XML.
+                from xml.etree import ElementTree  # pylint: disable=C0415
+                return ElementTree.fromstring(response.text)
             elif response_type == ResponseType.JSON:
-                return response.json()
+                return self.__load_json(response)
             elif response_type == ResponseType.TEXT:
                 return response.text
             else:
@@ -313,6 +379,7 @@ class HttpClient:
         files: Optional[Dict[str, Any]] = None,
         timeout: Optional[float] = None,
         skip_auth: Optional[bool] = False,
+        stream: Optional[bool] = False,
     ):
         """
         Makes a request to the Alfred API using the configured HTTP client.
@@ -324,6 +391,9 @@ class HttpClient:
         - data: Body data.
         - headers: HTTP headers.
         - timeout: Timeout for the requests in seconds.
+        - stream: If True, the response body is not downloaded nor parsed. The
+          parsed response will be None and the caller is responsible for consuming
+          and closing the returned response.
         """
         if timeout is None:
             timeout = self.timeout
@@ -341,8 +411,13 @@ class HttpClient:
             "files": files,
         }
 
-        if headers and headers.get("Content-Type") == "application/json":
-            kwargs["json"] = data
+        if (
+            headers
+            and headers.get("Content-Type") == "application/json"
+            and data is not None
+            and not is_raw_body(data)
+        ):
+            kwargs["data"] = self.json_codec.dumps(data)
         else:
             kwargs["data"] = data
 
@@ -356,13 +431,62 @@ class HttpClient:
             elif self.auth_method == AuthMethod.HMAC:
                 self.__auth_with_hmac(prepped_request)
 
-        self.throttle_request(self.throttle_delay)
+        throttled = self.throttle_request()
 
-        response = self.session.send(prepped_request, timeout=timeout)
+        if self.metrics is None:
+            response = self.session.send(prepped_request, timeout=timeout, stream=stream)
+        else:
+            response = self.__send_measured(prepped_request, uri, timeout, stream, throttled)
 
         response.raise_for_status()
+        if stream:
+            return None, response
         return self.__parse_response(response), response
 
+    def __send_measured(
+        self,
+        prepped_request: PreparedRequest,
+        uri: Text,
+        timeout: float,
+        stream: bool,
+        throttled: float,
+    ) -> Response:
+        """
+        Send a request and record its metrics.
+        """
+        method = prepped_request.method
+        endpoint = endpoint_template(uri)
+        bytes_sent = int(prepped_request.headers.get("Content-Length") or 0)
+        self.metrics.record_throttle(method, endpoint, throttled)
+
+        start = perf_counter()
+        try:
+            response = self.session.send(prepped_request, timeout=timeout, stream=stream)
+        except Exception:
+            self.metrics.record_request(method, endpoint, None, perf_counter() - start, bytes_sent)
+            raise
+        duration = perf_counter() - start
+
+        # Retries performed by urllib3 are recorded in the response's retry history.
+        retries = getattr(getattr(response.raw, "retries", None), "history", None)
+        self.metrics.record_retry(method, endpoint, len(retries or ()))
+        if stream:
+            bytes_received = int(response.headers.get("Content-Length") or 0)
+        else:
+            bytes_received = len(response.content or b"")
+        self.metrics.record_request(
+            method, endpoint, response.status_code, duration, bytes_sent, bytes_received
+        )
+        return response
+
+    def __endpoint_template(self, url: Text) -> Text:
+        """
+        Get the endpoint template of a request URL, relative to the base URL.
+        """
+        if url.startswith(self.base_url):
+            url = url[len(self.base_url):]
+        return endpoint_template(url)
+
     def get(
         self,
         uri: Text,
@@ -371,6 +495,7 @@ class HttpClient:
         headers: Optional[Dict[str, str]] = None,
         files: Optional[Dict[str, Any]] = None,
         timeout: Optional[float] = None,
+        stream: Optional[bool] = False,
     ):
         """
         Makes a GET request to the Alfred API.
@@ -382,8 +507,11 @@ class HttpClient:
         - headers: HTTP headers.
         - files: Files to upload.
         - timeout: Timeout for the requests in seconds.
+        - stream: If True, the response body is left unread (see `request`).
         """
-        return self.request(HttpMethod.GET, uri, params, data, headers, files, timeout)
+        return self.request(
+            HttpMethod.GET, uri, params, data, headers, files, timeout, stream=stream
+        )
 
     def post(
         self,
@@ -453,6 +581,32 @@ class HttpClient:
             HttpMethod.DELETE, uri, params, data, headers, files, timeout
         )
 
+    @property
+    def rate_limit(self) -> Optional[Dict[str, Any]]:
+        """
+        Rate limit reported by the last response, if any.
+        """
+        state = self.rate_limiter.state()
+        if state.get("limit") is None:
+            return None
+
+        return {
+            "limit": state.get("limit"),
+            "remaining": state.get("remaining"),
+            "reset_time": state.get("reset_time"),
+        }
+
+    @rate_limit.setter
+    def rate_limit(self, rate_limit: Optional[Dict[str, Any]]):
+        """
+        Replace the rate limit the requests are throttled against, e.g. with
+        one saved from another client. None clears it until the next response.
+        """
+        rate_limit = rate_limit or {}
+        self.rate_limiter.set_state(
+            rate_limit.get("limit"), rate_limit.get("remaining"), rate_limit.get("reset_time")
+        )
+
     def should_throttle(self) -> bool:
         """
         Check if the client should throttle requests based on rate limiting headers.
@@ -461,64 +615,42 @@ class HttpClient:
         # We should throttle if the remaining rate limit is less than the threshold in percentage.
         # For example, if the rate limit is 100 and the remaining is 20, we should throttle.
         # If the rate limit is 100 and the remaining is 80, we should not throttle.
-        if self.rate_limit and self.throttle_threshold > 0:
-            remaining = self.rate_limit.get("remaining", 0)
-            limit = self.rate_limit.get("limit", 0)
-
-            if remaining <= 0:
-                self.throttle_delay = min(self.throttle_delay * self.throttle_delay_backoff, self.throttle_delay_max)
-                return True
-            else:
-                # Reset the throttle delay in case the rate limit has been reset.
-                self.throttle_delay = self.__initial_throttle_delay
-
-                # Check if the remaining rate limit is less than the threshold.
-                return (remaining / limit) * 100 <= self.throttle_threshold
-        return False
+        return self.rate_limiter.should_throttle()
 
-    def throttle_request(self, delay: float = 1.0):
+    def throttle_request(self, delay: Optional[float] = None):
         """
-        Throttle the request by delaying for a given time.
+        Throttle the request by waiting as long as the rate limit requires.
+        Safe to call from multiple threads. Returns the time waited in seconds.
+
+        Args:
+        - delay: Unused. Kept for backwards compatibility, the delay is derived
+          from the rate limit window.
         """
-        if self.should_throttle():
-            logging.warning("Rate limit is close to being reached. Throttling request.")
-            sleep(delay)
+        waited = self.rate_limiter.acquire()
+        if waited > 0:
+            self.logger.warning(
+                f"Rate limit is close to being reached. Throttled request for {waited:.2f}s."
+            )
+        return waited
 
     def __logger_interceptor(self, response: Response, *args, **kwargs):
         """
-        Log the HTTP status code and response body of erroneous responses.
+        Log the details of the request and, if it failed, of the response. Does
+        nothing unless the logger is enabled for DEBUG.
         """
+        if not self.request_logger.should_log():
+            return
 
-        # Log detailed HTTP request information.
-        body = (
-            response.request.body
-            if not isinstance(response.request.body, bytes)
-            else ""
-        )
-        self.logger.debug(
-            {
-                "message": "HTTP request details.",
-                "method": response.request.method,
-                "url": response.request.url,
-                "headers": {
-                    k: v
-                    for k, v in response.request.headers.items()
-                    if k.lower() not in ["authorization", "cookie", "x-tagshelfapi-key"]
-                },
-                "body": body,
-            }
+        request = response.request
+        self.request_logger.log_request(
+            request.method, request.url, request.headers, request.body
         )
-
-        # Log response details if not successful.
         if not response.ok:
-            self.logger.debug(
-                {
-                    "message": "HTTP response details.",
-                    "method": response.request.method,
-                    "url": response.request.url,
-                    "status_code": response.status_code,
-                    "body": response.text,
-                    "response_size": len(response.content),
-                    "response_content_type": response.headers.get("Content-Type"),
-                }
+            self.request_logger.log_response(
+                request.method,
+                request.url,
+                response.status_code,
+                response.headers.get("Content-Type"),
+                response.content,
+                response.encoding,
             )
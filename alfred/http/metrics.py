@@ -0,0 +1,285 @@
+# Native imports
+import re
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Text, Tuple
+from urllib.parse import urlsplit
+
+# Project imports
+from .typed import EndpointMetrics, MetricsSnapshot
+
+__all__ = ["ClientMetrics", "endpoint_template", "format_prometheus"]
+
+# Upper bounds in seconds of the request latency histogram buckets.
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Path segments that identify a resource rather than an endpoint: UUIDs,
+# numbers, and long tokens containing digits (e.g. hex or base64 IDs).
+ID_SEGMENT = re.compile(
+    r"^(?:[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}"
+    r"|\d+"
+    r"|(?=[^/]*\d)[\w\-.~%=]{8,})$"
+)
+
+
+@lru_cache(maxsize=4096)
+def endpoint_template(path: Text) -> Text:
+    """
+    Get the endpoint template of a request path or URL, with the segments
+    that identify resources replaced by `{id}`. For example,
+    `/api/file/detail/8f0c…` becomes `/api/file/detail/{id}`.
+
+    Args:
+    - path: Request path or URL. The query string is ignored.
+    """
+    path = urlsplit(path).path or "/"
+    return "/".join(
+        "{id}" if ID_SEGMENT.match(segment) else segment for segment in path.split("/")
+    )
+
+
+class _Endpoint:
+    __slots__ = (
+        "requests",
+        "statuses",
+        "buckets",
+        "latency_sum",
+        "retries",
+        "reauthentications",
+        "throttled_seconds",
+        "bytes_sent",
+        "bytes_received",
+    )
+
+    def __init__(self, bucket_count: int):
+        self.requests = 0
+        self.statuses: Dict[Text, int] = {}
+        # Non-cumulative counts, the last one being the +Inf bucket.
+        self.buckets = [0] * (bucket_count + 1)
+        self.latency_sum = 0.0
+        self.retries = 0
+        self.reauthentications = 0
+        self.throttled_seconds = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+class ClientMetrics:
+    """
+    Thread-safe request metrics of an HTTP client, aggregated per HTTP method
+    and endpoint template: request counts per status code, latency histograms,
+    retries, OAuth re-authentications, time spent throttled by the rate
+    limiter, and bytes sent and received.
+
+    Pass an instance (or True) as the `metrics` option of `HttpConfiguration`
+    to collect them, read them with `snapshot()`, and publish them with
+    `format_prometheus` or exporters registered with `add_exporter`.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Args:
+        - latency_buckets: Upper bounds in seconds of the latency histogram buckets.
+        """
+        self.latency_buckets: Tuple[float, ...] = tuple(sorted(latency_buckets))
+        self.__lock = threading.Lock()
+        self.__endpoints: Dict[Tuple[Text, Text], _Endpoint] = {}
+        self.__exporters: List[Callable[[MetricsSnapshot], None]] = []
+
+    def record_request(
+        self,
+        method: Text,
+        endpoint: Text,
+        status: Optional[int],
+        duration: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ):
+        """
+        Record a completed request.
+
+        Args:
+        - method: HTTP method.
+        - endpoint: Endpoint template, see `endpoint_template`.
+        - status: HTTP status code, or None if no response was received.
+        - duration: Time in seconds spent sending the request and receiving
+          the response, including retries.
+        - bytes_sent: Size of the request body.
+        - bytes_received: Size of the response body.
+        """
+        bucket = bisect_left(self.latency_buckets, duration)
+        status_label = str(status) if status is not None else "error"
+        with self.__lock:
+            stats = self.__get(method, endpoint)
+            stats.requests += 1
+            stats.statuses[status_label] = stats.statuses.get(status_label, 0) + 1
+            stats.buckets[bucket] += 1
+            stats.latency_sum += duration
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+
+    def record_retry(self, method: Text, endpoint: Text, count: int = 1):
+        """
+        Record retries of a request.
+        """
+        if count <= 0:
+            return
+        with self.__lock:
+            self.__get(method, endpoint).retries += count
+
+    def record_reauthentication(self, method: Text, endpoint: Text):
+        """
+        Record a request re-sent with a new OAuth token after a 401 response.
+        """
+        with self.__lock:
+            self.__get(method, endpoint).reauthentications += 1
+
+    def record_throttle(self, method: Text, endpoint: Text, seconds: float):
+        """
+        Record time a request waited for the rate limiter.
+        """
+        if seconds <= 0:
+            return
+        with self.__lock:
+            self.__get(method, endpoint).throttled_seconds += seconds
+
+    def snapshot(self) -> MetricsSnapshot:
+        """
+        Get a copy of the metrics collected so far.
+        """
+        endpoints: List[EndpointMetrics] = []
+        with self.__lock:
+            for (method, endpoint), stats in self.__endpoints.items():
+                cumulative = []
+                total = 0
+                for count in stats.buckets:
+                    total += count
+                    cumulative.append(total)
+                endpoints.append(
+                    {
+                        "method": method,
+                        "endpoint": endpoint,
+                        "requests": stats.requests,
+                        "statuses": dict(stats.statuses),
+                        "latency_buckets": list(
+                            zip(self.latency_buckets + (float("inf"),), cumulative)
+                        ),
+                        "latency_sum": stats.latency_sum,
+                        "retries": stats.retries,
+                        "reauthentications": stats.reauthentications,
+                        "throttled_seconds": stats.throttled_seconds,
+                        "bytes_sent": stats.bytes_sent,
+                        "bytes_received": stats.bytes_received,
+                    }
+                )
+
+        return {
+            "endpoints": endpoints,
+            "requests": sum(item["requests"] for item in endpoints),
+            "retries": sum(item["retries"] for item in endpoints),
+            "reauthentications": sum(item["reauthentications"] for item in endpoints),
+            "throttled_seconds": sum(item["throttled_seconds"] for item in endpoints),
+            "bytes_sent": sum(item["bytes_sent"] for item in endpoints),
+            "bytes_received": sum(item["bytes_received"] for item in endpoints),
+        }
+
+    def reset(self):
+        """
+        Discard the metrics collected so far.
+        """
+        with self.__lock:
+            self.__endpoints.clear()
+
+    def add_exporter(self, exporter: Callable[[MetricsSnapshot], None]):
+        """
+        Register a function called with a snapshot on every `export()`.
+        """
+        self.__exporters.append(exporter)
+
+    def remove_exporter(self, exporter: Callable[[MetricsSnapshot], None]):
+        """
+        Unregister an exporter.
+        """
+        self.__exporters.remove(exporter)
+
+    def export(self) -> MetricsSnapshot:
+        """
+        Take a snapshot and pass it to every exporter. Returns the snapshot.
+        """
+        snapshot = self.snapshot()
+        for exporter in list(self.__exporters):
+            exporter(snapshot)
+        return snapshot
+
+    def __get(self, method: Text, endpoint: Text) -> _Endpoint:
+        """
+        Get the stats of an endpoint. Must be called while holding the lock.
+        """
+        stats = self.__endpoints.get((method, endpoint))
+        if stats is None:
+            stats = self.__endpoints[(method, endpoint)] = _Endpoint(len(self.latency_buckets))
+        return stats
+
+
+def format_prometheus(snapshot: MetricsSnapshot, prefix: Text = "alfred_client") -> Text:
+    """
+    Format a metrics snapshot in the Prometheus text exposition format.
+
+    Args:
+    - snapshot: Snapshot returned by `ClientMetrics.snapshot`.
+    - prefix: Prefix of the metric names.
+    """
+    lines: List[Text] = []
+
+    def family(name: Text, kind: Text, description: Text):
+        lines.append(f"# HELP {prefix}_{name} {description}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+    def sample(name: Text, labels: Dict[Text, Text], value: float):
+        label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+        lines.append(f"{prefix}_{name}{{{label_text}}} {_format_value(value)}")
+
+    endpoints = snapshot["endpoints"]
+
+    family("requests_total", "counter", "Requests sent, by endpoint and status code.")
+    for item in endpoints:
+        for status, count in sorted(item["statuses"].items()):
+            sample("requests_total", {**_labels(item), "status": status}, count)
+
+    family("request_duration_seconds", "histogram", "Request latency in seconds.")
+    for item in endpoints:
+        labels = _labels(item)
+        for bound, count in item["latency_buckets"]:
+            le = "+Inf" if bound == float("inf") else _format_value(bound)
+            sample("request_duration_seconds_bucket", {**labels, "le": le}, count)
+        sample("request_duration_seconds_sum", labels, item["latency_sum"])
+        sample("request_duration_seconds_count", labels, item["requests"])
+
+    counters = (
+        ("retries_total", "retries", "Request retries."),
+        ("reauthentications_total", "reauthentications", "Requests re-sent with a new token."),
+        ("throttled_seconds_total", "throttled_seconds", "Time spent waiting for the rate limit."),
+        ("sent_bytes_total", "bytes_sent", "Request body bytes sent."),
+        ("received_bytes_total", "bytes_received", "Response body bytes received."),
+    )
+    for name, key, description in counters:
+        family(name, "counter", description)
+        for item in endpoints:
+            sample(name, _labels(item), item[key])
+
+    return "\n".join(lines) + "\n"
+
+
+def _labels(item: EndpointMetrics) -> Dict[Text, Text]:
+    return {"method": item["method"], "endpoint": item["endpoint"]}
+
+
+def _escape(value: Text) -> Text:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> Text:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
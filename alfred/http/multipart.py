@@ -0,0 +1,138 @@
+# Native imports
+import os
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Text, Tuple
+from uuid import uuid4
+
+__all__ = ["MultipartEncoder"]
+
+# Size of the chunks read from disk when streaming multipart bodies.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class MultipartEncoder:
+    """
+    Streaming multipart/form-data encoder.
+
+    Unlike `requests`' built-in multipart encoding, the body is never built in
+    memory: files are read from their current position in chunks while the
+    request is being sent. The encoder knows its exact length upfront, so it
+    is sent with a Content-Length header instead of chunked encoding.
+
+    The encoder can be iterated more than once (e.g. to hash the body before
+    sending it, or to re-send it after re-authenticating), as long as the
+    underlying file objects are seekable.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, Tuple[Text, BinaryIO, Text]]] = None,
+        boundary: Optional[Text] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Args:
+        - fields: Plain form fields. None values are skipped.
+        - files: Files to upload, as {name: (filename, file object, content type)}.
+        - boundary: Multipart boundary (default: random).
+        - chunk_size: Size in bytes of each chunk read from the files.
+        """
+        self.boundary = boundary or uuid4().hex
+        self.chunk_size = chunk_size
+        self.__parts: List[Tuple[bytes, Optional[BinaryIO], int, int]] = []
+
+        for name, value in (fields or {}).items():
+            if value is None:
+                continue
+            if not isinstance(value, bytes):
+                value = str(value).encode("utf-8")
+            header = self.__part_header(name)
+            self.__parts.append((header + value + b"\r\n", None, 0, 0))
+
+        for name, (filename, file, content_type) in (files or {}).items():
+            header = self.__part_header(name, filename, content_type)
+            start = file.tell()
+            self.__parts.append((header, file, start, self.__file_size(file) - start))
+
+        self.__closing = f"--{self.boundary}--\r\n".encode("utf-8")
+
+    @property
+    def content_type(self) -> Text:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        length = len(self.__closing)
+        for header, file, _, size in self.__parts:
+            length += len(header)
+            if file is not None:
+                length += size + 2
+        return length
+
+    def __iter__(self) -> Iterator[bytes]:
+        for header, file, start, size in self.__parts:
+            yield header
+            if file is None:
+                continue
+
+            file.seek(start)
+            remaining = size
+            while remaining > 0:
+                chunk = file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    raise IOError("File was truncated while being uploaded.")
+                remaining -= len(chunk)
+                yield chunk
+            yield b"\r\n"
+
+        yield self.__closing
+
+    def update_hash(self, hasher):
+        """
+        Feed the whole encoded body into a hashlib-compatible object,
+        chunk by chunk.
+
+        Args:
+        - hasher: Object with an `update(bytes)` method.
+        """
+        for chunk in self:
+            hasher.update(chunk)
+
+    def __part_header(
+        self,
+        name: Text,
+        filename: Optional[Text] = None,
+        content_type: Optional[Text] = None,
+    ) -> bytes:
+        disposition = f'form-data; name="{self.__quote(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{self.__quote(filename)}"'
+
+        lines = [f"--{self.boundary}", f"Content-Disposition: {disposition}"]
+        if content_type:
+            lines.append(f"Content-Type: {content_type}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+
+    @staticmethod
+    def __quote(value: Text) -> Text:
+        """
+        Escape a header parameter value following the HTML5 form encoding rules.
+        """
+        return (
+            value.replace("\\", "\\\\")
+            .replace('"', "%22")
+            .replace("\r", "%0D")
+            .replace("\n", "%0A")
+        )
+
+    @staticmethod
+    def __file_size(file: BinaryIO) -> int:
+        """
+        Get the total size of a file object, without reading it.
+        """
+        try:
+            return os.fstat(file.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            position = file.tell()
+            size = file.seek(0, os.SEEK_END)
+            file.seek(position)
+            return size
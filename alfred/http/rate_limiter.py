@@ -0,0 +1,247 @@
+# Native imports
+import calendar
+import threading
+from datetime import datetime
+from time import sleep, time
+from typing import Any, Callable, Mapping, Optional, Tuple
+
+# Project imports
+from .typed import RateLimitState
+
+__all__ = ["RateLimiter"]
+
+# Values of X-RateLimit-Reset below this are treated as seconds until the reset
+# instead of a Unix timestamp.
+RELATIVE_RESET_THRESHOLD = 10 ** 9
+
+
+class RateLimiter:
+    """
+    Thread-safe client-side token bucket seeded from the X-RateLimit-Limit,
+    X-RateLimit-Remaining and X-RateLimit-Reset response headers.
+
+    Every request takes a token before being sent. While tokens are plentiful
+    requests go out immediately. Once the remaining tokens drop below the
+    throttle threshold, requests are paced evenly over what is left of the
+    rate limit window, and when the bucket is empty callers wait until the
+    window resets. Tokens are accounted locally, so concurrent callers never
+    collectively exceed the limit while their responses are still in flight.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 20,
+        delay: float = 1,
+        delay_backoff: float = 2,
+        delay_max: float = 60,
+        window: float = 60,
+        clock: Callable[[], float] = time,
+    ):
+        """
+        Args:
+        - threshold: Percentage of the rate limit below which requests are paced.
+          Set to 0 to disable throttling.
+        - delay: Initial delay in seconds used when the bucket is empty but the
+          server did not report when the window resets.
+        - delay_backoff: Multiplier applied to `delay` on consecutive waits.
+        - delay_max: Maximum value of `delay`.
+        - window: Initial estimate in seconds of the rate limit window length,
+          refined as windows reset.
+        - clock: Function returning the current Unix time.
+        """
+        self.threshold = threshold
+        self.window = window
+        self.__clock = clock
+        self.__lock = threading.Lock()
+
+        self.__initial_delay = delay
+        self.__delay = delay
+        self.__delay_backoff = delay_backoff
+        self.__delay_max = delay_max
+
+        self.__limit: Optional[int] = None
+        self.__remaining: Optional[int] = None
+        self.__reset_at: Optional[float] = None
+        self.__tokens: float = 0
+        self.__next_slot: float = 0
+        self.__throttled_requests = 0
+        self.__throttled_seconds: float = 0
+
+    def update(self, headers: Mapping[str, Any]):
+        """
+        Seed the bucket from the rate limit headers of a response. Responses
+        without rate limit headers are ignored.
+
+        Args:
+        - headers: Case-insensitive response headers.
+        """
+        try:
+            limit = int(headers.get("X-RateLimit-Limit"))
+            remaining = int(headers.get("X-RateLimit-Remaining", limit))
+            reset = int(headers.get("X-RateLimit-Reset", 0))
+        except (TypeError, ValueError):
+            return
+
+        now = self.__clock()
+        reset_at = None
+        if reset > 0:
+            reset_at = now + reset if reset < RELATIVE_RESET_THRESHOLD else float(reset)
+
+        with self.__lock:
+            first_update = self.__limit is None
+            self.__limit = limit
+            self.__remaining = remaining
+
+            if reset_at is not None and (
+                self.__reset_at is None or abs(reset_at - self.__reset_at) >= 1
+            ):
+                # A new window started. Learn its length from the previous one.
+                if self.__reset_at is not None and self.__reset_at <= now < reset_at:
+                    self.window = reset_at - self.__reset_at
+                self.__reset_at = reset_at
+                self.__tokens = remaining
+                self.__next_slot = now
+            elif first_update:
+                self.__tokens = remaining
+            else:
+                # Same window: requests still in flight already took their
+                # token locally, so the server count can only lower ours.
+                self.__tokens = min(self.__tokens, remaining)
+
+    def set_state(
+        self,
+        limit: Optional[int],
+        remaining: Optional[int] = None,
+        reset_time: Optional[datetime] = None,
+    ):
+        """
+        Replace the rate limit learned from the responses, e.g. to restore a
+        rate limit saved earlier. A limit of None clears it.
+
+        Args:
+        - limit: Requests allowed per window.
+        - remaining: Requests left in the current window (default: the limit).
+        - reset_time: UTC time at which the current window resets, as
+          returned by `state`.
+        """
+        reset_at = None
+        if reset_time is not None:
+            reset_at = float(calendar.timegm(reset_time.utctimetuple()))
+            if reset_at <= 0:
+                reset_at = None
+        remaining = limit if remaining is None else remaining
+
+        with self.__lock:
+            self.__limit = limit
+            self.__remaining = remaining
+            self.__reset_at = reset_at
+            self.__tokens = remaining or 0
+            self.__next_slot = self.__clock()
+            self.__delay = self.__initial_delay
+
+    def reserve(self) -> Tuple[float, bool]:
+        """
+        Try to take a token without blocking. Returns a tuple of (delay, acquired):
+        - If acquired is True, a token was taken and the request may be sent
+          after waiting `delay` seconds.
+        - If acquired is False, the bucket is empty: wait `delay` seconds and
+          call `reserve` again.
+        """
+        now = self.__clock()
+        with self.__lock:
+            delay, acquired = self.__reserve(now)
+            if delay > 0:
+                self.__throttled_requests += 1
+                self.__throttled_seconds += delay
+            return delay, acquired
+
+    def acquire(self) -> float:
+        """
+        Take a token, blocking the calling thread as long as the rate limit
+        requires. Returns the number of seconds waited.
+        """
+        waited: float = 0
+        while True:
+            delay, acquired = self.reserve()
+            if delay > 0:
+                sleep(delay)
+                waited += delay
+            if acquired:
+                return waited
+
+    def should_throttle(self) -> bool:
+        """
+        Check whether the remaining tokens are below the throttle threshold.
+        """
+        with self.__lock:
+            if self.__limit is None or self.threshold <= 0:
+                return False
+            self.__refill(self.__clock())
+            return self.__is_scarce()
+
+    def state(self) -> RateLimitState:
+        """
+        Get a snapshot of the limiter state.
+        """
+        with self.__lock:
+            return {
+                "limit": self.__limit,
+                "remaining": self.__remaining,
+                "tokens": int(self.__tokens) if self.__limit is not None else None,
+                "reset_time": datetime.utcfromtimestamp(self.__reset_at)
+                if self.__reset_at is not None
+                else None,
+                "window": self.window,
+                "throttled_requests": self.__throttled_requests,
+                "throttled_seconds": self.__throttled_seconds,
+            }
+
+    def __reserve(self, now: float) -> Tuple[float, bool]:
+        if self.__limit is None or self.threshold <= 0:
+            return 0, True
+
+        self.__refill(now)
+
+        if self.__tokens >= 1:
+            self.__tokens -= 1
+            self.__delay = self.__initial_delay
+            return self.__pace(now), True
+
+        if self.__reset_at is not None and self.__limit >= 1:
+            return max(self.__reset_at - now, 0), False
+
+        # The bucket is empty and the server did not say when it refills, or
+        # reported a limit of 0 that no reset would refill: back off
+        # exponentially and let the request probe the server.
+        delay = self.__delay
+        self.__delay = min(self.__delay * self.__delay_backoff, self.__delay_max)
+        return delay, True
+
+    def __refill(self, now: float):
+        """
+        Refill the bucket if the current window has reset since the last response.
+        """
+        if self.__reset_at is None or now < self.__reset_at:
+            return
+
+        elapsed_windows = int((now - self.__reset_at) // self.window) + 1
+        self.__reset_at += elapsed_windows * self.window
+        self.__tokens = self.__limit
+        self.__next_slot = now
+
+    def __is_scarce(self) -> bool:
+        return self.__tokens < self.__limit * self.threshold / 100
+
+    def __pace(self, now: float) -> float:
+        """
+        Spread the remaining tokens evenly over the rest of the window once
+        they drop below the threshold. Returns the delay of this request.
+        """
+        if self.__reset_at is None or not self.__is_scarce():
+            return 0
+
+        slot = max(now, self.__next_slot)
+        # Measured from the slot, as earlier requests already hold the slots before it.
+        interval = max(self.__reset_at - slot, 0) / (self.__tokens + 1)
+        self.__next_slot = slot + interval
+        return slot - now
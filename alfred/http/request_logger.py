@@ -0,0 +1,139 @@
+# Native imports
+import logging
+import random
+from typing import Any, Callable, Mapping, Optional, Text
+
+__all__ = ["RequestLogger"]
+
+# Headers never written to the logs.
+REDACTED_HEADERS = frozenset(["authorization", "cookie", "x-tagshelfapi-key"])
+
+
+class RequestLogger:
+    """
+    Debug logging of HTTP requests and of erroneous responses.
+
+    Log records are only built when the logger is enabled for DEBUG, so a
+    client logging at INFO or above pays a single level check per request.
+    When enabled, a `sample_rate` fraction of the requests is logged, and
+    logged bodies are truncated to `max_body_size` characters.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        sample_rate: float = 1.0,
+        max_body_size: Optional[int] = None,
+        sampler: Callable[[], float] = random.random,
+    ):
+        """
+        Args:
+        - logger: Logger the records are written to.
+        - sample_rate: Fraction of the requests logged, between 0 and 1.
+        - max_body_size: Maximum number of characters of each logged body
+          (default: no limit).
+        - sampler: Function returning a random number in [0, 1).
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"Log sample rate ({sample_rate}) must be between 0 and 1.")
+        if max_body_size is not None and max_body_size < 0:
+            raise ValueError(f"Log max body size ({max_body_size}) cannot be negative.")
+
+        self.logger = logger
+        self.sample_rate = sample_rate
+        self.max_body_size = max_body_size
+        self._sampler = sampler
+
+    def should_log(self) -> bool:
+        """
+        Whether the current request should be logged.
+        """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return False
+        return self.sample_rate >= 1 or self._sampler() < self.sample_rate
+
+    def log_request(self, method: Text, url: Text, headers: Mapping[str, str], body: Any):
+        """
+        Log the details of a request. Streaming and multipart bodies are not logged.
+
+        Args:
+        - method: HTTP method.
+        - url: Fully qualified URL.
+        - headers: Request headers. Credentials are redacted.
+        - body: Request body.
+        """
+        if headers.get("Content-Type", "").startswith("multipart/"):
+            body = None
+
+        self.logger.debug(
+            {
+                "message": "HTTP request details.",
+                "method": method,
+                "url": url,
+                "headers": {
+                    k: v for k, v in headers.items() if k.lower() not in REDACTED_HEADERS
+                },
+                "body": self.format_body(body),
+            }
+        )
+
+    def log_response(
+        self,
+        method: Text,
+        url: Text,
+        status_code: int,
+        content_type: Optional[Text],
+        content: Optional[bytes],
+        encoding: Optional[Text] = None,
+    ):
+        """
+        Log the details of a response.
+
+        Args:
+        - method: HTTP method.
+        - url: Fully qualified URL.
+        - status_code: HTTP status code.
+        - content_type: Content-Type of the response.
+        - content: Raw response body.
+        - encoding: Encoding of the response body (default: UTF-8).
+        """
+        self.logger.debug(
+            {
+                "message": "HTTP response details.",
+                "method": method,
+                "url": url,
+                "status_code": status_code,
+                "body": self.format_body(content, encoding),
+                "response_size": len(content or b""),
+                "response_content_type": content_type,
+            }
+        )
+
+    def format_body(self, body: Any, encoding: Optional[Text] = None) -> Text:
+        """
+        Get the loggable text of a body, truncated to `max_body_size`.
+        Bodies that are neither text nor bytes are logged as an empty string.
+
+        Args:
+        - body: Body.
+        - encoding: Encoding of byte bodies (default: UTF-8).
+        """
+        limit = self.max_body_size
+        truncated = False
+        if isinstance(body, (bytes, bytearray)):
+            if limit is not None and len(body) > limit * 4:
+                # Only decode the prefix that can hold `limit` characters.
+                body = body[:limit * 4]
+                truncated = True
+            try:
+                text = body.decode(encoding or "utf-8", errors="replace")
+            except LookupError:
+                text = body.decode("utf-8", errors="replace")
+        elif isinstance(body, str):
+            text = body
+        else:
+            return ""
+
+        if limit is not None and (truncated or len(text) > limit):
+            return f"{text[:limit]}... (truncated)"
+        return text
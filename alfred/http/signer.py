@@ -0,0 +1,211 @@
+# Native imports
+import base64
+import hashlib
+import hmac
+from collections.abc import Iterable, Iterator, Mapping
+from tempfile import SpooledTemporaryFile
+from time import time
+from typing import Any, Callable, Text, Tuple
+from urllib.parse import quote
+from uuid import uuid4
+
+# Project imports
+from .multipart import MultipartEncoder
+
+__all__ = ["HmacSigner", "is_raw_body"]
+
+# Size of the chunks read from file bodies while hashing them.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# One-shot bodies up to this size are kept in memory once consumed, larger
+# ones are spooled to a temporary file.
+DEFAULT_SPOOL_MAX_SIZE = 1024 * 1024
+
+
+def is_raw_body(data: Any) -> bool:
+    """
+    Whether a request body is sent as is rather than serialized: bytes,
+    multipart encoders, file objects and iterators of chunks.
+
+    Args:
+    - data: Request body.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview, MultipartEncoder)):
+        return True
+    if hasattr(data, "read"):
+        return True
+    return isinstance(data, Iterator)
+
+
+class HmacSigner:
+    """
+    Signs requests for HMAC authentication.
+
+    The API key is decoded once, and the keyed HMAC state is reused for every
+    request. Bodies are hashed incrementally, so bytes, multipart encoders,
+    file objects and iterables of chunks are never loaded in memory as a
+    whole. File objects are rewound after hashing. One-shot iterators, such as
+    generators, can only be read once: they are consumed while hashing and
+    replaced by a replayable copy, kept in memory or spooled to a temporary
+    file past `spool_max_size` bytes.
+    """
+
+    def __init__(
+        self,
+        api_key: Text,
+        secret_key: Text,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE,
+        clock: Callable[[], float] = time,
+    ):
+        """
+        Args:
+        - api_key: Base64 encoded API key, used as the HMAC key.
+        - secret_key: Secret key, sent with the signature.
+        - chunk_size: Size of the chunks read from file bodies.
+        - spool_max_size: Size past which one-shot bodies are spooled to disk.
+        - clock: Function returning the current Unix time.
+        """
+        if not api_key:
+            raise ValueError('HMAC api_key is missing: set auth_config["hmac"]["api_key"].')
+        if not secret_key:
+            raise ValueError('HMAC secret_key is missing: set auth_config["hmac"]["secret_key"].')
+        try:
+            key = base64.b64decode(api_key)
+        except (TypeError, ValueError) as e:
+            raise ValueError(
+                f'HMAC api_key (auth_config["hmac"]["api_key"]) is not valid base64: {e}'
+            ) from e
+
+        self.secret_key = secret_key
+        self.chunk_size = chunk_size
+        self.spool_max_size = spool_max_size
+        self._clock = clock
+        self.__hmac = hmac.new(key, digestmod=hashlib.sha256)
+
+    def sign(self, method: Text, url: Text, body: Any = None) -> Tuple[Text, Any]:
+        """
+        Sign a request. Returns the Authorization header value and the body to
+        send, which is a replayable copy of `body` if it was a one-shot iterator
+        and `body` itself otherwise.
+
+        Args:
+        - method: HTTP method.
+        - url: Fully qualified URL, including the query string.
+        - body: Request body.
+        """
+        body, content_hash = self.hash_body(body)
+
+        nonce = str(uuid4())
+        request_timestamp = str(int(self._clock()))
+        signature_raw_data = (
+            self.secret_key
+            + method.upper()
+            + quote(url, safe="").lower()
+            + request_timestamp
+            + nonce
+            + content_hash
+        )
+
+        signature = self.__hmac.copy()
+        signature.update(signature_raw_data.encode("utf-8"))
+        signature_base64 = base64.b64encode(signature.digest()).decode("utf-8")
+
+        return f"amx {self.secret_key}:{signature_base64}:{nonce}:{request_timestamp}", body
+
+    def hash_body(self, body: Any) -> Tuple[Any, Text]:
+        """
+        Compute the base64 encoded MD5 hash of a request body, or an empty
+        string for empty bodies. Returns the body to send and its hash.
+
+        Args:
+        - body: Request body.
+        """
+        if body is None:
+            return body, ""
+
+        md5_hash = hashlib.md5()
+        if isinstance(body, (str, bytes, bytearray, memoryview)):
+            size = self.__update(md5_hash, body)
+        elif isinstance(body, MultipartEncoder):
+            body.update_hash(md5_hash)
+            size = len(body)
+        elif hasattr(body, "read") and self.__seekable(body):
+            size = self.__hash_file(md5_hash, body)
+        elif hasattr(body, "read"):
+            body, size = self.__spool(md5_hash, self.__read_chunks(body))
+        elif isinstance(body, Iterator):
+            body, size = self.__spool(md5_hash, body)
+        elif isinstance(body, Iterable) and not isinstance(body, Mapping):
+            size = 0
+            for chunk in body:
+                size += self.__update(md5_hash, chunk)
+        else:
+            raise TypeError(f"Cannot sign a request body of type {type(body).__name__}.")
+
+        if not size:
+            return body, ""
+        return body, base64.b64encode(md5_hash.digest()).decode("utf-8")
+
+    def __hash_file(self, md5_hash, file) -> int:
+        """
+        Hash a file body from its current position, then rewind it.
+        """
+        position = file.tell()
+        size = 0
+        try:
+            for chunk in self.__read_chunks(file):
+                size += self.__update(md5_hash, chunk)
+        finally:
+            file.seek(position)
+        return size
+
+    def __spool(self, md5_hash, chunks) -> Tuple[Any, int]:
+        """
+        Hash a one-shot body while copying it. Returns the copy, as bytes if
+        it is small enough and as a temporary file positioned at its start
+        otherwise, and its size.
+        """
+        spool = SpooledTemporaryFile(max_size=self.spool_max_size)
+        size = 0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                md5_hash.update(chunk)
+                spool.write(chunk)
+                size += len(chunk)
+            spool.seek(0)
+            if size <= self.spool_max_size:
+                data = spool.read()
+                spool.close()
+                return data, size
+        except BaseException:
+            spool.close()
+            raise
+        return spool, size
+
+    def __read_chunks(self, file):
+        while True:
+            chunk = file.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def __update(md5_hash, chunk) -> int:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        md5_hash.update(chunk)
+        return len(chunk)
+
+    @staticmethod
+    def __seekable(file) -> bool:
+        try:
+            seekable = getattr(file, "seekable", None)
+            if seekable is not None and not seekable():
+                return False
+            file.tell()
+            return True
+        except (AttributeError, OSError, ValueError):
+            return False
@@ -0,0 +1,257 @@
+# Native imports
+import threading
+from time import time
+from typing import Awaitable, Callable, Optional, Text, Tuple
+
+# Project imports
+from .typed import OAuthToken
+from ..utils import logging
+
+__all__ = ["TokenManager", "AsyncTokenManager"]
+
+
+class BaseTokenManager:
+    """
+    Expiry bookkeeping shared by the sync and async token managers.
+
+    A token is considered fresh until `refresh_margin` seconds before it
+    expires. Past that point it is still used, but the next caller refreshes
+    it ahead of time so requests never go out with an expired token. Tokens
+    issued without `expires_in` are used until they are invalidated.
+    """
+
+    def __init__(self, refresh_margin: float = 60, clock: Callable[[], float] = time):
+        """
+        Args:
+        - refresh_margin: Seconds before expiry at which the token is refreshed.
+        - clock: Function returning the current Unix time.
+        """
+        self.refresh_margin = refresh_margin
+        self.refresh_count = 0
+        self.logger = logging.getLogger("alfred-python")
+        self._clock = clock
+        # (access token, expiry timestamp), replaced as a whole so readers
+        # never see a token paired with another token's expiry.
+        self._state: Optional[Tuple[Text, Optional[float]]] = None
+
+    @property
+    def token(self) -> Optional[Text]:
+        """
+        Current access token, if any.
+        """
+        state = self._state
+        return state[0] if state else None
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        """
+        Unix time at which the current token expires, if known.
+        """
+        state = self._state
+        return state[1] if state else None
+
+    def _fresh_token(self) -> Optional[Text]:
+        """
+        Get the current token if it does not need to be refreshed yet.
+        """
+        state = self._state
+        if state is None:
+            return None
+        token, expires_at = state
+        if expires_at is None or self._clock() < expires_at - self.refresh_margin:
+            return token
+        return None
+
+    def _valid_token(self) -> Optional[Text]:
+        """
+        Get the current token if it has not expired yet, even if it is due
+        for a refresh.
+        """
+        state = self._state
+        if state is None:
+            return None
+        token, expires_at = state
+        if expires_at is None or self._clock() < expires_at:
+            return token
+        return None
+
+    def _store(self, payload: OAuthToken) -> Text:
+        token = payload.get("access_token")
+        if not token:
+            raise ValueError("Token response does not contain an access token.")
+
+        self._set(token, payload.get("expires_in"))
+        self.refresh_count += 1
+        return token
+
+    def _set(self, token: Optional[Text], expires_in: Optional[float]):
+        if token is None:
+            self._state = None
+            return
+        expires_at = self._clock() + float(expires_in) if expires_in else None
+        self._state = (token, expires_at)
+
+    def _invalidate(self, token: Optional[Text]):
+        state = self._state
+        if state is not None and (token is None or state[0] == token):
+            self._state = None
+
+
+class TokenManager(BaseTokenManager):
+    """
+    Thread-safe OAuth token manager.
+
+    Only one thread fetches a token at a time: concurrent callers that need
+    a new token wait for the in-flight refresh and reuse its result instead
+    of each calling the token endpoint. While a token is due for refresh but
+    still valid, other callers keep using it without waiting.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], OAuthToken],
+        refresh_margin: float = 60,
+        clock: Callable[[], float] = time,
+    ):
+        """
+        Args:
+        - fetch: Function that requests a new token from the token endpoint.
+        - refresh_margin: Seconds before expiry at which the token is refreshed.
+        - clock: Function returning the current Unix time.
+        """
+        super().__init__(refresh_margin, clock)
+        self.__fetch = fetch
+        self.__lock = threading.Lock()
+
+    def get_token(self) -> Text:
+        """
+        Get a valid access token, fetching a new one if needed.
+        """
+        token = self._fresh_token()
+        if token is not None:
+            return token
+
+        current = self._valid_token()
+        if current is not None:
+            # Refresh ahead of expiry. Someone else is already on it: the
+            # current token is still good, so do not wait for them.
+            if not self.__lock.acquire(blocking=False):
+                return current
+        else:
+            self.__lock.acquire()
+
+        try:
+            # The token may have been refreshed while waiting for the lock.
+            token = self._fresh_token()
+            if token is not None:
+                return token
+            try:
+                return self._store(self.__fetch())
+            except Exception:
+                current = self._valid_token()
+                if current is None:
+                    raise
+                self.logger.warning("Could not refresh the access token ahead of expiry.")
+                return current
+        finally:
+            self.__lock.release()
+
+    def invalidate(self, token: Optional[Text] = None):
+        """
+        Drop the current token, e.g. after the API rejected it.
+
+        Args:
+        - token: The rejected token. If the current token is a different,
+          newer one, it is kept, so a burst of requests rejected with the same
+          stale token only causes one refresh.
+        """
+        with self.__lock:
+            self._invalidate(token)
+
+    def set_token(self, token: Optional[Text], expires_in: Optional[float] = None):
+        """
+        Use a token obtained elsewhere instead of fetching one. None drops the
+        current token.
+
+        Args:
+        - token: Access token.
+        - expires_in: Seconds until the token expires. If omitted, it is used
+          until it is invalidated.
+        """
+        with self.__lock:
+            self._set(token, expires_in)
+
+
+class AsyncTokenManager(BaseTokenManager):
+    """
+    Asyncio counterpart of `TokenManager`: concurrent tasks that need a new
+    token await a single in-flight refresh.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[OAuthToken]],
+        refresh_margin: float = 60,
+        clock: Callable[[], float] = time,
+    ):
+        """
+        Args:
+        - fetch: Coroutine function that requests a new token from the token endpoint.
+        - refresh_margin: Seconds before expiry at which the token is refreshed.
+        - clock: Function returning the current Unix time.
+        """
+        super().__init__(refresh_margin, clock)
+        self.__fetch = fetch
+        # Created on first use so it binds to the running event loop.
+        self.__lock: Optional["asyncio.Lock"] = None
+
+    async def get_token(self) -> Text:
+        """
+        Get a valid access token, fetching a new one if needed.
+        """
+        token = self._fresh_token()
+        if token is not None:
+            return token
+
+        if self.__lock is None:
+            import asyncio  # pylint: disable=C0415
+            self.__lock = asyncio.Lock()
+
+        current = self._valid_token()
+        if current is not None and self.__lock.locked():
+            return current
+
+        async with self.__lock:
+            token = self._fresh_token()
+            if token is not None:
+                return token
+            try:
+                return self._store(await self.__fetch())
+            except Exception:
+                current = self._valid_token()
+                if current is None:
+                    raise
+                self.logger.warning("Could not refresh the access token ahead of expiry.")
+                return current
+
+    def invalidate(self, token: Optional[Text] = None):
+        """
+        Drop the current token, e.g. after the API rejected it.
+
+        Args:
+        - token: The rejected token. If the current token is a different,
+          newer one, it is kept.
+        """
+        self._invalidate(token)
+
+    def set_token(self, token: Optional[Text], expires_in: Optional[float] = None):
+        """
+        Use a token obtained elsewhere instead of fetching one. None drops the
+        current token.
+
+        Args:
+        - token: Access token.
+        - expires_in: Seconds until the token expires. If omitted, it is used
+          until it is invalidated.
+        """
+        self._set(token, expires_in)
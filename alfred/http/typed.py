@@ -1,9 +1,14 @@
 # Native imports
+from datetime import datetime
 from enum import Enum
-from typing import TypedDict, Optional, Text
+from typing import TYPE_CHECKING, Dict, List, TypedDict, Optional, Text, Tuple, Union
 
 # Project Imports
 from alfred.base import ResponseType
+from .codec import JsonCodec
+
+if TYPE_CHECKING:
+    from .metrics import ClientMetrics
 
 
 class HttpMethod(Enum):
@@ -26,6 +31,12 @@ class OAuthConfiguration(TypedDict):
     password: Text
 
 
+class OAuthToken(TypedDict):
+    access_token: Text
+    token_type: Optional[Text]
+    expires_in: Optional[int]
+
+
 class HmacConfiguration(TypedDict):
     api_key: Text
     secret_key: Text
@@ -44,3 +55,43 @@ class HttpConfiguration(TypedDict):
     response_type: Optional[ResponseType]
     throttle_delay: Optional[float]
     throttle_threshold: Optional[int]
+    max_connections: Optional[int]
+    token_refresh_margin: Optional[float]
+    json_codec: Optional[Union[Text, JsonCodec]]
+    log_sample_rate: Optional[float]
+    log_max_body_size: Optional[int]
+    metrics: Optional[Union[bool, "ClientMetrics"]]
+
+
+class RateLimitState(TypedDict):
+    limit: Optional[int]
+    remaining: Optional[int]
+    tokens: Optional[int]
+    reset_time: Optional[datetime]
+    window: float
+    throttled_requests: int
+    throttled_seconds: float
+
+
+class EndpointMetrics(TypedDict):
+    method: Text
+    endpoint: Text
+    requests: int
+    statuses: Dict[Text, int]
+    latency_buckets: List[Tuple[float, int]]
+    latency_sum: float
+    retries: int
+    reauthentications: int
+    throttled_seconds: float
+    bytes_sent: int
+    bytes_received: int
+
+
+class MetricsSnapshot(TypedDict):
+    endpoints: List[EndpointMetrics]
+    requests: int
+    retries: int
+    reauthentications: int
+    throttled_seconds: float
+    bytes_sent: int
+    bytes_received: int
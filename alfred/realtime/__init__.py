@@ -1,34 +1,93 @@
 # Native Imports
-from typing import Union
-
-# 3rd Party Imports
-import socketio
+import threading
+from functools import partial
+from typing import Any, Iterable, Optional, Set, Union
 
 # Project Imports
 import alfred.exceptions
 from alfred.base.config import ConfigurationDict
 from alfred.base.constants import EventType, FileEvent, JobEvent
 from alfred.http.typed import AuthConfiguration
+from alfred.realtime.backfill import EventBackfiller
+from alfred.realtime.coalescer import CoalesceConfiguration, EventCoalescer
+from alfred.realtime.dispatcher import DispatchConfiguration, EventDispatcher
+from alfred.realtime.intake import EventIntake, ordered_socket_client
+from alfred.realtime.journal import DEFAULT_CONSUMER, EventJournal, JournalConfiguration
+from alfred.realtime.reconnect import ConnectionHealth, ConnectionStats, ReconnectConfiguration, backoff_delays
+from alfred.realtime.router import Subscription, SubscriptionRouter
+from alfred.realtime.stream import EventStream
 from alfred.utils import logging, setup_logger
 
 
 class AlfredRealTimeClient:
-    def __init__(self, config: ConfigurationDict, auth_config: AuthConfiguration, verbose=False, error_callback=None, on_connect=None):
+    def __init__(self, config: ConfigurationDict, auth_config: AuthConfiguration, verbose=False, error_callback=None, on_connect=None,
+                 dispatch_config: Optional[DispatchConfiguration] = None,
+                 coalesce_config: Optional[CoalesceConfiguration] = None,
+                 reconnect_config: Optional[ReconnectConfiguration] = None,
+                 journal_config: Optional[JournalConfiguration] = None):
         """
         Initializes the AlfredRealTimeClient class.
 
+        Received events are queued and handled one at a time, in the order they were received,
+        by a dedicated thread, so callbacks never hold up the socket. See `EventIntake`.
+
         Args:
            config (ConfigurationDict): The configuration dictionary.
            auth_config (AuthConfiguration): The authentication configuration.
            verbose (bool, optional): Whether to print verbose output. Defaults to False.
+           dispatch_config (DispatchConfiguration, optional): If set, callbacks run on a pool of
+              worker threads fed by a bounded queue instead of on the socket thread. See
+              `EventDispatcher`. Defaults to None.
+           coalesce_config (CoalesceConfiguration, optional): If set, bursts of update events
+              about the same File or Job are merged, and only the latest is delivered. See
+              `EventCoalescer`. Defaults to None.
+           reconnect_config (ReconnectConfiguration, optional): If set, the client reconnects
+              with a jittered exponential backoff whenever the connection drops or a reconnection
+              attempt fails, until `disconnect()` is called. See `backoff_delays`. Defaults to
+              None, which uses the built-in reconnection of the socket, stopped by the first
+              connection error.
+           journal_config (JournalConfiguration, optional): If set, received events are appended
+              to a local journal before being delivered, with their offset in a `journal_offset`
+              key. Payloads that are not dictionaries are wrapped as `{"data": payload}`.
+              Acknowledge the handled events with `journal.ack()`, and call `replay_journal()`
+              on restart to handle the others again. Events merged by the coalescer, or matching
+              no subscription, are acknowledged automatically. See `EventJournal`. Defaults to None.
         """
-        self.socket = socketio.Client()
+        # Managed reconnection replaces the built-in one.
+        self.socket = ordered_socket_client(reconnection=reconnect_config is None)
         self.verbose = verbose
         self.config = config
         self.auth_config = auth_config
         self.base_url = config.get("realtime_url")
         self.error_callback = error_callback
         self.on_connect = on_connect
+        self.reconnect_config = reconnect_config
+        self.health = ConnectionHealth()
+        self.backfiller: Optional[EventBackfiller] = None
+        self.__url = f"{self.base_url}?apiKey={auth_config.get('api_key')}"
+        self.__closing = threading.Event()
+        self.__reconnect_lock = threading.Lock()
+        self.__reconnecting = False
+        self.router = SubscriptionRouter()
+        self.__socket_events: Set[str] = set()
+        if journal_config is not None and (dispatch_config or {}).get("overflow") == "drop_oldest":
+            # Dropped events would never be acknowledged.
+            raise ValueError("The journal cannot be combined with the drop_oldest dispatch overflow policy.")
+        self.dispatcher: Optional[EventDispatcher] = None
+        if dispatch_config is not None:
+            self.dispatcher = EventDispatcher(self.__handle_event, dispatch_config)
+        self.journal: Optional[EventJournal] = None
+        if journal_config is not None:
+            self.journal = EventJournal(journal_config)
+        self.coalescer: Optional[EventCoalescer] = None
+        if coalesce_config is not None:
+            self.coalescer = EventCoalescer(self.__deliver_event, coalesce_config,
+                                            on_superseded=self.__acknowledge)
+        # Subscriptions of the client itself, which do not handle events for the user.
+        self.__internal_subscriptions: Set[Subscription] = set()
+        self.__intake = EventIntake(self.__process_event)
+        # Streams returned by `events` and not closed yet.
+        self.__streams: Set[EventStream] = set()
 
         # Initialize logger
         self.logger = logging.getLogger("alfred-python")
@@ -47,24 +106,39 @@ class AlfredRealTimeClient:
         if self.verbose:
             self.logger.debug("Attempting to establish a connection...")
         try:
-            self.socket.connect(f"{self.base_url}?apiKey={auth_config.get('api_key')}")
+            self.socket.connect(self.__url)
         except Exception as err:
             raise alfred.exceptions.ConnectionError(f"Could not establish connection with server: {err}")
 
+    @property
+    def connected(self) -> bool:
+        """
+        Whether the client is connected to the server.
+        """
+        return self.socket.connected
+
     def __on_connect(self):
         """
         Handles the 'connect' event.
         """
+        reconnected = self.health.record_connect()
         self.logger.info(f"Successfully connected to: {self.base_url}")
+        if reconnected and self.backfiller is not None:
+            # Fetching the tracked Jobs must not hold up the socket thread.
+            threading.Thread(target=self.__backfill, name="alfred-backfill", daemon=True).start()
         if self.on_connect:
             self.on_connect()
 
-    def __on_disconnect(self):
+    def __on_disconnect(self, *args):
         """
         Handles the 'disconnect' event.
         """
+        expected = self.__closing.is_set()
+        self.health.record_disconnect(expected)
         if self.verbose:
             self.logger.info("Disconnected from the server.")
+        if self.reconnect_config is not None and not expected:
+            self.__start_reconnect()
 
     def __on_connect_error(self, err):
         """
@@ -75,58 +149,315 @@ class AlfredRealTimeClient:
         """
         if self.verbose:
             self.logger.error("Connection error:  %s", err)
-        self.disconnect()
+        if self.reconnect_config is None:
+            self.disconnect()
         # trigger error callback:
         if self.error_callback:
             self.error_callback(err)
 
-    def __callback(self, event: Union[FileEvent, JobEvent, EventType], callback):
+    def __callback(self, event: Union[FileEvent, JobEvent, EventType], callback, job_id=None, file_id=None) -> Subscription:
         """
-        Wrapper function to subscribe a specific event.
+        Wrapper function to subscribe a specific event. An event can have
+        several callbacks, called in subscription order.
 
         Args:
             event (str): The event name.
             callback (function): The callback function to handle the event.
+            job_id (str, optional): Only deliver events about this Job.
+            file_id (str, optional): Only deliver events about this File.
         """
-        def handle_event(data):
-            if self.verbose:
-                self.logger.debug(f"Event {event} received: %s", data)
-            callback(data)
+        if event not in self.__socket_events:
+            self.__socket_events.add(event)
+
+            self.socket.on(event, partial(self.__receive_event, event))
+
+        return self.router.subscribe(event, callback, job_id, file_id)
+
+    def __receive_event(self, event: str, data: Any):
+        """
+        Queues an event received from the server, or emitted by the backfiller.
+        """
+        if self.verbose:
+            self.logger.debug(f"Event {event} received: %s", data)
+        self.__intake.put(event, data)
+
+    def __process_event(self, event: str, data: Any):
+        """
+        Journals an event, then hands it over to the coalescer or delivers it.
+        Called on the intake thread, in the order the events were received.
+        """
+        if self.journal is not None:
+            if self.journal.closed:
+                # Only when disconnecting from a dispatched callback, which cannot
+                # wait for the intake.
+                self.logger.warning(f"Event {event} received after the journal was closed: dropped.")
+                return
+            data = self.__with_offset(data, self.journal.append(event, data))
+        if self.coalescer is not None:
+            self.coalescer.submit(event, data)
+        else:
+            self.__deliver_event(event, data)
+
+    @staticmethod
+    def __with_offset(data: Any, offset: int) -> Any:
+        """
+        Adds the journal offset of an event to its payload, wrapping payloads
+        that are not dictionaries.
+        """
+        if isinstance(data, dict):
+            return {**data, "journal_offset": offset}
+        return {"data": data, "journal_offset": offset}
+
+    def __acknowledge(self, event: str, data: Any):
+        """
+        Acknowledges a journaled event that no callback will handle.
+        """
+        if self.journal is not None and isinstance(data, dict) and "journal_offset" in data:
+            self.journal.ack(data["journal_offset"])
+
+    def __deliver_event(self, event: str, data: Any):
+        """
+        Hands an event over to the dispatcher, or calls its callbacks.
+        """
+        if self.dispatcher is not None:
+            self.dispatcher.submit(event, data)
+        else:
+            self.__handle_event(event, data)
 
-        self.socket.on(event, handle_event)
+    def __handle_event(self, event: str, data: Any):
+        """
+        Calls the callbacks subscribed to an event, in subscription order.
+        """
+        subscriptions = self.router.match(event, data)
+        if self.journal is not None and all(
+                subscription in self.__internal_subscriptions for subscription in subscriptions):
+            # No callback will acknowledge it.
+            self.__acknowledge(event, data)
+        for subscription in subscriptions:
+            try:
+                subscription.callback(data)
+            except Exception:  # pylint: disable=W0703
+                # Do not let a failing callback starve the others.
+                self.logger.exception(f"Error handling event {event}.")
 
-    def on_file_event(self, callback):
+    def on_file_event(self, callback, file_id=None) -> Subscription:
         """
         Listens to all file-related events.
 
         Args:
             callback (function): The callback function to handle the event.
+            file_id (str, optional): Only deliver events about this File.
+
+        Returns:
+            Subscription: Call `unsubscribe()` on it to stop listening.
         """
-        self.__callback(EventType.FILE_EVENT.value, callback)
+        return self.__callback(EventType.FILE_EVENT.value, callback, file_id=file_id)
 
-    def on_job_event(self, callback):
+    def on_job_event(self, callback, job_id=None) -> Subscription:
         """
          Listens to all job-related events.
 
          Args:
              callback (function): The callback function to handle the event.
+             job_id (str, optional): Only deliver events about this Job.
+
+         Returns:
+             Subscription: Call `unsubscribe()` on it to stop listening.
          """
-        self.__callback(EventType.JOB_EVENT.value, callback)
+        return self.__callback(EventType.JOB_EVENT.value, callback, job_id=job_id)
 
-    def on(self, event: Union[FileEvent, JobEvent], callback):
+    def on(self, event: Union[FileEvent, JobEvent], callback, job_id=None, file_id=None) -> Subscription:
         """
         Listens to a specific event.
 
         Args:
             event (str): The event name.
             callback (function): The callback function to handle the event.
+            job_id (str, optional): Only deliver events about this Job.
+            file_id (str, optional): Only deliver events about this File.
+
+        Returns:
+            Subscription: Call `unsubscribe()` on it to stop listening.
+        """
+        return self.__callback(event, callback, job_id, file_id)
+
+    def events(self, types: Optional[Iterable[Union[FileEvent, JobEvent, EventType, str]]] = None, batch_size=None,
+               max_wait=None, max_size=1000, overflow="block", job_id=None, file_id=None) -> EventStream:
+        """
+        Streams events through a bounded buffer, to consume by iterating over
+        the returned stream instead of with callbacks. Close the stream to
+        stop receiving events. Streams are closed when the client disconnects.
+
+        Args:
+            types (list, optional): Events to stream. Defaults to all File and Job events.
+            batch_size (int, optional): If set, the stream yields lists of up to this many events.
+            max_wait (float, optional): Maximum time in seconds to wait for a batch to fill up
+               once its first event is available. Defaults to batches of the events already buffered.
+            max_size (int, optional): Maximum number of buffered events. Defaults to 1000.
+            overflow (str, optional): "block" to hold up event delivery while the buffer is full,
+               or "drop_oldest" to discard the oldest buffered event. Events received while
+               delivery is held up wait in the intake queue, which is not bounded. "drop_oldest"
+               cannot be combined with the journal. Defaults to "block".
+            job_id (str, optional): Only stream events about this Job.
+            file_id (str, optional): Only stream events about this File.
+
+        Returns:
+            EventStream: The stream of events.
+        """
+        if self.journal is not None and overflow == "drop_oldest":
+            # Dropped events would never be acknowledged.
+            raise ValueError("The journal cannot be combined with the drop_oldest stream overflow policy.")
+        subscriptions = []
+
+        def on_close():
+            self.__streams.discard(stream)
+            for subscription in subscriptions:
+                subscription.unsubscribe()
+
+        stream = EventStream(max_size, batch_size, max_wait, overflow, on_close=on_close)
+        self.__streams.add(stream)
+        for event in types or (EventType.FILE_EVENT, EventType.JOB_EVENT):
+            event = getattr(event, "value", event)
+            subscriptions.append(self.__callback(event, partial(stream.put, event), job_id, file_id))
+        return stream
+
+    def enable_backfill(self, jobs=None, sessions=None, track_events=True, max_tracked=10000,
+                        max_workers=4) -> EventBackfiller:
+        """
+        Recovers the events missed while the client was disconnected. After
+        every reconnection, the tracked Jobs and Sessions are fetched, and
+        synthetic events are delivered for the changes missed in the gap. See
+        `EventBackfiller`.
+
+        Args:
+            jobs (Jobs, optional): Jobs domain used to fetch the tracked Jobs, such as `client.jobs`.
+            sessions (Sessions, optional): Sessions domain used to fetch the tracked Sessions,
+               such as `client.sessions`.
+            track_events (bool, optional): Whether to track the Jobs seen in events until they
+               finish or fail. Defaults to True.
+            max_tracked (int, optional): Maximum number of tracked Jobs. Defaults to 10000.
+            max_workers (int, optional): Maximum number of concurrent requests. Defaults to 4.
+
+        Returns:
+            EventBackfiller: Call `track_job()` or `track_session()` on it to track more entities.
+        """
+        self.backfiller = EventBackfiller(self.__receive_event, jobs, sessions, track_events,
+                                          max_tracked, max_workers)
+        for event in (EventType.JOB_EVENT, *JobEvent):
+            self.__internal_subscriptions.add(
+                self.__callback(event.value, partial(self.backfiller.observe, event.value)))
+        return self.backfiller
+
+    def replay_journal(self, consumer=DEFAULT_CONSUMER) -> int:
+        """
+        Delivers again the journaled events after the last offset committed by
+        a consumer, such as the events received before a crash that were not
+        fully handled. Call it after subscribing the callbacks.
+
+        Args:
+            consumer (str, optional): Name of the consumer committing offsets. Defaults to "default".
+
+        Returns:
+            int: Number of replayed events.
+        """
+        if self.journal is None:
+            raise ValueError("The journal is not enabled: pass a journal_config.")
+        count = 0
+        for entry in self.journal.replay(consumer):
+            self.__deliver_event(entry["event"], self.__with_offset(entry["data"], entry["offset"]))
+            count += 1
+        return count
+
+    def connection_stats(self) -> ConnectionStats:
+        """
+        Gets the connection health metrics: connections, disconnections,
+        reconnection attempts, downtime and backfilled events.
+        """
+        return self.health.stats()
+
+    def __start_reconnect(self):
+        with self.__reconnect_lock:
+            if self.__reconnecting:
+                return
+            self.__reconnecting = True
+        threading.Thread(target=self.__reconnect, name="alfred-reconnect", daemon=True).start()
+
+    def __reconnect(self):
+        """
+        Reconnects until connected, closed, or out of attempts.
         """
-        self.__callback(event, callback)
+        while self.__attempt_reconnection():
+            with self.__reconnect_lock:
+                # The connection may have dropped again before getting here.
+                if self.connected or self.__closing.is_set():
+                    self.__reconnecting = False
+                    return
+        with self.__reconnect_lock:
+            self.__reconnecting = False
+
+    def __attempt_reconnection(self) -> bool:
+        """
+        Returns True once reconnected, False if closed or out of attempts.
+        """
+        for delay in backoff_delays(self.reconnect_config):
+            if self.__closing.wait(delay):
+                return False
+            if self.connected:
+                return True
+            self.health.record_attempt()
+            if self.verbose:
+                self.logger.debug("Attempting to reconnect...")
+            try:
+                self.socket.connect(self.__url)
+            except Exception as err:  # pylint: disable=W0703
+                self.health.record_failure(err)
+                self.logger.warning("Reconnection attempt failed: %s", err)
+                continue
+            if self.__closing.is_set():
+                self.socket.disconnect()
+                return False
+            return True
+
+        self.logger.error(f"Could not reconnect to: {self.base_url}. Giving up.")
+        return False
+
+    def __backfill(self):
+        try:
+            count = self.backfiller.backfill()
+        except Exception:  # pylint: disable=W0703
+            self.logger.exception("Could not backfill missed events.")
+            return
+        self.health.record_backfill(count)
+        if count:
+            self.logger.info("Backfilled %d missed events.", count)
 
     def disconnect(self):
         """
         Disconnects client from the server.
         """
         self.logger.info("Closing connection...")
+        self.__closing.set()
         self.socket.disconnect()
+        for stream in list(self.__streams):
+            # A full stream would hold the intake up.
+            stream.close()
+        # Journal and hand over the events already received. Dispatched callbacks
+        # cannot wait: the intake may be waiting for them to free a slot.
+        self.__intake.close(wait=self.dispatcher is None or not self.dispatcher.is_worker())
+        if self.coalescer is not None:
+            # Deliver the events waiting for their window to close.
+            self.coalescer.close()
+        if self.dispatcher is not None:
+            # Queued events are still handled in the background.
+            self.dispatcher.close(wait=False)
+        if self.journal is not None:
+            # Offsets committed by the queued events are still saved.
+            self.journal.close()
+
 
+def __getattr__(name):
+    # The asyncio client pulls in asyncio: import it on first use.
+    if name == "AsyncAlfredRealTimeClient":
+        from .async_client import AsyncAlfredRealTimeClient  # pylint: disable=C0415
+        return AsyncAlfredRealTimeClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,244 @@
+# Native Imports
+import inspect
+from functools import partial
+from typing import Callable, Iterable, Optional, Set, Union
+
+# Project Imports
+import alfred.exceptions
+from alfred.base.config import ConfigurationDict
+from alfred.base.constants import EventType, FileEvent, JobEvent
+from alfred.http.typed import AuthConfiguration
+from alfred.realtime.async_stream import AsyncEventStream
+from alfred.realtime.router import Subscription, SubscriptionRouter
+from alfred.utils import logging, setup_logger
+
+__all__ = ["AsyncAlfredRealTimeClient"]
+
+
+async def _call(callback: Callable, *args):
+    """
+    Call a callback, awaiting its result if it is a coroutine.
+    """
+    result = callback(*args)
+    if inspect.isawaitable(result):
+        await result
+
+
+class AsyncAlfredRealTimeClient:
+    """
+    Asyncio counterpart of `AlfredRealTimeClient`, built on `socketio.AsyncClient`.
+
+    Callbacks can be plain functions or coroutine functions. They run on the
+    event loop that called `connect()`, so they can await an
+    `AsyncAlfredClient` directly.
+
+    Usage:
+        async with AsyncAlfredRealTimeClient(config, auth_config) as realtime_client:
+            realtime_client.on_job_event(handle_job_event)
+            await realtime_client.wait()
+    """
+
+    def __init__(self, config: ConfigurationDict, auth_config: AuthConfiguration, verbose=False, error_callback=None, on_connect=None):
+        """
+        Initializes the AsyncAlfredRealTimeClient class. The connection is only
+        established by `connect()`.
+
+        Args:
+           config (ConfigurationDict): The configuration dictionary.
+           auth_config (AuthConfiguration): The authentication configuration.
+           verbose (bool, optional): Whether to print verbose output. Defaults to False.
+           error_callback (function, optional): Called with the error when the connection fails.
+           on_connect (function, optional): Called when the connection is established.
+        """
+        # socketio is slow to import: load it only when a client is built.
+        import socketio  # pylint: disable=C0415
+
+        self.socket = socketio.AsyncClient()
+        self.verbose = verbose
+        self.config = config
+        self.auth_config = auth_config
+        self.base_url = config.get("realtime_url")
+        self.error_callback = error_callback
+        self.on_connect = on_connect
+        self.router = SubscriptionRouter()
+        self.__socket_events: Set[str] = set()
+
+        # Initialize logger
+        self.logger = logging.getLogger("alfred-python")
+        if self.logger.level == logging.NOTSET:
+            setup_logger({
+                "level": "DEBUG" if verbose else "INFO",
+                "name": "alfred-python"
+            })
+
+        # Subscribe to connection life-cycle events.
+        self.socket.on('connect', self.__on_connect)
+        self.socket.on('disconnect', self.__on_disconnect)
+        self.socket.on('connect_error', self.__on_connect_error)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.disconnect()
+
+    @property
+    def connected(self) -> bool:
+        """
+        Whether the client is connected to the server.
+        """
+        return self.socket.connected
+
+    async def connect(self):
+        """
+        Connects the client to the server.
+
+        Raises:
+            alfred.exceptions.ConnectionError: If the connection could not be established.
+        """
+        if self.verbose:
+            self.logger.debug("Attempting to establish a connection...")
+        try:
+            await self.socket.connect(f"{self.base_url}?apiKey={self.auth_config.get('api_key')}")
+        except Exception as err:
+            raise alfred.exceptions.ConnectionError(f"Could not establish connection with server: {err}")
+
+    async def wait(self):
+        """
+        Waits until the connection with the server ends.
+        """
+        await self.socket.wait()
+
+    async def __on_connect(self):
+        """
+        Handles the 'connect' event.
+        """
+        self.logger.info(f"Successfully connected to: {self.base_url}")
+        if self.on_connect:
+            await _call(self.on_connect)
+
+    async def __on_disconnect(self, *_args):
+        """
+        Handles the 'disconnect' event.
+        """
+        if self.verbose:
+            self.logger.info("Disconnected from the server.")
+
+    async def __on_connect_error(self, err):
+        """
+        Handles the 'connect_error' event.
+
+        Args:
+          err (str): The error message.
+        """
+        if self.verbose:
+            self.logger.error("Connection error:  %s", err)
+        await self.disconnect()
+        # trigger error callback:
+        if self.error_callback:
+            await _call(self.error_callback, err)
+
+    def __callback(self, event: Union[FileEvent, JobEvent, EventType], callback, job_id=None, file_id=None) -> Subscription:
+        """
+        Wrapper function to subscribe a specific event. An event can have
+        several callbacks, awaited in subscription order.
+
+        Args:
+            event (str): The event name.
+            callback (function): The callback function or coroutine function to handle the event.
+            job_id (str, optional): Only deliver events about this Job.
+            file_id (str, optional): Only deliver events about this File.
+        """
+        if event not in self.__socket_events:
+            self.__socket_events.add(event)
+
+            async def handle_event(data):
+                if self.verbose:
+                    self.logger.debug(f"Event {event} received: %s", data)
+                for subscription in self.router.match(event, data):
+                    try:
+                        await _call(subscription.callback, data)
+                    except Exception:  # pylint: disable=W0703
+                        # Do not let a failing callback starve the others.
+                        self.logger.exception(f"Error handling event {event}.")
+
+            self.socket.on(event, handle_event)
+
+        return self.router.subscribe(event, callback, job_id, file_id)
+
+    def on_file_event(self, callback, file_id=None) -> Subscription:
+        """
+        Listens to all file-related events.
+
+        Args:
+            callback (function): The callback function or coroutine function to handle the event.
+            file_id (str, optional): Only deliver events about this File.
+
+        Returns:
+            Subscription: Call `unsubscribe()` on it to stop listening.
+        """
+        return self.__callback(EventType.FILE_EVENT.value, callback, file_id=file_id)
+
+    def on_job_event(self, callback, job_id=None) -> Subscription:
+        """
+         Listens to all job-related events.
+
+         Args:
+             callback (function): The callback function or coroutine function to handle the event.
+             job_id (str, optional): Only deliver events about this Job.
+
+         Returns:
+             Subscription: Call `unsubscribe()` on it to stop listening.
+         """
+        return self.__callback(EventType.JOB_EVENT.value, callback, job_id=job_id)
+
+    def on(self, event: Union[FileEvent, JobEvent], callback, job_id=None, file_id=None) -> Subscription:
+        """
+        Listens to a specific event.
+
+        Args:
+            event (str): The event name.
+            callback (function): The callback function or coroutine function to handle the event.
+            job_id (str, optional): Only deliver events about this Job.
+            file_id (str, optional): Only deliver events about this File.
+
+        Returns:
+            Subscription: Call `unsubscribe()` on it to stop listening.
+        """
+        return self.__callback(event, callback, job_id, file_id)
+
+    def events(self, types: Optional[Iterable[Union[FileEvent, JobEvent, EventType, str]]] = None, batch_size=None,
+               max_wait=None, max_size=1000, overflow="block", job_id=None, file_id=None) -> AsyncEventStream:
+        """
+        Streams events through a bounded buffer, to consume with `async for`
+        instead of with callbacks. Close the stream to stop receiving events.
+
+        Args:
+            types (list, optional): Events to stream. Defaults to all File and Job events.
+            batch_size (int, optional): If set, the stream yields lists of up to this many events.
+            max_wait (float, optional): Maximum time in seconds to wait for a batch to fill up
+               once its first event is available. Defaults to batches of the events already buffered.
+            max_size (int, optional): Maximum number of buffered events. Defaults to 1000.
+            overflow (str, optional): "block" to hold up event delivery while the buffer is full,
+               or "drop_oldest" to discard the oldest buffered event. Defaults to "block".
+            job_id (str, optional): Only stream events about this Job.
+            file_id (str, optional): Only stream events about this File.
+
+        Returns:
+            AsyncEventStream: The stream of events.
+        """
+        subscriptions = []
+        stream = AsyncEventStream(max_size, batch_size, max_wait, overflow,
+                                  on_close=lambda: [subscription.unsubscribe() for subscription in subscriptions])
+        for event in types or (EventType.FILE_EVENT, EventType.JOB_EVENT):
+            event = getattr(event, "value", event)
+            subscriptions.append(self.__callback(event, partial(stream.put, event), job_id, file_id))
+        return stream
+
+    async def disconnect(self):
+        """
+        Disconnects client from the server.
+        """
+        self.logger.info("Closing connection...")
+        await self.socket.disconnect()
@@ -0,0 +1,179 @@
+# Native imports
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, List, Optional, Text, Union
+
+# Project imports
+from alfred.realtime.stream import STREAM_OVERFLOW_POLICIES, RealTimeEvent
+
+__all__ = ["AsyncEventStream"]
+
+
+class AsyncEventStream:
+    """
+    Asyncio counterpart of `EventStream`, consumed with `async for`.
+
+    Usage:
+        async with realtime_client.events([JobEvent.JOB_FINISHED_EVENT], batch_size=50) as stream:
+            async for batch in stream:
+                ...
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        batch_size: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        overflow: Text = "block",
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Args:
+        - max_size: Maximum number of buffered events.
+        - batch_size: If set, iteration yields lists of up to this many events.
+        - max_wait: Maximum time in seconds to wait for a batch to fill up once
+          its first event is available. By default, batches hold the events
+          already buffered.
+        - overflow: What to do with events received while the buffer is full,
+          one of `STREAM_OVERFLOW_POLICIES`.
+        - on_close: Function called when the stream is closed.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if overflow not in STREAM_OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow must be one of {', '.join(STREAM_OVERFLOW_POLICIES)}, got {overflow!r}"
+            )
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.overflow = overflow
+        self.on_close = on_close
+        self.dropped = 0
+
+        self.__buffer: Deque[RealTimeEvent] = deque()
+        self.__closed = False
+        # Created on first use, on the running event loop.
+        self.__condition: Optional[asyncio.Condition] = None
+
+    def __len__(self) -> int:
+        return len(self.__buffer)
+
+    async def __aenter__(self) -> "AsyncEventStream":
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    async def put(self, event: Text, data: Any) -> bool:
+        """
+        Buffer an event. Returns False if the stream is closed.
+        """
+        condition = self.__get_condition()
+        async with condition:
+            while not self.__closed and len(self.__buffer) >= self.max_size:
+                if self.overflow == "drop_oldest":
+                    self.__buffer.popleft()
+                    self.dropped += 1
+                else:
+                    await condition.wait()
+            if self.__closed:
+                return False
+
+            self.__buffer.append({"event": event, "data": data})
+            condition.notify_all()
+            return True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[RealTimeEvent]:
+        """
+        Take the next event. Returns None if no event arrived within `timeout`
+        seconds, or if the stream is closed and drained.
+        """
+        events = await self.get_batch(1, timeout=timeout)
+        return events[0] if events else None
+
+    async def get_batch(
+        self,
+        batch_size: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> List[RealTimeEvent]:
+        """
+        Take up to `batch_size` events. Returns an empty list if no event
+        arrived within `timeout` seconds, or if the stream is closed and drained.
+
+        Args:
+        - batch_size: Maximum number of events (default: the stream's `batch_size`, or 1).
+        - max_wait: Maximum time in seconds to wait for the batch to fill up
+          once its first event is available (default: the stream's `max_wait`).
+        - timeout: Maximum time in seconds to wait for the first event
+          (default: no limit).
+        """
+        batch_size = batch_size or self.batch_size or 1
+        max_wait = self.max_wait if max_wait is None else max_wait
+
+        condition = self.__get_condition()
+        async with condition:
+            if not await self.__wait(condition, lambda: self.__buffer or self.__closed, timeout):
+                return []
+
+            if max_wait:
+                await self.__wait(
+                    condition,
+                    lambda: len(self.__buffer) >= batch_size or self.__closed,
+                    max_wait,
+                )
+
+            count = min(batch_size, len(self.__buffer))
+            events = [self.__buffer.popleft() for _ in range(count)]
+            if events:
+                condition.notify_all()
+            return events
+
+    async def __aiter__(self) -> AsyncIterator[Union[RealTimeEvent, List[RealTimeEvent]]]:
+        while True:
+            events = await self.get_batch()
+            if not events:
+                return
+            if self.batch_size is None:
+                yield events[0]
+            else:
+                yield events
+
+    async def close(self):
+        """
+        Stop buffering events. Iteration ends once the buffered events are consumed.
+        """
+        if self.__closed:
+            return
+        condition = self.__get_condition()
+        async with condition:
+            self.__closed = True
+            condition.notify_all()
+
+        if self.on_close is not None:
+            self.on_close()
+
+    def __get_condition(self) -> asyncio.Condition:
+        if self.__condition is None:
+            self.__condition = asyncio.Condition()
+        return self.__condition
+
+    @staticmethod
+    async def __wait(
+        condition: asyncio.Condition, predicate: Callable[[], Any], timeout: Optional[float]
+    ) -> bool:
+        """
+        Wait until `predicate()` is true. Must be called while holding the condition.
+        """
+        try:
+            await asyncio.wait_for(condition.wait_for(predicate), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
@@ -0,0 +1,252 @@
+# Native imports
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, List, Optional, Text, Tuple
+
+# Project imports
+from alfred.base.constants import JobEvent
+from alfred.rest.jobs.waiter import JOB_STATE_KEYS, TERMINAL_JOB_EVENTS, get_job_status, unwrap_job
+from alfred.utils import logging
+from alfred.utils.concurrency import run_concurrently
+from alfred.utils.events import extract_entity_id
+
+__all__ = ["EventBackfiller", "job_state"]
+
+TERMINAL_EVENTS = frozenset(event.value for event in TERMINAL_JOB_EVENTS)
+
+# Events emitted when a backfilled Job is found in a terminal state.
+STATUS_EVENTS = {
+    "finished": JobEvent.JOB_FINISHED_EVENT.value,
+    "failed": JobEvent.JOB_FAILED_EVENT.value,
+}
+
+
+def job_state(data: Any) -> Optional[Text]:
+    """
+    Get the stage of a Job from its details or from a real-time event
+    payload, where it may be nested under "data".
+    """
+    if isinstance(data, (str, bytes)):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            return None
+    job = unwrap_job(data)
+    for candidate in (job, job.get("data") if job is not None else None):
+        if not isinstance(candidate, Mapping):
+            continue
+        for key in JOB_STATE_KEYS:
+            value = candidate.get(key)
+            if isinstance(value, str) and value:
+                return value
+    return None
+
+
+class EventBackfiller:
+    """
+    Recovers the Job events missed while a real-time client was disconnected.
+
+    It remembers the last stage seen for each tracked Job. When asked to
+    backfill, it fetches the tracked Jobs and emits a synthetic stage update
+    event for those whose stage changed, followed by a finished or failed
+    event for those that completed. Tracked deferred Sessions that turned
+    into a Job produce a synthetic Job created event, and the Job is tracked
+    from then on.
+
+    Synthetic events carry `"synthetic": True` in their payload.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[Text, Any], None],
+        jobs: Any = None,
+        sessions: Any = None,
+        track_events: bool = True,
+        max_tracked: int = 10000,
+        max_workers: int = 4,
+    ):
+        """
+        Args:
+        - emit: Function called with the event name and payload of each synthetic event.
+        - jobs: Jobs domain, such as `AlfredClient.jobs`. Required to backfill Jobs.
+        - sessions: Sessions domain, such as `AlfredClient.sessions`. Required to
+          backfill Sessions.
+        - track_events: If True, Jobs seen in real-time events are tracked until
+          they finish or fail.
+        - max_tracked: Maximum number of tracked Jobs. Beyond it, the Job tracked
+          the longest ago is forgotten.
+        - max_workers: Maximum number of concurrent requests while backfilling.
+        """
+        self.emit = emit
+        self.jobs = jobs
+        self.sessions = sessions
+        self.track_events = track_events
+        self.max_tracked = max_tracked
+        self.max_workers = max_workers
+        self.logger = logging.getLogger("alfred-python")
+
+        self.__lock = threading.Lock()
+        # Last stage seen for each tracked Job, None if unknown.
+        self.__jobs: "OrderedDict[Text, Optional[Text]]" = OrderedDict()
+        self.__sessions: "OrderedDict[Text, None]" = OrderedDict()
+
+    @property
+    def tracked_jobs(self) -> List[Text]:
+        with self.__lock:
+            return list(self.__jobs)
+
+    @property
+    def tracked_sessions(self) -> List[Text]:
+        with self.__lock:
+            return list(self.__sessions)
+
+    def track_job(self, job_id: Text, stage: Optional[Text] = None):
+        """
+        Backfill the events of a Job until it finishes or fails.
+
+        Args:
+        - job_id: Unique identifier of the Job.
+        - stage: Last stage seen. If omitted, a stage update event is emitted
+          on the next backfill.
+        """
+        with self.__lock:
+            self.__track_job(job_id, stage)
+
+    def untrack_job(self, job_id: Text):
+        with self.__lock:
+            self.__jobs.pop(job_id, None)
+
+    def track_session(self, session_id: Text):
+        """
+        Backfill the creation of the Job of a deferred Session.
+
+        Args:
+        - session_id: Unique identifier of the Session.
+        """
+        with self.__lock:
+            self.__sessions[session_id] = None
+            self.__sessions.move_to_end(session_id)
+            while len(self.__sessions) > self.max_tracked:
+                self.__sessions.popitem(last=False)
+
+    def untrack_session(self, session_id: Text):
+        with self.__lock:
+            self.__sessions.pop(session_id, None)
+
+    def observe(self, event: Text, data: Any):
+        """
+        Update the state of the tracked Jobs from a real-time event.
+        """
+        job_id = extract_entity_id(data, "job")
+        if job_id is None:
+            return
+
+        with self.__lock:
+            if event in TERMINAL_EVENTS:
+                self.__jobs.pop(job_id, None)
+                return
+            if job_id not in self.__jobs:
+                if not (self.track_events and event.startswith("job")):
+                    return
+                self.__track_job(job_id, None)
+            stage = job_state(data)
+            if stage is not None:
+                self.__jobs[job_id] = stage
+
+    def backfill(self) -> int:
+        """
+        Fetch the tracked Sessions and Jobs and emit the events missed since
+        they were last seen. Returns the number of events emitted.
+        """
+        count = 0
+        if self.sessions is not None:
+            count += self.__backfill_sessions()
+        if self.jobs is not None:
+            count += self.__backfill_jobs()
+        return count
+
+    def __backfill_sessions(self) -> int:
+        count = 0
+        for _, session_id, session, err in run_concurrently(
+            self.__fetch_session, self.tracked_sessions, self.max_workers
+        ):
+            if err is not None:
+                self.logger.warning("Could not backfill session %s: %s", session_id, err)
+                continue
+            if isinstance(session, Mapping):
+                session = dict(session)
+            job_id = extract_entity_id(session, "job")
+            if job_id is None:
+                continue
+
+            with self.__lock:
+                if session_id not in self.__sessions:
+                    continue
+                del self.__sessions[session_id]
+                known = job_id in self.__jobs
+                if not known:
+                    self.__track_job(job_id, None)
+            if not known:
+                self.emit(
+                    JobEvent.JOB_CREATE_EVENT.value,
+                    {"jobId": job_id, "sessionId": session_id, "synthetic": True},
+                )
+                count += 1
+        return count
+
+    def __backfill_jobs(self) -> int:
+        count = 0
+        for _, job_id, job, err in run_concurrently(
+            self.__fetch_job, self.tracked_jobs, self.max_workers
+        ):
+            if err is not None:
+                self.logger.warning("Could not backfill job %s: %s", job_id, err)
+                continue
+            for event, payload in self.__job_events(job_id, job):
+                self.emit(event, payload)
+                count += 1
+        return count
+
+    def __job_events(self, job_id: Text, job: Any) -> List[Tuple[Text, Any]]:
+        stage = job_state(job)
+        status = get_job_status(job)
+        events = []
+        with self.__lock:
+            if job_id not in self.__jobs:
+                # Untracked, or completed by an event, while being fetched.
+                return []
+            if stage is not None and stage != self.__jobs[job_id]:
+                self.__jobs[job_id] = stage
+                events.append(JobEvent.JOB_STAGE_UPDATE_EVENT.value)
+            if status is not None:
+                del self.__jobs[job_id]
+                events.append(STATUS_EVENTS[status])
+        payload = {"jobId": job_id, "stage": stage, "job": job, "synthetic": True}
+        return [(event, payload) for event in events]
+
+    def __fetch_job(self, job_id: Text) -> Any:
+        # Cached details may be stale: the events evicting them were missed too.
+        cache = getattr(self.jobs, "cache", None)
+        if cache is not None:
+            cache.invalidate_job(job_id)
+        return self.jobs.get(job_id)
+
+    def __fetch_session(self, session_id: Text) -> Any:
+        cache = getattr(self.sessions, "cache", None)
+        if cache is not None:
+            cache.invalidate("sessions", session_id)
+        return self.sessions.get(session_id)
+
+    def __track_job(self, job_id: Text, stage: Optional[Text]):
+        """
+        Must be called while holding the lock.
+        """
+        if job_id in self.__jobs:
+            if stage is not None:
+                self.__jobs[job_id] = stage
+            return
+        self.__jobs[job_id] = stage
+        while len(self.__jobs) > self.max_tracked:
+            self.__jobs.popitem(last=False)
@@ -0,0 +1,282 @@
+# Native imports
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Text, Tuple, TypedDict
+
+# Project imports
+from alfred.base.constants import FileEvent, JobEvent
+from alfred.utils.events import extract_entity_id
+
+__all__ = [
+    "EventCoalescer",
+    "CoalesceConfiguration",
+    "CoalesceStats",
+    "coalesce_key",
+    "DEFAULT_COALESCED_EVENTS",
+]
+
+# Events sent many times per File or Job while it is processed.
+DEFAULT_COALESCED_EVENTS = (
+    FileEvent.FILE_STATUS_UPDATE_EVENT.value,
+    FileEvent.FILE_UPDATE_EVENT.value,
+    JobEvent.JOB_STAGE_UPDATE_EVENT.value,
+)
+
+
+class CoalesceConfiguration(TypedDict):
+    window: Optional[float]
+    events: Optional[Iterable[Text]]
+    max_pending: Optional[int]
+
+
+class CoalesceStats(TypedDict):
+    received: int
+    delivered: int
+    coalesced: int
+    pending: int
+
+
+def coalesce_key(event: Text, data: Any) -> Optional[Text]:
+    """
+    Get the ID of the entity an event is about: the File ID of File events,
+    and the Job ID of the others.
+    """
+    entities = ("file", "job") if event.startswith("file") else ("job", "file")
+    for entity in entities:
+        entity_id = extract_entity_id(data, entity)
+        if entity_id is not None:
+            return entity_id
+    return None
+
+
+class _Pending:
+    __slots__ = ("event", "data", "entity_id", "count", "deadline")
+
+    def __init__(self, event: Text, data: Any, entity_id: Text, deadline: float):
+        self.event = event
+        self.data = data
+        self.entity_id = entity_id
+        self.count = 1
+        self.deadline = deadline
+
+
+class EventCoalescer:
+    """
+    Merges bursts of real-time events. The first occurrence of an event about
+    a File or Job opens a window; the events of the same type about the same
+    entity received during the window are merged, and only the latest is
+    delivered when the window closes, with a `coalesced_count` key holding
+    the number of events it stands for.
+
+    Events of other types are delivered right away, after the pending events
+    about the same entity, so that they are not delivered out of order.
+    Callbacks are never called concurrently.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[Text, Any], None],
+        config: Optional[CoalesceConfiguration] = None,
+        clock: Callable[[], float] = monotonic,
+        on_superseded: Optional[Callable[[Text, Any], None]] = None,
+    ):
+        """
+        Args:
+        - deliver: Function called with the event name and payload of each delivered event.
+        - config: Coalescing configuration.
+            - config.window: Time in seconds during which events are merged
+            (default: 0.5). Set to 0 to deliver every event right away.
+            - config.events: Names of the events to merge (default: `DEFAULT_COALESCED_EVENTS`).
+            - config.max_pending: Maximum number of events waiting for their
+            window to close. Beyond it, the oldest is delivered early (default: 10000).
+        - clock: Monotonic clock in seconds.
+        - on_superseded: Function called with the event name and payload of each
+          event replaced by a later one, which is not delivered.
+        """
+        config = config or {}
+        self.deliver = deliver
+        self.window = config.get("window", 0.5)
+        self.events = frozenset(
+            getattr(event, "value", event)
+            for event in (config.get("events") or DEFAULT_COALESCED_EVENTS)
+        )
+        self.max_pending = config.get("max_pending") or 10000
+        self.clock = clock
+        self.on_superseded = on_superseded
+
+        self.__lock = threading.Lock()
+        self.__changed = threading.Condition(self.__lock)
+        # Serializes deliveries from the socket and timer threads.
+        self.__delivery_lock = threading.Lock()
+        # Pending events by (event, entity ID), in deadline order.
+        self.__pending: "OrderedDict[Tuple[Text, Text], _Pending]" = OrderedDict()
+        self.__by_entity: Dict[Text, Set[Tuple[Text, Text]]] = {}
+        self.__closed = False
+        self.__thread: Optional[threading.Thread] = None
+        self.__stats = {"received": 0, "delivered": 0, "coalesced": 0}
+
+    def submit(self, event: Text, data: Any):
+        """
+        Merge an event with the pending ones, or deliver it.
+        """
+        entity_id = coalesce_key(event, data)
+        if event not in self.events or self.window <= 0 or entity_id is None:
+            with self.__delivery_lock:
+                with self.__lock:
+                    self.__stats["received"] += 1
+                    pending = self.__pop_entity(entity_id) if entity_id is not None else []
+                self.__deliver(pending)
+                self.__deliver_one(event, data)
+            return
+
+        key = (event, entity_id)
+        pending = superseded = None
+        with self.__lock:
+            self.__stats["received"] += 1
+            if self.__closed:
+                # Delivered below, without merging.
+                overflow = [_Pending(event, data, entity_id, 0)]
+            else:
+                pending = self.__pending.get(key)
+                if pending is not None:
+                    superseded = pending.data
+                overflow = self.__merge(key, event, data, entity_id)
+
+        if pending is not None and self.on_superseded is not None:
+            self.on_superseded(event, superseded)
+        if overflow:
+            with self.__delivery_lock:
+                self.__deliver(overflow)
+
+    def stats(self) -> CoalesceStats:
+        """
+        Get the number of events received, delivered, merged into others, and
+        waiting for their window to close.
+        """
+        with self.__lock:
+            return {**self.__stats, "pending": len(self.__pending)}
+
+    def flush(self):
+        """
+        Deliver the pending events now.
+        """
+        with self.__delivery_lock:
+            with self.__lock:
+                pending = list(self.__pending.values())
+                self.__pending.clear()
+                self.__by_entity.clear()
+            self.__deliver(pending)
+
+    def close(self):
+        """
+        Deliver the pending events and stop merging new ones.
+        """
+        with self.__lock:
+            self.__closed = True
+            self.__changed.notify_all()
+            thread = self.__thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+    def __run(self):
+        while True:
+            with self.__lock:
+                while not self.__closed:
+                    if self.__pending:
+                        wait_time = next(iter(self.__pending.values())).deadline - self.clock()
+                        if wait_time <= 0:
+                            break
+                        self.__changed.wait(wait_time)
+                    else:
+                        self.__changed.wait()
+                if self.__closed:
+                    return
+
+            with self.__delivery_lock:
+                with self.__lock:
+                    due = self.__pop_due(self.clock())
+                self.__deliver(due)
+
+    def __merge(
+        self, key: Tuple[Text, Text], event: Text, data: Any, entity_id: Text
+    ) -> List[_Pending]:
+        """
+        Merge an event with the pending ones. Returns the events to deliver
+        early. Must be called while holding the lock.
+        """
+        pending = self.__pending.get(key)
+        if pending is not None:
+            pending.data = data
+            pending.count += 1
+            self.__stats["coalesced"] += 1
+            return []
+
+        self.__pending[key] = _Pending(event, data, entity_id, self.clock() + self.window)
+        self.__by_entity.setdefault(entity_id, set()).add(key)
+        if self.__thread is None:
+            self.__thread = threading.Thread(
+                target=self.__run, name="alfred-coalescer", daemon=True
+            )
+            self.__thread.start()
+        elif len(self.__pending) == 1:
+            self.__changed.notify()
+        return self.__pop_oldest() if len(self.__pending) > self.max_pending else []
+
+    def __pop_due(self, now: float) -> List[_Pending]:
+        """
+        Must be called while holding the lock.
+        """
+        due = []
+        while self.__pending:
+            key, pending = next(iter(self.__pending.items()))
+            if pending.deadline > now:
+                break
+            due.append(self.__remove(key))
+        return due
+
+    def __pop_oldest(self) -> List[_Pending]:
+        """
+        Must be called while holding the lock.
+        """
+        return [self.__remove(next(iter(self.__pending)))]
+
+    def __pop_entity(self, entity_id: Text) -> List[_Pending]:
+        """
+        Must be called while holding the lock.
+        """
+        keys = self.__by_entity.get(entity_id)
+        if not keys:
+            return []
+        pending = [self.__pending[key] for key in keys]
+        for key in list(keys):
+            self.__remove(key)
+        pending.sort(key=lambda item: item.deadline)
+        return pending
+
+    def __remove(self, key: Tuple[Text, Text]) -> _Pending:
+        """
+        Must be called while holding the lock.
+        """
+        pending = self.__pending.pop(key)
+        keys = self.__by_entity[pending.entity_id]
+        keys.discard(key)
+        if not keys:
+            del self.__by_entity[pending.entity_id]
+        return pending
+
+    def __deliver(self, pending: List[_Pending]):
+        """
+        Must be called while holding the delivery lock.
+        """
+        for item in pending:
+            data = item.data
+            if isinstance(data, dict):
+                data = {**data, "coalesced_count": item.count}
+            self.__deliver_one(item.event, data)
+
+    def __deliver_one(self, event: Text, data: Any):
+        with self.__lock:
+            self.__stats["delivered"] += 1
+        self.deliver(event, data)
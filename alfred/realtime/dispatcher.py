@@ -0,0 +1,353 @@
+# Native imports
+import io
+import json
+import tempfile
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Text, Tuple, TypedDict
+
+# Project imports
+from alfred.utils import logging
+from alfred.utils.events import extract_entity_id
+
+__all__ = [
+    "EventDispatcher",
+    "DispatchConfiguration",
+    "DispatchStats",
+    "default_ordering_key",
+    "OVERFLOW_POLICIES",
+]
+
+# What `submit` does with an event when the queue is full:
+# - "block": wait until a worker frees a slot. Events received meanwhile wait
+#   in the real-time client's intake queue, which is not bounded.
+# - "drop_oldest": discard the oldest queued event.
+# - "spill": write the event to a temporary file, read back once slots free up.
+OVERFLOW_POLICIES = ("block", "drop_oldest", "spill")
+
+
+class DispatchConfiguration(TypedDict):
+    max_workers: Optional[int]
+    max_queue_size: Optional[int]
+    overflow: Optional[Text]
+    ordering_key: Optional[Callable[[Text, Any], Optional[Hashable]]]
+    spill_dir: Optional[Text]
+
+
+class DispatchStats(TypedDict):
+    queued: int
+    spilled: int
+    in_flight: int
+    max_queued: int
+    lanes: int
+    submitted: int
+    processed: int
+    failed: int
+    dropped: int
+    spilled_total: int
+
+
+def default_ordering_key(_event: Text, data: Any) -> Optional[Hashable]:
+    """
+    Order the events of a Job, or of a File if the event has no Job ID.
+    Events with neither are handled in any order.
+    """
+    return extract_entity_id(data, "job") or extract_entity_id(data, "file")
+
+
+class _Entry:
+    __slots__ = ("event", "data", "lane", "done")
+
+    def __init__(self, event: Text, data: Any, lane: Hashable):
+        self.event = event
+        self.data = data
+        # Entries without an ordering key get a lane of their own.
+        self.lane = self if lane is None else lane
+        self.done = False
+
+
+class _SpillFile:
+    """
+    FIFO of events stored as JSON lines in a temporary file.
+    """
+
+    def __init__(self, directory: Optional[Text]):
+        self.file = tempfile.TemporaryFile(mode="w+b", dir=directory)
+        self.read_offset = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, event: Text, data: Any):
+        self.file.seek(0, io.SEEK_END)
+        self.file.write(json.dumps([event, data], default=str).encode("utf-8") + b"\n")
+        self.count += 1
+
+    def pop(self) -> Tuple[Text, Any]:
+        self.file.seek(self.read_offset)
+        line = self.file.readline()
+        self.read_offset = self.file.tell()
+        self.count -= 1
+        if self.count == 0:
+            # Reuse the file from the start once it is drained.
+            self.file.seek(0)
+            self.file.truncate()
+            self.read_offset = 0
+        event, data = json.loads(line)
+        return event, data
+
+
+class EventDispatcher:
+    """
+    Runs real-time event handlers on a pool of worker threads, fed by a
+    bounded queue, so that slow handlers do not hold up the others.
+
+    Events sharing an ordering key (by default their Job ID, or File ID) are
+    handled one at a time in the order they were submitted; events with
+    different keys are handled concurrently. The real-time client submits
+    events from a single thread, in the order they were received.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Text, Any], None],
+        config: Optional[DispatchConfiguration] = None,
+    ):
+        """
+        Args:
+        - handler: Function called with the event name and payload of each event.
+        - config: Dispatch configuration.
+            - config.max_workers: Number of worker threads (default: 4).
+            - config.max_queue_size: Maximum number of events waiting for a
+            worker (default: 1000).
+            - config.overflow: What to do with events received while the queue
+            is full, one of `OVERFLOW_POLICIES` (default: "block").
+            - config.ordering_key: Function of the event name and payload
+            returning the key of the events to handle in order, or None for
+            events that can be handled in any order (default: `default_ordering_key`).
+            - config.spill_dir: Directory of the spill file (default: the
+            system temporary directory).
+        """
+        config = config or {}
+        self.handler = handler
+        self.max_workers = config.get("max_workers") or 4
+        self.max_queue_size = config.get("max_queue_size") or 1000
+        self.overflow = config.get("overflow") or "block"
+        self.ordering_key = config.get("ordering_key") or default_ordering_key
+        self.spill_dir = config.get("spill_dir")
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}, got {self.overflow!r}"
+            )
+        self.logger = logging.getLogger("alfred-python")
+
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+        # Queued entries per lane. A lane is in the dict while it has queued
+        # entries or one of them is being handled, and in `__ready` while it
+        # has queued entries and none is being handled.
+        self.__lanes: Dict[Hashable, Deque[_Entry]] = {}
+        self.__ready: Deque[Hashable] = deque()
+        # Queued entries, oldest first, for the "drop_oldest" policy.
+        self.__order: Deque[_Entry] = deque()
+        self.__spill: Optional[_SpillFile] = None
+        self.__closed = False
+        self.__stats = {
+            "queued": 0,
+            "in_flight": 0,
+            "max_queued": 0,
+            "submitted": 0,
+            "processed": 0,
+            "failed": 0,
+            "dropped": 0,
+            "spilled_total": 0,
+        }
+
+        self.__workers: List[threading.Thread] = [
+            threading.Thread(target=self.__work, name=f"alfred-dispatch-{index}", daemon=True)
+            for index in range(self.max_workers)
+        ]
+        for worker in self.__workers:
+            worker.start()
+
+    def submit(self, event: Text, data: Any) -> bool:
+        """
+        Queue an event. Returns False if the dispatcher is closed.
+        """
+        lane = self.ordering_key(event, data)
+        with self.__lock:
+            if self.__closed:
+                return False
+            self.__stats["submitted"] += 1
+
+            # Queue behind spilled events to keep them in order.
+            if self.__spill:
+                self.__spill_event(event, data)
+                return True
+
+            while self.__stats["queued"] >= self.max_queue_size:
+                if self.overflow == "block":
+                    self.__not_full.wait()
+                    if self.__closed:
+                        return False
+                elif self.overflow == "drop_oldest":
+                    self.__drop_oldest()
+                else:
+                    self.__spill_event(event, data)
+                    return True
+
+            self.__enqueue(_Entry(event, data, lane))
+            return True
+
+    def stats(self) -> DispatchStats:
+        """
+        Get the queue depth and event counters.
+
+        - queued: Events waiting in memory for a worker.
+        - spilled: Events waiting in the spill file.
+        - in_flight: Events being handled.
+        - max_queued: Highest number of waiting events so far.
+        - lanes: Ordering keys with waiting or in-flight events.
+        """
+        with self.__lock:
+            return {
+                **self.__stats,
+                "spilled": len(self.__spill) if self.__spill else 0,
+                "lanes": len(self.__lanes),
+            }
+
+    def is_worker(self) -> bool:
+        """
+        Whether the current thread is one of the workers.
+        """
+        return threading.current_thread() in self.__workers
+
+    def close(self, wait: bool = True, timeout: Optional[float] = None):
+        """
+        Stop accepting events. Queued events are still handled.
+
+        Args:
+        - wait: Whether to wait for the queued events to be handled.
+        - timeout: Maximum time in seconds to wait.
+        """
+        with self.__lock:
+            self.__closed = True
+            self.__not_empty.notify_all()
+            self.__not_full.notify_all()
+
+        if wait:
+            for worker in self.__workers:
+                if worker is not threading.current_thread():
+                    worker.join(timeout)
+
+    def __enqueue(self, entry: _Entry):
+        """
+        Must be called while holding the lock.
+        """
+        lane = self.__lanes.get(entry.lane)
+        if lane is None:
+            lane = self.__lanes[entry.lane] = deque()
+            self.__ready.append(entry.lane)
+            self.__not_empty.notify()
+        lane.append(entry)
+
+        if self.overflow == "drop_oldest":
+            while self.__order and self.__order[0].done:
+                self.__order.popleft()
+            self.__order.append(entry)
+
+        self.__stats["queued"] += 1
+        self.__update_max_queued()
+
+    def __drop_oldest(self):
+        """
+        Must be called while holding the lock.
+        """
+        while self.__order:
+            entry = self.__order.popleft()
+            if entry.done:
+                continue
+            # The oldest queued entry is necessarily the first of its lane.
+            self.__lanes[entry.lane].popleft()
+            entry.done = True
+            self.__stats["queued"] -= 1
+            self.__stats["dropped"] += 1
+            self.logger.warning(f"Event queue is full. Dropped event {entry.event}.")
+            return
+
+    def __spill_event(self, event: Text, data: Any):
+        """
+        Must be called while holding the lock.
+        """
+        if self.__spill is None:
+            self.__spill = _SpillFile(self.spill_dir)
+        self.__spill.append(event, data)
+        self.__stats["spilled_total"] += 1
+        self.__update_max_queued()
+
+    def __refill(self):
+        """
+        Move spilled events back to the queue while it has room. Must be
+        called while holding the lock.
+        """
+        while self.__spill and self.__stats["queued"] < self.max_queue_size:
+            event, data = self.__spill.pop()
+            self.__enqueue(_Entry(event, data, self.ordering_key(event, data)))
+
+    def __update_max_queued(self):
+        depth = self.__stats["queued"] + (len(self.__spill) if self.__spill else 0)
+        if depth > self.__stats["max_queued"]:
+            self.__stats["max_queued"] = depth
+
+    def __next(self) -> Optional[_Entry]:
+        """
+        Wait for the next entry to handle. Returns None once the dispatcher is
+        closed and drained.
+        """
+        with self.__lock:
+            while True:
+                while not self.__ready:
+                    if self.__closed and not self.__spill:
+                        return None
+                    self.__not_empty.wait()
+
+                key = self.__ready.popleft()
+                lane = self.__lanes[key]
+                if not lane:
+                    # Its entries were dropped.
+                    del self.__lanes[key]
+                    continue
+
+                entry = lane.popleft()
+                entry.done = True
+                self.__stats["queued"] -= 1
+                self.__stats["in_flight"] += 1
+                self.__refill()
+                self.__not_full.notify()
+                return entry
+
+    def __work(self):
+        while True:
+            entry = self.__next()
+            if entry is None:
+                return
+
+            failed = False
+            try:
+                self.handler(entry.event, entry.data)
+            except Exception:  # pylint: disable=W0703
+                failed = True
+                self.logger.exception(f"Error handling event {entry.event}.")
+
+            with self.__lock:
+                self.__stats["in_flight"] -= 1
+                self.__stats["processed"] += 1
+                if failed:
+                    self.__stats["failed"] += 1
+                if self.__lanes[entry.lane]:
+                    self.__ready.append(entry.lane)
+                    self.__not_empty.notify()
+                else:
+                    del self.__lanes[entry.lane]
@@ -0,0 +1,131 @@
+# Native imports
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Text, Tuple
+
+# Project imports
+from alfred.utils import logging
+
+__all__ = ["EventIntake", "ordered_socket_client"]
+
+# Socket.IO client class handling messages in order, built on first use.
+_ORDERED_CLIENT = None
+
+
+def ordered_socket_client(**kwargs):
+    """
+    Build a `socketio.Client` that handles the messages of the socket on the
+    thread reading them, in the order they arrive.
+
+    engineio hands every message to a new thread, so the handlers of
+    messages received back to back race each other. Handlers must return
+    quickly, as the socket is not read while they run: queue the events on
+    an `EventIntake` instead of handling them.
+
+    Args:
+    - kwargs: Arguments of `socketio.Client`.
+    """
+    global _ORDERED_CLIENT  # pylint: disable=W0603
+    if _ORDERED_CLIENT is None:
+        # socketio is slow to import: load it only when a client is built.
+        import engineio  # pylint: disable=C0415
+        import socketio  # pylint: disable=C0415
+
+        class OrderedEngineIOClient(engineio.Client):
+            def _trigger_event(self, event, *args, **kwargs):
+                if event == "message":
+                    kwargs["run_async"] = False
+                return super()._trigger_event(event, *args, **kwargs)
+
+        class OrderedClient(socketio.Client):
+            def _engineio_client_class(self):
+                return OrderedEngineIOClient
+
+        _ORDERED_CLIENT = OrderedClient
+    return _ORDERED_CLIENT(**kwargs)
+
+
+class EventIntake:
+    """
+    Queue of received real-time events, handled one at a time and in the
+    order they were received by a single thread.
+
+    The queue is not bounded, so the socket is never held up: while the
+    handler falls behind, for instance because a full dispatcher or stream
+    blocks it, the events wait here.
+    """
+
+    def __init__(self, handler: Callable[[Text, Any], None]):
+        """
+        Args:
+        - handler: Function called with the event name and payload of each event.
+        """
+        self.handler = handler
+        self.logger = logging.getLogger("alfred-python")
+
+        self.__queue: Deque[Tuple[Text, Any]] = deque()
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__closed = False
+        self.__discard = False
+        self.__thread = threading.Thread(target=self.__run, name="alfred-intake", daemon=True)
+        self.__thread.start()
+
+    def __len__(self) -> int:
+        return len(self.__queue)
+
+    def put(self, event: Text, data: Any) -> bool:
+        """
+        Queue an event. Returns False if the intake is closed.
+        """
+        with self.__lock:
+            if self.__closed:
+                return False
+            self.__queue.append((event, data))
+            self.__not_empty.notify()
+            return True
+
+    def close(self, wait: bool = True, timeout: Optional[float] = None):
+        """
+        Stop accepting events. Queued events are still handled, unless the
+        intake is closed by the handler itself: it cannot wait for them, so
+        they are discarded.
+
+        Args:
+        - wait: Whether to wait for the queued events to be handled.
+        - timeout: Maximum time in seconds to wait.
+        """
+        with self.__lock:
+            self.__closed = True
+            if threading.current_thread() is self.__thread:
+                self.__discard = True
+                wait = False
+            self.__not_empty.notify_all()
+
+        if wait:
+            self.__thread.join(timeout)
+
+    def __next(self) -> Optional[Tuple[Text, Any]]:
+        """
+        Wait for the next event. Returns None once closed and drained.
+        """
+        with self.__lock:
+            while not self.__queue:
+                if self.__closed:
+                    return None
+                self.__not_empty.wait()
+            if self.__discard:
+                self.__queue.clear()
+                return None
+            return self.__queue.popleft()
+
+    def __run(self):
+        while True:
+            entry = self.__next()
+            if entry is None:
+                return
+            event, data = entry
+            try:
+                self.handler(event, data)
+            except Exception:  # pylint: disable=W0703
+                self.logger.exception(f"Error handling event {event}.")
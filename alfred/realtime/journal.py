@@ -0,0 +1,485 @@
+# Native imports
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Text, TypedDict, Union
+
+# Project imports
+from alfred.http.codec import JsonCodec, get_json_codec
+from alfred.utils import logging
+
+__all__ = [
+    "EventJournal",
+    "JournalConfiguration",
+    "JournalEntry",
+    "JournalStats",
+    "DEFAULT_CONSUMER",
+]
+
+DEFAULT_CONSUMER = "default"
+SEGMENT_SUFFIX = ".jsonl"
+OFFSETS_FILE = "offsets.json"
+
+
+class JournalConfiguration(TypedDict):
+    directory: Text
+    segment_size: Optional[int]
+    fsync: Optional[bool]
+    fsync_interval: Optional[float]
+    retention_bytes: Optional[int]
+    retention_seconds: Optional[float]
+    json_codec: Optional[Union[Text, JsonCodec]]
+
+
+class JournalEntry(TypedDict):
+    offset: int
+    time: float
+    event: Text
+    data: Any
+
+
+class JournalStats(TypedDict):
+    segments: int
+    size: int
+    first_offset: int
+    next_offset: int
+    appended: int
+    syncs: int
+    unsynced: int
+
+
+class EventJournal:
+    """
+    Append-only log of real-time events, stored as JSON lines in a directory
+    of segment files named after the offset of their first entry.
+
+    Every entry gets a sequential offset. Consumers acknowledge each entry
+    they processed with `ack`, in any order: the committed offset only moves
+    past entries that were all acknowledged. `replay` yields the entries
+    after the committed offset, so that events received before a crash are
+    handled again on restart: processing is at-least-once.
+
+    Entries are written to the operating system as soon as they are appended,
+    so they survive a crash of the process. They are flushed to disk with
+    fsync in batches, at most `fsync_interval` seconds after being appended.
+    Committed offsets are saved on the same schedule, and the retention is
+    applied whenever they are.
+    """
+
+    def __init__(self, config: JournalConfiguration):
+        """
+        Args:
+        - config: Journal configuration.
+            - config.directory: Directory holding the segments. Created if missing.
+            - config.segment_size: Size in bytes beyond which a new segment is
+            started (default: 16 MiB).
+            - config.fsync: Whether to flush the segments to disk with fsync (default: True).
+            - config.fsync_interval: Maximum time in seconds between an append and
+            its flush to disk (default: 0.1). Set to 0 to flush every append.
+            - config.retention_bytes: Maximum total size of the segments. Beyond it,
+            the oldest segments are deleted (default: no limit).
+            - config.retention_seconds: Maximum age of the segments, from their last
+            append (default: no limit).
+            - config.json_codec: JSON codec, as in `HttpConfiguration` (default: "json").
+        """
+        self.directory = config["directory"]
+        self.segment_size = config.get("segment_size") or 16 * 1024 * 1024
+        self.fsync = config.get("fsync", True)
+        self.fsync_interval = config.get("fsync_interval", 0.1)
+        self.retention_bytes = config.get("retention_bytes")
+        self.retention_seconds = config.get("retention_seconds")
+        self.codec = get_json_codec(config.get("json_codec"))
+        self.logger = logging.getLogger("alfred-python")
+
+        self.__lock = threading.Lock()
+        self.__changed = threading.Condition(self.__lock)
+        self.__closed = False
+        self.__thread: Optional[threading.Thread] = None
+        self.__unsynced = 0
+        self.__stats = {"appended": 0, "syncs": 0}
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.__offsets = self.__load_offsets()
+        self.__offsets_dirty = False
+        # Offsets acknowledged past the committed offset of each consumer.
+        self.__acked: Dict[Text, Set[int]] = {}
+        # First offset of each segment, in order. The last one is written to.
+        self.__segments: List[int] = sorted(
+            int(name[: -len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.endswith(SEGMENT_SUFFIX) and name[: -len(SEGMENT_SUFFIX)].isdigit()
+        )
+        if not self.__segments:
+            self.__segments.append(0)
+        self.__next_offset = self.__recover(self.__segments[-1])
+        # Unbuffered, so that appended entries reach the operating system right away.
+        self.__file = open(self.__segment_path(self.__segments[-1]), "ab", buffering=0)
+        self.__size = self.__file.tell()
+        self.apply_retention()
+
+    def __enter__(self) -> "EventJournal":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    @property
+    def next_offset(self) -> int:
+        with self.__lock:
+            return self.__next_offset
+
+    def append(self, event: Text, data: Any) -> int:
+        """
+        Append an event. Returns its offset.
+        """
+        with self.__lock:
+            if self.__closed:
+                raise ValueError("The journal is closed.")
+            offset = self.__next_offset
+            line = self.codec.dumps(
+                {"offset": offset, "time": time.time(), "event": event, "data": data}
+            ) + b"\n"
+            if self.__size and self.__size + len(line) > self.segment_size:
+                self.__roll(offset)
+
+            self.__file.write(line)
+            self.__size += len(line)
+            self.__next_offset += 1
+            self.__unsynced += 1
+            self.__stats["appended"] += 1
+            self.__schedule_sync()
+            return offset
+
+    def ack(self, offset: int, consumer: Text = DEFAULT_CONSUMER):
+        """
+        Acknowledge that an entry was processed. Entries can be acknowledged
+        in any order, such as when they are handled concurrently: the
+        committed offset moves forward once every earlier entry is
+        acknowledged too.
+
+        Args:
+        - offset: Offset of the processed entry.
+        - consumer: Name of the consumer, to keep several replay positions.
+        """
+        with self.__lock:
+            committed = self.__low_water(consumer)
+            if offset <= committed:
+                return
+            self.__acked.setdefault(consumer, set()).add(offset)
+            self.__advance(consumer, committed)
+
+    def commit(self, offset: int, consumer: Text = DEFAULT_CONSUMER):
+        """
+        Acknowledge that every entry up to `offset` was processed, such as
+        when entries are handled one after the other. Committed offsets only
+        move forward.
+
+        Args:
+        - offset: Offset of the last processed entry.
+        - consumer: Name of the consumer, to keep several replay positions.
+        """
+        with self.__lock:
+            if offset <= self.__low_water(consumer):
+                return
+            acked = self.__acked.get(consumer)
+            if acked:
+                acked.difference_update([item for item in acked if item <= offset])
+            self.__set_committed(consumer, offset)
+            self.__advance(consumer, offset)
+
+    def committed(self, consumer: Text = DEFAULT_CONSUMER) -> Optional[int]:
+        """
+        Get the last offset committed by a consumer, or None.
+        """
+        with self.__lock:
+            return self.__offsets.get(consumer)
+
+    def replay(
+        self, consumer: Text = DEFAULT_CONSUMER, from_offset: Optional[int] = None
+    ) -> Iterator[JournalEntry]:
+        """
+        Yield the entries after the last offset committed by a consumer, up
+        to the last one appended when the replay started.
+
+        Args:
+        - consumer: Name of the consumer.
+        - from_offset: Offset of the first entry to yield, instead of the one
+          after the committed offset.
+        """
+        with self.__lock:
+            if from_offset is None:
+                from_offset = self.__offsets.get(consumer, -1) + 1
+            end = self.__next_offset
+            segments = list(self.__segments)
+
+        for index, base in enumerate(segments):
+            following = segments[index + 1] if index + 1 < len(segments) else end
+            if following <= from_offset:
+                continue
+            for entry in self.__read_segment(base):
+                if entry["offset"] >= end:
+                    return
+                if entry["offset"] >= from_offset:
+                    yield entry
+
+    def sync(self):
+        """
+        Flush the appended entries and committed offsets to disk now.
+        """
+        with self.__lock:
+            self.__sync()
+
+    def apply_retention(self) -> int:
+        """
+        Delete the oldest segments beyond `retention_bytes`, and those last
+        appended to more than `retention_seconds` ago. The segment being
+        written to is kept. Returns the number of deleted segments.
+        """
+        with self.__lock:
+            return self.__apply_retention()
+
+    def stats(self) -> JournalStats:
+        with self.__lock:
+            sizes = [self.__segment_size(base) for base in self.__segments[:-1]]
+            return {
+                "segments": len(self.__segments),
+                "size": sum(sizes) + self.__size,
+                "first_offset": self.__segments[0],
+                "next_offset": self.__next_offset,
+                "unsynced": self.__unsynced,
+                **self.__stats,
+            }
+
+    def close(self):
+        """
+        Flush to disk and close the segment being written to. Offsets can
+        still be committed afterwards.
+        """
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__changed.notify_all()
+            thread = self.__thread
+        if thread is not None:
+            thread.join()
+        with self.__lock:
+            self.__sync()
+            self.__file.close()
+
+    def __low_water(self, consumer: Text) -> int:
+        """
+        Get the offset before the first entry a consumer has to acknowledge.
+        Entries deleted by the retention cannot be acknowledged anymore. Must
+        be called while holding the lock.
+        """
+        return max(self.__offsets.get(consumer, -1), self.__segments[0] - 1)
+
+    def __advance(self, consumer: Text, committed: int):
+        """
+        Move the committed offset past the acknowledged entries that follow
+        it. Must be called while holding the lock.
+        """
+        acked = self.__acked.get(consumer)
+        offset = committed + 1
+        if not acked or offset not in acked:
+            return
+        while offset in acked:
+            acked.remove(offset)
+            offset += 1
+        self.__set_committed(consumer, offset - 1)
+
+    def __set_committed(self, consumer: Text, offset: int):
+        """
+        Must be called while holding the lock.
+        """
+        self.__offsets[consumer] = offset
+        self.__offsets_dirty = True
+        if self.__closed:
+            self.__save_offsets()
+        else:
+            self.__schedule_sync()
+
+    def __run(self):
+        with self.__lock:
+            while not self.__closed:
+                if self.__unsynced or self.__offsets_dirty:
+                    # Let a batch build up, then flush it at once.
+                    self.__changed.wait(self.fsync_interval)
+                    self.__sync()
+                else:
+                    self.__changed.wait()
+
+    def __schedule_sync(self):
+        """
+        Must be called while holding the lock.
+        """
+        if not self.fsync_interval:
+            self.__sync()
+        elif self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run, name="alfred-journal", daemon=True)
+            self.__thread.start()
+        else:
+            self.__changed.notify()
+
+    def __sync(self):
+        """
+        Must be called while holding the lock.
+        """
+        if self.__unsynced and not self.__file.closed:
+            if self.fsync:
+                os.fsync(self.__file.fileno())
+                self.__stats["syncs"] += 1
+            self.__unsynced = 0
+        if self.__offsets_dirty:
+            self.__save_offsets()
+            # Quiet journals rarely start a segment: expire old ones on commit too.
+            self.__apply_retention()
+
+    def __roll(self, offset: int):
+        """
+        Start a new segment. Must be called while holding the lock.
+        """
+        self.__sync()
+        self.__file.close()
+        self.__segments.append(offset)
+        self.__file = open(self.__segment_path(offset), "ab", buffering=0)
+        self.__size = 0
+        self.__apply_retention()
+
+    def __apply_retention(self) -> int:
+        """
+        Must be called while holding the lock.
+        """
+        now = time.time()
+        sizes = {base: self.__segment_size(base) for base in self.__segments[:-1]}
+        total = sum(sizes.values()) + self.__size
+        deleted = 0
+        for base in self.__segments[:-1]:
+            expired = self.retention_seconds is not None and (
+                now - self.__segment_mtime(base) > self.retention_seconds
+            )
+            oversized = self.retention_bytes is not None and total > self.retention_bytes
+            if not expired and not oversized:
+                break
+            try:
+                os.remove(self.__segment_path(base))
+            except FileNotFoundError:
+                pass
+            total -= sizes[base]
+            deleted += 1
+
+        if deleted:
+            del self.__segments[:deleted]
+            first_offset = self.__segments[0]
+            lagging = [
+                consumer for consumer, offset in self.__offsets.items()
+                if offset + 1 < first_offset
+            ]
+            if lagging:
+                self.logger.warning(
+                    "Journal retention deleted events not committed by: %s", ", ".join(lagging)
+                )
+        return deleted
+
+    def __recover(self, base: int) -> int:
+        """
+        Drop the partial entry a crash may have left at the end of the last
+        segment. Returns the next offset.
+        """
+        path = self.__segment_path(base)
+        if not os.path.exists(path):
+            return base
+        with open(path, "rb") as file:
+            data = file.read()
+
+        end = len(data)
+        while end > 0:
+            start = data.rfind(b"\n", 0, end - 1) + 1
+            line = data[start:end]
+            entry = self.__parse(line) if line.endswith(b"\n") else None
+            if entry is not None:
+                break
+            end = start
+        if end < len(data):
+            self.logger.warning(
+                "Discarding %d bytes of partial journal entries in %s.", len(data) - end, path
+            )
+            with open(path, "r+b") as file:
+                file.truncate(end)
+                file.flush()
+                os.fsync(file.fileno())
+        return entry["offset"] + 1 if end > 0 else base
+
+    def __read_segment(self, base: int) -> Iterator[JournalEntry]:
+        try:
+            file = open(self.__segment_path(base), "rb")
+        except FileNotFoundError:
+            # Deleted by the retention.
+            return
+        with file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    # Being appended.
+                    return
+                entry = self.__parse(line)
+                if entry is None:
+                    self.logger.warning("Skipping corrupted journal entry in segment %d.", base)
+                    continue
+                yield entry
+
+    def __parse(self, line: bytes) -> Optional[JournalEntry]:
+        try:
+            entry = self.codec.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get("offset"), int):
+            return None
+        return entry
+
+    def __load_offsets(self) -> Dict[Text, int]:
+        path = os.path.join(self.directory, OFFSETS_FILE)
+        try:
+            with open(path, "rb") as file:
+                offsets = self.codec.loads(file.read())
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            offsets = None
+        if not isinstance(offsets, dict):
+            self.logger.warning("Ignoring unreadable journal offsets in %s.", path)
+            return {}
+        return {key: value for key, value in offsets.items() if isinstance(value, int)}
+
+    def __save_offsets(self):
+        """
+        Replace the offsets file atomically. Must be called while holding the lock.
+        """
+        path = os.path.join(self.directory, OFFSETS_FILE)
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(self.codec.dumps(self.__offsets))
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+        os.replace(temporary, path)
+        self.__offsets_dirty = False
+
+    def __segment_path(self, base: int) -> Text:
+        return os.path.join(self.directory, f"{base:020d}{SEGMENT_SUFFIX}")
+
+    def __segment_size(self, base: int) -> int:
+        try:
+            return os.path.getsize(self.__segment_path(base))
+        except FileNotFoundError:
+            return 0
+
+    def __segment_mtime(self, base: int) -> float:
+        try:
+            return os.path.getmtime(self.__segment_path(base))
+        except FileNotFoundError:
+            return 0.0
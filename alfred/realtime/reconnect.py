@@ -0,0 +1,139 @@
+# Native imports
+import random
+import threading
+import time
+from time import monotonic
+from typing import Callable, Iterator, Optional, Text, TypedDict
+
+__all__ = ["ReconnectConfiguration", "ConnectionStats", "ConnectionHealth", "backoff_delays"]
+
+
+class ReconnectConfiguration(TypedDict):
+    max_attempts: Optional[int]
+    initial_delay: Optional[float]
+    max_delay: Optional[float]
+    jitter: Optional[float]
+
+
+class ConnectionStats(TypedDict):
+    connected: bool
+    connects: int
+    disconnects: int
+    reconnects: int
+    reconnect_attempts: int
+    failed_attempts: int
+    last_connected_at: Optional[float]
+    last_disconnected_at: Optional[float]
+    last_error: Optional[Text]
+    downtime: float
+    backfilled_events: int
+
+
+def backoff_delays(
+    config: Optional[ReconnectConfiguration] = None,
+    rand: Callable[[], float] = random.random,
+) -> Iterator[float]:
+    """
+    Yield the time in seconds to wait before each reconnection attempt. The
+    delay doubles after every attempt up to `max_delay`, and is spread by up
+    to `jitter` of its value either way, so that clients dropped at the same
+    time do not all come back at once.
+
+    Args:
+    - config: Reconnection configuration.
+        - config.max_attempts: Number of attempts before giving up (default: no limit).
+        - config.initial_delay: Delay before the first attempt (default: 1).
+        - config.max_delay: Maximum delay between attempts (default: 30).
+        - config.jitter: Fraction of the delay to randomize, between 0 and 1 (default: 0.5).
+    - rand: Random number generator returning floats in [0, 1).
+    """
+    config = config or {}
+    max_attempts = config.get("max_attempts")
+    delay = config.get("initial_delay", 1.0)
+    max_delay = config.get("max_delay", 30.0)
+    jitter = min(max(config.get("jitter", 0.5), 0.0), 1.0)
+
+    attempt = 0
+    while max_attempts is None or attempt < max_attempts:
+        attempt += 1
+        yield min(delay, max_delay) * (1 - jitter + 2 * jitter * rand())
+        delay = min(delay * 2, max_delay)
+
+
+class ConnectionHealth:
+    """
+    Keeps track of the connections, disconnections and reconnection attempts
+    of a real-time client.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__stats: ConnectionStats = {
+            "connected": False,
+            "connects": 0,
+            "disconnects": 0,
+            "reconnects": 0,
+            "reconnect_attempts": 0,
+            "failed_attempts": 0,
+            "last_connected_at": None,
+            "last_disconnected_at": None,
+            "last_error": None,
+            "downtime": 0.0,
+            "backfilled_events": 0,
+        }
+        self.__disconnected_since: Optional[float] = None
+
+    def record_connect(self) -> bool:
+        """
+        Record a connection. Returns True if it is a reconnection.
+        """
+        with self.__lock:
+            stats = self.__stats
+            reconnected = stats["connects"] > 0
+            stats["connected"] = True
+            stats["connects"] += 1
+            stats["last_connected_at"] = time.time()
+            if reconnected:
+                stats["reconnects"] += 1
+            if self.__disconnected_since is not None:
+                stats["downtime"] += monotonic() - self.__disconnected_since
+                self.__disconnected_since = None
+            return reconnected
+
+    def record_disconnect(self, expected: bool = False):
+        """
+        Record a disconnection. Expected ones, requested by the client, do not
+        count towards the downtime.
+        """
+        with self.__lock:
+            if not self.__stats["connected"]:
+                return
+            self.__stats["connected"] = False
+            self.__stats["disconnects"] += 1
+            self.__stats["last_disconnected_at"] = time.time()
+            if not expected:
+                self.__disconnected_since = monotonic()
+
+    def record_attempt(self):
+        with self.__lock:
+            self.__stats["reconnect_attempts"] += 1
+
+    def record_failure(self, err: object):
+        with self.__lock:
+            self.__stats["failed_attempts"] += 1
+            self.__stats["last_error"] = str(err)
+
+    def record_backfill(self, count: int):
+        with self.__lock:
+            self.__stats["backfilled_events"] += count
+
+    def stats(self) -> ConnectionStats:
+        """
+        Get the connection counters. `downtime` is the time in seconds spent
+        disconnected since the first connection, including the current outage.
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            if self.__disconnected_since is not None:
+                stats["downtime"] += monotonic() - self.__disconnected_since
+            return stats
@@ -0,0 +1,193 @@
+# Native imports
+import itertools
+import threading
+from typing import Any, Callable, Dict, List, Optional, Text, Tuple
+
+# Project imports
+from alfred.utils.events import extract_entity_id
+
+__all__ = ["SubscriptionRouter", "Subscription"]
+
+
+class Subscription:
+    """
+    Handle of a callback subscribed to a real-time event. Call
+    `unsubscribe()` to stop receiving events.
+    """
+    __slots__ = ("router", "event", "callback", "job_id", "file_id", "order", "active")
+
+    def __init__(
+        self,
+        router: "SubscriptionRouter",
+        event: Text,
+        callback: Callable,
+        job_id: Optional[Text],
+        file_id: Optional[Text],
+        order: int,
+    ):
+        self.router = router
+        self.event = event
+        self.callback = callback
+        self.job_id = job_id
+        self.file_id = file_id
+        self.order = order
+        self.active = True
+
+    def unsubscribe(self):
+        """
+        Stop receiving events. Does nothing if already unsubscribed.
+        """
+        self.router.unsubscribe(self)
+
+    def matches(self, job_id: Optional[Text], file_id: Optional[Text]) -> bool:
+        """
+        Whether an event about the given Job and File is for this subscription.
+        """
+        return (self.job_id is None or self.job_id == job_id) and (
+            self.file_id is None or self.file_id == file_id
+        )
+
+    def __repr__(self) -> Text:
+        scope = "".join(
+            f", {name}={value!r}"
+            for name, value in (("job_id", self.job_id), ("file_id", self.file_id))
+            if value is not None
+        )
+        return f"Subscription({self.event!r}{scope})"
+
+
+class SubscriptionRouter:
+    """
+    Thread-safe registry of the callbacks subscribed to real-time events.
+
+    Each event can have any number of subscribers. Subscriptions scoped to a
+    Job or File are indexed by event and ID, so finding the subscribers of an
+    event costs O(matching subscribers) however many scoped subscriptions
+    are live.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__order = itertools.count()
+        # Ordered sets (dicts with None values) of subscriptions, per event
+        # for unscoped ones, and per event and ID for scoped ones. Those
+        # scoped to both a Job and a File are only indexed by Job.
+        self.__unscoped: Dict[Text, Dict[Subscription, None]] = {}
+        self.__by_job: Dict[Tuple[Text, Text], Dict[Subscription, None]] = {}
+        self.__by_file: Dict[Tuple[Text, Text], Dict[Subscription, None]] = {}
+        # Number of scoped subscriptions per event, to skip extracting IDs
+        # from the payloads of events without any.
+        self.__scoped_counts: Dict[Text, int] = {}
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return sum(
+                len(subscriptions)
+                for index in (self.__unscoped, self.__by_job, self.__by_file)
+                for subscriptions in index.values()
+            )
+
+    def subscribe(
+        self,
+        event: Text,
+        callback: Callable,
+        job_id: Optional[Text] = None,
+        file_id: Optional[Text] = None,
+    ) -> Subscription:
+        """
+        Subscribe a callback to an event.
+
+        Args:
+        - event: Event name.
+        - callback: Function called with the event payload.
+        - job_id: If set, only events about this Job are delivered.
+        - file_id: If set, only events about this File are delivered.
+        """
+        job_id = str(job_id) if job_id is not None else None
+        file_id = str(file_id) if file_id is not None else None
+        with self.__lock:
+            subscription = Subscription(
+                self, event, callback, job_id, file_id, next(self.__order)
+            )
+            index, key = self.__index_of(subscription)
+            index.setdefault(key, {})[subscription] = None
+            if job_id is not None or file_id is not None:
+                self.__scoped_counts[event] = self.__scoped_counts.get(event, 0) + 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Remove a subscription. Does nothing if it was already removed.
+        """
+        with self.__lock:
+            if not subscription.active:
+                return
+            subscription.active = False
+            index, key = self.__index_of(subscription)
+            subscriptions = index.get(key)
+            if subscriptions is None:
+                return
+            subscriptions.pop(subscription, None)
+            if not subscriptions:
+                del index[key]
+            if subscription.job_id is not None or subscription.file_id is not None:
+                count = self.__scoped_counts[subscription.event] - 1
+                if count:
+                    self.__scoped_counts[subscription.event] = count
+                else:
+                    del self.__scoped_counts[subscription.event]
+
+    def match(self, event: Text, data: Any) -> List[Subscription]:
+        """
+        Get the subscriptions an event must be delivered to, in subscription order.
+
+        Args:
+        - event: Event name.
+        - data: Event payload.
+        """
+        with self.__lock:
+            unscoped = self.__unscoped.get(event)
+            if event not in self.__scoped_counts:
+                return list(unscoped) if unscoped else []
+
+        job_id = extract_entity_id(data, "job")
+        file_id = extract_entity_id(data, "file")
+        with self.__lock:
+            groups = [
+                subscriptions
+                for subscriptions in (
+                    self.__unscoped.get(event),
+                    self.__by_job.get((event, job_id)) if job_id is not None else None,
+                    self.__by_file.get((event, file_id)) if file_id is not None else None,
+                )
+                if subscriptions
+            ]
+            matches = [
+                subscription
+                for subscriptions in groups
+                for subscription in subscriptions
+                if subscription.matches(job_id, file_id)
+            ]
+
+        if len(groups) > 1:
+            matches.sort(key=lambda subscription: subscription.order)
+        return matches
+
+    def clear(self):
+        """
+        Remove every subscription.
+        """
+        with self.__lock:
+            for index in (self.__unscoped, self.__by_job, self.__by_file):
+                for subscriptions in index.values():
+                    for subscription in subscriptions:
+                        subscription.active = False
+                index.clear()
+            self.__scoped_counts.clear()
+
+    def __index_of(self, subscription: Subscription) -> Tuple[Dict, Any]:
+        if subscription.job_id is not None:
+            return self.__by_job, (subscription.event, subscription.job_id)
+        if subscription.file_id is not None:
+            return self.__by_file, (subscription.event, subscription.file_id)
+        return self.__unscoped, subscription.event
@@ -0,0 +1,182 @@
+# Native imports
+import threading
+from collections import deque
+from time import monotonic
+from typing import Any, Callable, Deque, Iterator, List, Optional, Text, TypedDict, Union
+
+__all__ = ["EventStream", "RealTimeEvent", "STREAM_OVERFLOW_POLICIES"]
+
+# What `put` does with an event when the buffer is full:
+# - "block": wait until the consumer takes events. Events received meanwhile
+#   wait in the real-time client's intake queue, which is not bounded.
+# - "drop_oldest": discard the oldest buffered event.
+STREAM_OVERFLOW_POLICIES = ("block", "drop_oldest")
+
+
+class RealTimeEvent(TypedDict):
+    event: Text
+    data: Any
+
+
+class EventStream:
+    """
+    Bounded buffer of real-time events, consumed by iterating over it.
+
+    Iteration yields events one at a time or, if `batch_size` is set, in
+    lists of up to `batch_size` events. It blocks until events arrive and ends
+    once the stream is closed and drained.
+
+    Usage:
+        with realtime_client.events([JobEvent.JOB_FINISHED_EVENT], batch_size=50) as stream:
+            for batch in stream:
+                ...
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        batch_size: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        overflow: Text = "block",
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Args:
+        - max_size: Maximum number of buffered events.
+        - batch_size: If set, iteration yields lists of up to this many events.
+        - max_wait: Maximum time in seconds to wait for a batch to fill up once
+          its first event is available. By default, batches hold the events
+          already buffered.
+        - overflow: What to do with events received while the buffer is full,
+          one of `STREAM_OVERFLOW_POLICIES`.
+        - on_close: Function called when the stream is closed.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if overflow not in STREAM_OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow must be one of {', '.join(STREAM_OVERFLOW_POLICIES)}, got {overflow!r}"
+            )
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.overflow = overflow
+        self.on_close = on_close
+        self.dropped = 0
+
+        self.__buffer: Deque[RealTimeEvent] = deque()
+        self.__closed = False
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+
+    def __len__(self) -> int:
+        return len(self.__buffer)
+
+    def __enter__(self) -> "EventStream":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    def put(self, event: Text, data: Any) -> bool:
+        """
+        Buffer an event. Returns False if the stream is closed.
+        """
+        with self.__lock:
+            while not self.__closed and len(self.__buffer) >= self.max_size:
+                if self.overflow == "drop_oldest":
+                    self.__buffer.popleft()
+                    self.dropped += 1
+                else:
+                    self.__not_full.wait()
+            if self.__closed:
+                return False
+
+            self.__buffer.append({"event": event, "data": data})
+            self.__not_empty.notify()
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[RealTimeEvent]:
+        """
+        Take the next event. Returns None if no event arrived within `timeout`
+        seconds, or if the stream is closed and drained.
+        """
+        events = self.get_batch(1, timeout=timeout)
+        return events[0] if events else None
+
+    def get_batch(
+        self,
+        batch_size: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> List[RealTimeEvent]:
+        """
+        Take up to `batch_size` events. Returns an empty list if no event
+        arrived within `timeout` seconds, or if the stream is closed and drained.
+
+        Args:
+        - batch_size: Maximum number of events (default: the stream's `batch_size`, or 1).
+        - max_wait: Maximum time in seconds to wait for the batch to fill up
+          once its first event is available (default: the stream's `max_wait`).
+        - timeout: Maximum time in seconds to wait for the first event
+          (default: no limit).
+        """
+        batch_size = batch_size or self.batch_size or 1
+        max_wait = self.max_wait if max_wait is None else max_wait
+
+        with self.__lock:
+            if not self.__wait(lambda: self.__buffer or self.__closed, timeout):
+                return []
+
+            if max_wait:
+                self.__wait(lambda: len(self.__buffer) >= batch_size or self.__closed, max_wait)
+
+            count = min(batch_size, len(self.__buffer))
+            events = [self.__buffer.popleft() for _ in range(count)]
+            if events:
+                self.__not_full.notify_all()
+            return events
+
+    def __iter__(self) -> Iterator[Union[RealTimeEvent, List[RealTimeEvent]]]:
+        while True:
+            events = self.get_batch()
+            if not events:
+                return
+            if self.batch_size is None:
+                yield events[0]
+            else:
+                yield events
+
+    def close(self):
+        """
+        Stop buffering events. Iteration ends once the buffered events are consumed.
+        """
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__not_empty.notify_all()
+            self.__not_full.notify_all()
+
+        if self.on_close is not None:
+            self.on_close()
+
+    def __wait(self, predicate: Callable[[], Any], timeout: Optional[float]) -> bool:
+        """
+        Wait for events until `predicate()` is true. Must be called while
+        holding the lock.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        while not predicate():
+            remaining = None if deadline is None else deadline - monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            self.__not_empty.wait(remaining)
+        return True
@@ -1,15 +1,24 @@
 # Native imports
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 # Project imports
 from alfred.base.config import ConfigurationDict
 from alfred.http.http_client import HttpClient
+from alfred.base.constants import FileEvent, JobEvent
 from alfred.http.typed import AuthConfiguration, HttpConfiguration
+from alfred.rest.cache import CacheConfiguration, ResponseCache
 from alfred.rest.data_points import DataPointsBase, DataPointsFactory
 from alfred.rest.sessions import SessionsBase, SessionsFactory
 from alfred.rest.jobs import JobsBase, JobsFactory
 from alfred.rest.files import FilesBase, FilesFactory
 
+if TYPE_CHECKING:
+    from alfred.http.async_http_client import AsyncHttpClient
+    from alfred.rest.data_points.async_v1 import AsyncDataPoints
+    from alfred.rest.sessions.async_v1 import AsyncSessions
+    from alfred.rest.jobs.async_v1 import AsyncJobs
+    from alfred.rest.files.async_v1 import AsyncFiles
+
 
 class AlfredClient:
     __DEFAULT_HTTP_CONFIG: HttpConfiguration = {
@@ -24,7 +33,25 @@ class AlfredClient:
         auth_config: AuthConfiguration,
         http_config: HttpConfiguration = None,
         http_client: HttpClient = None,
+        cache_config: Optional[CacheConfiguration] = None,
+        response_models: bool = False,
+        lazy_jobs: bool = False,
     ) -> None:
+        """
+        Args:
+        - config: Client configuration.
+        - auth_config: Authentication configuration.
+        - http_config: HTTP client configuration.
+        - http_client: HTTP client to use instead of creating one.
+        - cache_config: If set, `files.get`, `jobs.get`, `sessions.get` and
+          `data_points.get_values` responses are cached in-process. See `ResponseCache`.
+        - response_models: If True, file details, jobs and sessions are returned
+          as compact, read-only models (see `alfred.rest.models`) instead of
+          dicts. Call `to_dict()` on a model to get a dict back.
+        - lazy_jobs: If True, jobs are returned as read-only views over the
+          parsed responses, with their metadata decoded on first access,
+          instead of normalized copies. See `JobView`.
+        """
         # Initialize HTTP client
         self.config = config
         http_config = http_config or self.__DEFAULT_HTTP_CONFIG
@@ -32,18 +59,26 @@ class AlfredClient:
             config.get("base_url"), auth_config, http_config
         )
 
+        # Initialize response cache (if any)
+        self.cache: Optional[ResponseCache] = None
+        if cache_config is not None:
+            self.cache = ResponseCache(cache_config)
+
+        self.response_models = response_models
+        self.lazy_jobs = lazy_jobs
+
         # Domain properties
         self._data_points: Optional[DataPointsBase] = None
         self._sessions: Optional[SessionsBase] = None
         self._jobs: Optional[JobsBase] = None
         self._files: Optional[FilesBase] = None
 
-    def __get_domain_by_version(self, factory):
+    def __get_domain_by_version(self, factory, **options):
         """
         Get domain instance based on specified version.
         """
         version = self.config.get("version")
-        return factory.create(version, self.http_client)
+        return factory.create(version, self.http_client, cache=self.cache, **options)
 
     @property
     def data_points(self) -> "DataPointsBase":
@@ -61,7 +96,9 @@ class AlfredClient:
         Access the Sessions domain.
         """
         if self._sessions is None:
-            self._sessions = self.__get_domain_by_version(SessionsFactory)
+            self._sessions = self.__get_domain_by_version(
+                SessionsFactory, models=self.response_models
+            )
 
         return self._sessions
 
@@ -71,12 +108,131 @@ class AlfredClient:
         Access the Jobs domain.
         """
         if self._jobs is None:
-            self._jobs = self.__get_domain_by_version(JobsFactory)
+            self._jobs = self.__get_domain_by_version(
+                JobsFactory, models=self.response_models, lazy=self.lazy_jobs
+            )
 
         return self._jobs
 
     @property
     def files(self) -> "FilesBase":
+        """
+        Access the Files domain.
+        """
+        if self._files is None:
+            self._files = self.__get_domain_by_version(
+                FilesFactory, models=self.response_models
+            )
+
+        return self._files
+
+    def bind_realtime(self, realtime_client):
+        """
+        Use real-time events to complete `jobs.wait` without polling and, if the
+        cache is enabled, to evict cached Files and Jobs as soon as they change.
+
+        Args:
+        - realtime_client: Connected `AlfredRealTimeClient`.
+        """
+        self.jobs.bind_realtime(realtime_client)
+
+        if self.cache is None:
+            return
+
+        realtime_client.on_file_event(self.cache.handle_event)
+        realtime_client.on_job_event(self.cache.handle_event)
+        for event in (*FileEvent, *JobEvent):
+            realtime_client.on(event.value, self.cache.handle_event)
+
+
+class AsyncAlfredClient:
+    """
+    Asyncio counterpart of `AlfredClient`. Every domain method is awaitable,
+    so a single event loop can hold many in-flight requests.
+
+    Use it as an async context manager, or call `close()` when done, to
+    release the underlying connection pool.
+    """
+    __DEFAULT_HTTP_CONFIG: HttpConfiguration = {
+        "max_retries": 3,
+        "pool_connections": True,
+        "timeout": 5,
+    }
+
+    def __init__(
+        self,
+        config: ConfigurationDict,
+        auth_config: AuthConfiguration,
+        http_config: HttpConfiguration = None,
+        http_client: "AsyncHttpClient" = None,
+    ) -> None:
+        # The asyncio client pulls in asyncio and aiohttp: import it on first use.
+        from alfred.http.async_http_client import AsyncHttpClient  # pylint: disable=C0415
+
+        # Initialize HTTP client
+        self.config = config
+        http_config = http_config or self.__DEFAULT_HTTP_CONFIG
+        self.http_client = http_client or AsyncHttpClient(
+            config.get("base_url"), auth_config, http_config
+        )
+
+        # Domain properties
+        self._data_points: Optional["AsyncDataPoints"] = None
+        self._sessions: Optional["AsyncSessions"] = None
+        self._jobs: Optional["AsyncJobs"] = None
+        self._files: Optional["AsyncFiles"] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the underlying HTTP client.
+        """
+        await self.http_client.close()
+
+    def __get_domain_by_version(self, factory):
+        """
+        Get asyncio domain instance based on specified version.
+        """
+        version = self.config.get("version")
+        return factory.create_async(version, self.http_client)
+
+    @property
+    def data_points(self) -> "AsyncDataPoints":
+        """
+        Access the Data Points domain.
+        """
+        if self._data_points is None:
+            self._data_points = self.__get_domain_by_version(DataPointsFactory)
+
+        return self._data_points
+
+    @property
+    def sessions(self) -> "AsyncSessions":
+        """
+        Access the Sessions domain.
+        """
+        if self._sessions is None:
+            self._sessions = self.__get_domain_by_version(SessionsFactory)
+
+        return self._sessions
+
+    @property
+    def jobs(self) -> "AsyncJobs":
+        """
+        Access the Jobs domain.
+        """
+        if self._jobs is None:
+            self._jobs = self.__get_domain_by_version(JobsFactory)
+
+        return self._jobs
+
+    @property
+    def files(self) -> "AsyncFiles":
         """
         Access the Files domain.
         """
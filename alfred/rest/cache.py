@@ -0,0 +1,322 @@
+# Native imports
+import sys
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Dict, Optional, Text, Tuple, TypedDict
+
+# Project imports
+from alfred.utils.events import extract_entity_id
+
+__all__ = ["ResponseCache", "CacheConfiguration", "CacheStats", "CacheDomainStats"]
+
+# Default time to live in seconds of each cached domain.
+DEFAULT_TTLS: Dict[Text, float] = {
+    "files": 60,
+    "jobs": 10,
+    "sessions": 30,
+    "data_points": 60,
+}
+
+# Domains whose entries are keyed by File ID, Job ID or Session ID.
+FILE_DOMAINS = ("files", "data_points")
+JOB_DOMAINS = ("jobs",)
+SESSION_DOMAINS = ("sessions",)
+
+
+class CacheConfiguration(TypedDict):
+    ttl: Optional[float]
+    ttls: Optional[Dict[Text, float]]
+    max_entries: Optional[int]
+    max_bytes: Optional[int]
+
+
+class CacheDomainStats(TypedDict):
+    hits: int
+    misses: int
+
+
+class CacheStats(TypedDict):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    entries: int
+    size: int
+    domains: Dict[Text, CacheDomainStats]
+
+
+class ResponseCache:
+    """
+    Thread-safe in-process cache of API responses, with a time to live per
+    domain and least-recently-used eviction once the entry or size cap is
+    reached.
+
+    Cached responses are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(
+        self,
+        config: Optional[CacheConfiguration] = None,
+        clock: Callable[[], float] = monotonic,
+    ):
+        """
+        Args:
+        - config: Cache configuration.
+            - config.ttl: Time to live in seconds of the domains missing from
+            `ttls` (default: 30).
+            - config.ttls: Time to live in seconds per domain ("files", "jobs",
+            "sessions" and "data_points"). Set a domain to 0 to disable its cache.
+            Defaults: files 60, jobs 10, sessions 30, data_points 60.
+            - config.max_entries: Maximum number of cached responses (default: 1024).
+            - config.max_bytes: Maximum estimated size in bytes of the cached
+            responses (default: unlimited).
+        - clock: Monotonic clock in seconds.
+        """
+        config = config or {}
+        self.ttl = config.get("ttl", 30)
+        self.ttls = {**DEFAULT_TTLS, **(config.get("ttls") or {})}
+        self.max_entries = config.get("max_entries", 1024)
+        self.max_bytes = config.get("max_bytes")
+        if self.max_entries <= 0:
+            raise ValueError(f"Max entries ({self.max_entries}) cannot be zero or less.")
+
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        # (domain, key) -> (value, expires at, estimated size), oldest first.
+        self.__entries: "OrderedDict[Tuple[Text, Text], Tuple[Any, float, int]]" = OrderedDict()
+        self.__size = 0
+        # Bumped on every invalidation, so responses loaded before an
+        # invalidation are not cached after it.
+        self.__epoch = 0
+        self.__domain_stats: Dict[Text, CacheDomainStats] = {}
+        self.__evictions = 0
+        self.__expirations = 0
+        self.__invalidations = 0
+
+    def get_ttl(self, domain: Text) -> float:
+        """
+        Get the time to live in seconds of a domain.
+
+        Args:
+        - domain: Domain name.
+        """
+        return self.ttls.get(domain, self.ttl)
+
+    def get_or_load(self, domain: Text, key: Text, loader: Callable[[], Any]) -> Any:
+        """
+        Get a cached response, or load and cache it on a miss.
+
+        Args:
+        - domain: Domain name.
+        - key: Entity ID.
+        - loader: Function fetching the response from the API.
+        """
+        if self.get_ttl(domain) <= 0:
+            return loader()
+
+        with self.__lock:
+            found, value = self.__lookup(domain, key)
+            epoch = self.__epoch
+        if found:
+            return value
+
+        value = loader()
+        self.set(domain, key, value, epoch)
+        return value
+
+    def get(self, domain: Text, key: Text, default: Any = None) -> Any:
+        """
+        Get a cached response.
+
+        Args:
+        - domain: Domain name.
+        - key: Entity ID.
+        - default: Value returned on a miss.
+        """
+        with self.__lock:
+            found, value = self.__lookup(domain, key)
+        return value if found else default
+
+    def set(self, domain: Text, key: Text, value: Any, epoch: Optional[int] = None):
+        """
+        Cache a response.
+
+        Args:
+        - domain: Domain name.
+        - key: Entity ID.
+        - value: Response to cache.
+        - epoch: Value of `epoch` when the response was requested. The response
+          is dropped if the cache was invalidated since.
+        """
+        ttl = self.get_ttl(domain)
+        if ttl <= 0:
+            return
+
+        size = estimate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self.__lock:
+            if epoch is not None and epoch != self.__epoch:
+                return
+            self.__remove((domain, key))
+            self.__entries[(domain, key)] = (value, self.__clock() + ttl, size)
+            self.__size += size
+            self.__evict()
+
+    @property
+    def epoch(self) -> int:
+        """
+        Counter bumped on every invalidation.
+        """
+        return self.__epoch
+
+    def invalidate(self, domain: Optional[Text] = None, key: Optional[Text] = None):
+        """
+        Evict cached responses.
+
+        Args:
+        - domain: Domain to evict. If omitted, every domain is evicted.
+        - key: Entity ID to evict. If omitted, the whole domain is evicted.
+        """
+        with self.__lock:
+            self.__epoch += 1
+            self.__invalidations += 1
+            if domain is not None and key is not None:
+                self.__remove((domain, key))
+                return
+
+            for entry in list(self.__entries):
+                if domain is None or entry[0] == domain:
+                    self.__remove(entry)
+
+    def invalidate_file(self, file_id: Text):
+        """
+        Evict the cached details and Data Point values of a File.
+
+        Args:
+        - file_id: Unique identifier of the File.
+        """
+        for domain in FILE_DOMAINS:
+            self.invalidate(domain, file_id)
+
+    def invalidate_job(self, job_id: Text):
+        """
+        Evict the cached details of a Job.
+
+        Args:
+        - job_id: Unique identifier of the Job.
+        """
+        for domain in JOB_DOMAINS:
+            self.invalidate(domain, job_id)
+
+    def invalidate_session(self, session_id: Text):
+        """
+        Evict the cached details of a Session.
+
+        Args:
+        - session_id: Unique identifier of the Session.
+        """
+        for domain in SESSION_DOMAINS:
+            self.invalidate(domain, session_id)
+
+    def handle_event(self, data: Any):
+        """
+        Evict the File, Job and Session referenced by a real-time event. Meant
+        to be subscribed to `AlfredRealTimeClient` File and Job events.
+
+        Args:
+        - data: Event payload.
+        """
+        file_id = extract_entity_id(data, "file")
+        if file_id:
+            self.invalidate_file(file_id)
+
+        job_id = extract_entity_id(data, "job")
+        if job_id:
+            self.invalidate_job(job_id)
+
+        session_id = extract_entity_id(data, "session")
+        if session_id:
+            self.invalidate_session(session_id)
+
+    def clear(self):
+        """
+        Evict every cached response.
+        """
+        self.invalidate()
+
+    def stats(self) -> CacheStats:
+        """
+        Get the cache counters.
+        """
+        with self.__lock:
+            domains = {
+                domain: {"hits": stats["hits"], "misses": stats["misses"]}
+                for domain, stats in self.__domain_stats.items()
+            }
+            return {
+                "hits": sum(stats["hits"] for stats in domains.values()),
+                "misses": sum(stats["misses"] for stats in domains.values()),
+                "evictions": self.__evictions,
+                "expirations": self.__expirations,
+                "invalidations": self.__invalidations,
+                "entries": len(self.__entries),
+                "size": self.__size,
+                "domains": domains,
+            }
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __lookup(self, domain: Text, key: Text) -> Tuple[bool, Any]:
+        stats = self.__domain_stats.setdefault(domain, {"hits": 0, "misses": 0})
+        entry = self.__entries.get((domain, key))
+        if entry is not None and entry[1] <= self.__clock():
+            self.__remove((domain, key))
+            self.__expirations += 1
+            entry = None
+
+        if entry is None:
+            stats["misses"] += 1
+            return False, None
+
+        self.__entries.move_to_end((domain, key))
+        stats["hits"] += 1
+        return True, entry[0]
+
+    def __remove(self, entry_key: Tuple[Text, Text]):
+        entry = self.__entries.pop(entry_key, None)
+        if entry is not None:
+            self.__size -= entry[2]
+
+    def __evict(self):
+        while len(self.__entries) > self.max_entries or (
+            self.max_bytes is not None and self.__size > self.max_bytes
+        ):
+            _, (_, _, size) = self.__entries.popitem(last=False)
+            self.__size -= size
+            self.__evictions += 1
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint in bytes of a JSON-like value.
+
+    Args:
+    - value: Dictionaries, lists and scalars.
+    """
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return size
@@ -4,11 +4,23 @@ from .v1 import DataPoints as V1
 
 class DataPointsFactory:
     @staticmethod
-    def create(version: int, http_client):
+    def create(version: int, http_client, **options):
         """
         Instance of Data Points class
         """
         if version == 1:
-            return V1(http_client)
+            return V1(http_client, **options)
+
+        raise Exception("Unsupported version for the specified domain.")
+
+    @staticmethod
+    def create_async(version: int, http_client):
+        """
+        Instance of asyncio Data Points class
+        """
+        if version == 1:
+            # Imported on first use, as it pulls in asyncio.
+            from .async_v1 import AsyncDataPoints  # pylint: disable=C0415
+            return AsyncDataPoints(http_client)
 
         raise Exception("Unsupported version for the specified domain.")
@@ -0,0 +1,23 @@
+# Native imports
+from typing import Text
+
+# Project imports
+from alfred.http.async_http_client import AsyncHttpClient
+
+
+class AsyncDataPoints:
+    """
+    Asyncio counterpart of the V1 Data Points domain. Every method is awaitable.
+    """
+    def __init__(self, http_client: AsyncHttpClient):
+        self.http_client = http_client
+
+    async def get_values(self, file_id: Text):
+        """
+        Fetches Data Point values for a specific File by its ID.
+
+        Args:
+        - file_id: Unique identifier of the File.
+        """
+        parsed_resp, _ = await self.http_client.get(f"/api/values/file/{file_id}")
+        return parsed_resp
@@ -1,14 +1,16 @@
 # Native imports
-from typing import Text
+from typing import Optional, Text
 
 # Project imports
 from alfred.http.http_client import HttpClient
+from alfred.rest.cache import ResponseCache
 from alfred.rest.data_points.base import DataPointsBase
 
 
 class DataPoints(DataPointsBase):
-    def __init__(self, http_client: HttpClient):
+    def __init__(self, http_client: HttpClient, cache: Optional[ResponseCache] = None):
         self.http_client = http_client
+        self.cache = cache
 
     def get_values(self, file_id: Text):
         """
@@ -17,5 +19,12 @@ class DataPoints(DataPointsBase):
         Args:
         - file_id: Unique identifier of the File.
         """
+        if self.cache is not None:
+            return self.cache.get_or_load(
+                "data_points", file_id, lambda: self.__get_values(file_id)
+            )
+        return self.__get_values(file_id)
+
+    def __get_values(self, file_id: Text):
         parsed_resp, _ = self.http_client.get(f"/api/values/file/{file_id}")
         return parsed_resp
@@ -5,11 +5,23 @@ from .v1 import Files as V1
 
 class FilesFactory:
     @staticmethod
-    def create(version: int, http_client):
+    def create(version: int, http_client, **options):
         """
         Create Files domain instance based on specified version.
         """
         if version == 1:
-            return V1(http_client)
+            return V1(http_client, **options)
+        else:
+            raise ValueError(f"Unsupported version: {version}")
+
+    @staticmethod
+    def create_async(version: int, http_client):
+        """
+        Create asyncio Files domain instance based on specified version.
+        """
+        if version == 1:
+            # Imported on first use, as it pulls in asyncio.
+            from .async_v1 import AsyncFiles  # pylint: disable=C0415
+            return AsyncFiles(http_client)
         else:
             raise ValueError(f"Unsupported version: {version}")
@@ -0,0 +1,228 @@
+# Native imports
+import os
+from io import BytesIO
+from typing import Any, Dict, Optional, Text, Tuple
+
+# Project imports
+from alfred.http.async_http_client import AsyncHttpClient
+from alfred.http.codec import get_json_codec
+from alfred.http.multipart import MultipartEncoder
+from .typed import (
+    UploadLocalFilePayload,
+    UploadLocalPathPayload,
+    UploadRemoteFilePayload,
+    UploadResponse,
+    DownloadResponse,
+    DownloadDestination,
+    DownloadToResponse,
+    StreamingDownloadResponse,
+    FileDetailsResponse,
+)
+from .utils import (
+    DEFAULT_CHUNK_SIZE,
+    DownloadSink,
+    build_file_form,
+    build_upload_form,
+    extract_filename,
+)
+
+
+class AsyncFiles:
+    """
+    Asyncio counterpart of the V1 Files domain. Every method is awaitable.
+    """
+    def __init__(self, http_client: AsyncHttpClient):
+        self.http_client = http_client
+        self.json_codec = get_json_codec(getattr(http_client, "json_codec", None))
+
+    async def get(self, file_id: Text) -> FileDetailsResponse:
+        """
+        Fetch file details by ID.
+
+        Args:
+        - file_id: Unique identifier of the File.
+        """
+        parsed_resp, _ = await self.http_client.get(f"/api/file/detail/{file_id}")
+        return parsed_resp
+
+    async def download(self, file_id: Text) -> DownloadResponse:
+        """
+        Download file by ID. Returns an object with a binary
+        of the file, along with its name and mime type.
+
+        Args:
+        - file_id: Unique identifier of the File.
+        """
+        _, response = await self.http_client.get(f"/api/file/download/{file_id}")
+        file = BytesIO(await response.read())
+        mime_type = response.headers.get("Content-Type")
+        original_name = extract_filename(response.headers.get("Content-Disposition"))
+
+        return {
+            "file": file,
+            "mime_type": mime_type,
+            "original_name": original_name,
+        }
+
+    async def iter_download(
+        self, file_id: Text, chunk_size: int = None
+    ) -> StreamingDownloadResponse:
+        """
+        Download file by ID without buffering it in memory. Returns an object
+        with an async iterator over the chunks of the file, along with its
+        name and mime type. The connection is released once the iterator is
+        exhausted or closed.
+
+        Args:
+        - file_id: Unique identifier of the File.
+        - chunk_size: Size in bytes of each chunk read from the network.
+        """
+        _, download = await self.__stream_download(file_id, chunk_size)
+        return download
+
+    async def download_to(
+        self,
+        file_id: Text,
+        destination: DownloadDestination,
+        chunk_size: int = None,
+    ) -> DownloadToResponse:
+        """
+        Stream a file by ID into a path, directory or writable binary file,
+        using bounded memory.
+
+        Args:
+        - file_id: Unique identifier of the File.
+        - destination: File path, existing directory (the original file name
+          is used) or writable binary file object.
+        - chunk_size: Size in bytes of each chunk read from the network.
+        """
+        response, download = await self.__stream_download(file_id, chunk_size)
+
+        # The response is released here, and not by the chunks iterator, as
+        # the iterator never starts if the sink cannot be opened.
+        try:
+            with DownloadSink(
+                destination, download.get("original_name"), file_id
+            ) as sink:
+                async for chunk in download.get("chunks"):
+                    sink.write(chunk)
+        finally:
+            response.release()
+
+        return {
+            "path": sink.path,
+            "mime_type": download.get("mime_type"),
+            "original_name": download.get("original_name"),
+            "size": sink.size,
+        }
+
+    async def upload(self, payload: UploadRemoteFilePayload) -> UploadResponse:
+        """
+        Upload a remote file (URL or blob).
+
+        Args:
+        - payload: Payload with remote file details and Alfred's properties.
+        """
+        parsed_resp, _ = await self.http_client.post("/api/file/upload", data=payload)
+        return parsed_resp
+
+    async def upload_file(
+        self, payload: UploadLocalFilePayload, stream: bool = False
+    ) -> UploadResponse:
+        """
+        Upload a local file.
+
+        Args:
+        - payload: Payload with the local file and Alfred's properties.
+        - stream: If True, the multipart body is streamed from the file in
+          chunks instead of being built in memory. The file must be seekable.
+        """
+        files, data = build_upload_form(payload, self.json_codec)
+        return await self.__post_upload(files, data, stream)
+
+    async def upload_path(self, payload: UploadLocalPathPayload) -> UploadResponse:
+        """
+        Upload a local file by its path. The file is streamed from disk in
+        chunks, so memory usage does not grow with the file size.
+
+        Args:
+        - payload: Payload with the path of the local file and Alfred's properties.
+        """
+        path = os.fspath(payload.get("path"))
+
+        with open(path, "rb") as file:
+            files, data = build_file_form(
+                file,
+                payload.get("filename") or os.path.basename(path),
+                payload.get("session_id"),
+                payload.get("metadata", {}),
+                self.json_codec,
+            )
+            return await self.__post_upload(files, data, stream=True)
+
+    async def __post_upload(
+        self, files: Dict[str, Any], data: Dict[str, Any], stream: bool
+    ) -> UploadResponse:
+        """
+        Send a local file upload request.
+
+        Args:
+        - files: Multipart files.
+        - data: Multipart form fields.
+        - stream: If True, stream the body through a MultipartEncoder.
+        """
+        if stream:
+            encoder = MultipartEncoder(data, files)
+            parsed_response, _ = await self.http_client.post(
+                "/api/file/uploadfile",
+                data=encoder,
+                headers={"Content-Type": encoder.content_type},
+            )
+        else:
+            parsed_response, _ = await self.http_client.post(
+                "/api/file/uploadfile",
+                data=data,
+                files=files
+            )
+
+        return parsed_response
+
+    async def __stream_download(
+        self, file_id: Text, chunk_size: Optional[int] = None
+    ) -> Tuple[Any, StreamingDownloadResponse]:
+        """
+        Request a file by ID without reading its body.
+        Returns a tuple of (response, download).
+
+        Args:
+        - file_id: Unique identifier of the File.
+        - chunk_size: Size in bytes of each chunk read from the network.
+        """
+        _, response = await self.http_client.get(
+            f"/api/file/download/{file_id}", stream=True
+        )
+
+        return response, {
+            "chunks": self.__iter_chunks(response, chunk_size or DEFAULT_CHUNK_SIZE),
+            "mime_type": response.headers.get("Content-Type"),
+            "original_name": extract_filename(
+                response.headers.get("Content-Disposition")
+            ),
+            "content_length": response.content_length,
+        }
+
+    @staticmethod
+    async def __iter_chunks(response, chunk_size: int):
+        """
+        Yield the body of a streamed response in chunks, releasing the
+        connection once done.
+
+        Args:
+        - response: Streamed aiohttp response.
+        - chunk_size: Size in bytes of each chunk.
+        """
+        try:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+        finally:
+            response.release()
@@ -1,13 +1,22 @@
 # Native imports
-from typing import Text
+import threading
+from typing import Callable, Iterable, Iterator, List, Optional, Text
 from abc import ABC, abstractmethod
 
 # Project imports
 from .typed import (
     UploadLocalFilePayload,
+    UploadLocalPathPayload,
     UploadRemoteFilePayload,
     UploadResponse,
+    UploadManyItem,
+    UploadManyResult,
+    GetManyResult,
+    DownloadManyResult,
     DownloadResponse,
+    DownloadDestination,
+    DownloadToResponse,
+    StreamingDownloadResponse,
     FileDetailsResponse,
 )
 
@@ -32,6 +41,39 @@ class FilesBase(ABC):
         - file_id: Unique identifier of the Job.
         """
 
+    @abstractmethod
+    def iter_download(
+        self, file_id: Text, chunk_size: int = None
+    ) -> StreamingDownloadResponse:
+        """
+        Download file by ID without buffering it in memory. Returns an object
+        with an iterator over the chunks of the file, along with its name
+        and mime type. The connection is released once the iterator is
+        exhausted or closed.
+
+        Args:
+        - file_id: Unique identifier of the File.
+        - chunk_size: Size in bytes of each chunk read from the network.
+        """
+
+    @abstractmethod
+    def download_to(
+        self,
+        file_id: Text,
+        destination: DownloadDestination,
+        chunk_size: int = None,
+    ) -> DownloadToResponse:
+        """
+        Stream a file by ID into a path, directory or writable binary file,
+        using bounded memory.
+
+        Args:
+        - file_id: Unique identifier of the File.
+        - destination: File path, existing directory (the original file name
+          is used) or writable binary file object.
+        - chunk_size: Size in bytes of each chunk read from the network.
+        """
+
     @abstractmethod
     def upload(self, payload: UploadRemoteFilePayload) -> UploadResponse:
         """
@@ -42,10 +84,97 @@ class FilesBase(ABC):
         """
 
     @abstractmethod
-    def upload_file(self, payload: UploadLocalFilePayload) -> UploadResponse:
+    def upload_file(
+        self, payload: UploadLocalFilePayload, stream: bool = False
+    ) -> UploadResponse:
         """
         Upload a local file.
 
         Args:
         - payload: Payload with the local file and Alfred's properties.
+        - stream: If True, the multipart body is streamed from the file in
+          chunks instead of being built in memory. The file must be seekable.
+        """
+
+    @abstractmethod
+    def upload_path(self, payload: UploadLocalPathPayload) -> UploadResponse:
+        """
+        Upload a local file by its path. The file is streamed from disk in
+        chunks, so memory usage does not grow with the file size.
+
+        Args:
+        - payload: Payload with the path of the local file and Alfred's properties.
+        """
+
+    @abstractmethod
+    def upload_many(
+        self,
+        items: Iterable[UploadManyItem],
+        session_id: Optional[Text] = None,
+        metadata: Optional[dict] = None,
+        max_workers: Optional[int] = None,
+        on_progress: Optional[Callable[[int, UploadManyResult], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[UploadManyResult]:
+        """
+        Upload many local files concurrently, on a bounded pool of workers
+        sharing the client's connection pool and rate limit throttling.
+        Files are streamed from disk. A failing upload does not stop the
+        others: its error is reported in its result instead.
+
+        Args:
+        - items: Iterable of `UploadLocalFilePayload`, `UploadLocalPathPayload`
+          or bare file paths. Can be a generator.
+        - session_id: Session used for bare file paths.
+        - metadata: Metadata used for bare file paths.
+        - max_workers: Maximum number of concurrent uploads (default: size of
+          the HTTP connection pool).
+        - on_progress: Callback invoked with (completed count, result) after
+          each upload.
+        - cancel_event: When set, no further uploads are started.
+        """
+
+    @abstractmethod
+    def get_many(
+        self,
+        file_ids: Iterable[Text],
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[GetManyResult]:
+        """
+        Fetch the details of many files concurrently. Results are yielded as
+        soon as each request completes, not in input order. A failed request
+        does not stop the others: its error is reported in its result instead.
+
+        Args:
+        - file_ids: Iterable of File IDs. Can be a generator.
+        - max_workers: Maximum number of concurrent requests (default: size of
+          the HTTP connection pool).
+        - cancel_event: When set, no further requests are started.
+        """
+
+    @abstractmethod
+    def download_many(
+        self,
+        file_ids: Iterable[Text],
+        dest_dir: Text,
+        max_workers: Optional[int] = None,
+        chunk_size: int = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[DownloadManyResult]:
+        """
+        Stream many files to a directory concurrently. Each file is stored
+        under its original name (or its ID when the server does not report
+        one). Files sharing a name get a " (n)" suffix, such as
+        "scan (1).pdf"; the path of each file is in its result. Existing
+        files are overwritten. Results are yielded as soon as each download
+        completes, not in input order.
+
+        Args:
+        - file_ids: Iterable of File IDs. Can be a generator.
+        - dest_dir: Existing directory where files are stored.
+        - max_workers: Maximum number of concurrent downloads (default: size of
+          the HTTP connection pool).
+        - chunk_size: Size in bytes of each chunk read from the network.
+        - cancel_event: When set, no further downloads are started.
         """
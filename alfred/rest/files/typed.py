@@ -1,6 +1,10 @@
 # Native imports
 from io import BufferedReader, BytesIO
-from typing import Dict, List, TypedDict, Optional, Union
+from os import PathLike
+from typing import BinaryIO, Dict, Iterator, List, TypedDict, Optional, Union
+
+# Destination of a streamed download: a file path, a directory or a writable binary file.
+DownloadDestination = Union[str, PathLike, BinaryIO]
 
 
 class UploadRemoteFilePayload(TypedDict):
@@ -23,6 +27,13 @@ class UploadLocalFilePayload(TypedDict):
     metadata: Optional[Dict]
 
 
+class UploadLocalPathPayload(TypedDict):
+    path: Union[str, PathLike]
+    filename: Optional[str]
+    session_id: str
+    metadata: Optional[Dict]
+
+
 class UploadResponse(TypedDict):
     file_id: str
 
@@ -33,6 +44,43 @@ class DownloadResponse(TypedDict):
     mime_type: str
 
 
+class StreamingDownloadResponse(TypedDict):
+    chunks: Iterator[bytes]
+    original_name: Optional[str]
+    mime_type: str
+    content_length: Optional[int]
+
+
+class DownloadToResponse(TypedDict):
+    path: Optional[str]
+    original_name: Optional[str]
+    mime_type: str
+    size: int
+
+
+# Item accepted by the bulk upload: a file payload, a path payload or a bare path.
+UploadManyItem = Union["UploadLocalFilePayload", "UploadLocalPathPayload", str, PathLike]
+
+
+class UploadManyResult(TypedDict):
+    index: int
+    item: UploadManyItem
+    result: Optional[UploadResponse]
+    error: Optional[Exception]
+
+
+class GetManyResult(TypedDict):
+    file_id: str
+    result: Optional["FileDetailsResponse"]
+    error: Optional[Exception]
+
+
+class DownloadManyResult(TypedDict):
+    file_id: str
+    result: Optional[DownloadToResponse]
+    error: Optional[Exception]
+
+
 class FileDetailsResponse(TypedDict):
     id: str
     creation_date: str
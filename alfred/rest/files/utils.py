@@ -0,0 +1,210 @@
+# Native imports
+import os
+import secrets
+import threading
+from io import BufferedReader
+from typing import Any, BinaryIO, Dict, Optional, Set, Text, Tuple, Union
+from urllib.parse import unquote
+
+# Project imports
+from alfred.base.exceptions import AlfredMissingArgument
+from alfred.http.codec import DEFAULT_CODEC, JsonCodec
+from .typed import DownloadDestination, UploadLocalFilePayload
+
+# Size of the chunks read from the network when streaming downloads.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def extract_filename(content_disposition: Optional[Text]) -> Optional[Text]:
+    """
+    Extract the file name from the Content-Disposition header.
+    If no file name present, None would be returned.
+
+    Args:
+    - content_disposition: Value of the Content-Disposition header.
+    """
+    filename = None
+    if not content_disposition:
+        return filename
+
+    if "filename*" in content_disposition:
+        filename = content_disposition.split("filename*=UTF-8''")[-1]
+        filename = unquote(filename)
+    elif "filename=" in content_disposition:
+        filename = content_disposition.split("filename=")[-1]
+        filename = filename.strip("\"'")
+
+    return filename
+
+
+def build_upload_form(
+    payload: UploadLocalFilePayload,
+    codec: Optional[JsonCodec] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Build the multipart files and form fields for a local file upload.
+    Returns a tuple of (files, data).
+
+    Args:
+    - payload: Payload with the local file and Alfred's properties.
+    - codec: JSON codec used to encode the metadata (default: standard library).
+    """
+    file = payload.get("file")
+    filename = payload.get("filename")
+
+    if isinstance(file, BufferedReader):
+        filename = os.path.basename(file.name)
+
+    return build_file_form(
+        file, filename, payload.get("session_id"), payload.get("metadata", {}), codec
+    )
+
+
+def build_file_form(
+    file: Union[BinaryIO, BufferedReader],
+    filename: Optional[Text],
+    session_id: Text,
+    metadata: Optional[Dict],
+    codec: Optional[JsonCodec] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Build the multipart files and form fields for an open file.
+    Returns a tuple of (files, data).
+
+    Args:
+    - file: Binary file object, positioned at the start of its content.
+    - filename: Name of the file as it should be stored in Alfred.
+    - session_id: Unique identifier of the deferred Session.
+    - metadata: Metadata to attach to the File.
+    - codec: JSON codec used to encode the metadata (default: standard library).
+    """
+    # Detect MIME type. libmagic is loaded on first use, as loading it is slow.
+    import magic  # pylint: disable=C0415
+    content_type = magic.from_buffer(file.read(1024), mime=True)
+    file.seek(0)  # reset pointer
+
+    if not filename:
+        raise AlfredMissingArgument("filename must be provided.")
+
+    files = {
+        "file": (filename, file, content_type)
+    }
+
+    data = {
+        "session_id": session_id,
+        "metadata": (codec or DEFAULT_CODEC).dumps(metadata or {}).decode("utf-8")
+    }
+
+    return files, data
+
+
+class UniqueNames:
+    """
+    Hands out file paths that were not handed out before, adding a " (n)"
+    suffix to repeated ones, so that concurrent downloads sharing a name do
+    not write to the same file.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__claimed: Set[Text] = set()
+
+    def claim(self, path: Text) -> Text:
+        """
+        Reserve a path, or the first free variant of it.
+
+        Args:
+        - path: Desired file path.
+        """
+        root, extension = os.path.splitext(path)
+        with self.__lock:
+            candidate, index = path, 0
+            while candidate in self.__claimed:
+                index += 1
+                candidate = f"{root} ({index}){extension}"
+            self.__claimed.add(candidate)
+            return candidate
+
+
+class DownloadSink:
+    """
+    Writable target for streamed downloads.
+
+    Paths are written to a uniquely named temporary file in the same
+    directory, which is moved into place once the download completes, so a
+    failed download never leaves a truncated file behind. If the destination
+    is an existing directory, the file is stored inside it using its
+    original name. File objects are written as-is and left open.
+    """
+
+    def __init__(
+        self,
+        destination: DownloadDestination,
+        original_name: Optional[Text],
+        fallback_name: Text,
+        names: Optional[UniqueNames] = None,
+    ):
+        """
+        Args:
+        - destination: File path, directory or writable binary file object.
+        - original_name: Name of the file as reported by the server.
+        - fallback_name: Name to use when the server does not report one.
+        - names: Registry of the paths already used by other downloads. If set,
+          files stored in a directory get a name no other download uses.
+        """
+        self.path: Optional[Text] = None
+        self.size = 0
+        self.__file: Optional[BinaryIO] = None
+        self.__temp_path: Optional[Text] = None
+
+        if hasattr(destination, "write"):
+            self.__file = destination
+            return
+
+        path = os.fspath(destination)
+        if os.path.isdir(path):
+            name = os.path.basename(original_name or "") or fallback_name
+            path = os.path.join(path, name)
+            if names is not None:
+                path = names.claim(path)
+        self.path = path
+
+    def __enter__(self) -> "DownloadSink":
+        if self.path is not None:
+            descriptor, self.__temp_path = self.__create_temp_file(self.path)
+            self.__file = os.fdopen(descriptor, "wb")
+        return self
+
+    @staticmethod
+    def __create_temp_file(path: Text) -> Tuple[int, Text]:
+        """
+        Create a uniquely named temporary file next to a path, with the
+        permissions of a regular file (mkstemp ones are owner-only).
+        Returns a tuple of (descriptor, temp_path).
+
+        Args:
+        - path: Final path of the file.
+        """
+        directory, name = os.path.split(path)
+        while True:
+            temp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.part")
+            try:
+                flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+                return os.open(temp_path, flags, 0o666), temp_path
+            except FileExistsError:
+                continue
+
+    def write(self, chunk: bytes):
+        self.__file.write(chunk)
+        self.size += len(chunk)
+
+    def __exit__(self, exc_type, *args):
+        if self.__temp_path is None:
+            return
+
+        self.__file.close()
+        if exc_type is None:
+            os.replace(self.__temp_path, self.path)
+        elif os.path.exists(self.__temp_path):
+            os.remove(self.__temp_path)
+
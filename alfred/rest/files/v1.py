@@ -1,32 +1,63 @@
 # Native imports
 import os
-import json
-from typing import Text
-from urllib.parse import unquote
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Text, Tuple
 
 # Project imports
 from alfred.rest.files.typed import *  # pylint: disable=W0401, W0614
 from alfred.http.http_client import HttpClient
-from alfred.base.exceptions import AlfredMissingArgument
+from alfred.http.codec import get_json_codec
+from alfred.http.multipart import MultipartEncoder
+from alfred.rest.cache import ResponseCache
+from alfred.rest.models import FileDetails
+from alfred.utils.concurrency import run_concurrently
 from .base import FilesBase
 from .typed import FileDetailsResponse
-import magic
+from .utils import (
+    DEFAULT_CHUNK_SIZE,
+    DownloadSink,
+    UniqueNames,
+    build_file_form,
+    build_upload_form,
+    extract_filename,
+)
+
 
 class Files(FilesBase):
-    def __init__(self, http_client: HttpClient):
+    def __init__(
+        self,
+        http_client: HttpClient,
+        cache: Optional[ResponseCache] = None,
+        models: bool = False,
+    ):
+        """
+        Args:
+        - http_client: HTTP client.
+        - cache: Response cache used by `get`.
+        - models: If True, file details are returned as compact, read-only
+          `FileDetails` models instead of dicts.
+        """
         self.http_client = http_client
+        self.cache = cache
+        self.models = models
+        self.json_codec = get_json_codec(getattr(http_client, "json_codec", None))
 
     def get(self, file_id: Text) -> FileDetailsResponse:
+        if self.cache is not None:
+            return self.cache.get_or_load("files", file_id, lambda: self.__get(file_id))
+        return self.__get(file_id)
+
+    def __get(self, file_id: Text) -> FileDetailsResponse:
         parsed_resp, _ = self.http_client.get(f"/api/file/detail/{file_id}")
+        if self.models and isinstance(parsed_resp, dict):
+            return FileDetails(parsed_resp, self.json_codec)
         return parsed_resp
 
     def download(self, file_id: Text) -> DownloadResponse:
         _, response = self.http_client.get(f"/api/file/download/{file_id}")
         file = BytesIO(response.content)
         mime_type = response.headers.get("Content-Type")
-        original_name = self.__extract_filename(
-            response.headers.get("Content-Disposition")
-        )
+        original_name = extract_filename(response.headers.get("Content-Disposition"))
 
         return {
             "file": file,
@@ -34,57 +65,211 @@ class Files(FilesBase):
             "original_name": original_name,
         }
 
+    def iter_download(
+        self, file_id: Text, chunk_size: int = None
+    ) -> StreamingDownloadResponse:
+        _, download = self.__stream_download(file_id, chunk_size)
+        return download
+
+    def download_to(
+        self,
+        file_id: Text,
+        destination: DownloadDestination,
+        chunk_size: int = None,
+    ) -> DownloadToResponse:
+        return self.__download_to(file_id, destination, chunk_size)
+
+    def __download_to(
+        self,
+        file_id: Text,
+        destination: DownloadDestination,
+        chunk_size: Optional[int] = None,
+        names: Optional[UniqueNames] = None,
+    ) -> DownloadToResponse:
+        response, download = self.__stream_download(file_id, chunk_size)
+
+        # The response is closed here, and not by the chunks iterator, as the
+        # iterator never starts if the sink cannot be opened.
+        try:
+            with DownloadSink(
+                destination, download.get("original_name"), file_id, names
+            ) as sink:
+                for chunk in download.get("chunks"):
+                    sink.write(chunk)
+        finally:
+            response.close()
+
+        return {
+            "path": sink.path,
+            "mime_type": download.get("mime_type"),
+            "original_name": download.get("original_name"),
+            "size": sink.size,
+        }
+
     def upload(self, payload: UploadRemoteFilePayload) -> UploadResponse:
         parsed_resp, _ = self.http_client.post("/api/file/upload", data=payload)
         return parsed_resp
 
-    def upload_file(self, payload: UploadLocalFilePayload) -> UploadResponse:
-        file = payload.get("file")
-        filename = payload.get("filename")
-        session_id = payload.get("session_id")
-        metadata = payload.get("metadata", {})
+    def upload_file(
+        self, payload: UploadLocalFilePayload, stream: bool = False
+    ) -> UploadResponse:
+        files, data = build_upload_form(payload, self.json_codec)
+        return self.__post_upload(files, data, stream)
 
-        # Detect MIME type
-        content_type = magic.from_buffer(file.read(1024), mime=True)
-        file.seek(0)  # reset pointer
+    def upload_path(self, payload: UploadLocalPathPayload) -> UploadResponse:
+        path = os.fspath(payload.get("path"))
 
-        if isinstance(file, BufferedReader):
-            filename = os.path.basename(file.name)
+        with open(path, "rb") as file:
+            files, data = build_file_form(
+                file,
+                payload.get("filename") or os.path.basename(path),
+                payload.get("session_id"),
+                payload.get("metadata", {}),
+                self.json_codec,
+            )
+            return self.__post_upload(files, data, stream=True)
 
-        if not filename:
-            raise AlfredMissingArgument("filename must be provided.")
+    def upload_many(
+        self,
+        items: Iterable[UploadManyItem],
+        session_id: Optional[Text] = None,
+        metadata: Optional[dict] = None,
+        max_workers: Optional[int] = None,
+        on_progress: Optional[Callable[[int, UploadManyResult], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[UploadManyResult]:
+        def upload(item: UploadManyItem) -> UploadResponse:
+            if isinstance(item, dict) and "file" in item:
+                return self.upload_file(item, stream=True)
+            if isinstance(item, dict):
+                return self.upload_path(item)
+            return self.upload_path(
+                {"path": item, "session_id": session_id, "metadata": metadata}
+            )
 
-        files = {
-            "file": (filename, file, content_type)
-        }
+        results: List[UploadManyResult] = []
 
-        data = {
-            "session_id": session_id,
-            "metadata": json.dumps(metadata)
-        }
+        for index, item, result, error in run_concurrently(
+            upload, items, self.__get_max_workers(max_workers), cancel_event
+        ):
+            item_result: UploadManyResult = {
+                "index": index,
+                "item": item,
+                "result": result,
+                "error": error,
+            }
+            results.append(item_result)
+            if on_progress:
+                on_progress(len(results), item_result)
 
-        parsed_response, _ = self.http_client.post(
-            "/api/file/uploadfile",
-            data=data,
-            files=files
-        )
+        results.sort(key=lambda item_result: item_result["index"])
+        return results
+
+    def get_many(
+        self,
+        file_ids: Iterable[Text],
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[GetManyResult]:
+        for _, file_id, result, error in run_concurrently(
+            self.get, file_ids, self.__get_max_workers(max_workers), cancel_event
+        ):
+            yield {"file_id": file_id, "result": result, "error": error}
+
+    def download_many(
+        self,
+        file_ids: Iterable[Text],
+        dest_dir: Text,
+        max_workers: Optional[int] = None,
+        chunk_size: int = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[DownloadManyResult]:
+        if not os.path.isdir(dest_dir):
+            raise NotADirectoryError(dest_dir)
+
+        # Files sharing a name are stored under distinct names.
+        names = UniqueNames()
+
+        def download(file_id: Text) -> DownloadToResponse:
+            return self.__download_to(file_id, dest_dir, chunk_size, names)
+
+        for _, file_id, result, error in run_concurrently(
+            download, file_ids, self.__get_max_workers(max_workers), cancel_event
+        ):
+            yield {"file_id": file_id, "result": result, "error": error}
+
+    def __get_max_workers(self, max_workers: Optional[int]) -> int:
+        """
+        Get the number of workers used by bulk operations. Defaults to the
+        size of the HTTP connection pool, so workers never wait on a connection.
+        """
+        return max_workers or getattr(self.http_client, "pool_maxsize", 1)
+
+    def __post_upload(
+        self, files: Dict[str, Any], data: Dict[str, Any], stream: bool
+    ) -> UploadResponse:
+        """
+        Send a local file upload request.
+
+        Args:
+        - files: Multipart files.
+        - data: Multipart form fields.
+        - stream: If True, stream the body through a MultipartEncoder.
+        """
+        if stream:
+            encoder = MultipartEncoder(data, files)
+            parsed_response, _ = self.http_client.post(
+                "/api/file/uploadfile",
+                data=encoder,
+                headers={"Content-Type": encoder.content_type},
+            )
+        else:
+            parsed_response, _ = self.http_client.post(
+                "/api/file/uploadfile",
+                data=data,
+                files=files
+            )
 
         return parsed_response
 
-    def __extract_filename(self, content_disposition: Text):
+    def __stream_download(
+        self, file_id: Text, chunk_size: Optional[int] = None
+    ) -> Tuple[Any, StreamingDownloadResponse]:
+        """
+        Request a file by ID without reading its body.
+        Returns a tuple of (response, download).
+
+        Args:
+        - file_id: Unique identifier of the File.
+        - chunk_size: Size in bytes of each chunk read from the network.
+        """
+        _, response = self.http_client.get(
+            f"/api/file/download/{file_id}", stream=True
+        )
+        content_length = response.headers.get("Content-Length")
+
+        return response, {
+            "chunks": self.__iter_chunks(response, chunk_size or DEFAULT_CHUNK_SIZE),
+            "mime_type": response.headers.get("Content-Type"),
+            "original_name": extract_filename(
+                response.headers.get("Content-Disposition")
+            ),
+            "content_length": int(content_length) if content_length else None,
+        }
+
+    @staticmethod
+    def __iter_chunks(response, chunk_size: int):
         """
-        Extract the file name from the Content-Disposition header.
-        If no file name present, None would be returned.
+        Yield the body of a streamed response in chunks, releasing the
+        connection once done.
 
         Args:
-        - content_disposition: Value of the Content-Disposition header.
+        - response: Streamed HTTP response.
+        - chunk_size: Size in bytes of each chunk.
         """
-        filename = None
-        if "filename*" in content_disposition:
-            filename = content_disposition.split("filename*=UTF-8''")[-1]
-            filename = unquote(filename)
-        elif "filename=" in content_disposition:
-            filename = content_disposition.split("filename=")[-1]
-            filename = filename.strip("\"'")
-
-        return filename
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    yield chunk
+        finally:
+            response.close()
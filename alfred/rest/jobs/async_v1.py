@@ -0,0 +1,51 @@
+# Native imports
+from typing import Text
+
+# Project imports
+from alfred.http.async_http_client import AsyncHttpClient
+from alfred.http.codec import get_json_codec
+from alfred.rest.jobs.typed import CreateJobDict
+from alfred.rest.jobs.normalize import normalize_job_response
+from alfred.rest.jobs.v1 import build_get_all_params
+
+
+class AsyncJobs:
+    """
+    Asyncio counterpart of the V1 Jobs domain. Every method is awaitable.
+    """
+    def __init__(self, http_client: AsyncHttpClient):
+        self.http_client = http_client
+        self.json_codec = get_json_codec(getattr(http_client, "json_codec", None))
+
+    async def create(self, job: CreateJobDict):
+        """
+        Creates a new Job.
+
+        Args:
+        - job: Job creation parameters.
+        """
+        parsed_resp, _ = await self.http_client.post("/api/job/create", data=job)
+        return parsed_resp
+
+    async def get(self, job_id: Text):
+        """
+        Fetches a Job by its ID.
+
+        Args:
+        - job_id: Unique identifier of the Job.
+        """
+        parsed_resp, _ = await self.http_client.get(f"/api/job/detail/{job_id}")
+        return normalize_job_response(parsed_resp, self.json_codec)
+
+    async def get_all(self, page_size: int = None, current_page: int = None):
+        """
+        Fetches all jobs for a company
+
+        Args:
+        - page_size: Number of jobs to fetch per page.
+        - current_page: Page number to fetch.
+        """
+        parsed_resp, _ = await self.http_client.get(
+            "/api/job/all", params=build_get_all_params(page_size, current_page)
+        )
+        return normalize_job_response(parsed_resp, self.json_codec)
@@ -1,6 +1,6 @@
 # Native imports
-from typing import Text, Any
-from alfred.rest.jobs.typed import CreateJobDict
+from typing import Dict, Iterable, Iterator, Optional, Text, Any
+from alfred.rest.jobs.typed import CreateJobDict, JobWaitResult
 from abc import ABC, abstractmethod
 
 
@@ -32,3 +32,56 @@ class JobsBase(ABC):
         - page_size: Number of jobs to fetch per page.
         - current_page: Page number to fetch.
         """
+
+    @abstractmethod
+    def iter_all(
+        self, page_size: int = 100, prefetch: int = 2, start_page: int = 1
+    ) -> Iterator[Any]:
+        """
+        Iterates over all jobs for a company, fetching pages automatically
+        and prefetching the next ones in the background.
+
+        Args:
+        - page_size: Number of jobs to fetch per page.
+        - prefetch: Number of pages fetched ahead.
+        - start_page: Page number to start from.
+        """
+
+    @abstractmethod
+    def bind_realtime(self, realtime_client):
+        """
+        Complete `wait` and `wait_all` on real-time job events instead of polling.
+
+        Args:
+        - realtime_client: `AlfredRealTimeClient` instance.
+        """
+
+    @abstractmethod
+    def wait(
+        self, job_id: Text, timeout: Optional[float] = None, check_first: bool = True
+    ) -> JobWaitResult:
+        """
+        Waits for a Job to finish or fail, using real-time events when bound
+        to a real-time client and polling otherwise.
+
+        Args:
+        - job_id: Unique identifier of the Job.
+        - timeout: Maximum time to wait in seconds (default: no limit).
+        - check_first: If True, fetch the Job once before relying on events.
+        """
+
+    @abstractmethod
+    def wait_all(
+        self,
+        job_ids: Iterable[Text],
+        timeout: Optional[float] = None,
+        check_first: bool = True,
+    ) -> Dict[Text, JobWaitResult]:
+        """
+        Waits for several Jobs to finish or fail.
+
+        Args:
+        - job_ids: Unique identifiers of the Jobs.
+        - timeout: Maximum time to wait in seconds for all Jobs (default: no limit).
+        - check_first: If True, fetch each Job once before relying on events.
+        """
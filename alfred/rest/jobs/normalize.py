@@ -0,0 +1,197 @@
+# Native imports
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Optional, Text
+
+# Project imports
+from alfred.http.codec import DEFAULT_CODEC, JsonCodec
+
+# Marks metadata that has not been decoded yet.
+_UNSET = object()
+
+
+def normalize_job_response(
+    payload: Any, codec: Optional[JsonCodec] = None, model: Optional[Callable] = None
+):
+    """
+    Normalize job payloads returned by job endpoints.
+
+    Supports direct job objects as well as wrapped responses where jobs
+    are returned under a `result` key.
+
+    Args:
+    - payload: Parsed response.
+    - codec: JSON codec used to decode metadata (default: standard library).
+    - model: Read-only class jobs are converted to instead of dicts, e.g.
+      `JobView` or `Job`. Identical metadata strings are then parsed once per
+      response.
+    """
+    decoder = MetadataDecoder(codec) if model is not None else None
+
+    if isinstance(payload, list):
+        return [normalize_job(item, codec, model, decoder) for item in payload]
+
+    if not isinstance(payload, dict):
+        return payload
+
+    result = payload.get("result")
+
+    if isinstance(result, list):
+        response = dict(payload)
+        response["result"] = [normalize_job(item, codec, model, decoder) for item in result]
+        return response
+
+    if isinstance(result, dict):
+        response = dict(payload)
+        response["result"] = normalize_job(result, codec, model, decoder)
+        return response
+
+    return normalize_job(payload, codec, model, decoder)
+
+
+def normalize_job(
+    job: Any,
+    codec: Optional[JsonCodec] = None,
+    model: Optional[Callable] = None,
+    decoder: Optional["MetadataDecoder"] = None,
+):
+    """
+    Normalize a single job object and coerce its metadata to a dictionary.
+
+    Args:
+    - job: Job object.
+    - codec: JSON codec used to decode metadata (default: standard library).
+    - model: Read-only class the job is converted to instead of a dict. It
+      decodes the metadata on first access.
+    - decoder: Metadata decoder shared by the jobs of the same page.
+    """
+    if not isinstance(job, dict):
+        return job
+
+    if model is not None:
+        return model(job, codec, decoder)
+
+    normalized_job = dict(job)
+    normalized_job["metadata"] = normalize_metadata(normalized_job.get("metadata"), codec)
+    return normalized_job
+
+
+def normalize_metadata(metadata: Any, codec: Optional[JsonCodec] = None) -> Dict[str, Any]:
+    """
+    Convert upstream job metadata into a dictionary when possible.
+
+    Metadata may arrive as a JSON-encoded string, an already parsed
+    dictionary, or an empty/invalid value. Non-dictionary results are
+    normalized to an empty dictionary.
+    """
+    if isinstance(metadata, dict):
+        return metadata
+
+    if not metadata or not isinstance(metadata, str):
+        return {}
+
+    try:
+        parsed_metadata = (codec or DEFAULT_CODEC).loads(metadata)
+    except (TypeError, ValueError):
+        return {}
+
+    if isinstance(parsed_metadata, dict):
+        return parsed_metadata
+
+    return {}
+
+
+class MetadataDecoder:
+    """
+    Decodes job metadata, parsing each distinct metadata string once. Jobs
+    sharing a decoder share the decoded dictionaries, which must therefore
+    not be modified.
+    """
+    __slots__ = ("codec", "parsed")
+
+    def __init__(self, codec: Optional[JsonCodec] = None):
+        """
+        Args:
+        - codec: JSON codec used to decode metadata (default: standard library).
+        """
+        self.codec = codec
+        self.parsed: Dict[Text, Dict[str, Any]] = {}
+
+    def decode(self, metadata: Any) -> Dict[str, Any]:
+        """
+        Convert metadata into a dictionary, see `normalize_metadata`.
+        """
+        if not isinstance(metadata, str):
+            return normalize_metadata(metadata, self.codec)
+
+        parsed = self.parsed.get(metadata)
+        if parsed is None:
+            parsed = self.parsed[metadata] = normalize_metadata(metadata, self.codec)
+        return parsed
+
+
+class JobView(Mapping):
+    """
+    Read-only view of a job object, returned by lazy normalization.
+
+    The job is not copied, and its metadata is only decoded when it is first
+    read. Like a normalized job, a view always has a `metadata` key holding
+    a dictionary. Use `to_dict()` to get a normalized dict.
+    """
+    __slots__ = ("_job", "_metadata", "_codec", "_decoder")
+
+    def __init__(
+        self,
+        job: Dict[Text, Any],
+        codec: Optional[JsonCodec] = None,
+        decoder: Optional[MetadataDecoder] = None,
+    ):
+        """
+        Args:
+        - job: Job object. It must not be modified while the view is in use.
+        - codec: JSON codec used to decode metadata (default: standard library).
+        - decoder: Metadata decoder shared by the jobs of the same page.
+        """
+        self._job = job
+        self._metadata = _UNSET
+        self._codec = codec
+        self._decoder = decoder
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """
+        Job metadata, decoded on first access.
+        """
+        if self._metadata is _UNSET:
+            raw = self._job.get("metadata")
+            if self._decoder is not None:
+                self._metadata = self._decoder.decode(raw)
+            else:
+                self._metadata = normalize_metadata(raw, self._codec)
+        return self._metadata
+
+    def __getitem__(self, key: Text) -> Any:
+        if key == "metadata":
+            return self.metadata
+        return self._job[key]
+
+    def __iter__(self) -> Iterator[Text]:
+        yield from self._job
+        if "metadata" not in self._job:
+            yield "metadata"
+
+    def __len__(self) -> int:
+        return len(self._job) + (0 if "metadata" in self._job else 1)
+
+    def __contains__(self, key: object) -> bool:
+        return key == "metadata" or key in self._job
+
+    def __repr__(self) -> Text:
+        return f"JobView({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[Text, Any]:
+        """
+        Get the job as a normalized dict.
+        """
+        job = dict(self._job)
+        job["metadata"] = self.metadata
+        return job
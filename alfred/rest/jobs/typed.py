@@ -13,3 +13,13 @@ class CreateJobDict(TypedDict):
     container: Optional[str]
     file_name: Optional[str]
     file_names: Optional[List[str]]
+
+
+class JobWaitResult(TypedDict):
+    job_id: str
+    # Either "finished" or "failed".
+    status: str
+    # Job details, when the outcome was found by polling.
+    job: Optional[Any]
+    # Real-time event payload, when the outcome was reported by an event.
+    event: Optional[Any]
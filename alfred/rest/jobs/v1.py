@@ -1,16 +1,56 @@
 # Native imports
-import json
-from typing import Any, Dict, Text
+import itertools
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Text, Tuple
 
 # Project imports
-from alfred.rest.jobs.typed import CreateJobDict
+from alfred.rest.jobs.typed import CreateJobDict, JobWaitResult
+from alfred.http.codec import get_json_codec
 from alfred.http.http_client import HttpClient
+from alfred.rest.cache import ResponseCache
 from alfred.rest.jobs.base import JobsBase
+from alfred.rest.jobs.normalize import (
+    JobView,
+    MetadataDecoder,
+    normalize_job,
+    normalize_job_response,
+)
+from alfred.rest.jobs.waiter import JobWaiter
+from alfred.rest.models import Job
+from alfred.utils.concurrency import iter_prefetched
+
+# Keys that may hold the total number of pages or jobs in paginated responses.
+TOTAL_PAGES_KEYS = ("totalPages", "total_pages", "TotalPages", "pageCount", "page_count")
+TOTAL_ITEMS_KEYS = ("totalCount", "total_count", "TotalCount", "total", "Total")
+# Keys that may hold the number of the page served.
+CURRENT_PAGE_KEYS = ("currentPage", "current_page", "CurrentPage", "page", "Page")
 
 
 class Jobs(JobsBase):
-    def __init__(self, http_client: HttpClient):
+    def __init__(
+        self,
+        http_client: HttpClient,
+        cache: Optional[ResponseCache] = None,
+        models: bool = False,
+        lazy: bool = False,
+    ):
+        """
+        Args:
+        - http_client: HTTP client.
+        - cache: Response cache used by `get`.
+        - models: If True, jobs are returned as compact, read-only `Job`
+          models instead of dicts.
+        - lazy: If True, jobs are returned as read-only `JobView`s over the
+          parsed response instead of normalized copies, and their metadata
+          is decoded on first access. Ignored if `models` is True.
+        """
         self.http_client = http_client
+        self.cache = cache
+        self.model = Job if models else JobView if lazy else None
+        self.json_codec = get_json_codec(getattr(http_client, "json_codec", None))
+        self.waiter = JobWaiter(
+            self.__get, max_workers=getattr(http_client, "pool_maxsize", 8)
+        )
 
     def create(self, job: CreateJobDict):
         """
@@ -29,8 +69,13 @@ class Jobs(JobsBase):
         Args:
         - job_id: Unique identifier of the Job.
         """
+        if self.cache is not None:
+            return self.cache.get_or_load("jobs", job_id, lambda: self.__get(job_id))
+        return self.__get(job_id)
+
+    def __get(self, job_id: Text):
         parsed_resp, _ = self.http_client.get(f"/api/job/detail/{job_id}")
-        return self.__normalize_job_response(parsed_resp)
+        return normalize_job_response(parsed_resp, self.json_codec, self.model)
 
     def get_all(self, page_size: int = None, current_page: int = None):
         """
@@ -40,74 +85,183 @@ class Jobs(JobsBase):
         - page_size: Number of jobs to fetch per page.
         - current_page: Page number to fetch.
         """
-        params = {}
-        if page_size:
-            params["pageSize"] = page_size
-        if current_page:
-            params["currentPage"] = current_page
-        parsed_resp, _ = self.http_client.get("/api/job/all", params=params)
-        return self.__normalize_job_response(parsed_resp)
+        parsed_resp, _ = self.http_client.get(
+            "/api/job/all", params=build_get_all_params(page_size, current_page)
+        )
+        return normalize_job_response(parsed_resp, self.json_codec, self.model)
 
-    def __normalize_job_response(self, payload: Any):
+    def iter_all(
+        self, page_size: int = 100, prefetch: int = 2, start_page: int = 1
+    ) -> Iterator[Any]:
         """
-        Normalize job payloads returned by job endpoints.
+        Iterates over all jobs for a company, fetching pages automatically.
 
-        Supports direct job objects as well as wrapped responses where jobs
-        are returned under a `result` key.
+        The next `prefetch` pages are fetched in the background while the
+        current one is being consumed, and at most `prefetch + 1` pages are held
+        in memory. Each job's metadata is normalized only when the job is
+        reached. Iteration stops after the last page reported by the API, or
+        on a short, empty or repeated page.
+
+        Args:
+        - page_size: Number of jobs to fetch per page. The API may cap it.
+        - prefetch: Number of pages fetched ahead. Set to 0 to fetch pages
+          sequentially.
+        - start_page: Page number to start from.
         """
-        if isinstance(payload, list):
-            return [self.__normalize_job(item) for item in payload]
+        def fetch(current_page: int) -> Tuple[int, Any]:
+            return current_page, self.__get_page(page_size, current_page)
 
-        if not isinstance(payload, dict):
-            return payload
+        # Last page to request, once the API reported the total.
+        last_page: Optional[int] = None
 
-        response = dict(payload)
-        result = response.get("result")
+        def next_pages() -> Iterator[int]:
+            for current_page in itertools.count(start_page + 1):
+                if last_page is not None and current_page > last_page:
+                    return
+                yield current_page
 
-        if isinstance(result, list):
-            response["result"] = [self.__normalize_job(item) for item in result]
-            return response
+        # The first page is fetched on its own, so that no page is fetched
+        # ahead before the total is known.
+        prefetched = iter_prefetched(fetch, next_pages(), depth=prefetch)
+        pages = itertools.chain([fetch(start_page)], prefetched)
+        # Length of a full page, learnt from the responses in case the API
+        # caps the requested page size.
+        full_page_size = 0
+        previous_jobs: Optional[List[Any]] = None
+        previous_page: Optional[int] = None
+        try:
+            for current_page, payload in pages:
+                jobs, total_pages, total_jobs = extract_page(payload)
+                if not jobs:
+                    return
+
+                # An API ignoring `currentPage` would serve the same page forever.
+                reported_page = extract_current_page(payload)
+                if jobs == previous_jobs or (
+                    reported_page is not None
+                    and previous_page is not None
+                    and reported_page <= previous_page
+                ):
+                    return
+                previous_jobs, previous_page = jobs, reported_page
 
-        if isinstance(result, dict):
-            response["result"] = self.__normalize_job(result)
-            return response
+                decoder = MetadataDecoder(self.json_codec) if self.model else None
+                for job in jobs:
+                    yield normalize_job(job, self.json_codec, self.model, decoder)
 
-        return self.__normalize_job(response)
+                full_page_size = max(full_page_size, len(jobs))
+                if total_pages is None and total_jobs is not None:
+                    total_pages = math.ceil(total_jobs / full_page_size)
+                if total_pages is not None:
+                    last_page = total_pages
+                    if current_page >= total_pages:
+                        return
+                elif len(jobs) < full_page_size:
+                    return
+        finally:
+            prefetched.close()
+
+    def __get_page(self, page_size: int, current_page: int) -> Any:
+        parsed_resp, _ = self.http_client.get(
+            "/api/job/all", params=build_get_all_params(page_size, current_page)
+        )
+        return parsed_resp
 
-    def __normalize_job(self, job: Any):
+    def bind_realtime(self, realtime_client):
         """
-        Normalize a single job object and coerce its metadata to a dictionary.
+        Complete `wait` and `wait_all` on real-time job events instead of polling.
+
+        Args:
+        - realtime_client: `AlfredRealTimeClient` instance.
         """
-        if not isinstance(job, dict):
-            return job
+        self.waiter.bind_realtime(realtime_client)
 
-        normalized_job = dict(job)
-        normalized_job["metadata"] = self.__normalize_metadata(
-            normalized_job.get("metadata")
-        )
-        return normalized_job
+    def wait(
+        self, job_id: Text, timeout: Optional[float] = None, check_first: bool = True
+    ) -> JobWaitResult:
+        """
+        Waits for a Job to finish or fail. Raises `AlfredTimeoutException` when
+        the timeout is exceeded.
+
+        Args:
+        - job_id: Unique identifier of the Job.
+        - timeout: Maximum time to wait in seconds (default: no limit).
+        - check_first: If True, fetch the Job once before relying on events,
+          in case it completed before waiting.
+        """
+        return self.waiter.wait(job_id, timeout, check_first)
 
-    @staticmethod
-    def __normalize_metadata(metadata: Any) -> Dict[str, Any]:
+    def wait_all(
+        self,
+        job_ids: Iterable[Text],
+        timeout: Optional[float] = None,
+        check_first: bool = True,
+    ) -> Dict[Text, JobWaitResult]:
         """
-        Convert upstream job metadata into a dictionary when possible.
+        Waits for several Jobs to finish or fail. Returns the outcome of each
+        Job by ID. Raises `AlfredTimeoutException` when the timeout is exceeded.
 
-        Metadata may arrive as a JSON-encoded string, an already parsed
-        dictionary, or an empty/invalid value. Non-dictionary results are
-        normalized to an empty dictionary.
+        Args:
+        - job_ids: Unique identifiers of the Jobs.
+        - timeout: Maximum time to wait in seconds for all Jobs (default: no limit).
+        - check_first: If True, fetch each Job once before relying on events,
+          in case they completed before waiting.
         """
-        if isinstance(metadata, dict):
-            return metadata
+        return self.waiter.wait_all(job_ids, timeout, check_first)
 
-        if not metadata or not isinstance(metadata, str):
-            return {}
 
-        try:
-            parsed_metadata = json.loads(metadata)
-        except (TypeError, ValueError, json.JSONDecodeError):
-            return {}
+def build_get_all_params(page_size: int = None, current_page: int = None):
+    """
+    Build the query string parameters for the paginated jobs endpoint.
+
+    Args:
+    - page_size: Number of jobs to fetch per page.
+    - current_page: Page number to fetch.
+    """
+    params = {}
+    if page_size:
+        params["pageSize"] = page_size
+    if current_page:
+        params["currentPage"] = current_page
+    return params
+
+
+def extract_page(payload: Any) -> Tuple[List[Any], Optional[int], Optional[int]]:
+    """
+    Extract the jobs of a page of the paginated jobs endpoint, along with the
+    total number of pages and jobs when the API reports them.
+
+    Args:
+    - payload: Parsed response. Either a list of jobs or an object holding
+      them under `result`.
+    """
+    if isinstance(payload, list):
+        return payload, None, None
+    if not isinstance(payload, dict):
+        return [], None, None
+
+    jobs = payload.get("result")
+    if not isinstance(jobs, list):
+        jobs = []
+
+    return jobs, _get_int(payload, TOTAL_PAGES_KEYS), _get_int(payload, TOTAL_ITEMS_KEYS)
+
+
+def extract_current_page(payload: Any) -> Optional[int]:
+    """
+    Get the page number reported in a page of the paginated jobs endpoint, if any.
+
+    Args:
+    - payload: Parsed response.
+    """
+    if not isinstance(payload, dict):
+        return None
+    return _get_int(payload, CURRENT_PAGE_KEYS)
 
-        if isinstance(parsed_metadata, dict):
-            return parsed_metadata
 
-        return {}
+def _get_int(payload: Dict[Text, Any], keys: Tuple[Text, ...]) -> Optional[int]:
+    for key in keys:
+        value = payload.get(key)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
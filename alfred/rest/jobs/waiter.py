@@ -0,0 +1,367 @@
+# Native imports
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from time import monotonic
+from typing import Any, Callable, Dict, Iterable, List, Optional, Text
+
+# 3rd party imports
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import RetryError, Timeout
+
+# Project imports
+from alfred.base.constants import JobEvent
+from alfred.base.exceptions import AlfredTimeoutException
+from alfred.rest.jobs.typed import JobWaitResult
+from alfred.utils import logging
+from alfred.utils.concurrency import run_concurrently
+from alfred.utils.events import extract_entity_id
+
+__all__ = ["JobWaiter", "get_job_status", "is_retryable_error"]
+
+# Real-time events reporting that a job will make no further progress.
+TERMINAL_JOB_EVENTS = {
+    JobEvent.JOB_FINISHED_EVENT: "finished",
+    JobEvent.JOB_FAILED_EVENT: "failed",
+    JobEvent.JOB_INVALID_EVENT: "failed",
+}
+
+# Terminal values of a job's stage or status, normalized to lower snake case.
+FINISHED_STATES = frozenset(["finished", "completed", "complete", "done", "succeeded", "success"])
+FAILED_STATES = frozenset(["failed", "failure", "error", "invalid", "cancelled", "canceled"])
+
+# Keys that may hold the state of a job in its details.
+JOB_STATE_KEYS = ("stage", "Stage", "status", "Status", "state", "State")
+
+# Response status codes of requests worth retrying.
+RETRYABLE_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+# How often, in seconds, a waiter relying on events checks that the socket
+# is still connected.
+SOCKET_CHECK_INTERVAL = 1.0
+
+
+def unwrap_job(job: Any) -> Optional[Mapping]:
+    """
+    Get the job object from job details, which may be wrapped under `result`.
+    """
+    if isinstance(job, Mapping) and isinstance(job.get("result"), Mapping):
+        job = job.get("result")
+    return job if isinstance(job, Mapping) else None
+
+
+def is_retryable_error(err: BaseException) -> bool:
+    """
+    Whether a request error is likely transient: a connection error, a
+    timeout, or a response with a 429 or 5xx status code.
+
+    Args:
+    - err: Error raised by the request.
+    """
+    if isinstance(err, AlfredTimeoutException):
+        return False
+    if isinstance(err, (RequestsConnectionError, Timeout, RetryError)):
+        return True
+    if isinstance(err, (ConnectionError, TimeoutError)):
+        return True
+    response = getattr(err, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None:
+        # aiohttp errors hold the status themselves.
+        status = getattr(err, "status", None)
+    return status in RETRYABLE_STATUS_CODES
+
+
+def get_job_status(job: Any) -> Optional[Text]:
+    """
+    Get the terminal status of a job from its details. Returns "finished",
+    "failed", or None if the job is still in progress.
+
+    Args:
+    - job: Job details, as returned by `Jobs.get`.
+    """
+    job = unwrap_job(job)
+    if job is None:
+        return None
+
+    for key in JOB_STATE_KEYS:
+        value = job.get(key)
+        if not isinstance(value, str):
+            continue
+        state = value.strip().lower().replace(" ", "_").replace("-", "_")
+        if state in FINISHED_STATES:
+            return "finished"
+        if state in FAILED_STATES:
+            return "failed"
+    return None
+
+
+class JobWaiter:
+    """
+    Waits for jobs to finish or fail.
+
+    When bound to a connected `AlfredRealTimeClient`, completion is reported
+    by the job finished, failed and invalid events, so a single socket can
+    track any number of jobs without polling. Without a socket, or while it
+    is disconnected, jobs are polled with an adaptive backoff: the interval
+    grows while a job stays in the same stage and resets when it moves on.
+    """
+
+    def __init__(
+        self,
+        fetch_job: Callable[[Text], Any],
+        realtime_client=None,
+        poll_interval: float = 1,
+        max_poll_interval: float = 30,
+        poll_backoff: float = 1.5,
+        max_workers: int = 8,
+        max_buffered_events: int = 10000,
+    ):
+        """
+        Args:
+        - fetch_job: Function fetching the details of a job by ID, bypassing any cache.
+        - realtime_client: Real-time client reporting job events.
+        - poll_interval: Initial polling interval in seconds.
+        - max_poll_interval: Maximum polling interval in seconds.
+        - poll_backoff: Multiplier applied to the polling interval while a job
+          stays in the same stage.
+        - max_workers: Maximum number of concurrent requests when checking the
+          initial state of many jobs.
+        - max_buffered_events: Number of terminal events kept for jobs that are
+          not awaited yet, e.g. a job that finishes right after being created.
+        """
+        self.realtime_client = None
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.poll_backoff = poll_backoff
+        self.max_workers = max_workers
+        self.max_buffered_events = max_buffered_events
+        self.logger = logging.getLogger("alfred-python")
+
+        self.__fetch_job = fetch_job
+        self.__condition = threading.Condition()
+        # Number of waiters per awaited job.
+        self.__awaited: Dict[Text, int] = {}
+        # Outcomes of awaited jobs, and recent outcomes of other jobs.
+        self.__results: Dict[Text, JobWaitResult] = {}
+        self.__buffered: "OrderedDict[Text, JobWaitResult]" = OrderedDict()
+
+        if realtime_client is not None:
+            self.bind_realtime(realtime_client)
+
+    def bind_realtime(self, realtime_client):
+        """
+        Complete waits on real-time job events.
+
+        Args:
+        - realtime_client: `AlfredRealTimeClient` instance.
+        """
+        self.realtime_client = realtime_client
+        for event, status in TERMINAL_JOB_EVENTS.items():
+            realtime_client.on(event.value, self.__event_handler(status))
+
+    def wait(
+        self, job_id: Text, timeout: Optional[float] = None, check_first: bool = True
+    ) -> JobWaitResult:
+        """
+        Wait for a job to finish or fail.
+
+        Args:
+        - job_id: Unique identifier of the Job.
+        - timeout: Maximum time to wait in seconds (default: no limit). Raises
+          `AlfredTimeoutException` when exceeded.
+        - check_first: If True, fetch the job once before relying on events,
+          in case it completed before waiting.
+        """
+        return self.wait_all([job_id], timeout, check_first)[job_id]
+
+    def wait_all(
+        self,
+        job_ids: Iterable[Text],
+        timeout: Optional[float] = None,
+        check_first: bool = True,
+    ) -> Dict[Text, JobWaitResult]:
+        """
+        Wait for several jobs to finish or fail. Returns the outcome of each job
+        by ID.
+
+        Args:
+        - job_ids: Unique identifiers of the Jobs.
+        - timeout: Maximum time to wait in seconds for all jobs (default: no
+          limit). Raises `AlfredTimeoutException`, holding the jobs still
+          pending and the outcomes collected so far, when exceeded.
+        - check_first: If True, fetch each job once before relying on events,
+          in case it completed before waiting.
+
+        Transient request errors, see `is_retryable_error`, are logged and the
+        job is polled again with backoff until the timeout. Other errors are raised.
+        """
+        awaited: List[Text] = list(dict.fromkeys(job_ids))
+        pending = awaited
+        deadline = None if timeout is None else monotonic() + timeout
+        results: Dict[Text, JobWaitResult] = {}
+        # Polling schedule per job: [next poll time, interval, last state].
+        schedule: Dict[Text, List[Any]] = {}
+
+        self.__register(awaited)
+        try:
+            if check_first or not self.__socket_available():
+                self.__check(pending, results, schedule)
+
+            while True:
+                with self.__condition:
+                    self.__collect(pending, results)
+                    pending = [job_id for job_id in pending if job_id not in results]
+                    if not pending:
+                        return results
+
+                    now = monotonic()
+                    if deadline is not None and now >= deadline:
+                        raise AlfredTimeoutException(
+                            f"{len(pending)} job(s) did not complete within {timeout}s.",
+                            pending=pending,
+                            results=results,
+                        )
+
+                    polling = not self.__socket_available()
+                    if polling:
+                        next_poll = min(
+                            schedule.get(job_id, [now])[0] for job_id in pending
+                        )
+                        wait_time = max(next_poll - now, 0)
+                    else:
+                        wait_time = SOCKET_CHECK_INTERVAL
+                    if deadline is not None:
+                        wait_time = min(wait_time, max(deadline - now, 0))
+                    if wait_time > 0:
+                        self.__condition.wait(wait_time)
+                        continue
+
+                if polling:
+                    self.__poll(pending, results, schedule)
+        finally:
+            self.__unregister(awaited)
+
+    def __socket_available(self) -> bool:
+        if self.realtime_client is None:
+            return False
+        return bool(getattr(self.realtime_client, "connected", True))
+
+    def __event_handler(self, status: Text):
+        def handle_event(data):
+            job_id = extract_entity_id(data, "job")
+            if job_id:
+                self.__complete(
+                    {"job_id": job_id, "status": status, "job": None, "event": data}
+                )
+
+        return handle_event
+
+    def __complete(self, result: JobWaitResult):
+        job_id = result["job_id"]
+        with self.__condition:
+            if job_id in self.__awaited:
+                self.__results[job_id] = result
+            else:
+                self.__buffered[job_id] = result
+                self.__buffered.move_to_end(job_id)
+                while len(self.__buffered) > self.max_buffered_events:
+                    self.__buffered.popitem(last=False)
+            self.__condition.notify_all()
+
+    def __register(self, job_ids: List[Text]):
+        with self.__condition:
+            for job_id in job_ids:
+                self.__awaited[job_id] = self.__awaited.get(job_id, 0) + 1
+                if job_id in self.__buffered:
+                    self.__results[job_id] = self.__buffered.pop(job_id)
+
+    def __unregister(self, job_ids: List[Text]):
+        with self.__condition:
+            for job_id in job_ids:
+                self.__awaited[job_id] -= 1
+                if self.__awaited[job_id] <= 0:
+                    del self.__awaited[job_id]
+                    self.__results.pop(job_id, None)
+
+    def __collect(self, pending: List[Text], results: Dict[Text, JobWaitResult]):
+        """
+        Move the outcomes reported by events into the results. Must be called
+        while holding the condition.
+        """
+        for job_id in pending:
+            result = self.__results.get(job_id)
+            if result is not None:
+                results[job_id] = result
+
+    def __check(
+        self,
+        pending: List[Text],
+        results: Dict[Text, JobWaitResult],
+        schedule: Dict[Text, List[Any]],
+    ):
+        """
+        Fetch every pending job once, concurrently.
+        """
+        for _, job_id, job, err in run_concurrently(
+            self.__fetch_job, pending, max_workers=self.max_workers
+        ):
+            if err is not None:
+                self.__retry_later(job_id, err, schedule)
+                continue
+            self.__update(job_id, job, results, schedule)
+
+    def __poll(
+        self,
+        pending: List[Text],
+        results: Dict[Text, JobWaitResult],
+        schedule: Dict[Text, List[Any]],
+    ):
+        """
+        Fetch the pending jobs that are due for polling, concurrently.
+        """
+        now = monotonic()
+        due = [job_id for job_id in pending if schedule.get(job_id, [now])[0] <= now]
+        self.__check(due, results, schedule)
+
+    def __retry_later(self, job_id: Text, err: Exception, schedule: Dict[Text, List[Any]]):
+        """
+        Schedule the next poll of a job that could not be fetched, backing off
+        like for a job that stays in the same stage. Non-retryable errors are raised.
+        """
+        if not is_retryable_error(err):
+            raise err
+
+        entry = schedule.get(job_id)
+        if entry is None:
+            interval, state = self.poll_interval, None
+        else:
+            interval = min(entry[1] * self.poll_backoff, self.max_poll_interval)
+            state = entry[2]
+        self.logger.warning(f"Could not fetch job {job_id}, retrying in {interval:.2f}s: {err}")
+        schedule[job_id] = [monotonic() + interval, interval, state]
+
+    def __update(
+        self,
+        job_id: Text,
+        job: Any,
+        results: Dict[Text, JobWaitResult],
+        schedule: Dict[Text, List[Any]],
+    ):
+        """
+        Record the outcome of a fetched job, or schedule its next poll.
+        """
+        status = get_job_status(job)
+        if status is not None:
+            results[job_id] = {"job_id": job_id, "status": status, "job": job, "event": None}
+            return
+
+        details = unwrap_job(job) or {}
+        state = repr([details.get(key) for key in JOB_STATE_KEYS])
+        entry = schedule.get(job_id)
+        if entry is None or entry[2] != state:
+            # First poll or the job moved on: poll again soon.
+            interval = self.poll_interval
+        else:
+            interval = min(entry[1] * self.poll_backoff, self.max_poll_interval)
+        schedule[job_id] = [monotonic() + interval, interval, state]
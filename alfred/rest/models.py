@@ -0,0 +1,177 @@
+# Native imports
+import sys
+import threading
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Text, Tuple
+
+# Project imports
+from alfred.http.codec import JsonCodec
+
+if TYPE_CHECKING:
+    from alfred.rest.jobs.normalize import MetadataDecoder
+
+__all__ = ["ResponseModel", "FileDetails", "Job", "Session"]
+
+# Maximum number of distinct key sets shared per model class. Responses with
+# more shapes than this still work, they just do not share their key index.
+MAX_SHAPES = 1024
+
+# Marks a lazily decoded field that has not been decoded yet.
+_UNSET = object()
+
+
+class _Shape:
+    """
+    Key set shared by every model built from responses with the same keys,
+    so each model only stores its values.
+    """
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys: Tuple[Text, ...]):
+        self.keys = keys
+        self.index = {key: position for position, key in enumerate(keys)}
+
+
+class ResponseModel(Mapping):
+    """
+    Compact, read-only representation of an API response object.
+
+    Values are stored in a tuple and the keys are shared between all models
+    of the same class and shape, so a model takes a fraction of the memory
+    of the equivalent dict. Fields are available both as attributes
+    (`job.id`) and as keys (`job["id"]`), and `metadata` is decoded on first
+    access. Use `to_dict()` to get a plain dict back.
+    """
+    __slots__ = ("_shape", "_values", "_metadata", "_codec", "_decoder")
+
+    # Shared key sets, per model class.
+    _shapes: Dict[Tuple[Text, ...], _Shape]
+    _shapes_lock: threading.Lock
+    # Whether models always have a `metadata` key, empty if the response had none.
+    _has_metadata: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._shapes = {}
+        cls._shapes_lock = threading.Lock()
+
+    def __init__(
+        self,
+        data: Dict[Text, Any],
+        codec: Optional[JsonCodec] = None,
+        decoder: Optional["MetadataDecoder"] = None,
+    ):
+        """
+        Args:
+        - data: Response object.
+        - codec: JSON codec used to decode `metadata` (default: standard library).
+        - decoder: Metadata decoder shared by the models of the same page.
+        """
+        keys = tuple(data)
+        shape = self._shapes.get(keys)
+        if shape is None:
+            shape = _Shape(keys)
+            with self._shapes_lock:
+                if len(self._shapes) < MAX_SHAPES:
+                    shape = self._shapes.setdefault(keys, shape)
+
+        self._shape = shape
+        self._values = tuple(data.values())
+        self._metadata = _UNSET
+        self._codec = codec
+        self._decoder = decoder
+
+    def __getattr__(self, name: Text) -> Any:
+        # Only called for names that are not slots or methods.
+        if name.startswith("__"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            ) from None
+
+    def __setattr__(self, name: Text, value: Any):
+        if name not in ResponseModel.__slots__:
+            raise AttributeError(f"{type(self).__name__!r} object is read-only")
+        object.__setattr__(self, name, value)
+
+    def __getitem__(self, key: Text) -> Any:
+        if key == "metadata":
+            return self._decode_metadata()
+        return self._values[self._shape.index[key]]
+
+    def __iter__(self) -> Iterator[Text]:
+        yield from self._shape.keys
+        if self._has_metadata and "metadata" not in self._shape.index:
+            yield "metadata"
+
+    def __len__(self) -> int:
+        missing = self._has_metadata and "metadata" not in self._shape.index
+        return len(self._values) + (1 if missing else 0)
+
+    def __contains__(self, key: object) -> bool:
+        return (self._has_metadata and key == "metadata") or key in self._shape.index
+
+    def __sizeof__(self) -> int:
+        # Values are counted shallowly; the shared keys are not counted.
+        size = object.__sizeof__(self) + sys.getsizeof(self._values)
+        return size + sum(sys.getsizeof(value) for value in self._values)
+
+    def __repr__(self) -> Text:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return {"data": dict(zip(self._shape.keys, self._values)), "codec": self._codec}
+
+    def __setstate__(self, state):
+        type(self).__init__(self, state["data"], state["codec"])
+
+    def to_dict(self) -> Dict[Text, Any]:
+        """
+        Get the response as a plain dict, with `metadata` decoded.
+        """
+        data = dict(zip(self._shape.keys, self._values))
+        if "metadata" in self:
+            data["metadata"] = self["metadata"]
+        return data
+
+    def _decode_metadata(self) -> Any:
+        if self._metadata is _UNSET:
+            position = self._shape.index.get("metadata")
+            if position is None and not self._has_metadata:
+                raise KeyError("metadata")
+
+            # Imported here: the jobs package imports this module.
+            from alfred.rest.jobs.normalize import normalize_metadata  # pylint: disable=C0415
+
+            raw = self._values[position] if position is not None else None
+            if self._decoder is not None:
+                self._metadata = self._decoder.decode(raw)
+            else:
+                self._metadata = normalize_metadata(raw, self._codec)
+        return self._metadata
+
+
+class FileDetails(ResponseModel):
+    """
+    File details. Holds the same fields as `FileDetailsResponse`.
+    """
+    __slots__ = ()
+
+
+class Job(ResponseModel):
+    """
+    Job details, with `metadata` decoded on first access. Like a normalized
+    job, a model always has a `metadata` key holding a dictionary.
+    """
+    __slots__ = ()
+    _has_metadata = True
+
+
+class Session(ResponseModel):
+    """
+    Deferred Session details.
+    """
+    __slots__ = ()
@@ -0,0 +1,30 @@
+# Native imports
+from typing import Text
+
+# Project imports
+from alfred.http.async_http_client import AsyncHttpClient
+
+
+class AsyncSessions:
+    """
+    Asyncio counterpart of the V1 Sessions domain. Every method is awaitable.
+    """
+    def __init__(self, http_client: AsyncHttpClient):
+        self.http_client = http_client
+
+    async def create(self):
+        """
+        Creates a new Session.
+        """
+        parsed_resp, _ = await self.http_client.post("/api/deferred/create")
+        return parsed_resp
+
+    async def get(self, session_id: Text):
+        """
+        Fetches a Session by its ID.
+
+        Args:
+        - session_id: Unique identifier of the Session.
+        """
+        parsed_resp, _ = await self.http_client.get(f"/api/deferred/detail/{session_id}")
+        return parsed_resp
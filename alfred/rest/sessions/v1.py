@@ -1,14 +1,30 @@
 # Native imports
-from typing import Text
+from typing import Optional, Text
 
 # Project imports
 from alfred.http.http_client import HttpClient
+from alfred.rest.cache import ResponseCache
+from alfred.rest.models import Session
 from alfred.rest.sessions.base import SessionsBase
 
 
 class Sessions(SessionsBase):
-    def __init__(self, http_client: HttpClient):
+    def __init__(
+        self,
+        http_client: HttpClient,
+        cache: Optional[ResponseCache] = None,
+        models: bool = False,
+    ):
+        """
+        Args:
+        - http_client: HTTP client.
+        - cache: Response cache used by `get`.
+        - models: If True, sessions are returned as compact, read-only
+          `Session` models instead of dicts.
+        """
         self.http_client = http_client
+        self.cache = cache
+        self.models = models
 
     def create(self):
         """
@@ -24,5 +40,14 @@ class Sessions(SessionsBase):
         Args:
         - session_id: Unique identifier of the Session.
         """
+        if self.cache is not None:
+            return self.cache.get_or_load(
+                "sessions", session_id, lambda: self.__get(session_id)
+            )
+        return self.__get(session_id)
+
+    def __get(self, session_id: Text):
         parsed_resp, _ = self.http_client.get(f"/api/deferred/detail/{session_id}")
+        if self.models and isinstance(parsed_resp, dict):
+            return Session(parsed_resp)
         return parsed_resp
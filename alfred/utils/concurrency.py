@@ -0,0 +1,128 @@
+# Native imports
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+__all__ = ["run_concurrently", "iter_prefetched"]
+
+
+def run_concurrently(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int,
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[Tuple[int, Any, Any, Optional[BaseException]]]:
+    """
+    Run `func` over `items` on a bounded pool of worker threads, yielding
+    `(index, item, result, error)` tuples as soon as each call completes,
+    which is not necessarily in input order.
+
+    Items are pulled lazily from the iterable, so at most a couple of items
+    per worker are in flight at any time and memory stays bounded regardless
+    of the number of items. Setting `cancel_event` stops new items from being
+    scheduled; items that were queued but not started are reported with a
+    `CancelledError`, while running calls are allowed to finish.
+
+    Args:
+    - func: Callable applied to each item.
+    - items: Iterable of items. Can be a generator.
+    - max_workers: Maximum number of concurrent calls.
+    - cancel_event: Event used to cancel the remaining work.
+    """
+    if max_workers <= 0:
+        raise ValueError(f"Max workers ({max_workers}) cannot be zero or less.")
+
+    max_in_flight = max_workers * 2
+    iterator = enumerate(items)
+    pending: Dict[Future, Tuple[int, Any]] = {}
+    exhausted = False
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="alfred-worker"
+    )
+    try:
+        while True:
+            cancelled = cancel_event is not None and cancel_event.is_set()
+            if cancelled:
+                for future in pending:
+                    future.cancel()
+
+            while not exhausted and not cancelled and len(pending) < max_in_flight:
+                try:
+                    index, item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(func, item)] = (index, item)
+
+            if not pending:
+                return
+
+            # Wake up periodically so a cancellation is noticed while waiting.
+            done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as err:  # pylint: disable=W0703
+                    # Includes CancelledError for queued calls.
+                    yield index, item, None, err
+                else:
+                    yield index, item, result, None
+    finally:
+        # Reached on completion, on cancellation and when the consumer stops
+        # iterating early: drop queued calls and wait for running ones.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def iter_prefetched(
+    func: Callable[[Any], Any], items: Iterable[Any], depth: int = 2
+) -> Iterator[Any]:
+    """
+    Yield `func(item)` for each item, in input order, while calling `func` on
+    the next `depth` items in the background.
+
+    Useful to overlap the latency of fetching the next pages with the
+    processing of the current one. Items are pulled lazily, so `items` can be
+    infinite: stop iterating (or close the generator) once done, and the
+    calls already scheduled are cancelled or waited for. An error raised by
+    `func` is raised when its result is reached.
+
+    Args:
+    - func: Callable applied to each item.
+    - items: Iterable of items. Can be a generator.
+    - depth: Number of calls running ahead of the consumer. With 0, calls
+      are made synchronously.
+    """
+    if depth < 0:
+        raise ValueError(f"Prefetch depth ({depth}) cannot be less than zero.")
+
+    iterator = iter(items)
+    if depth == 0:
+        for item in iterator:
+            yield func(item)
+        return
+
+    pending: Deque[Future] = deque()
+    executor = ThreadPoolExecutor(max_workers=depth, thread_name_prefix="alfred-prefetch")
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) <= depth:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.append(executor.submit(func, item))
+
+            if not pending:
+                return
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
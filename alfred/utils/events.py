@@ -0,0 +1,45 @@
+# Native imports
+import json
+from typing import Any, Dict, Optional, Text, Tuple
+
+__all__ = ["extract_entity_id"]
+
+# Keys holding the ID of each entity in real-time event payloads, in the
+# different casings used by the API.
+ENTITY_ID_KEYS: Dict[Text, Tuple[Text, ...]] = {
+    "file": ("file_id", "fileId", "FileId"),
+    "job": ("job_id", "jobId", "JobId"),
+    "session": ("session_id", "sessionId", "SessionId"),
+}
+
+
+def extract_entity_id(data: Any, entity: Text) -> Optional[Text]:
+    """
+    Extract the ID of a File, Job or Session from a real-time event payload.
+
+    The payload may be a dictionary or a JSON string, and the ID may be at
+    the top level or nested under "data".
+
+    Args:
+    - data: Event payload.
+    - entity: One of "file", "job" or "session".
+    """
+    keys = ENTITY_ID_KEYS[entity]
+    payload = _as_dict(data)
+    for candidate in (payload, _as_dict(payload.get("data")) if payload else None):
+        if not candidate:
+            continue
+        for key in keys:
+            value = candidate.get(key)
+            if isinstance(value, (str, int)) and not isinstance(value, bool) and value != "":
+                return str(value)
+    return None
+
+
+def _as_dict(data: Any) -> Optional[Dict[Text, Any]]:
+    if isinstance(data, (str, bytes)):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            return None
+    return data if isinstance(data, dict) else None
@@ -0,0 +1,101 @@
+"""
+Measure the cold import time of the SDK.
+
+Each sample imports the module in a fresh interpreter with `-X importtime`,
+so the numbers include everything a short-lived CLI or serverless
+invocation pays before its first request. The script also checks that the
+heavy optional modules are not loaded, and exits with status 1 if any of
+them is, or if the median import time exceeds the budget.
+
+Usage:
+    python benchmarks/import_time.py [--module alfred.rest] [--runs 10] [--budget-ms 500]
+"""
+# Native imports
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Text, Tuple
+
+# Modules that must only be loaded on first use.
+LAZY_MODULES = ("magic", "socketio", "engineio", "aiohttp", "asyncio", "xml.etree.ElementTree")
+
+
+def measure(module: Text) -> Tuple[float, Dict[Text, float], List[Text]]:
+    """
+    Import a module in a fresh interpreter. Returns the total import time in
+    milliseconds, the time spent importing each package (excluding the
+    packages it imports), and the lazy modules that were loaded.
+    """
+    code = (
+        f"import json, sys; import {module}; "
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    packages: Dict[Text, float] = {}
+    total = 0.0
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative, name = line.split("|")
+        try:
+            self_ms = int(self_time.split(":")[1]) / 1000
+            cumulative_ms = int(cumulative) / 1000
+        except ValueError:
+            # Header line.
+            continue
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + self_ms
+        if name.strip() == module:
+            total = cumulative_ms
+
+    return total, packages, json.loads(process.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--module", default="alfred.rest", help="Module to import.")
+    parser.add_argument("--runs", type=int, default=10, help="Number of cold imports.")
+    parser.add_argument(
+        "--budget-ms", type=float, default=None, help="Maximum median import time."
+    )
+    args = parser.parse_args()
+
+    totals: List[float] = []
+    packages: Dict[Text, List[float]] = {}
+    loaded = set()
+    for _ in range(args.runs):
+        total, run_packages, run_loaded = measure(args.module)
+        totals.append(total)
+        loaded.update(run_loaded)
+        for package, elapsed in run_packages.items():
+            packages.setdefault(package, []).append(elapsed)
+
+    median = statistics.median(totals)
+    print(f"import {args.module}: median {median:.1f} ms, min {min(totals):.1f} ms "
+          f"over {args.runs} runs")
+    print("Slowest packages (median self time, ms):")
+    slowest = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))
+    for package, elapsed in slowest[:10]:
+        print(f"  {package:<30} {statistics.median(elapsed):8.1f}")
+
+    failed = False
+    if loaded:
+        print(f"Modules that should be loaded lazily: {', '.join(sorted(loaded))}")
+        failed = True
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"Median import time exceeds the budget of {args.budget_ms:.0f} ms.")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
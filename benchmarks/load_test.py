@@ -0,0 +1,243 @@
+"""
+Load-test the SDK against a local stand-in of the Alfred API.
+
+Each scenario sends requests through an `AlfredClient` from a pool of
+worker threads, at every concurrency level, against the in-process server
+in `server.py`. The server can add latency, enforce a rate limit and inject
+errors, so retries and throttling are part of the measurement. For each run
+the script reports the throughput, the p50 and p99 latency, the failed
+requests, the retries and the memory used.
+
+The server shares the interpreter, and thus the GIL, with the client, so the
+absolute numbers are pessimistic: compare runs with each other rather than
+with production figures.
+
+Usage:
+    python benchmarks/load_test.py [--scenario get,upload,download,streaming,paging]
+        [--concurrency 1,8,32] [--requests 500] [--latency-ms 5]
+        [--error-rate 0.01] [--rate-limit 1000] [--trace-memory] [--json]
+"""
+# Native imports
+import argparse
+import itertools
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Project imports
+from alfred.base.config import Configuration  # noqa: E402
+from alfred.rest import AlfredClient  # noqa: E402
+from server import StandInServer  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # Not available on Windows.
+    resource = None
+
+SCENARIOS = ("get", "upload", "download", "streaming", "paging")
+
+
+def build_operation(client: AlfredClient, scenario: Text, upload_size: int) -> Callable[[int], Any]:
+    """
+    Get the function sending the `index`-th request of a scenario.
+    """
+    if scenario == "get":
+        return lambda index: client.files.get(str(uuid.uuid4()))
+    if scenario == "upload":
+        content = os.urandom(upload_size)
+        return lambda index: client.files.upload_file(
+            {"file": BytesIO(content), "filename": f"bench-{index}.pdf"}
+        )
+    if scenario == "download":
+        return lambda index: client.files.download(str(uuid.uuid4()))
+    if scenario == "streaming":
+        # Streamed chunk by chunk to a discarding file, so memory stays bounded.
+        def download_to(index):
+            with open(os.devnull, "wb") as sink:
+                return client.files.download_to(str(uuid.uuid4()), sink)
+        return download_to
+    if scenario == "paging":
+        return lambda index: client.jobs.get_all(page_size=100, current_page=index % 10 + 1)
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Get a percentile of sorted samples, by the nearest-rank method.
+    """
+    if not samples:
+        return 0.0
+    rank = max(int(round(fraction * len(samples) + 0.5)) - 1, 0)
+    return samples[min(rank, len(samples) - 1)]
+
+
+def max_rss_mb() -> Optional[float]:
+    """
+    Get the peak resident set size of the process, in MiB.
+    """
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return usage / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run(
+    server: StandInServer,
+    scenario: Text,
+    concurrency: int,
+    requests: int,
+    upload_size: int,
+    trace_memory: bool,
+) -> Dict[Text, Any]:
+    """
+    Send `requests` requests of a scenario with `concurrency` workers.
+    """
+    client = AlfredClient(
+        Configuration.v1({"base_url": server.base_url}),
+        {"api_key": "benchmark"},
+        {"max_retries": 3, "pool_connections": True, "timeout": 30, "metrics": True},
+    )
+    operation = build_operation(client, scenario, upload_size)
+    server.reset_stats()
+
+    def timed(index: int) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            operation(index)
+        except Exception:  # pylint: disable=W0703
+            return None
+        return time.perf_counter() - start
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, range(requests)))
+    elapsed = time.perf_counter() - start
+    traced_peak = None
+    if trace_memory:
+        traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+    latencies = sorted(result for result in results if result is not None)
+    snapshot = client.http_client.metrics.snapshot()
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": requests,
+        "failed": requests - len(latencies),
+        "retries": snapshot["retries"],
+        "throttled_seconds": round(snapshot["throttled_seconds"], 3),
+        "requests_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "traced_peak_mb": round(traced_peak, 2) if traced_peak is not None else None,
+        "max_rss_mb": round(max_rss_mb(), 1) if resource is not None else None,
+        "server_errors": server.stats()["errors"],
+    }
+
+
+def print_table(results: List[Dict[Text, Any]]):
+    columns = (
+        ("scenario", "scenario", "{:<9}"),
+        ("concurrency", "conc", "{:>5}"),
+        ("requests_per_second", "req/s", "{:>9}"),
+        ("p50_ms", "p50 ms", "{:>8}"),
+        ("p99_ms", "p99 ms", "{:>8}"),
+        ("failed", "failed", "{:>7}"),
+        ("retries", "retries", "{:>8}"),
+        ("traced_peak_mb", "traced MiB", "{:>11}"),
+        ("max_rss_mb", "RSS MiB", "{:>8}"),
+    )
+    print("  ".join(fmt.format(title) for _, title, fmt in columns))
+    for result in results:
+        print("  ".join(
+            fmt.format("-" if result[key] is None else result[key]) for key, _, fmt in columns
+        ))
+
+
+def parse_list(value: Text) -> List[Text]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scenario", default=",".join(SCENARIOS),
+        help=f"Comma-separated scenarios among {', '.join(SCENARIOS)}.",
+    )
+    parser.add_argument(
+        "--concurrency", default="1,8,32", help="Comma-separated numbers of workers."
+    )
+    parser.add_argument("--requests", type=int, default=500, help="Requests per run.")
+    parser.add_argument(
+        "--latency-ms", type=float, default=5, help="Latency added by the server."
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0, help="Maximum random latency added on top."
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0, help="Fraction of requests answered with a 503."
+    )
+    parser.add_argument(
+        "--rate-limit", type=int, default=None, help="Requests allowed per minute by the server."
+    )
+    parser.add_argument(
+        "--file-size", type=int, default=256 * 1024, help="Size of downloaded files in bytes."
+    )
+    parser.add_argument(
+        "--upload-size", type=int, default=256 * 1024, help="Size of uploaded files in bytes."
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="Measure the peak memory allocated during each run with tracemalloc (slower).",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    # Throttling and retries are reported in the results rather than logged.
+    logging.getLogger("alfred-python").setLevel(logging.ERROR)
+
+    scenarios = parse_list(args.scenario)
+    unknown = [scenario for scenario in scenarios if scenario not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    levels = [int(level) for level in parse_list(args.concurrency)]
+
+    results = []
+    with StandInServer(
+        latency=args.latency_ms / 1000,
+        latency_jitter=args.jitter_ms / 1000,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        file_size=args.file_size,
+        seed=0,
+    ) as server:
+        for scenario, concurrency in itertools.product(scenarios, levels):
+            results.append(
+                run(server, scenario, concurrency, args.requests, args.upload_size,
+                    args.trace_memory)
+            )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
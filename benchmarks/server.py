@@ -0,0 +1,335 @@
+"""
+In-process stand-in for the Alfred v1 API, used by the load-test benchmarks.
+
+It serves the endpoints called by the SDK with canned payloads, and can add
+latency, send rate limit headers (answering 429 once the limit is reached)
+and inject errors, so the client can be measured without a real backend.
+
+Usage:
+    with StandInServer(latency=0.02, error_rate=0.01) as server:
+        client = AlfredClient({"base_url": server.base_url, "version": 1}, ...)
+"""
+# Native imports
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Text, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+__all__ = ["StandInServer"]
+
+DEFAULT_FILE_SIZE = 256 * 1024
+
+
+def build_file_details(file_id: Text) -> Dict[Text, Any]:
+    return {
+        "id": file_id,
+        "creation_date": "2024-01-01T00:00:00Z",
+        "update_date": "2024-01-01T00:00:00Z",
+        "file_name": f"{file_id}.pdf",
+        "file_name_without_extension": file_id,
+        "blob_name": f"blobs/{file_id}",
+        "blob_url": f"https://storage.example.com/blobs/{file_id}",
+        "user_name": "bench@example.com",
+        "md5_hash": "d41d8cd98f00b204e9800998ecf8427e",
+        "content_type": "application/pdf",
+        "channel": "api",
+        "should_be_classified": True,
+        "classifier": "default",
+        "classification_score": 0.97,
+        "status": "completed",
+        "input_type": "file",
+        "is_duplicate": False,
+        "is_duplicate_by_values": False,
+        "duplicate_origin_id": None,
+        "tag_id": "tag-1",
+        "is_parent": False,
+        "parent_id": None,
+        "deferred_session_id": None,
+        "tag_name": "Invoice",
+        "company_id": "company-1",
+        "file_size": DEFAULT_FILE_SIZE,
+        "proposed_tag_id": None,
+        "proposed_tag_variance": None,
+        "classification_score_above_deviation": True,
+        "confirmed_tag_id": None,
+        "confirmed_by": None,
+        "manual_classification": False,
+        "metadata": json.dumps({"source": "benchmark"}),
+        "page_count": 1,
+        "page_number": 1,
+    }
+
+
+def build_job(job_id: Text) -> Dict[Text, Any]:
+    return {
+        "id": job_id,
+        "creation_date": "2024-01-01T00:00:00Z",
+        "stage": "finished",
+        "company_id": "company-1",
+        "channel": "api",
+        "file_ids": [f"{job_id}-file"],
+        "metadata": json.dumps({"source": "benchmark", "batch": job_id[-1:]}),
+    }
+
+
+class StandInServer:
+    """
+    Threaded HTTP server answering the v1 endpoints used by the SDK:
+    `/token`, `/api/file/*`, `/api/job/*`, `/api/deferred/*` and `/api/values/*`.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0,
+        latency_jitter: float = 0,
+        rate_limit: Optional[int] = None,
+        rate_limit_window: float = 60,
+        error_rate: float = 0,
+        error_status: int = 503,
+        file_size: int = DEFAULT_FILE_SIZE,
+        total_jobs: int = 1000,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+        - latency: Seconds added to every response.
+        - latency_jitter: Maximum random seconds added on top of `latency`.
+        - rate_limit: Requests allowed per window. When set, responses carry
+          `X-RateLimit-*` headers and requests past the limit get a 429.
+        - rate_limit_window: Length of the rate limit window in seconds.
+        - error_rate: Fraction of the requests answered with `error_status`.
+        - error_status: Status code of injected errors.
+        - file_size: Size in bytes of downloaded files.
+        - total_jobs: Number of jobs served by the paginated jobs endpoint.
+        - seed: Seed of the latency jitter and error injection.
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.total_jobs = total_jobs
+        self.file_content = bytes(range(256)) * (file_size // 256) + bytes(file_size % 256)
+
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__window_start = time.time()
+        self.__window_requests = 0
+        self.__requests: Dict[Text, int] = {}
+        self.__errors = 0
+        self.__httpd: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> Text:
+        host, port = self.__httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        """
+        Start serving on a random local port, in a background thread.
+        """
+        server = self
+
+        class Handler(StandInHandler):
+            stand_in = server
+
+        self.__httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.__httpd.daemon_threads = True
+        # Let every benchmark worker connect at once.
+        self.__httpd.request_queue_size = 1024
+        threading.Thread(target=self.__httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving.
+        """
+        if self.__httpd is not None:
+            self.__httpd.shutdown()
+            self.__httpd.server_close()
+            self.__httpd = None
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def stats(self) -> Dict[Text, Any]:
+        """
+        Get the number of requests served per route and of injected errors.
+        """
+        with self.__lock:
+            return {"requests": dict(self.__requests), "errors": self.__errors}
+
+    def reset_stats(self):
+        with self.__lock:
+            self.__requests.clear()
+            self.__errors = 0
+
+    def admit(self, route: Text) -> Tuple[Optional[int], Dict[Text, Text]]:
+        """
+        Account for a request. Returns the status code of an error to answer
+        with, if any, and the rate limit headers to send.
+        """
+        with self.__lock:
+            self.__requests[route] = self.__requests.get(route, 0) + 1
+            delay = self.latency + self.__random.uniform(0, self.latency_jitter)
+            inject_error = self.error_rate > 0 and self.__random.random() < self.error_rate
+            if inject_error:
+                self.__errors += 1
+
+            headers: Dict[Text, Text] = {}
+            status = self.error_status if inject_error else None
+            if self.rate_limit is not None:
+                now = time.time()
+                if now - self.__window_start >= self.rate_limit_window:
+                    self.__window_start = now
+                    self.__window_requests = 0
+                self.__window_requests += 1
+                reset = math.ceil(self.__window_start + self.rate_limit_window - now)
+                remaining = max(self.rate_limit - self.__window_requests, 0)
+                headers = {
+                    "X-RateLimit-Limit": str(self.rate_limit),
+                    "X-RateLimit-Remaining": str(remaining),
+                    "X-RateLimit-Reset": str(max(reset, 1)),
+                }
+                if self.__window_requests > self.rate_limit:
+                    status = 429
+                    headers["Retry-After"] = str(max(reset, 1))
+
+        if delay > 0:
+            time.sleep(delay)
+        return status, headers
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which would otherwise wait
+    # for the client's delayed ACK.
+    disable_nagle_algorithm = True
+    stand_in: StandInServer
+
+    ROUTES = (
+        ("POST", re.compile(r"^/token$"), "token"),
+        ("GET", re.compile(r"^/api/file/detail/([^/]+)$"), "file_detail"),
+        ("GET", re.compile(r"^/api/file/download/([^/]+)$"), "file_download"),
+        ("POST", re.compile(r"^/api/file/upload$"), "file_upload"),
+        ("POST", re.compile(r"^/api/file/uploadfile$"), "file_upload"),
+        ("POST", re.compile(r"^/api/job/create$"), "job_create"),
+        ("GET", re.compile(r"^/api/job/detail/([^/]+)$"), "job_detail"),
+        ("GET", re.compile(r"^/api/job/all$"), "job_all"),
+        ("POST", re.compile(r"^/api/deferred/create$"), "session_create"),
+        ("GET", re.compile(r"^/api/deferred/detail/([^/]+)$"), "session_detail"),
+        ("GET", re.compile(r"^/api/values/file/([^/]+)$"), "values"),
+    )
+
+    def log_message(self, *_args):
+        pass
+
+    def do_GET(self):  # pylint: disable=C0103
+        self.__handle()
+
+    def do_POST(self):  # pylint: disable=C0103
+        self.__handle()
+
+    def __handle(self):
+        url = urlsplit(self.path)
+        self.__read_body()
+
+        for method, pattern, route in self.ROUTES:
+            match = pattern.match(url.path)
+            if method == self.command and match:
+                break
+        else:
+            self.__send_json(404, {"message": "Not found"})
+            return
+
+        status, headers = self.stand_in.admit(route)
+        if status is not None:
+            self.__send_json(status, {"message": "Injected error"}, headers)
+            return
+
+        argument = match.group(1) if match.groups() else None
+        if route == "file_download":
+            self.__send(200, self.stand_in.file_content, "application/pdf", {
+                **headers,
+                "Content-Disposition": f'attachment; filename="{argument}.pdf"',
+            })
+            return
+
+        self.__send_json(200, self.__payload(route, argument, parse_qs(url.query)), headers)
+
+    def __payload(self, route: Text, argument: Optional[Text], query: Dict[Text, Any]) -> Any:
+        if route == "token":
+            return {"access_token": uuid.uuid4().hex, "token_type": "bearer", "expires_in": 3600}
+        if route == "file_detail":
+            return build_file_details(argument)
+        if route == "file_upload":
+            return {"file_id": str(uuid.uuid4())}
+        if route == "job_create":
+            return {"job_id": str(uuid.uuid4())}
+        if route == "job_detail":
+            return build_job(argument)
+        if route == "job_all":
+            page_size = int(query.get("pageSize", ["10"])[0])
+            current_page = int(query.get("currentPage", ["1"])[0])
+            total = self.stand_in.total_jobs
+            start = (current_page - 1) * page_size
+            return {
+                "result": [
+                    build_job(f"job-{index}")
+                    for index in range(start, min(start + page_size, total))
+                ],
+                "totalCount": total,
+                "totalPages": math.ceil(total / page_size),
+            }
+        if route == "session_create":
+            return {"session_id": str(uuid.uuid4())}
+        if route == "session_detail":
+            return {"id": argument, "status": "open", "files": []}
+        return [{"name": "total", "value": "100.00", "file_id": argument}]
+
+    def __read_body(self):
+        """
+        Read and discard the request body, plain or chunked.
+        """
+        length = self.headers.get("Content-Length")
+        if length:
+            remaining = int(length)
+            while remaining > 0:
+                chunk = self.rfile.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+        elif self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                self.rfile.read(size + 2)
+                if size == 0:
+                    break
+
+    def __send_json(self, status: int, payload: Any, headers: Optional[Dict[Text, Text]] = None):
+        self.__send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def __send(
+        self,
+        status: int,
+        content: bytes,
+        content_type: Text,
+        headers: Optional[Dict[Text, Text]] = None,
+    ):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
@@ -0,0 +1,214 @@
+import asyncio
+import io
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from alfred.base.config import Configuration
+from alfred.rest.jobs.async_v1 import AsyncJobs
+
+try:
+    import aiohttp  # noqa: F401
+    from alfred.http.async_http_client import AsyncHttpClient
+    from alfred.rest import AsyncAlfredClient
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """
+    Minimal handler that records requests and replays queued responses.
+    """
+    def log_message(self, *_args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self.server.requests.append((self.command, self.path, dict(self.headers), body))
+
+        status, payload = 200, {"ok": True}
+        if self.server.responses:
+            status, payload = self.server.responses.pop(0)
+
+        content = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("X-RateLimit-Limit", "100")
+        self.send_header("X-RateLimit-Remaining", "99")
+        self.send_header("X-RateLimit-Reset", "0")
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class FakeAsyncHttpClient:
+    def __init__(self, get_response=None):
+        self.get_response = get_response
+
+    async def get(self, *_args, **_kwargs):
+        return self.get_response, None
+
+
+class TestAsyncJobs(unittest.TestCase):
+    def test_get_normalizes_job_metadata(self):
+        jobs = AsyncJobs(
+            FakeAsyncHttpClient(
+                get_response={"id": "job-1", "metadata": "{\"key\": \"value\"}"}
+            )
+        )
+
+        result = asyncio.run(jobs.get("job-1"))
+
+        self.assertEqual(result, {"id": "job-1", "metadata": {"key": "value"}})
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsyncHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+        self.server.requests = []
+        self.server.responses = []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get_sends_api_key_and_tracks_rate_limit(self):
+        async def run():
+            async with AsyncHttpClient(self.base_url, {"api_key": "key"}) as client:
+                parsed, _ = await client.get("/api/file/detail/1", params={"a": 1})
+                return parsed, client.rate_limit
+
+        parsed, rate_limit = asyncio.run(run())
+
+        method, path, headers, _ = self.server.requests[0]
+        self.assertEqual(parsed, {"ok": True})
+        self.assertEqual((method, path), ("GET", "/api/file/detail/1?a=1"))
+        self.assertEqual(headers.get("X-TagshelfAPI-Key"), "key")
+        self.assertEqual(rate_limit["remaining"], 99)
+
+    def test_hmac_signs_json_body(self):
+        auth = {"hmac": {"api_key": "c2VjcmV0", "secret_key": "public"}}
+
+        async def run():
+            async with AsyncHttpClient(self.base_url, auth) as client:
+                await client.post("/api/job/create", data={"channel": "test"})
+
+        asyncio.run(run())
+
+        _, _, headers, body = self.server.requests[0]
+        self.assertTrue(headers.get("Authorization").startswith("amx public:"))
+        self.assertEqual(json.loads(body), {"channel": "test"})
+
+    def test_retries_idempotent_requests_on_server_errors(self):
+        self.server.responses = [(503, {}), (200, {"id": "job-1"})]
+
+        async def run():
+            async with AsyncHttpClient(self.base_url, {"api_key": "key"}) as client:
+                parsed, _ = await client.get("/api/job/detail/job-1")
+                return parsed
+
+        self.assertEqual(asyncio.run(run()), {"id": "job-1"})
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_file_bodies_are_read_off_the_event_loop(self):
+        threads = set()
+
+        class RecordingFile(io.BytesIO):
+            def read(self, *args):
+                threads.add(threading.get_ident())
+                return super().read(*args)
+
+        async def run():
+            async with AsyncHttpClient(self.base_url, {"api_key": "key"}) as client:
+                await client.post(
+                    "/api/file/upload",
+                    data=RecordingFile(b"x" * 100000),
+                    headers={"Content-Type": "application/pdf", "Content-Length": "100000"},
+                )
+                return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+
+        self.assertEqual(self.server.requests[0][3], b"x" * 100000)
+        self.assertTrue(threads)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_file_bodies_are_resent_whole_after_reauthentication(self):
+        self.server.responses = [
+            (200, {"access_token": "stale"}),
+            (401, {}),
+            (200, {"access_token": "fresh"}),
+            (200, {"ok": True}),
+        ]
+        auth = {"oauth": {"username": "user", "password": "secret"}}
+
+        async def run():
+            async with AsyncHttpClient(self.base_url, auth, {"metrics": True}) as client:
+                parsed, _ = await client.post(
+                    "/api/file/upload",
+                    data=io.BytesIO(b"x" * 100000),
+                    headers={"Content-Type": "application/pdf", "Content-Length": "100000"},
+                )
+                return parsed, client.metrics.snapshot()
+
+        parsed, snapshot = asyncio.run(run())
+
+        uploads = [request for request in self.server.requests if request[1] == "/api/file/upload"]
+        self.assertEqual(parsed, {"ok": True})
+        self.assertEqual([body for *_, body in uploads], [b"x" * 100000] * 2)
+        self.assertEqual(uploads[1][2].get("Authorization"), "Bearer fresh")
+        upload = [item for item in snapshot["endpoints"] if item["endpoint"] == "/api/file/upload"]
+        self.assertEqual(upload[0]["requests"], 1)
+        self.assertEqual(upload[0]["statuses"], {"200": 1})
+        self.assertEqual(upload[0]["reauthentications"], 1)
+
+    def test_iterator_bodies_are_not_resent_after_reauthentication(self):
+        self.server.responses = [(200, {"access_token": "stale"}), (401, {})]
+        auth = {"oauth": {"username": "user", "password": "secret"}}
+
+        async def run():
+            async with AsyncHttpClient(self.base_url, auth) as client:
+                await client.post(
+                    "/api/file/upload",
+                    data=iter([b"x" * 10]),
+                    headers={"Content-Type": "application/pdf", "Content-Length": "10"},
+                )
+
+        with self.assertLogs("alfred-python", "WARNING"):
+            with self.assertRaises(aiohttp.ClientResponseError):
+                asyncio.run(run())
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_client_exposes_awaitable_domains(self):
+        self.server.responses = [(200, {"session_id": "session-1"})]
+        config = Configuration.v1({"base_url": self.base_url})
+
+        async def run():
+            async with AsyncAlfredClient(config, {"api_key": "key"}) as client:
+                return await client.sessions.create()
+
+        self.assertEqual(asyncio.run(run()), {"session_id": "session-1"})
+
+    def test_download_returns_response_body(self):
+        config = Configuration.v1({"base_url": self.base_url})
+
+        async def run():
+            async with AsyncAlfredClient(config, {"api_key": "key"}) as client:
+                return await client.files.download("file-1")
+
+        result = asyncio.run(run())
+
+        self.assertEqual(json.loads(result.get("file").getvalue()), {"ok": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
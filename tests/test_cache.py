@@ -0,0 +1,182 @@
+import unittest
+
+from alfred.base.config import Configuration
+from alfred.rest import AlfredClient
+from alfred.rest.cache import ResponseCache
+from alfred.utils.events import extract_entity_id
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingHttpClient:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, uri, *_args, **_kwargs):
+        self.calls.append(uri)
+        return {"uri": uri, "metadata": None}, None
+
+
+class FakeRealTimeClient:
+    def __init__(self):
+        self.callbacks = {}
+
+    def on_file_event(self, callback):
+        self.on("file_event", callback)
+
+    def on_job_event(self, callback):
+        self.on("job_event", callback)
+
+    def on(self, event, callback):
+        self.callbacks.setdefault(event, []).append(callback)
+
+    def emit(self, event, data):
+        for callback in self.callbacks.get(event, []):
+            callback(data)
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return {"load": self.loads}
+
+    def test_caches_until_domain_ttl_expires(self):
+        cache = ResponseCache({"ttls": {"jobs": 5}}, clock=self.clock)
+
+        self.assertEqual(cache.get_or_load("jobs", "job-1", self.load), {"load": 1})
+        self.clock.now = 4
+        self.assertEqual(cache.get_or_load("jobs", "job-1", self.load), {"load": 1})
+        self.clock.now = 5
+        self.assertEqual(cache.get_or_load("jobs", "job-1", self.load), {"load": 2})
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"]), (1, 2, 1))
+        self.assertEqual(stats["domains"]["jobs"], {"hits": 1, "misses": 2})
+
+    def test_zero_ttl_disables_domain(self):
+        cache = ResponseCache({"ttls": {"sessions": 0}}, clock=self.clock)
+
+        cache.get_or_load("sessions", "session-1", self.load)
+        cache.get_or_load("sessions", "session-1", self.load)
+
+        self.assertEqual(self.loads, 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_evicts_least_recently_used_entries(self):
+        cache = ResponseCache({"max_entries": 2}, clock=self.clock)
+        cache.set("files", "a", 1)
+        cache.set("files", "b", 2)
+        cache.get("files", "a")
+        cache.set("files", "c", 3)
+
+        self.assertEqual(cache.get("files", "a"), 1)
+        self.assertIsNone(cache.get("files", "b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_evicts_to_stay_under_max_bytes(self):
+        cache = ResponseCache({"max_bytes": 3000}, clock=self.clock)
+        for index in range(10):
+            cache.set("files", str(index), {"content": "x" * 500})
+
+        stats = cache.stats()
+        self.assertLessEqual(stats["size"], 3000)
+        self.assertLess(stats["entries"], 10)
+        self.assertIsNotNone(cache.get("files", "9"))
+
+    def test_responses_loaded_before_an_invalidation_are_not_cached(self):
+        cache = ResponseCache(clock=self.clock)
+
+        def stale_load():
+            # An event arrives while the request is in flight.
+            cache.invalidate_file("file-1")
+            return {"stale": True}
+
+        cache.get_or_load("files", "file-1", stale_load)
+
+        self.assertEqual(len(cache), 0)
+
+    def test_handle_event_evicts_referenced_entities(self):
+        cache = ResponseCache(clock=self.clock)
+        cache.set("files", "file-1", {})
+        cache.set("data_points", "file-1", [])
+        cache.set("jobs", "job-1", {})
+        cache.set("jobs", "job-2", {})
+        cache.set("sessions", "session-1", {})
+        cache.set("sessions", "session-2", {})
+
+        cache.handle_event(
+            {"fileId": "file-1", "data": {"job_id": "job-1", "sessionId": "session-1"}}
+        )
+
+        self.assertIsNone(cache.get("files", "file-1"))
+        self.assertIsNone(cache.get("data_points", "file-1"))
+        self.assertIsNone(cache.get("jobs", "job-1"))
+        self.assertEqual(cache.get("jobs", "job-2"), {})
+        self.assertIsNone(cache.get("sessions", "session-1"))
+        self.assertEqual(cache.get("sessions", "session-2"), {})
+
+
+class TestExtractEntityId(unittest.TestCase):
+    def test_supports_key_casings_nesting_and_json_strings(self):
+        self.assertEqual(extract_entity_id({"file_id": "a"}, "file"), "a")
+        self.assertEqual(extract_entity_id({"FileId": "a"}, "file"), "a")
+        self.assertEqual(extract_entity_id('{"data": {"jobId": 7}}', "job"), "7")
+        self.assertEqual(extract_entity_id({"data": '{"job_id": "b"}'}, "job"), "b")
+        self.assertIsNone(extract_entity_id({"job_id": "b"}, "file"))
+        self.assertIsNone(extract_entity_id("not json", "file"))
+
+
+class TestAlfredClientCache(unittest.TestCase):
+    def setUp(self):
+        self.http_client = CountingHttpClient()
+        self.client = AlfredClient(
+            Configuration.v1(), {}, http_client=self.http_client, cache_config={}
+        )
+
+    def test_repeated_reads_hit_the_cache(self):
+        for _ in range(3):
+            self.client.files.get("file-1")
+            self.client.jobs.get("job-1")
+            self.client.sessions.get("session-1")
+            self.client.data_points.get_values("file-1")
+
+        self.assertEqual(len(self.http_client.calls), 4)
+        self.assertEqual(self.client.cache.stats()["hits"], 8)
+
+    def test_realtime_events_evict_cached_entities(self):
+        realtime_client = FakeRealTimeClient()
+        self.client.bind_realtime(realtime_client)
+        self.client.files.get("file-1")
+        self.client.jobs.get("job-1")
+
+        realtime_client.emit("file_update_event", {"fileId": "file-1"})
+        self.client.files.get("file-1")
+        self.client.jobs.get("job-1")
+
+        self.assertEqual(
+            self.http_client.calls,
+            ["/api/file/detail/file-1", "/api/job/detail/job-1", "/api/file/detail/file-1"],
+        )
+
+    def test_cache_is_disabled_by_default(self):
+        client = AlfredClient(Configuration.v1(), {}, http_client=self.http_client)
+
+        client.files.get("file-1")
+        client.files.get("file-1")
+
+        self.assertIsNone(client.cache)
+        self.assertEqual(len(self.http_client.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from alfred.http.codec import (
+    JsonCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+    get_json_codec,
+)
+from alfred.http.http_client import HttpClient
+from alfred.rest.jobs.normalize import normalize_job_response
+from alfred.rest.jobs.v1 import Jobs
+
+try:
+    import orjson  # noqa: F401
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class RecordingCodec(StdlibJsonCodec):
+    def __init__(self):
+        self.dumped = []
+        self.loaded = []
+
+    def dumps(self, value):
+        self.dumped.append(value)
+        return super().dumps(value)
+
+    def loads(self, data):
+        self.loaded.append(data)
+        return super().loads(data)
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    def log_message(self, *_args):
+        pass
+
+    def do_POST(self):  # pylint: disable=C0103
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.bodies.append(body)
+        content = json.dumps(
+            {"id": "job-1", "metadata": json.dumps({"echo": json.loads(body or b"null")})}
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST
+
+
+class TestGetJsonCodec(unittest.TestCase):
+    def test_resolves_codec_settings(self):
+        codec = RecordingCodec()
+
+        self.assertIsInstance(get_json_codec(None), StdlibJsonCodec)
+        self.assertIsInstance(get_json_codec("json"), StdlibJsonCodec)
+        self.assertIs(get_json_codec(codec), codec)
+        with self.assertRaises(ValueError):
+            get_json_codec("yaml")
+
+    def test_custom_codecs_must_implement_dumps_and_loads(self):
+        class PartialCodec(JsonCodec):
+            def dumps(self, value):
+                return b"null"
+
+        with self.assertRaises(TypeError):
+            PartialCodec()
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_codec_matches_stdlib_semantics(self):
+        codec = get_json_codec("auto")
+        value = {"name": "façade", 1: [1.5, None, True]}
+
+        self.assertIsInstance(codec, OrjsonCodec)
+        self.assertEqual(codec.loads(codec.dumps(value)), json.loads(json.dumps(value)))
+        with self.assertRaises(ValueError):
+            codec.loads(b"{invalid")
+
+
+class TestHttpClientJsonCodec(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+        self.server.bodies = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.codec = RecordingCodec()
+        self.http_client = HttpClient(
+            f"http://127.0.0.1:{self.server.server_address[1]}",
+            {"api_key": "key"},
+            {"json_codec": self.codec},
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_codec_encodes_requests_and_decodes_responses_and_metadata(self):
+        job = Jobs(self.http_client).create({"session_id": "session-1"})
+
+        self.assertEqual(json.loads(self.server.bodies[0]), {"session_id": "session-1"})
+        self.assertEqual(self.codec.dumped, [{"session_id": "session-1"}])
+        self.assertEqual(len(self.codec.loaded), 1)
+
+        Jobs(self.http_client).get("job-1")
+        # Response body and job metadata.
+        self.assertEqual(len(self.codec.loaded), 3)
+        self.assertEqual(job["id"], "job-1")
+
+
+class TestNormalizeWithCodec(unittest.TestCase):
+    def test_metadata_is_decoded_with_the_given_codec(self):
+        codec = RecordingCodec()
+
+        jobs = normalize_job_response(
+            {"result": [{"metadata": '{"a": 1}'}, {"metadata": "not json"}]}, codec
+        )
+
+        self.assertEqual([job["metadata"] for job in jobs["result"]], [{"a": 1}, {}])
+        self.assertEqual(codec.loaded, ['{"a": 1}', "not json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
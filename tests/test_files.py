@@ -0,0 +1,311 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from urllib3 import encode_multipart_formdata
+
+from alfred.http.http_client import HttpClient
+from alfred.http.multipart import MultipartEncoder
+from alfred.rest.files.v1 import Files
+from alfred.utils.concurrency import run_concurrently
+
+FILE_CONTENT = os.urandom(256 * 1024)
+
+
+def duplicate_content(file_id):
+    return hashlib.sha256(file_id.encode("utf-8")).digest() * 8192
+
+
+class DownloadHandler(BaseHTTPRequestHandler):
+    def log_message(self, *_args):
+        pass
+
+    def end_headers(self):
+        self.send_header("X-RateLimit-Limit", "1000")
+        self.send_header("X-RateLimit-Remaining", "1000")
+        super().end_headers()
+
+    def do_GET(self):  # pylint: disable=C0103
+        file_id = self.path.rsplit("/", 1)[-1]
+        content, name = FILE_CONTENT, f"report%20{file_id}.pdf"
+        if file_id.startswith("scan-"):
+            # Files sharing a name, with distinct content.
+            content, name = duplicate_content(file_id), "scan.pdf"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{name}")
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):  # pylint: disable=C0103
+        body = self.rfile.read(int(self.headers.get("Content-Length")))
+        self.server.uploads.append((dict(self.headers), body))
+
+        content = json.dumps({"file_id": "file-1"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class TestFilesStreaming(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), DownloadHandler)
+        self.server.uploads = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.files = Files(HttpClient(self.base_url, {"api_key": "key"}))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_iter_download_yields_bounded_chunks(self):
+        download = self.files.iter_download("final", chunk_size=1024)
+        chunks = list(download.get("chunks"))
+
+        self.assertTrue(all(len(chunk) <= 1024 for chunk in chunks))
+        self.assertEqual(b"".join(chunks), FILE_CONTENT)
+        self.assertEqual(download.get("mime_type"), "application/pdf")
+        self.assertEqual(download.get("original_name"), "report final.pdf")
+        self.assertEqual(download.get("content_length"), len(FILE_CONTENT))
+
+    def test_download_to_directory_uses_original_name(self):
+        with tempfile.TemporaryDirectory() as directory:
+            result = self.files.download_to("final", directory)
+
+            self.assertEqual(result.get("path"), os.path.join(directory, "report final.pdf"))
+            self.assertEqual(result.get("size"), len(FILE_CONTENT))
+            self.assertEqual(os.listdir(directory), ["report final.pdf"])
+            with open(result.get("path"), "rb") as file:
+                self.assertEqual(file.read(), FILE_CONTENT)
+
+    def test_download_to_file_object(self):
+        buffer = io.BytesIO()
+
+        result = self.files.download_to("file-1", buffer)
+
+        self.assertIsNone(result.get("path"))
+        self.assertEqual(buffer.getvalue(), FILE_CONTENT)
+
+    def test_download_to_closes_the_response_when_the_sink_cannot_be_opened(self):
+        responses = []
+        get = self.files.http_client.get
+
+        def recording_get(*args, **kwargs):
+            parsed, response = get(*args, **kwargs)
+            responses.append(response)
+            return parsed, response
+
+        self.files.http_client.get = recording_get
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(FileNotFoundError):
+                self.files.download_to("final", os.path.join(directory, "missing", "file.pdf"))
+
+        self.assertEqual(len(responses), 1)
+        self.assertTrue(responses[0].raw.closed)
+
+    def test_download_to_path_applies_the_umask(self):
+        umask = os.umask(0o027)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                result = self.files.download_to("final", os.path.join(directory, "file.pdf"))
+
+                self.assertEqual(os.stat(result.get("path")).st_mode & 0o777, 0o640)
+                self.assertEqual(os.listdir(directory), ["file.pdf"])
+        finally:
+            os.umask(umask)
+
+    def test_download_many_streams_files_to_directory(self):
+        file_ids = [f"file-{index}" for index in range(10)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            results = list(self.files.download_many(file_ids, directory, max_workers=4))
+
+            self.assertEqual(sorted(result["file_id"] for result in results), sorted(file_ids))
+            self.assertTrue(all(result["error"] is None for result in results))
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                sorted(f"report {file_id}.pdf" for file_id in file_ids),
+            )
+
+    def test_download_many_stores_files_sharing_a_name_under_distinct_names(self):
+        file_ids = [f"scan-{index}" for index in range(4)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            results = list(self.files.download_many(file_ids, directory, max_workers=4))
+
+            self.assertEqual([result["error"] for result in results], [None] * 4)
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                ["scan (1).pdf", "scan (2).pdf", "scan (3).pdf", "scan.pdf"],
+            )
+            for result in results:
+                with open(result["result"]["path"], "rb") as file:
+                    self.assertEqual(file.read(), duplicate_content(result["file_id"]))
+
+    def test_upload_path_streams_multipart_body_signed_with_hmac(self):
+        auth = {"hmac": {"api_key": "c2VjcmV0", "secret_key": "public"}}
+        files = Files(HttpClient(self.base_url, auth))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scan.pdf")
+            with open(path, "wb") as file:
+                file.write(b"%PDF-1.4" + FILE_CONTENT)
+
+            result = files.upload_path({"path": path, "session_id": "session-1"})
+
+        headers, body = self.server.uploads[0]
+        self.assertEqual(result, {"file_id": "file-1"})
+        self.assertTrue(headers.get("Authorization").startswith("amx public:"))
+        self.assertIn(b'name="file"; filename="scan.pdf"', body)
+        self.assertIn(b"Content-Type: application/pdf", body)
+        self.assertIn(b"%PDF-1.4" + FILE_CONTENT, body)
+
+
+class TestMultipartEncoder(unittest.TestCase):
+    def test_matches_urllib3_encoding(self):
+        file = io.BytesIO(FILE_CONTENT)
+        fields = {"session_id": "session-1", "metadata": "{}"}
+        encoder = MultipartEncoder(
+            fields, {"file": ("a \"b\".pdf", file, "application/pdf")}, chunk_size=1000
+        )
+
+        expected, content_type = encode_multipart_formdata(
+            list(fields.items())
+            + [("file", ("a \"b\".pdf", FILE_CONTENT, "application/pdf"))],
+            boundary=encoder.boundary,
+        )
+
+        body = b"".join(encoder)
+        self.assertEqual(body, expected)
+        self.assertEqual(len(encoder), len(expected))
+        self.assertEqual(encoder.content_type, content_type)
+        # The encoder can be consumed again, e.g. to hash the body before sending it.
+        md5_hash = hashlib.md5()
+        encoder.update_hash(md5_hash)
+        self.assertEqual(md5_hash.digest(), hashlib.md5(expected).digest())
+
+
+class ConcurrentUploadHttpClient:
+    """
+    Fake HTTP client that records the peak number of concurrent uploads.
+    """
+    pool_maxsize = 4
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    def post(self, *_args, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.calls += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            body = b"".join(kwargs.get("data"))
+            if b"broken" in body:
+                raise IOError("upload failed")
+            threading.Event().wait(0.01)
+            return {"file_id": "file-1"}, None
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestFilesUploadMany(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for index in range(20):
+            name = "broken.txt" if index == 3 else f"file-{index}.txt"
+            path = os.path.join(self.directory.name, name)
+            with open(path, "wb") as file:
+                file.write(b"content")
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_uploads_with_bounded_workers_and_reports_errors(self):
+        http_client = ConcurrentUploadHttpClient()
+        progress = []
+
+        results = Files(http_client).upload_many(
+            iter(self.paths),
+            session_id="session-1",
+            on_progress=lambda completed, _result: progress.append(completed),
+        )
+
+        self.assertEqual([result["index"] for result in results], list(range(20)))
+        self.assertEqual(results[0]["result"], {"file_id": "file-1"})
+        self.assertIsInstance(results[3]["error"], IOError)
+        self.assertEqual(progress, list(range(1, 21)))
+        self.assertLessEqual(http_client.peak, ConcurrentUploadHttpClient.pool_maxsize)
+        self.assertGreater(http_client.peak, 1)
+
+    def test_cancel_event_stops_scheduling_uploads(self):
+        http_client = ConcurrentUploadHttpClient()
+        cancel_event = threading.Event()
+
+        results = Files(http_client).upload_many(
+            self.paths,
+            session_id="session-1",
+            max_workers=1,
+            on_progress=lambda *_args: cancel_event.set(),
+            cancel_event=cancel_event,
+        )
+
+        # Only the running upload and the one queued behind it were scheduled.
+        self.assertLessEqual(http_client.calls, 2)
+        self.assertLessEqual(len(results), 2)
+
+
+class DetailsHttpClient:
+    pool_maxsize = 4
+
+    def get(self, uri, *_args, **_kwargs):
+        file_id = uri.rsplit("/", 1)[-1]
+        if file_id == "missing":
+            raise LookupError(file_id)
+        return {"id": file_id}, None
+
+
+class TestFilesGetMany(unittest.TestCase):
+    def test_yields_details_and_errors_per_file(self):
+        results = Files(DetailsHttpClient()).get_many(["file-1", "missing", "file-2"])
+
+        by_id = {result["file_id"]: result for result in results}
+
+        self.assertEqual(by_id["file-1"]["result"], {"id": "file-1"})
+        self.assertEqual(by_id["file-2"]["result"], {"id": "file-2"})
+        self.assertIsInstance(by_id["missing"]["error"], LookupError)
+
+
+class TestRunConcurrently(unittest.TestCase):
+    def test_pulls_items_lazily(self):
+        pulled = []
+
+        def items():
+            for index in range(1000):
+                pulled.append(index)
+                yield index
+
+        results = run_concurrently(lambda item: item * 2, items(), max_workers=2)
+        next(results)
+        results.close()
+
+        self.assertLess(len(pulled), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
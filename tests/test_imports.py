@@ -0,0 +1,33 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# Modules that must only be loaded on first use.
+LAZY_MODULES = ["magic", "socketio", "engineio", "aiohttp", "asyncio", "xml.etree.ElementTree"]
+
+
+def loaded_modules(statement):
+    code = f"import json, sys; {statement}; print(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(json.loads(output))
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_rest_client_does_not_load_heavy_modules(self):
+        modules = loaded_modules(
+            "from alfred.rest import AlfredClient; import alfred.http; import alfred.realtime"
+        )
+
+        self.assertEqual([module for module in LAZY_MODULES if module in modules], [])
+
+    def test_async_client_is_importable_on_demand(self):
+        modules = loaded_modules("from alfred.http import AsyncHttpClient")
+
+        self.assertIn("alfred.http.async_http_client", modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+
+from alfred.http.codec import StdlibJsonCodec
+from alfred.rest.jobs.normalize import JobView, normalize_job_response
+from alfred.rest.jobs.v1 import Jobs
+from alfred.rest.models import Job
+
+
+class CountingCodec(StdlibJsonCodec):
+    def __init__(self):
+        self.calls = 0
+
+    def loads(self, data):
+        self.calls += 1
+        return super().loads(data)
+
+
+class FakeHttpClient:
+    def __init__(self, get_response=None, json_codec=None):
+        self.get_response = get_response
+        self.json_codec = json_codec
+
+    def get(self, *_args, **_kwargs):
+        return self.get_response, None
+
+
+def build_page(count, metadata='{"source": "api"}'):
+    return {
+        "result": [{"id": f"job-{index}", "metadata": metadata} for index in range(count)],
+        "totalPages": 1,
+    }
+
+
+class TestLazyJobNormalization(unittest.TestCase):
+    def test_views_wrap_jobs_without_copying_or_parsing(self):
+        codec = CountingCodec()
+        payload = build_page(3)
+
+        response = normalize_job_response(payload, codec, JobView)
+
+        self.assertIsInstance(response["result"][0], JobView)
+        self.assertIs(response["result"][0]._job, payload["result"][0])
+        self.assertEqual(response["result"][0]["id"], "job-0")
+        self.assertEqual(codec.calls, 0)
+
+    def test_metadata_is_parsed_on_first_access_and_memoized(self):
+        codec = CountingCodec()
+        view = normalize_job_response({"id": "job-1", "metadata": '{"a": 1}'}, codec, JobView)
+
+        self.assertEqual(view["metadata"], {"a": 1})
+        self.assertIs(view.metadata, view["metadata"])
+        self.assertEqual(codec.calls, 1)
+
+    def test_identical_metadata_is_parsed_once_per_page(self):
+        codec = CountingCodec()
+        jobs = normalize_job_response(build_page(100), codec, JobView)["result"]
+
+        metadata = [job["metadata"] for job in jobs]
+
+        self.assertEqual(codec.calls, 1)
+        self.assertTrue(all(item is metadata[0] for item in metadata))
+
+    def test_views_match_eager_normalization(self):
+        payload = {"result": [{"id": "job-1", "metadata": "not-json"}, {"id": "job-2"}]}
+
+        eager = normalize_job_response(payload)["result"]
+        lazy = normalize_job_response(payload, model=JobView)["result"]
+
+        self.assertEqual([view.to_dict() for view in lazy], eager)
+        self.assertEqual(lazy, eager)
+        self.assertEqual(list(lazy[1]), ["id", "metadata"])
+        self.assertIn("metadata", lazy[1])
+        self.assertEqual(len(lazy[1]), 2)
+
+    def test_views_are_read_only(self):
+        view = JobView({"id": "job-1"})
+
+        with self.assertRaises(TypeError):
+            view["id"] = "job-2"
+        with self.assertRaises(AttributeError):
+            view.other = 1
+
+    def test_jobs_return_views_in_lazy_mode(self):
+        codec = CountingCodec()
+        jobs = Jobs(FakeHttpClient(build_page(10), codec), lazy=True)
+
+        page = jobs.get_all()
+        iterated = list(jobs.iter_all(prefetch=0))
+
+        self.assertTrue(all(isinstance(job, JobView) for job in page["result"]))
+        self.assertEqual(len(iterated), 10)
+        self.assertEqual([job["metadata"] for job in iterated][-1], {"source": "api"})
+        self.assertEqual(codec.calls, 1)
+
+    def test_models_take_precedence_and_share_parsed_metadata(self):
+        codec = CountingCodec()
+        jobs = Jobs(FakeHttpClient(build_page(5), codec), models=True, lazy=True)
+
+        result = jobs.get_all()["result"]
+
+        self.assertTrue(all(isinstance(job, Job) for job in result))
+        self.assertEqual([job.metadata for job in result], [{"source": "api"}] * 5)
+        self.assertEqual(codec.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
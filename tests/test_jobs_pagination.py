@@ -0,0 +1,132 @@
+import json
+import threading
+import unittest
+
+from alfred.rest.jobs.v1 import Jobs
+from alfred.utils.concurrency import iter_prefetched
+
+
+class PagedHttpClient:
+    """
+    Fake HTTP client serving `total` jobs, with an optional cap on the page size.
+    It can also ignore the requested page, or report a stale page number.
+    """
+    def __init__(
+        self, total, max_page_size=None, report_totals=True, ignore_page=False, stale_page=False
+    ):
+        self.total = total
+        self.max_page_size = max_page_size
+        self.report_totals = report_totals
+        self.ignore_page = ignore_page
+        self.stale_page = stale_page
+        self.requested_pages = []
+        self.lock = threading.Lock()
+
+    def get(self, uri, params=None, *_args, **_kwargs):
+        page_size = params.get("pageSize")
+        if self.max_page_size:
+            page_size = min(page_size, self.max_page_size)
+        current_page = params.get("currentPage")
+        with self.lock:
+            self.requested_pages.append(current_page)
+        if self.ignore_page:
+            current_page = 1
+
+        start = (current_page - 1) * page_size
+        jobs = [
+            {"id": f"job-{index}", "metadata": json.dumps({"index": index})}
+            for index in range(start, min(start + page_size, self.total))
+        ]
+        payload = {"result": jobs}
+        if self.report_totals:
+            payload["totalCount"] = self.total
+        if self.stale_page:
+            payload["currentPage"] = 1
+        return payload, None
+
+
+class TestJobsIterAll(unittest.TestCase):
+    def test_walks_all_pages_and_normalizes_metadata(self):
+        http_client = PagedHttpClient(total=25)
+
+        jobs = list(Jobs(http_client).iter_all(page_size=10))
+
+        self.assertEqual([job["id"] for job in jobs], [f"job-{i}" for i in range(25)])
+        self.assertEqual(jobs[24]["metadata"], {"index": 24})
+        # Pages beyond the reported total are never requested.
+        self.assertEqual(sorted(http_client.requested_pages), [1, 2, 3])
+
+    def test_does_not_request_pages_past_the_reported_total(self):
+        for total in (5, 10, 25, 30):
+            http_client = PagedHttpClient(total=total)
+
+            jobs = list(Jobs(http_client).iter_all(page_size=10, prefetch=2))
+
+            self.assertEqual(len(jobs), total)
+            self.assertEqual(
+                sorted(http_client.requested_pages), list(range(1, -(-total // 10) + 1))
+            )
+
+    def test_stops_when_the_api_repeats_a_page(self):
+        http_client = PagedHttpClient(total=100, report_totals=False, ignore_page=True)
+
+        jobs = list(Jobs(http_client).iter_all(page_size=10, prefetch=0))
+
+        self.assertEqual([job["id"] for job in jobs], [f"job-{i}" for i in range(10)])
+        self.assertEqual(http_client.requested_pages, [1, 2])
+
+    def test_stops_when_the_reported_page_does_not_advance(self):
+        http_client = PagedHttpClient(total=100, report_totals=False, stale_page=True)
+
+        jobs = list(Jobs(http_client).iter_all(page_size=10, prefetch=0))
+
+        self.assertEqual(len(jobs), 10)
+        self.assertEqual(http_client.requested_pages, [1, 2])
+
+    def test_stops_on_short_page_without_totals(self):
+        http_client = PagedHttpClient(total=25, report_totals=False)
+
+        jobs = list(Jobs(http_client).iter_all(page_size=10, prefetch=0))
+
+        self.assertEqual(len(jobs), 25)
+        self.assertEqual(http_client.requested_pages, [1, 2, 3])
+
+    def test_handles_page_size_capped_by_the_api(self):
+        http_client = PagedHttpClient(total=120, max_page_size=50, report_totals=False)
+
+        jobs = list(Jobs(http_client).iter_all(page_size=100, prefetch=0))
+
+        self.assertEqual(len(jobs), 120)
+        self.assertEqual(http_client.requested_pages, [1, 2, 3])
+
+    def test_prefetch_is_bounded_when_consumer_stops_early(self):
+        http_client = PagedHttpClient(total=10000)
+
+        iterator = Jobs(http_client).iter_all(page_size=10, prefetch=2)
+        next(iterator)
+        iterator.close()
+
+        self.assertLessEqual(len(http_client.requested_pages), 3)
+
+
+class TestIterPrefetched(unittest.TestCase):
+    def test_yields_results_in_order(self):
+        results = list(iter_prefetched(lambda item: item * 2, range(20), depth=3))
+
+        self.assertEqual(results, [item * 2 for item in range(20)])
+
+    def test_raises_errors_when_reached(self):
+        def func(item):
+            if item == 2:
+                raise ValueError(item)
+            return item
+
+        results = iter_prefetched(func, range(5), depth=2)
+
+        self.assertEqual([next(results), next(results)], [0, 1])
+        with self.assertRaises(ValueError):
+            next(results)
+
+
+if __name__ == "__main__":
+    unittest.main()
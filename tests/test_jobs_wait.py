@@ -0,0 +1,195 @@
+import threading
+import time
+import unittest
+
+from requests import Response
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError, Timeout
+
+from alfred.base.exceptions import AlfredTimeoutException
+from alfred.rest.jobs.v1 import Jobs
+from alfred.rest.jobs.waiter import get_job_status
+
+
+class StagedHttpClient:
+    """
+    Fake HTTP client returning the next stage of each job on every request.
+    """
+    pool_maxsize = 4
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, uri, *_args, **_kwargs):
+        job_id = uri.rsplit("/", 1)[-1]
+        with self.lock:
+            self.calls.append(job_id)
+            stages = self.stages[job_id]
+            stage = stages.pop(0) if len(stages) > 1 else stages[0]
+        if isinstance(stage, Exception):
+            raise stage
+        return {"id": job_id, "stage": stage, "metadata": None}, None
+
+
+class SlowStagedHttpClient(StagedHttpClient):
+    """
+    Staged HTTP client recording how many polls (requests after the first
+    one of each job) are in flight at once.
+    """
+    def __init__(self, stages):
+        super().__init__(stages)
+        self.polling = 0
+        self.max_polling = 0
+
+    def get(self, uri, *args, **kwargs):
+        job_id = uri.rsplit("/", 1)[-1]
+        with self.lock:
+            poll = job_id in self.calls
+            if poll:
+                self.polling += 1
+                self.max_polling = max(self.max_polling, self.polling)
+        try:
+            if poll:
+                time.sleep(0.05)
+            return super().get(uri, *args, **kwargs)
+        finally:
+            if poll:
+                with self.lock:
+                    self.polling -= 1
+
+
+class FakeRealTimeClient:
+    def __init__(self, connected=True):
+        self.connected = connected
+        self.callbacks = {}
+
+    def on(self, event, callback):
+        self.callbacks.setdefault(event, []).append(callback)
+
+    def emit(self, event, data):
+        for callback in self.callbacks.get(event, []):
+            callback(data)
+
+
+class TestJobsWait(unittest.TestCase):
+    def create_jobs(self, stages, realtime_client=None):
+        http_client = StagedHttpClient(stages)
+        jobs = Jobs(http_client)
+        jobs.waiter.poll_interval = 0.01
+        jobs.waiter.max_poll_interval = 0.05
+        if realtime_client is not None:
+            jobs.bind_realtime(realtime_client)
+        return jobs, http_client
+
+    def test_polls_until_job_finishes_without_socket(self):
+        jobs, http_client = self.create_jobs(
+            {"job-1": ["created", "extraction", "extraction", "Finished"]}
+        )
+
+        result = jobs.wait("job-1", timeout=5)
+
+        self.assertEqual(result["status"], "finished")
+        self.assertEqual(result["job"]["stage"], "Finished")
+        self.assertEqual(len(http_client.calls), 4)
+
+    def test_completes_on_realtime_events_without_polling(self):
+        realtime_client = FakeRealTimeClient()
+        jobs, http_client = self.create_jobs(
+            {"job-1": ["extraction"], "job-2": ["extraction"]}, realtime_client
+        )
+
+        def emit_events():
+            realtime_client.emit("job_finished_event", {"job_id": "job-1"})
+            realtime_client.emit("job_failed_event", {"data": {"jobId": "job-2"}})
+
+        threading.Timer(0.1, emit_events).start()
+        results = jobs.wait_all(["job-1", "job-2"], timeout=5)
+
+        self.assertEqual(results["job-1"]["status"], "finished")
+        self.assertEqual(results["job-2"]["status"], "failed")
+        self.assertEqual(results["job-2"]["event"], {"data": {"jobId": "job-2"}})
+        # Only the initial check of each job.
+        self.assertEqual(sorted(http_client.calls), ["job-1", "job-2"])
+
+    def test_uses_events_received_before_waiting(self):
+        realtime_client = FakeRealTimeClient()
+        jobs, http_client = self.create_jobs({"job-1": ["extraction"]}, realtime_client)
+
+        realtime_client.emit("job_finished_event", {"job_id": "job-1"})
+        result = jobs.wait("job-1", timeout=1, check_first=False)
+
+        self.assertEqual(result["status"], "finished")
+        self.assertEqual(http_client.calls, [])
+
+    def test_falls_back_to_polling_when_socket_is_disconnected(self):
+        jobs, http_client = self.create_jobs(
+            {"job-1": ["extraction", "failed"]}, FakeRealTimeClient(connected=False)
+        )
+
+        result = jobs.wait("job-1", timeout=5)
+
+        self.assertEqual(result["status"], "failed")
+        self.assertEqual(len(http_client.calls), 2)
+
+    def test_polls_due_jobs_concurrently(self):
+        job_ids = [f"job-{index}" for index in range(4)]
+        http_client = SlowStagedHttpClient(
+            {job_id: ["extraction", "Finished"] for job_id in job_ids}
+        )
+        jobs = Jobs(http_client)
+        jobs.waiter.poll_interval = 0.01
+
+        results = jobs.wait_all(job_ids, timeout=5)
+
+        self.assertEqual({result["status"] for result in results.values()}, {"finished"})
+        self.assertGreater(http_client.max_polling, 1)
+
+    def test_timeout_reports_pending_jobs_and_partial_results(self):
+        jobs, _ = self.create_jobs({"job-1": ["finished"], "job-2": ["extraction"]})
+
+        with self.assertRaises(AlfredTimeoutException) as context:
+            jobs.wait_all(["job-1", "job-2"], timeout=0.2)
+
+        self.assertEqual(context.exception.pending, ["job-2"])
+        self.assertEqual(list(context.exception.results), ["job-1"])
+
+    def test_retries_transient_errors_while_polling(self):
+        unavailable = HTTPError(response=Response())
+        unavailable.response.status_code = 503
+        jobs, http_client = self.create_jobs(
+            {"job-1": [Timeout("read timed out"), "extraction", unavailable,
+                       RequestsConnectionError("reset"), "Finished"]}
+        )
+
+        with self.assertLogs("alfred-python", "WARNING") as logs:
+            result = jobs.wait("job-1", timeout=5)
+
+        self.assertEqual(result["status"], "finished")
+        self.assertEqual(len(http_client.calls), 5)
+        self.assertEqual(len(logs.records), 3)
+
+    def test_transient_errors_time_out_at_the_deadline(self):
+        jobs, _ = self.create_jobs({"job-1": [RequestsConnectionError("refused")]})
+
+        with self.assertLogs("alfred-python", "WARNING"):
+            with self.assertRaises(AlfredTimeoutException):
+                jobs.wait("job-1", timeout=0.1)
+
+    def test_raises_non_retryable_errors(self):
+        not_found = HTTPError(response=Response())
+        not_found.response.status_code = 404
+        jobs, _ = self.create_jobs({"job-1": ["extraction", not_found]})
+
+        with self.assertRaises(HTTPError):
+            jobs.wait("job-1", timeout=5)
+
+    def test_get_job_status_reads_wrapped_details(self):
+        self.assertEqual(get_job_status({"result": {"status": "Completed"}}), "finished")
+        self.assertEqual(get_job_status({"stage": "exceeded retries"}), None)
+        self.assertEqual(get_job_status({"stage": "invalid"}), "failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
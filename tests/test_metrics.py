@@ -0,0 +1,194 @@
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from alfred.http.http_client import HttpClient
+from alfred.http.metrics import ClientMetrics, endpoint_template, format_prometheus
+
+try:
+    import aiohttp  # noqa: F401
+    from alfred.http.async_http_client import AsyncHttpClient
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+FILE_ID = "3f2b8c1e-9a4d-4c6e-8b1a-2d3e4f5a6b7c"
+
+
+class QueueHandler(BaseHTTPRequestHandler):
+    """
+    Replays queued responses, then answers 200.
+    """
+    def log_message(self, *_args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        status, payload = 200, {"ok": True}
+        if self.server.responses:
+            status, payload = self.server.responses.pop(0)
+
+        content = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class TestEndpointTemplate(unittest.TestCase):
+    def test_resource_ids_are_replaced(self):
+        cases = {
+            f"/api/file/detail/{FILE_ID}": "/api/file/detail/{id}",
+            "/api/job/detail/12345": "/api/job/detail/{id}",
+            "/api/values/5f8d0d55b54764421b7156c3?x=1": "/api/values/{id}",
+            "https://host/api/deferred/detail/abc123def456": "/api/deferred/detail/{id}",
+            "/api/job/all": "/api/job/all",
+            "/api/file/upload": "/api/file/upload",
+            "/token": "/token",
+        }
+        for path, template in cases.items():
+            self.assertEqual(endpoint_template(path), template)
+
+
+class TestClientMetrics(unittest.TestCase):
+    def test_snapshot_aggregates_requests_per_endpoint(self):
+        metrics = ClientMetrics(latency_buckets=(0.1, 1))
+        metrics.record_request("GET", "/api/job/{id}", 200, 0.05, 0, 100)
+        metrics.record_request("GET", "/api/job/{id}", 500, 0.5, 0, 10)
+        metrics.record_request("GET", "/api/job/{id}", None, 3)
+        metrics.record_retry("GET", "/api/job/{id}", 2)
+        metrics.record_throttle("GET", "/api/job/{id}", 0.25)
+        metrics.record_reauthentication("POST", "/api/job/create")
+
+        snapshot = metrics.snapshot()
+        job = snapshot["endpoints"][0]
+
+        self.assertEqual(job["requests"], 3)
+        self.assertEqual(job["statuses"], {"200": 1, "500": 1, "error": 1})
+        self.assertEqual(job["latency_buckets"], [(0.1, 1), (1, 2), (float("inf"), 3)])
+        self.assertAlmostEqual(job["latency_sum"], 3.55)
+        self.assertEqual((job["retries"], job["throttled_seconds"]), (2, 0.25))
+        self.assertEqual(snapshot["bytes_received"], 110)
+        self.assertEqual(snapshot["reauthentications"], 1)
+        self.assertEqual(snapshot["requests"], 3)
+
+    def test_prometheus_format(self):
+        metrics = ClientMetrics(latency_buckets=(0.1,))
+        metrics.record_request("GET", '/api/"x"', 200, 0.05, 0, 100)
+
+        text = format_prometheus(metrics.snapshot())
+
+        self.assertIn("# TYPE alfred_client_requests_total counter", text)
+        self.assertIn(
+            'alfred_client_requests_total{method="GET",endpoint="/api/\\"x\\"",status="200"} 1',
+            text,
+        )
+        self.assertIn(
+            'alfred_client_request_duration_seconds_bucket'
+            '{method="GET",endpoint="/api/\\"x\\"",le="+Inf"} 1',
+            text,
+        )
+        self.assertIn(
+            'alfred_client_received_bytes_total{method="GET",endpoint="/api/\\"x\\""} 100', text
+        )
+        self.assertTrue(text.endswith("\n"))
+
+    def test_exporters_receive_snapshots(self):
+        metrics = ClientMetrics()
+        exported = []
+        metrics.add_exporter(exported.append)
+        metrics.record_request("GET", "/token", 200, 0.01)
+
+        snapshot = metrics.export()
+        metrics.remove_exporter(exported.append)
+        metrics.export()
+
+        self.assertEqual(exported, [snapshot])
+
+
+class ServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), QueueHandler)
+        self.server.responses = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestHttpClientMetrics(ServerTestCase):
+    def test_requests_and_retries_are_recorded(self):
+        client = HttpClient(self.base_url, {"api_key": "key"}, {"metrics": True})
+        self.server.responses = [(503, {})]
+
+        client.get(f"/api/file/detail/{FILE_ID}")
+        client.post("/api/job/create", data={"name": "job"})
+
+        snapshot = client.metrics.snapshot()
+        endpoints = {item["endpoint"]: item for item in snapshot["endpoints"]}
+        detail = endpoints["/api/file/detail/{id}"]
+        self.assertEqual(detail["statuses"], {"200": 1})
+        self.assertEqual(detail["retries"], 1)
+        self.assertEqual(detail["bytes_received"], len(b'{"ok": true}'))
+        self.assertEqual(endpoints["/api/job/create"]["bytes_sent"], len(b'{"name": "job"}'))
+
+    def test_reauthentications_are_recorded(self):
+        metrics = ClientMetrics()
+        client = HttpClient(
+            self.base_url,
+            {"oauth": {"username": "user", "password": "secret"}},
+            {"metrics": metrics},
+        )
+        self.server.responses = [
+            (200, {"access_token": "stale", "expires_in": 3600}),
+            (401, {}),
+            (200, {"access_token": "fresh", "expires_in": 3600}),
+        ]
+
+        client.get("/api/job/detail/12345")
+
+        endpoints = {item["endpoint"]: item for item in metrics.snapshot()["endpoints"]}
+        self.assertEqual(endpoints["/api/job/detail/{id}"]["reauthentications"], 1)
+        self.assertEqual(endpoints["/token"]["requests"], 2)
+
+    def test_metrics_are_disabled_by_default(self):
+        client = HttpClient(self.base_url, {"api_key": "key"})
+
+        client.get("/api/job/all")
+
+        self.assertIsNone(client.metrics)
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsyncHttpClientMetrics(ServerTestCase):
+    def test_requests_and_retries_are_recorded(self):
+        async def run():
+            client = AsyncHttpClient(self.base_url, {"api_key": "key"}, {"metrics": True})
+            client.retry_backoff_factor = 0
+            try:
+                await client.get("/api/job/detail/12345")
+            finally:
+                await client.close()
+            return client.metrics.snapshot()
+
+        self.server.responses = [(503, {})]
+        snapshot = asyncio.run(run())
+
+        detail = snapshot["endpoints"][0]
+        self.assertEqual(detail["endpoint"], "/api/job/detail/{id}")
+        self.assertEqual(detail["statuses"], {"200": 1})
+        self.assertEqual(detail["retries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+import json
+import pickle
+import sys
+import tracemalloc
+import unittest
+
+from alfred.rest.cache import ResponseCache
+from alfred.rest.files.v1 import Files
+from alfred.rest.jobs.normalize import normalize_job
+from alfred.rest.jobs.v1 import Jobs
+from alfred.rest.jobs.waiter import get_job_status
+from alfred.rest.models import FileDetails, Job, Session
+from alfred.rest.sessions.v1 import Sessions
+
+
+class FakeHttpClient:
+    def __init__(self, get_response=None):
+        self.get_response = get_response
+
+    def get(self, *_args, **_kwargs):
+        return self.get_response, None
+
+
+def build_file(index):
+    return {
+        "id": f"file-{index}",
+        "creation_date": "2024-01-01T00:00:00Z",
+        "update_date": "2024-01-01T00:00:00Z",
+        "file_name": f"invoice-{index}.pdf",
+        "file_name_without_extension": f"invoice-{index}",
+        "blob_name": f"blob-{index}",
+        "blob_url": f"https://example.com/blob-{index}",
+        "user_name": "user@example.com",
+        "md5_hash": "d41d8cd98f00b204e9800998ecf8427e",
+        "content_type": "application/pdf",
+        "channel": "api",
+        "should_be_classified": True,
+        "classifier": None,
+        "classification_score": 0.9,
+        "status": "completed",
+        "input_type": "file",
+        "is_duplicate": False,
+        "is_duplicate_by_values": False,
+        "duplicate_origin_id": None,
+        "tag_id": "tag-1",
+        "is_parent": False,
+        "parent_id": None,
+        "deferred_session_id": None,
+        "tag_name": "Invoice",
+        "company_id": "company-1",
+        "file_size": 1024,
+        "proposed_tag_id": None,
+        "proposed_tag_variance": None,
+        "classification_score_above_deviation": True,
+        "confirmed_tag_id": None,
+        "confirmed_by": None,
+        "manual_classification": False,
+        "metadata": '{"source": "scanner"}',
+        "page_count": 1,
+        "page_number": 1,
+    }
+
+
+class TestResponseModel(unittest.TestCase):
+    def test_fields_are_available_as_attributes_and_keys(self):
+        model = FileDetails(build_file(1))
+
+        self.assertEqual(model.id, "file-1")
+        self.assertEqual(model["file_name"], "invoice-1.pdf")
+        self.assertEqual(model.get("missing", "default"), "default")
+        self.assertIn("tag_name", model)
+        self.assertEqual(len(model), 35)
+        with self.assertRaises(AttributeError):
+            model.missing
+
+    def test_models_are_read_only_and_slotted(self):
+        model = FileDetails(build_file(1))
+
+        self.assertFalse(hasattr(model, "__dict__"))
+        with self.assertRaises(AttributeError):
+            model.id = "other"
+        with self.assertRaises(TypeError):
+            model["id"] = "other"
+
+    def test_metadata_is_decoded_on_first_access_and_memoized(self):
+        model = Job({"id": "job-1", "metadata": '{"a": 1}'})
+
+        self.assertEqual(model.metadata, {"a": 1})
+        self.assertIs(model.metadata, model["metadata"])
+        self.assertEqual(Job({"id": "job-2", "metadata": "not-json"}).metadata, {})
+
+    def test_jobs_without_metadata_have_empty_metadata(self):
+        model = Job({"id": "job-1"})
+
+        self.assertEqual(model["metadata"], {})
+        self.assertEqual(model.metadata, {})
+        self.assertEqual(model.to_dict(), normalize_job({"id": "job-1"}))
+        self.assertEqual(dict(model), {"id": "job-1", "metadata": {}})
+        with self.assertRaises(KeyError):
+            Session({"id": "session-1"})["metadata"]
+
+    def test_to_dict_returns_a_decoded_copy(self):
+        data = build_file(1)
+        model = FileDetails(data)
+
+        result = model.to_dict()
+
+        self.assertEqual(result, {**data, "metadata": {"source": "scanner"}})
+        self.assertEqual(dict(model), result)
+        self.assertEqual(model, result)
+        self.assertEqual(json.loads(json.dumps(result)), result)
+
+    def test_models_with_the_same_keys_share_their_key_index(self):
+        first = FileDetails(build_file(1))
+        second = FileDetails(build_file(2))
+
+        self.assertIs(first._shape, second._shape)
+        self.assertIsNot(Session({"id": "s"})._shape, Job({"id": "j"})._shape)
+
+    def test_models_can_be_pickled(self):
+        model = FileDetails(build_file(1))
+
+        restored = pickle.loads(pickle.dumps(model))
+
+        self.assertEqual(restored.to_dict(), model.to_dict())
+
+    def test_models_use_less_memory_than_dicts(self):
+        payloads = [json.dumps(build_file(index)) for index in range(2000)]
+
+        def measure(build):
+            tracemalloc.start()
+            items = [build(json.loads(payload)) for payload in payloads]
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del items
+            return size
+
+        dict_size = measure(lambda data: data)
+        model_size = measure(FileDetails)
+
+        self.assertLess(model_size, dict_size * 0.75)
+        self.assertLess(sys.getsizeof(FileDetails(build_file(1))), 2000)
+
+
+class TestResponseModelsInDomains(unittest.TestCase):
+    def test_jobs_return_models_when_enabled(self):
+        payload = {
+            "result": [{"id": "job-1", "metadata": '{"a": 1}', "stage": "finished"}],
+            "totalPages": 1,
+        }
+        jobs = Jobs(FakeHttpClient(payload), models=True)
+
+        result = jobs.get_all()
+        job = result["result"][0]
+
+        self.assertIsInstance(job, Job)
+        self.assertEqual(job.metadata, {"a": 1})
+        self.assertEqual(get_job_status(job), "finished")
+        self.assertIsInstance(next(jobs.iter_all(prefetch=0)), Job)
+
+    def test_jobs_return_dicts_by_default(self):
+        jobs = Jobs(FakeHttpClient({"id": "job-1", "metadata": "{}"}))
+
+        self.assertIs(type(jobs.get("job-1")), dict)
+
+    def test_files_and_sessions_return_models_when_enabled(self):
+        files = Files(FakeHttpClient(build_file(1)), models=True)
+        sessions = Sessions(FakeHttpClient({"id": "session-1"}), models=True)
+
+        self.assertIsInstance(files.get("file-1"), FileDetails)
+        self.assertEqual(sessions.get("session-1").id, "session-1")
+
+    def test_cached_models_are_returned_as_is(self):
+        cache = ResponseCache({})
+        files = Files(FakeHttpClient(build_file(1)), cache=cache, models=True)
+
+        first = files.get("file-1")
+
+        self.assertIs(files.get("file-1"), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import threading
+import time
+import unittest
+from datetime import datetime
+
+from alfred.http.http_client import HttpClient
+from alfred.http.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def headers(limit, remaining, reset):
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
+    }
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(threshold=20, clock=self.clock)
+
+    def test_does_not_throttle_without_rate_limit_headers(self):
+        self.limiter.update({"Content-Type": "application/json"})
+
+        self.assertEqual(self.limiter.reserve(), (0, True))
+        self.assertFalse(self.limiter.should_throttle())
+        self.assertIsNone(self.limiter.state().get("limit"))
+
+    def test_sends_immediately_while_tokens_are_plentiful(self):
+        self.limiter.update(headers(100, 90, self.clock.now + 60))
+
+        delays = [self.limiter.reserve()[0] for _ in range(50)]
+
+        self.assertEqual(delays, [0] * 50)
+        self.assertEqual(self.limiter.state().get("tokens"), 40)
+
+    def test_paces_requests_once_tokens_are_scarce(self):
+        self.limiter.update(headers(100, 9, self.clock.now + 60))
+
+        delays = [self.limiter.reserve() for _ in range(9)]
+
+        # Nine tokens spread evenly over the 60 seconds left in the window.
+        self.assertEqual(delays[0], (0, True))
+        for index, (delay, acquired) in enumerate(delays):
+            self.assertTrue(acquired)
+            self.assertAlmostEqual(delay, index * 60 / 9, places=3)
+        self.assertTrue(self.limiter.should_throttle())
+
+    def test_waits_for_reset_when_bucket_is_empty(self):
+        self.limiter.update(headers(100, 0, 30))
+
+        self.assertEqual(self.limiter.reserve(), (30, False))
+
+        self.clock.now += 30
+        delay, acquired = self.limiter.reserve()
+
+        self.assertTrue(acquired)
+        self.assertEqual(delay, 0)
+        self.assertEqual(self.limiter.state().get("tokens"), 99)
+
+    def test_backs_off_when_reset_is_unknown(self):
+        limiter = RateLimiter(delay=1, delay_backoff=2, delay_max=3, clock=self.clock)
+        limiter.update({"X-RateLimit-Limit": "10", "X-RateLimit-Remaining": "0"})
+
+        delays = [limiter.reserve() for _ in range(3)]
+
+        self.assertEqual(delays, [(1, True), (2, True), (3, True)])
+
+    def test_backs_off_when_limit_is_zero(self):
+        limiter = RateLimiter(delay=1, delay_backoff=2, delay_max=3, clock=self.clock)
+        limiter.update(headers(0, 0, 30))
+
+        delays = [limiter.reserve() for _ in range(2)]
+        self.clock.now += 30
+        delays.append(limiter.reserve())
+
+        # Each wait lets a request through to probe the server.
+        self.assertEqual(delays, [(1, True), (2, True), (3, True)])
+
+    def test_server_count_only_lowers_local_tokens_within_window(self):
+        reset = self.clock.now + 60
+        self.limiter.update(headers(100, 50, reset))
+        for _ in range(10):
+            self.limiter.reserve()
+
+        # A late response still reports the count before our last requests.
+        self.limiter.update(headers(100, 45, reset))
+        self.assertEqual(self.limiter.state().get("tokens"), 40)
+
+        self.limiter.update(headers(100, 30, reset))
+        self.assertEqual(self.limiter.state().get("tokens"), 30)
+
+    def test_concurrent_callers_never_exceed_remaining_tokens(self):
+        self.limiter.update(headers(1000, 100, self.clock.now + 60))
+        acquired = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(50):
+                _, ok = self.limiter.reserve()
+                if ok:
+                    with lock:
+                        acquired.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(acquired), 100)
+        state = self.limiter.state()
+        self.assertEqual(state.get("tokens"), 0)
+        self.assertGreater(state.get("throttled_requests"), 0)
+
+    def test_restores_a_saved_state(self):
+        self.limiter.update(headers(100, 0, self.clock.now + 60))
+        saved = self.limiter.state()
+        limiter = RateLimiter(threshold=20, clock=self.clock)
+
+        limiter.set_state(saved["limit"], saved["remaining"], saved["reset_time"])
+
+        self.assertEqual(limiter.reserve(), (60, False))
+        limiter.set_state(None)
+        self.assertEqual(limiter.reserve(), (0, True))
+        self.assertIsNone(limiter.state().get("limit"))
+
+
+class TestHttpClientRateLimit(unittest.TestCase):
+    def test_assigned_rate_limit_is_enforced(self):
+        client = HttpClient("http://127.0.0.1", {"api_key": "key"})
+        reset_time = datetime.utcfromtimestamp(int(time.time()) + 3600)
+
+        client.rate_limit = {"limit": 100, "remaining": 0, "reset_time": reset_time}
+
+        self.assertEqual(
+            client.rate_limit, {"limit": 100, "remaining": 0, "reset_time": reset_time}
+        )
+        self.assertTrue(client.should_throttle())
+        client.rate_limit = None
+        self.assertIsNone(client.rate_limit)
+        self.assertFalse(client.should_throttle())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,346 @@
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+
+from alfred.base.config import Configuration
+from alfred.base.constants import EventType, FileEvent, JobEvent
+
+try:
+    import socketio
+    from aiohttp import web
+    from alfred.realtime import AlfredRealTimeClient
+except ImportError:  # pragma: no cover
+    socketio = None
+
+
+class SocketServer:
+    """
+    Socket.IO server running on its own event loop thread.
+    """
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.server, self.runner, self.url = self.run(self.__start())
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(5)
+
+    def emit(self, event, data):
+        self.run(self.server.emit(event, data))
+
+    def drop_connections(self):
+        self.run(self.server.eio.disconnect())
+
+    def stop(self):
+        self.run(self.__stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    async def __stop(self):
+        await self.server.shutdown()
+        await self.runner.cleanup()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def __start():
+        server = socketio.AsyncServer(async_mode="aiohttp")
+        app = web.Application()
+        server.attach(app)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # pylint: disable=W0212
+        return server, runner, f"http://127.0.0.1:{port}"
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time.")
+        time.sleep(0.01)
+
+
+@unittest.skipIf(socketio is None, "python-socketio or aiohttp is not installed")
+class RealTimeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = SocketServer()
+        self.config = Configuration.v1({"realtime_url": self.server.url})
+        self.clients = []
+
+    def tearDown(self):
+        for client in self.clients:
+            client.disconnect()
+        self.server.stop()
+
+    def connect(self, **options):
+        client = AlfredRealTimeClient(self.config, {"api_key": "key"}, **options)
+        self.clients.append(client)
+        wait_for(lambda: client.connected)
+        return client
+
+
+class TestAlfredRealTimeClient(RealTimeTestCase):
+    def test_events_are_delivered_inline(self):
+        client = self.connect()
+        received = []
+        client.on_job_event(received.append)
+
+        self.server.emit(EventType.JOB_EVENT.value, {"jobId": "1"})
+
+        wait_for(lambda: received)
+        self.assertEqual(received, [{"jobId": "1"}])
+
+    def test_scoped_subscriptions(self):
+        client = self.connect()
+        received = []
+        client.on_job_event(lambda data: received.append(("all", data["jobId"])))
+        subscription = client.on_job_event(
+            lambda data: received.append(("job 1", data["jobId"])), job_id="1"
+        )
+
+        self.server.emit(EventType.JOB_EVENT.value, {"jobId": "1"})
+        self.server.emit(EventType.JOB_EVENT.value, {"jobId": "2"})
+        wait_for(lambda: len(received) == 3)
+        subscription.unsubscribe()
+        self.server.emit(EventType.JOB_EVENT.value, {"jobId": "1"})
+        wait_for(lambda: len(received) == 4)
+
+        self.assertEqual(
+            received, [("all", "1"), ("job 1", "1"), ("all", "2"), ("all", "1")]
+        )
+
+    def test_events_are_streamed_in_batches(self):
+        client = self.connect()
+
+        with client.events([JobEvent.JOB_FINISHED_EVENT], batch_size=10, max_wait=5) as stream:
+            for job_id in range(10):
+                self.server.emit(JobEvent.JOB_FINISHED_EVENT.value, {"jobId": str(job_id)})
+            self.server.emit(EventType.JOB_EVENT.value, {"jobId": "other"})
+            batch = next(iter(stream))
+
+        self.assertEqual([item["data"]["jobId"] for item in batch], [str(i) for i in range(10)])
+        self.assertEqual({item["event"] for item in batch}, {"job_finished_event"})
+        self.assertEqual(len(client.router), 0)
+
+    def test_events_are_handled_in_the_order_they_were_received(self):
+        client = self.connect()
+        received = []
+
+        def slow_on_even(data):
+            # Callbacks racing each other would finish out of order.
+            if data["index"] % 2 == 0:
+                time.sleep(0.005)
+            received.append(data["index"])
+
+        client.on_job_event(slow_on_even)
+
+        for index in range(50):
+            self.server.emit(EventType.JOB_EVENT.value, {"jobId": "1", "index": index})
+
+        wait_for(lambda: len(received) == 50)
+        self.assertEqual(received, list(range(50)))
+
+    def test_update_bursts_are_coalesced(self):
+        client = self.connect(coalesce_config={"window": 60})
+        received = []
+        client.on(JobEvent.JOB_STAGE_UPDATE_EVENT.value, received.append)
+
+        for stage in ("classification", "extraction", "indexing"):
+            self.server.emit(
+                JobEvent.JOB_STAGE_UPDATE_EVENT.value, {"jobId": "1", "stage": stage}
+            )
+        wait_for(lambda: client.coalescer.stats()["received"] == 3)
+        client.coalescer.flush()
+
+        self.assertEqual(received, [{"jobId": "1", "stage": "indexing", "coalesced_count": 3}])
+
+    def test_slow_callbacks_run_on_dispatcher_workers(self):
+        client = self.connect(dispatch_config={"max_workers": 2})
+        release = threading.Event()
+        received = []
+
+        def slow(data):
+            release.wait(5)
+            received.append((data, threading.current_thread().name))
+
+        client.on_job_event(slow)
+        client.on_file_event(lambda data: received.append((data, "fast")))
+        self.server.emit(EventType.JOB_EVENT.value, {"jobId": "1"})
+        self.server.emit(EventType.FILE_EVENT.value, {"fileId": "2"})
+
+        # The file event is not held up by the slow job event callback.
+        wait_for(lambda: received)
+        self.assertEqual(received, [({"fileId": "2"}, "fast")])
+        release.set()
+        wait_for(lambda: len(received) == 2)
+        self.assertTrue(received[1][1].startswith("alfred-dispatch-"))
+        self.assertEqual(client.dispatcher.stats()["processed"], 2)
+
+    def test_dispatched_events_of_a_job_are_handled_in_order(self):
+        client = self.connect(dispatch_config={"max_workers": 4})
+        received = {"1": [], "2": []}
+
+        def slow_on_even(data):
+            if data["index"] % 2 == 0:
+                time.sleep(0.005)
+            received[data["jobId"]].append(data["index"])
+
+        client.on_job_event(slow_on_even)
+        for index in range(20):
+            job_id = str(index % 2 + 1)
+            self.server.emit(EventType.JOB_EVENT.value, {"jobId": job_id, "index": index})
+
+        wait_for(lambda: len(received["1"]) + len(received["2"]) == 20)
+        self.assertEqual(received, {"1": list(range(0, 20, 2)), "2": list(range(1, 20, 2))})
+
+    def test_dropped_connections_are_recovered_and_backfilled(self):
+        client = self.connect(reconnect_config={"initial_delay": 0.05, "max_delay": 0.1})
+        jobs = {"1": {"stage": "Classification"}}
+        backfiller = client.enable_backfill(jobs=jobs)
+        received = []
+        client.on(JobEvent.JOB_FINISHED_EVENT.value, received.append)
+
+        self.server.emit(
+            JobEvent.JOB_STAGE_UPDATE_EVENT.value, {"jobId": "1", "stage": "Classification"}
+        )
+        wait_for(lambda: backfiller.tracked_jobs == ["1"])
+        jobs["1"] = {"stage": "Finished"}
+        self.server.drop_connections()
+
+        wait_for(lambda: client.connection_stats()["backfilled_events"] == 2)
+        self.assertEqual(
+            received,
+            [{"jobId": "1", "stage": "Finished", "job": {"stage": "Finished"}, "synthetic": True}],
+        )
+        stats = client.connection_stats()
+        self.assertTrue(stats["connected"])
+        self.assertEqual(stats["reconnects"], 1)
+        self.assertEqual(backfiller.tracked_jobs, [])
+
+    def test_uncommitted_events_are_replayed_from_the_journal(self):
+        with tempfile.TemporaryDirectory() as directory:
+            client = self.connect(journal_config={"directory": directory})
+            received = []
+            client.on_job_event(received.append)
+
+            for job_id in ("1", "2"):
+                self.server.emit(EventType.JOB_EVENT.value, {"jobId": job_id})
+            wait_for(lambda: len(received) == 2)
+            client.journal.commit(received[0]["journal_offset"])
+            client.disconnect()
+
+            client = self.connect(journal_config={"directory": directory})
+            replayed = []
+            client.on_job_event(replayed.append)
+
+            self.assertEqual(client.replay_journal(), 1)
+            self.assertEqual(received, [{"jobId": "1", "journal_offset": 0},
+                                        {"jobId": "2", "journal_offset": 1}])
+            self.assertEqual(replayed, [{"jobId": "2", "journal_offset": 1}])
+            client.disconnect()
+
+    def test_events_acknowledged_out_of_order_are_replayed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            client = self.connect(
+                journal_config={"directory": directory}, coalesce_config={"window": 5}
+            )
+            received = []
+            client.on(FileEvent.FILE_UPDATE_EVENT.value, received.append)
+            client.on(JobEvent.JOB_CREATE_EVENT.value, received.append)
+            client.on(JobEvent.JOB_CREATE_EVENT.value,
+                      lambda data: client.journal.ack(data["journal_offset"]))
+
+            self.server.emit(FileEvent.FILE_UPDATE_EVENT.value, {"fileId": "1"})
+            self.server.emit(FileEvent.FILE_UPDATE_EVENT.value, {"fileId": "2"})
+            self.server.emit(FileEvent.FILE_UPDATE_EVENT.value, {"fileId": "2"})
+            self.server.emit(JobEvent.JOB_CREATE_EVENT.value, {"jobId": "3"})
+            wait_for(lambda: received)
+            self.assertEqual([data["jobId"] for data in received], ["3"])
+            self.assertIsNone(client.journal.committed())
+            client.disconnect()
+
+            # The pending updates were not acknowledged: they are replayed.
+            client = self.connect(journal_config={"directory": directory})
+            replayed = [entry["data"] for entry in client.journal.replay()]
+            self.assertIsNone(client.journal.committed())
+            self.assertIn({"fileId": "1"}, replayed)
+            self.assertEqual(len(replayed), 4)
+
+    def test_disconnect_journals_the_events_already_received(self):
+        with tempfile.TemporaryDirectory() as directory:
+            client = self.connect(journal_config={"directory": directory})
+            intake = client._AlfredRealTimeClient__intake  # pylint: disable=W0212
+            release = threading.Event()
+            received = []
+
+            def slow(data):
+                release.wait(5)
+                received.append(data["jobId"])
+
+            client.on_job_event(slow)
+            for job_id in range(5):
+                self.server.emit(EventType.JOB_EVENT.value, {"jobId": str(job_id)})
+            wait_for(lambda: len(intake) == 4)
+
+            threading.Timer(0.05, release.set).start()
+            client.disconnect()
+
+            self.assertEqual(received, [str(job_id) for job_id in range(5)])
+            self.assertEqual(client.journal.next_offset, 5)
+
+    def test_disconnect_closes_streams(self):
+        client = self.connect()
+        stream = client.events([JobEvent.JOB_FINISHED_EVENT], max_size=1)
+
+        for job_id in range(3):
+            self.server.emit(JobEvent.JOB_FINISHED_EVENT.value, {"jobId": str(job_id)})
+        wait_for(lambda: len(stream) == 1)
+        client.disconnect()
+
+        self.assertTrue(stream.closed)
+        self.assertEqual([item["data"]["jobId"] for item in stream], ["0"])
+        self.assertEqual(len(client.router), 0)
+
+    def test_payloads_that_are_not_dictionaries_are_wrapped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            client = self.connect(journal_config={"directory": directory})
+            received = []
+            client.on_job_event(received.append)
+            client.on(JobEvent.JOB_FAILED_EVENT.value, received.append).unsubscribe()
+
+            self.server.emit(JobEvent.JOB_FAILED_EVENT.value, {"jobId": "1"})
+            self.server.emit(EventType.JOB_EVENT.value, "text")
+            wait_for(lambda: received)
+            client.journal.ack(received[0]["journal_offset"])
+
+            self.assertEqual([data["data"] for data in received], ["text"])
+            # The event nobody subscribes to anymore is acknowledged as well.
+            self.assertEqual(client.journal.committed(), 1)
+            client.disconnect()
+
+    def test_journal_rejects_dropping_dispatch_overflow(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                AlfredRealTimeClient(
+                    self.config, {"api_key": "key"},
+                    journal_config={"directory": directory},
+                    dispatch_config={"overflow": "drop_oldest"},
+                )
+
+    def test_journal_rejects_dropping_stream_overflow(self):
+        with tempfile.TemporaryDirectory() as directory:
+            client = self.connect(journal_config={"directory": directory})
+
+            with self.assertRaises(ValueError):
+                client.events(overflow="drop_oldest")
+            client.disconnect()
+
+
+if __name__ == "__main__":
+    unittest.main()
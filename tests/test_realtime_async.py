@@ -0,0 +1,122 @@
+import asyncio
+import unittest
+
+import alfred.exceptions
+from alfred.base.config import Configuration
+from alfred.base.constants import EventType, JobEvent
+
+try:
+    import socketio
+    from aiohttp import web
+    from alfred.realtime import AsyncAlfredRealTimeClient
+except ImportError:  # pragma: no cover
+    socketio = None
+
+
+async def start_server():
+    """
+    Start a Socket.IO server on a random local port. Returns it with its runner and URL.
+    """
+    server = socketio.AsyncServer(async_mode="aiohttp")
+    app = web.Application()
+    server.attach(app)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # pylint: disable=W0212
+    return server, runner, f"http://127.0.0.1:{port}"
+
+
+@unittest.skipIf(socketio is None, "python-socketio or aiohttp is not installed")
+class TestAsyncAlfredRealTimeClient(unittest.TestCase):
+    def test_events_are_delivered_to_sync_and_async_callbacks(self):
+        async def run():
+            server, runner, url = await start_server()
+            connected = asyncio.Event()
+            received = []
+            done = asyncio.Event()
+
+            async def on_job_finished(data):
+                await asyncio.sleep(0)
+                received.append(("async", data))
+                done.set()
+
+            config = Configuration.v1({"realtime_url": url})
+            client = AsyncAlfredRealTimeClient(
+                config, {"api_key": "key"}, on_connect=connected.set
+            )
+            client.on_job_event(lambda data: received.append(("sync", data)))
+            client.on(JobEvent.JOB_FINISHED_EVENT.value, on_job_finished)
+            try:
+                async with client:
+                    await asyncio.wait_for(connected.wait(), 5)
+                    self.assertTrue(client.connected)
+                    await server.emit(EventType.JOB_EVENT.value, {"jobId": "1"})
+                    await server.emit(JobEvent.JOB_FINISHED_EVENT.value, {"jobId": "1"})
+                    await asyncio.wait_for(done.wait(), 5)
+                self.assertFalse(client.connected)
+            finally:
+                await runner.cleanup()
+            return received
+
+        received = asyncio.run(run())
+
+        self.assertEqual(received, [("sync", {"jobId": "1"}), ("async", {"jobId": "1"})])
+
+    def test_failing_callbacks_do_not_starve_the_others(self):
+        async def run():
+            server, runner, url = await start_server()
+            received = asyncio.Event()
+
+            async def failing(_data):
+                raise ValueError("boom")
+
+            client = AsyncAlfredRealTimeClient(
+                Configuration.v1({"realtime_url": url}), {"api_key": "key"}
+            )
+            client.on_file_event(failing)
+            client.on_file_event(lambda _data: received.set())
+            try:
+                async with client:
+                    await server.emit(EventType.FILE_EVENT.value, {"fileId": "1"})
+                    await asyncio.wait_for(received.wait(), 5)
+            finally:
+                await runner.cleanup()
+
+        with self.assertLogs("alfred-python", "ERROR"):
+            asyncio.run(run())
+
+    def test_events_are_streamed(self):
+        async def run():
+            server, runner, url = await start_server()
+            client = AsyncAlfredRealTimeClient(
+                Configuration.v1({"realtime_url": url}), {"api_key": "key"}
+            )
+            try:
+                async with client, client.events(job_id="1") as stream:
+                    await server.emit(EventType.JOB_EVENT.value, {"jobId": "2"})
+                    await server.emit(EventType.JOB_EVENT.value, {"jobId": "1"})
+                    event = await stream.get(timeout=5)
+            finally:
+                await runner.cleanup()
+            return event, len(client.router)
+
+        event, subscriptions = asyncio.run(run())
+
+        self.assertEqual(event, {"event": "job_event", "data": {"jobId": "1"}})
+        self.assertEqual(subscriptions, 0)
+
+    def test_connection_errors_are_raised(self):
+        async def run():
+            client = AsyncAlfredRealTimeClient(
+                Configuration.v1({"realtime_url": "http://127.0.0.1:9"}), {"api_key": "key"}
+            )
+            await client.connect()
+
+        with self.assertRaises(alfred.exceptions.ConnectionError):
+            asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import time
+import unittest
+
+from alfred.realtime.coalescer import EventCoalescer, coalesce_key
+
+STAGE = "job_stage_update_event"
+STATUS = "file_status_update_event"
+FINISHED = "job_finished_event"
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event, data):
+        self.events.append((event, data))
+
+
+class TestEventCoalescer(unittest.TestCase):
+    def test_bursts_are_merged_into_the_latest_event(self):
+        recorder = Recorder()
+        coalescer = EventCoalescer(recorder, {"window": 0.05})
+
+        for stage in ("a", "b", "c"):
+            coalescer.submit(STAGE, {"jobId": "1", "stage": stage})
+        coalescer.submit(STAGE, {"jobId": "2", "stage": "a"})
+        coalescer.submit(STATUS, {"jobId": "1", "fileId": "f", "status": "x"})
+
+        self.assertEqual(recorder.events, [])
+        deadline = time.monotonic() + 5
+        while len(recorder.events) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(recorder.events, [
+            (STAGE, {"jobId": "1", "stage": "c", "coalesced_count": 3}),
+            (STAGE, {"jobId": "2", "stage": "a", "coalesced_count": 1}),
+            (STATUS, {"jobId": "1", "fileId": "f", "status": "x", "coalesced_count": 1}),
+        ])
+        self.assertEqual(
+            coalescer.stats(), {"received": 5, "delivered": 3, "coalesced": 2, "pending": 0}
+        )
+        coalescer.close()
+
+    def test_other_events_flush_pending_events_of_their_entity_first(self):
+        recorder = Recorder()
+        coalescer = EventCoalescer(recorder, {"window": 60})
+
+        coalescer.submit(STAGE, {"jobId": "1", "stage": "a"})
+        coalescer.submit(STAGE, {"jobId": "1", "stage": "b"})
+        coalescer.submit(STAGE, {"jobId": "2", "stage": "a"})
+        coalescer.submit(FINISHED, {"jobId": "1"})
+
+        self.assertEqual(recorder.events, [
+            (STAGE, {"jobId": "1", "stage": "b", "coalesced_count": 2}),
+            (FINISHED, {"jobId": "1"}),
+        ])
+        self.assertEqual(coalescer.stats()["pending"], 1)
+
+        coalescer.close()
+        self.assertEqual(recorder.events[-1][1]["jobId"], "2")
+        coalescer.submit(STAGE, {"jobId": "3"})
+        self.assertEqual(recorder.events[-1][1]["jobId"], "3")
+
+    def test_replaced_events_are_reported(self):
+        superseded = Recorder()
+        coalescer = EventCoalescer(Recorder(), {"window": 60}, on_superseded=superseded)
+
+        for stage in ("a", "b", "c"):
+            coalescer.submit(STAGE, {"jobId": "1", "stage": stage})
+
+        self.assertEqual(superseded.events, [
+            (STAGE, {"jobId": "1", "stage": "a"}),
+            (STAGE, {"jobId": "1", "stage": "b"}),
+        ])
+        coalescer.close()
+
+    def test_oldest_pending_event_is_delivered_early_when_full(self):
+        recorder = Recorder()
+        coalescer = EventCoalescer(recorder, {"window": 60, "max_pending": 2})
+
+        for job_id in ("1", "2", "3"):
+            coalescer.submit(STAGE, {"jobId": job_id})
+
+        self.assertEqual(recorder.events, [(STAGE, {"jobId": "1", "coalesced_count": 1})])
+        coalescer.close()
+
+    def test_events_without_entity_or_with_no_window_are_delivered_right_away(self):
+        recorder = Recorder()
+        coalescer = EventCoalescer(recorder, {"window": 0})
+
+        coalescer.submit(STAGE, {"jobId": "1"})
+        coalescer.submit(STAGE, "not json")
+
+        self.assertEqual(recorder.events, [(STAGE, {"jobId": "1"}), (STAGE, "not json")])
+
+    def test_coalesce_key(self):
+        self.assertEqual(coalesce_key(STATUS, {"jobId": "j", "fileId": "f"}), "f")
+        self.assertEqual(coalesce_key(STAGE, {"jobId": "j", "fileId": "f"}), "j")
+        self.assertEqual(coalesce_key(STAGE, {"fileId": "f"}), "f")
+        self.assertIsNone(coalesce_key(STAGE, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import tempfile
+import threading
+import time
+import unittest
+
+from alfred.realtime.dispatcher import EventDispatcher, default_ordering_key
+
+
+class Recorder:
+    """
+    Event handler recording the events it handles, optionally blocking until released.
+    """
+    def __init__(self, blocked=False):
+        self.events = []
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+        if not blocked:
+            self.release.set()
+
+    def __call__(self, event, data):
+        self.release.wait(5)
+        with self.lock:
+            self.events.append((event, data))
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time.")
+        time.sleep(0.005)
+
+
+class TestEventDispatcher(unittest.TestCase):
+    def test_events_of_a_key_are_handled_in_order(self):
+        active = set()
+        overlaps = []
+        handled = []
+        lock = threading.Lock()
+
+        def handler(event, data):
+            key = data["job_id"]
+            with lock:
+                if key in active:
+                    overlaps.append(key)
+                active.add(key)
+            time.sleep(0.001)
+            with lock:
+                active.discard(key)
+                handled.append((key, data["seq"]))
+
+        dispatcher = EventDispatcher(handler, {"max_workers": 4})
+        for seq in range(50):
+            for key in ("a", "b", "c"):
+                dispatcher.submit("job_stage_update_event", {"job_id": key, "seq": seq})
+        dispatcher.close()
+
+        self.assertEqual(overlaps, [])
+        for key in ("a", "b", "c"):
+            self.assertEqual([seq for item, seq in handled if item == key], list(range(50)))
+        stats = dispatcher.stats()
+        self.assertEqual((stats["submitted"], stats["processed"]), (150, 150))
+        self.assertEqual((stats["queued"], stats["in_flight"], stats["lanes"]), (0, 0, 0))
+
+    def test_block_policy_waits_for_a_free_slot(self):
+        recorder = Recorder(blocked=True)
+        dispatcher = EventDispatcher(recorder, {"max_workers": 1, "max_queue_size": 1})
+        dispatcher.submit("event", 1)
+        wait_for(lambda: dispatcher.stats()["in_flight"] == 1)
+        dispatcher.submit("event", 2)
+
+        submitted = threading.Event()
+        threading.Thread(
+            target=lambda: dispatcher.submit("event", 3) and submitted.set(), daemon=True
+        ).start()
+        self.assertFalse(submitted.wait(0.1))
+
+        recorder.release.set()
+        self.assertTrue(submitted.wait(5))
+        dispatcher.close()
+        self.assertEqual([data for _, data in recorder.events], [1, 2, 3])
+
+    def test_drop_oldest_policy_discards_the_oldest_queued_event(self):
+        recorder = Recorder(blocked=True)
+        dispatcher = EventDispatcher(
+            recorder, {"max_workers": 1, "max_queue_size": 2, "overflow": "drop_oldest"}
+        )
+        dispatcher.submit("event", {"job_id": "a"})
+        wait_for(lambda: dispatcher.stats()["in_flight"] == 1)
+        for job_id in ("b", "c", "d", "e"):
+            dispatcher.submit("event", {"job_id": job_id})
+
+        self.assertEqual(dispatcher.stats()["dropped"], 2)
+        recorder.release.set()
+        dispatcher.close()
+        self.assertEqual([data["job_id"] for _, data in recorder.events], ["a", "d", "e"])
+
+    def test_spill_policy_keeps_overflowing_events_in_order(self):
+        recorder = Recorder(blocked=True)
+        with tempfile.TemporaryDirectory() as spill_dir:
+            dispatcher = EventDispatcher(recorder, {
+                "max_workers": 2,
+                "max_queue_size": 3,
+                "overflow": "spill",
+                "spill_dir": spill_dir,
+            })
+            dispatcher.submit("event", {"job_id": "a", "seq": 0})
+            wait_for(lambda: dispatcher.stats()["in_flight"] == 1)
+            for seq in range(1, 20):
+                dispatcher.submit("event", {"job_id": "a", "seq": seq})
+
+            stats = dispatcher.stats()
+            self.assertEqual(stats["queued"], 3)
+            self.assertEqual(stats["spilled"], 16)
+            self.assertEqual(stats["max_queued"], 19)
+
+            recorder.release.set()
+            dispatcher.close()
+
+        self.assertEqual([data["seq"] for _, data in recorder.events], list(range(20)))
+        self.assertEqual(dispatcher.stats()["spilled"], 0)
+
+    def test_failing_handlers_are_counted(self):
+        def handler(event, data):
+            raise ValueError("boom")
+
+        dispatcher = EventDispatcher(handler, {"max_workers": 1})
+        with self.assertLogs("alfred-python", "ERROR"):
+            dispatcher.submit("event", {})
+            dispatcher.close()
+
+        self.assertEqual(dispatcher.stats()["failed"], 1)
+        self.assertFalse(dispatcher.submit("event", {}))
+
+    def test_invalid_overflow_policy_is_rejected(self):
+        with self.assertRaises(ValueError):
+            EventDispatcher(lambda event, data: None, {"overflow": "grow"})
+
+    def test_default_ordering_key(self):
+        self.assertEqual(default_ordering_key("e", {"jobId": "j", "fileId": "f"}), "j")
+        self.assertEqual(default_ordering_key("e", '{"file_id": "f"}'), "f")
+        self.assertIsNone(default_ordering_key("e", {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import os
+import tempfile
+import time
+import unittest
+
+from alfred.realtime.journal import EventJournal
+
+
+class JournalTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.directory = self.temporary.name
+        self.journals = []
+
+    def tearDown(self):
+        for journal in self.journals:
+            journal.close()
+        self.temporary.cleanup()
+
+    def open(self, **config):
+        journal = EventJournal({"directory": self.directory, "fsync_interval": 0, **config})
+        self.journals.append(journal)
+        return journal
+
+    def segments(self):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(".jsonl"))
+
+
+class TestEventJournal(JournalTestCase):
+    def test_uncommitted_entries_are_replayed_after_reopening(self):
+        journal = self.open()
+        offsets = [journal.append("job_event", {"jobId": str(index)}) for index in range(3)]
+        journal.commit(0)
+        journal.commit(-1)
+        journal.close()
+
+        journal = self.open()
+        entries = list(journal.replay())
+
+        self.assertEqual(offsets, [0, 1, 2])
+        self.assertEqual(journal.committed(), 0)
+        self.assertEqual([entry["offset"] for entry in entries], [1, 2])
+        self.assertEqual(entries[0]["event"], "job_event")
+        self.assertEqual(entries[0]["data"], {"jobId": "1"})
+        self.assertEqual(journal.append("job_event", {}), 3)
+
+    def test_entries_acknowledged_out_of_order_are_committed_once_contiguous(self):
+        journal = self.open()
+        for index in range(4):
+            journal.append("job_event", index)
+
+        journal.ack(1)
+        journal.ack(3)
+        self.assertIsNone(journal.committed())
+        journal.ack(0)
+        self.assertEqual(journal.committed(), 1)
+        journal.close()
+
+        journal = self.open()
+        self.assertEqual([entry["offset"] for entry in journal.replay()], [2, 3])
+        journal.ack(2)
+        self.assertEqual(journal.committed(), 2)
+
+    def test_commit_acknowledges_every_earlier_entry(self):
+        journal = self.open()
+        for index in range(4):
+            journal.append("job_event", index)
+
+        journal.ack(2)
+        journal.commit(1)
+
+        self.assertEqual(journal.committed(), 2)
+
+    def test_consumers_keep_their_own_offsets(self):
+        journal = self.open()
+        for index in range(3):
+            journal.append("job_event", index)
+        journal.commit(2, consumer="audit")
+
+        self.assertEqual(len(list(journal.replay())), 3)
+        self.assertEqual(list(journal.replay("audit")), [])
+        self.assertEqual([entry["data"] for entry in journal.replay(from_offset=2)], [2])
+
+    def test_entries_are_split_into_segments(self):
+        journal = self.open(segment_size=200)
+        for index in range(10):
+            journal.append("job_event", {"jobId": str(index)})
+
+        self.assertGreater(len(self.segments()), 2)
+        self.assertEqual(self.segments()[0], f"{0:020d}.jsonl")
+        self.assertEqual([entry["data"]["jobId"] for entry in journal.replay()],
+                         [str(index) for index in range(10)])
+        self.assertEqual(
+            [entry["offset"] for entry in journal.replay(from_offset=7)], [7, 8, 9]
+        )
+
+    def test_oldest_segments_are_deleted_beyond_the_size_limit(self):
+        journal = self.open(segment_size=200)
+        for index in range(10):
+            journal.append("job_event", {"jobId": str(index)})
+        segments = self.segments()
+        journal.commit(0)
+
+        journal.retention_bytes = sum(
+            os.path.getsize(os.path.join(self.directory, name)) for name in segments[-2:]
+        )
+        with self.assertLogs("alfred-python", "WARNING"):
+            deleted = journal.apply_retention()
+
+        self.assertEqual(deleted, len(segments) - len(self.segments()))
+        self.assertEqual(self.segments(), segments[-2:])
+        first_offset = journal.stats()["first_offset"]
+        self.assertEqual(int(segments[-2][:-6]), first_offset)
+        self.assertEqual(next(iter(journal.replay()))["offset"], first_offset)
+
+    def test_old_segments_are_deleted(self):
+        journal = self.open(segment_size=100, retention_seconds=60)
+        for index in range(4):
+            journal.append("job_event", {"jobId": str(index)})
+        segments = self.segments()
+        old = time.time() - 120
+        os.utime(os.path.join(self.directory, segments[0]), (old, old))
+
+        self.assertEqual(journal.apply_retention(), 1)
+        self.assertEqual(self.segments(), segments[1:])
+
+    def test_old_segments_are_deleted_on_commit(self):
+        journal = self.open(segment_size=100, retention_seconds=60)
+        for index in range(4):
+            journal.append("job_event", {"jobId": str(index)})
+        segments = self.segments()
+        old = time.time() - 120
+        os.utime(os.path.join(self.directory, segments[0]), (old, old))
+
+        journal.ack(0)
+
+        self.assertEqual(self.segments(), segments[1:])
+
+    def test_partial_entries_left_by_a_crash_are_discarded(self):
+        journal = self.open()
+        journal.append("job_event", {"jobId": "1"})
+        journal.close()
+        with open(os.path.join(self.directory, self.segments()[-1]), "ab") as file:
+            file.write(b'{"offset": 1, "event": "job_ev')
+
+        with self.assertLogs("alfred-python", "WARNING"):
+            journal = self.open()
+        journal.append("job_event", {"jobId": "2"})
+
+        self.assertEqual([entry["offset"] for entry in journal.replay()], [0, 1])
+
+    def test_appends_are_flushed_in_batches(self):
+        journal = self.open(fsync_interval=0.05)
+        for index in range(100):
+            journal.append("job_event", index)
+        journal.commit(99)
+
+        deadline = time.monotonic() + 5
+        while journal.stats()["unsynced"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stats = journal.stats()
+        self.assertEqual(stats["unsynced"], 0)
+        self.assertEqual(stats["appended"], 100)
+        self.assertLess(stats["syncs"], 10)
+        journal.close()
+        self.assertEqual(self.open().committed(), 99)
+
+    def test_closed_journals_reject_appends(self):
+        journal = self.open()
+        journal.close()
+
+        with self.assertRaises(ValueError):
+            journal.append("job_event", {})
+
+
+if __name__ == "__main__":
+    unittest.main()
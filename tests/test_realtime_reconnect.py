@@ -0,0 +1,145 @@
+import unittest
+
+from alfred.realtime.backfill import EventBackfiller, job_state
+from alfred.realtime.reconnect import ConnectionHealth, backoff_delays
+
+STAGE = "job_stage_update_event"
+FINISHED = "job_finished_event"
+FAILED = "job_failed_event"
+CREATED = "job_create_event"
+
+
+class FakeDomain:
+    def __init__(self, entities):
+        self.entities = entities
+
+    def get(self, entity_id):
+        entity = self.entities[entity_id]
+        if isinstance(entity, Exception):
+            raise entity
+        return entity
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event, data):
+        self.events.append((event, data))
+
+
+class TestBackoffDelays(unittest.TestCase):
+    def test_delays_double_up_to_the_maximum(self):
+        delays = backoff_delays(
+            {"max_attempts": 5, "initial_delay": 1, "max_delay": 4, "jitter": 0}
+        )
+
+        self.assertEqual(list(delays), [1, 2, 4, 4, 4])
+
+    def test_delays_are_jittered_either_way(self):
+        config = {"max_attempts": 1, "initial_delay": 2, "jitter": 0.5}
+
+        self.assertEqual(list(backoff_delays(config, rand=lambda: 0)), [1])
+        self.assertEqual(list(backoff_delays(config, rand=lambda: 0.75)), [2.5])
+
+    def test_attempts_are_unlimited_by_default(self):
+        delays = backoff_delays()
+
+        self.assertEqual(len([next(delays) for _ in range(100)]), 100)
+
+
+class TestConnectionHealth(unittest.TestCase):
+    def test_connections_are_counted(self):
+        health = ConnectionHealth()
+
+        self.assertFalse(health.record_connect())
+        health.record_disconnect()
+        health.record_attempt()
+        health.record_failure(ConnectionError("refused"))
+        health.record_attempt()
+        self.assertTrue(health.record_connect())
+        health.record_disconnect(expected=True)
+
+        stats = health.stats()
+        self.assertEqual(
+            {key: stats[key] for key in ("connected", "connects", "disconnects", "reconnects")},
+            {"connected": False, "connects": 2, "disconnects": 2, "reconnects": 1},
+        )
+        self.assertEqual(stats["reconnect_attempts"], 2)
+        self.assertEqual(stats["failed_attempts"], 1)
+        self.assertEqual(stats["last_error"], "refused")
+        self.assertGreater(stats["downtime"], 0)
+        self.assertEqual(health.stats()["downtime"], stats["downtime"])
+
+
+class TestEventBackfiller(unittest.TestCase):
+    def test_missed_stage_changes_and_completions_are_emitted(self):
+        recorder = Recorder()
+        jobs = FakeDomain({
+            "1": {"stage": "Extraction"},
+            "2": {"result": {"stage": "Failed"}},
+            "3": {"stage": "Extraction"},
+        })
+        backfiller = EventBackfiller(recorder, jobs=jobs)
+        backfiller.observe(STAGE, {"jobId": "1", "stage": "Classification"})
+        backfiller.observe(STAGE, {"jobId": "2", "stage": "Classification"})
+        backfiller.observe(STAGE, {"data": {"JobId": "3", "stage": "Extraction"}})
+
+        self.assertEqual(backfiller.backfill(), 3)
+        self.assertEqual(sorted(recorder.events, key=lambda item: item[1]["jobId"]), [
+            (STAGE, {"jobId": "1", "stage": "Extraction", "job": jobs.entities["1"],
+                     "synthetic": True}),
+            (STAGE, {"jobId": "2", "stage": "Failed", "job": jobs.entities["2"],
+                     "synthetic": True}),
+            (FAILED, {"jobId": "2", "stage": "Failed", "job": jobs.entities["2"],
+                      "synthetic": True}),
+        ])
+        self.assertEqual(sorted(backfiller.tracked_jobs), ["1", "3"])
+        self.assertEqual(backfiller.backfill(), 0)
+
+    def test_completed_jobs_are_no_longer_tracked(self):
+        backfiller = EventBackfiller(Recorder(), jobs=FakeDomain({}))
+        backfiller.observe(STAGE, {"jobId": "1"})
+        backfiller.observe(FINISHED, {"jobId": "1"})
+        backfiller.observe("file_event", {"jobId": "2"})
+
+        self.assertEqual(backfiller.tracked_jobs, [])
+        self.assertEqual(backfiller.backfill(), 0)
+
+    def test_sessions_that_turned_into_jobs_are_emitted(self):
+        recorder = Recorder()
+        jobs = FakeDomain({"j": {"stage": "Finished"}})
+        sessions = FakeDomain({"s": {"job_id": "j"}, "pending": {}})
+        backfiller = EventBackfiller(recorder, jobs=jobs, sessions=sessions, track_events=False)
+        backfiller.track_session("s")
+        backfiller.track_session("pending")
+
+        self.assertEqual(backfiller.backfill(), 3)
+        self.assertEqual([event for event, _ in recorder.events], [CREATED, STAGE, FINISHED])
+        self.assertEqual(recorder.events[0][1], {"jobId": "j", "sessionId": "s", "synthetic": True})
+        self.assertEqual(backfiller.tracked_sessions, ["pending"])
+
+    def test_failed_requests_keep_jobs_tracked(self):
+        backfiller = EventBackfiller(Recorder(), jobs=FakeDomain({"1": ValueError("boom")}))
+        backfiller.track_job("1", "Classification")
+
+        with self.assertLogs("alfred-python", "WARNING"):
+            self.assertEqual(backfiller.backfill(), 0)
+        self.assertEqual(backfiller.tracked_jobs, ["1"])
+
+    def test_oldest_jobs_are_forgotten_beyond_the_limit(self):
+        backfiller = EventBackfiller(Recorder(), max_tracked=2)
+        for job_id in ("1", "2", "3"):
+            backfiller.track_job(job_id)
+
+        self.assertEqual(backfiller.tracked_jobs, ["2", "3"])
+
+    def test_job_state(self):
+        self.assertEqual(job_state({"Status": "Done"}), "Done")
+        self.assertEqual(job_state('{"data": {"stage": "Indexing"}}'), "Indexing")
+        self.assertIsNone(job_state("not json"))
+        self.assertIsNone(job_state({}))
+
+
+if __name__ == "__main__":
+    unittest.main()
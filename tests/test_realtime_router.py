@@ -0,0 +1,66 @@
+import unittest
+
+from alfred.realtime.router import SubscriptionRouter
+
+EVENT = "job_stage_update_event"
+
+
+def callbacks(subscriptions):
+    return [subscription.callback for subscription in subscriptions]
+
+
+class TestSubscriptionRouter(unittest.TestCase):
+    def test_every_subscriber_of_an_event_matches_in_order(self):
+        router = SubscriptionRouter()
+        router.subscribe(EVENT, "first")
+        router.subscribe(EVENT, "job", job_id="1")
+        router.subscribe(EVENT, "second")
+        router.subscribe("job_finished_event", "other event")
+
+        self.assertEqual(
+            callbacks(router.match(EVENT, {"jobId": "1"})), ["first", "job", "second"]
+        )
+        self.assertEqual(callbacks(router.match(EVENT, {"jobId": "2"})), ["first", "second"])
+
+    def test_scoped_subscriptions_only_match_their_entities(self):
+        router = SubscriptionRouter()
+        for job_id in range(20000):
+            router.subscribe(EVENT, f"job {job_id}", job_id=job_id)
+        router.subscribe(EVENT, "file", file_id="f")
+        router.subscribe(EVENT, "job and file", job_id="7", file_id="f")
+
+        self.assertEqual(callbacks(router.match(EVENT, {"job_id": 42})), ["job 42"])
+        self.assertEqual(callbacks(router.match(EVENT, '{"data": {"fileId": "f"}}')), ["file"])
+        self.assertEqual(
+            callbacks(router.match(EVENT, {"jobId": "7", "fileId": "f"})),
+            ["job 7", "file", "job and file"],
+        )
+        self.assertEqual(router.match(EVENT, {}), [])
+        self.assertEqual(len(router), 20002)
+
+    def test_subscriptions_can_be_removed(self):
+        router = SubscriptionRouter()
+        unscoped = router.subscribe(EVENT, "unscoped")
+        scoped = router.subscribe(EVENT, "scoped", job_id="1")
+
+        scoped.unsubscribe()
+        scoped.unsubscribe()
+        self.assertEqual(callbacks(router.match(EVENT, {"jobId": "1"})), ["unscoped"])
+
+        router.unsubscribe(unscoped)
+        self.assertEqual(router.match(EVENT, {"jobId": "1"}), [])
+        self.assertEqual(len(router), 0)
+        self.assertFalse(unscoped.active)
+
+    def test_clear_removes_every_subscription(self):
+        router = SubscriptionRouter()
+        subscription = router.subscribe(EVENT, "scoped", file_id="1")
+
+        router.clear()
+
+        self.assertFalse(subscription.active)
+        self.assertEqual(router.match(EVENT, {"fileId": "1"}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from alfred.realtime.async_stream import AsyncEventStream
+from alfred.realtime.stream import EventStream
+
+
+class TestEventStream(unittest.TestCase):
+    def test_events_are_yielded_one_at_a_time_until_closed(self):
+        stream = EventStream()
+        for index in range(3):
+            stream.put("job_event", index)
+        stream.close()
+
+        self.assertEqual([item["data"] for item in stream], [0, 1, 2])
+        self.assertFalse(stream.put("job_event", 3))
+
+    def test_batches_hold_the_buffered_events(self):
+        stream = EventStream(batch_size=2)
+        for index in range(5):
+            stream.put("job_event", index)
+        stream.close()
+
+        batches = [[item["data"] for item in batch] for batch in stream]
+
+        self.assertEqual(batches, [[0, 1], [2, 3], [4]])
+
+    def test_batches_wait_to_fill_up(self):
+        stream = EventStream(batch_size=3, max_wait=5)
+        stream.put("job_event", 0)
+
+        def produce():
+            time.sleep(0.05)
+            stream.put("job_event", 1)
+            stream.put("job_event", 2)
+
+        threading.Thread(target=produce, daemon=True).start()
+
+        self.assertEqual([item["data"] for item in stream.get_batch()], [0, 1, 2])
+        stream.put("job_event", 3)
+        started = time.monotonic()
+        self.assertEqual(len(stream.get_batch(max_wait=0.05)), 1)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_get_times_out(self):
+        stream = EventStream()
+
+        self.assertIsNone(stream.get(timeout=0.01))
+
+    def test_full_buffer_blocks_producers(self):
+        stream = EventStream(max_size=1)
+        stream.put("job_event", 0)
+        done = threading.Event()
+        threading.Thread(
+            target=lambda: stream.put("job_event", 1) and done.set(), daemon=True
+        ).start()
+
+        self.assertFalse(done.wait(0.05))
+        self.assertEqual(stream.get()["data"], 0)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(stream.get()["data"], 1)
+
+    def test_full_buffer_drops_oldest_events(self):
+        stream = EventStream(max_size=2, overflow="drop_oldest")
+        for index in range(4):
+            stream.put("job_event", index)
+
+        self.assertEqual([item["data"] for item in stream.get_batch(10)], [2, 3])
+        self.assertEqual(stream.dropped, 2)
+
+    def test_close_unblocks_producers_and_calls_on_close(self):
+        closed = []
+        stream = EventStream(max_size=1, on_close=lambda: closed.append(True))
+        stream.put("job_event", 0)
+        results = []
+        producer = threading.Thread(target=lambda: results.append(stream.put("job_event", 1)))
+        producer.start()
+
+        with stream:
+            pass
+        producer.join(5)
+
+        self.assertEqual(results, [False])
+        self.assertEqual(closed, [True])
+
+
+class TestAsyncEventStream(unittest.TestCase):
+    def test_events_are_yielded_in_batches(self):
+        async def run():
+            stream = AsyncEventStream(max_size=2, batch_size=2, max_wait=1)
+
+            async def produce():
+                for index in range(5):
+                    await stream.put("job_event", index)
+                await stream.close()
+
+            producer = asyncio.ensure_future(produce())
+            batches = [[item["data"] for item in batch] async for batch in stream]
+            await producer
+            return batches
+
+        self.assertEqual(asyncio.run(run()), [[0, 1], [2, 3], [4]])
+
+    def test_get_times_out(self):
+        async def run():
+            return await AsyncEventStream().get(timeout=0.01)
+
+        self.assertIsNone(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    unittest.main()
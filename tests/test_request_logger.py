@@ -0,0 +1,131 @@
+import json
+import logging
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from requests import HTTPError
+
+from alfred.http.http_client import HttpClient
+from alfred.http.request_logger import RequestLogger
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record.msg)
+
+
+class ErrorHandler(BaseHTTPRequestHandler):
+    def log_message(self, *_args):
+        pass
+
+    def do_POST(self):  # pylint: disable=C0103
+        self.rfile.read(int(self.headers.get("Content-Length")))
+        content = json.dumps({"error": "x" * 1000}).encode("utf-8")
+        self.send_response(400)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class TestRequestLogger(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("alfred-python.test-request-logger")
+        self.logger.propagate = False
+        self.handler = RecordingHandler()
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_nothing_is_sampled_below_debug(self):
+        calls = []
+        self.logger.setLevel(logging.INFO)
+        request_logger = RequestLogger(
+            self.logger, sample_rate=0.5, sampler=lambda: calls.append(1) or 0
+        )
+
+        self.assertFalse(request_logger.should_log())
+        self.assertEqual(calls, [])
+
+    def test_requests_are_sampled(self):
+        samples = iter([0.1, 0.9, 0.3, 0.7])
+        self.logger.setLevel(logging.DEBUG)
+        request_logger = RequestLogger(self.logger, sample_rate=0.5, sampler=lambda: next(samples))
+
+        self.assertEqual(
+            [request_logger.should_log() for _ in range(4)], [True, False, True, False]
+        )
+
+    def test_bodies_are_truncated(self):
+        request_logger = RequestLogger(self.logger, max_body_size=5)
+
+        self.assertEqual(request_logger.format_body("abcdefgh"), "abcde... (truncated)")
+        self.assertEqual(request_logger.format_body(b"abcdefgh" * 100), "abcde... (truncated)")
+        self.assertEqual(request_logger.format_body("é" * 5), "é" * 5)
+        self.assertEqual(request_logger.format_body(iter([b"a"])), "")
+
+    def test_invalid_options_are_rejected(self):
+        with self.assertRaises(ValueError):
+            RequestLogger(self.logger, sample_rate=2)
+        with self.assertRaises(ValueError):
+            RequestLogger(self.logger, max_body_size=-1)
+
+
+class TestHttpClientLogging(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ErrorHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.logger = logging.getLogger("alfred-python")
+        self.level = self.logger.level
+        self.handler = RecordingHandler()
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(self.level)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def post(self, config):
+        client = HttpClient(self.base_url, {"api_key": "secret"}, config)
+        with self.assertRaises(HTTPError):
+            client.post("/api/job/create", data={"name": "job"})
+
+    def test_requests_and_errors_are_logged_at_debug(self):
+        self.logger.setLevel(logging.DEBUG)
+
+        self.post({"log_max_body_size": 20})
+
+        request, response = self.handler.records
+        self.assertEqual(request["message"], "HTTP request details.")
+        self.assertEqual(request["body"], '{"name": "job"}')
+        self.assertNotIn("X-TagshelfAPI-Key", request["headers"])
+        self.assertEqual(response["status_code"], 400)
+        self.assertEqual(response["body"], '{"error": "xxxxxxxxx... (truncated)')
+        self.assertEqual(response["response_size"], 1013)
+
+    def test_nothing_is_logged_above_debug(self):
+        self.logger.setLevel(logging.INFO)
+
+        self.post({})
+
+        self.assertEqual(self.handler.records, [])
+
+    def test_unsampled_requests_are_not_logged(self):
+        self.logger.setLevel(logging.DEBUG)
+
+        self.post({"log_sample_rate": 0})
+
+        self.assertEqual(self.handler.records, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import base64
+import hashlib
+import hmac
+import io
+import json
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import quote
+
+from alfred.http.http_client import HttpClient
+from alfred.http.multipart import MultipartEncoder
+from alfred.http.signer import HmacSigner
+
+API_KEY = base64.b64encode(b"secret").decode("utf-8")
+CONTENT = os.urandom(200 * 1024)
+CONTENT_HASH = base64.b64encode(hashlib.md5(CONTENT).digest()).decode("utf-8")
+
+
+def expected_signature(url, method, timestamp, nonce, content_hash):
+    raw = "public" + method + quote(url, safe="").lower() + timestamp + nonce + content_hash
+    digest = hmac.new(b"secret", raw.encode("utf-8"), hashlib.sha256).digest()
+    return base64.b64encode(digest).decode("utf-8")
+
+
+class NonSeekable(io.RawIOBase):
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self.data.read(size)
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    def log_message(self, *_args):
+        pass
+
+    def do_POST(self):  # pylint: disable=C0103
+        body = self.rfile.read(int(self.headers.get("Content-Length")))
+        self.server.uploads.append((dict(self.headers), body))
+
+        content = json.dumps({"ok": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class TestHmacSigner(unittest.TestCase):
+    def setUp(self):
+        self.signer = HmacSigner(API_KEY, "public", chunk_size=4096, clock=lambda: 1700000000)
+
+    def test_signature_matches_the_reference_algorithm(self):
+        url = "https://api.example.com/api/file/upload?x=1"
+
+        authorization, _ = self.signer.sign("post", url, CONTENT)
+
+        scheme, value = authorization.split(" ")
+        secret_key, signature, nonce, timestamp = value.split(":")
+        self.assertEqual((scheme, secret_key, timestamp), ("amx", "public", "1700000000"))
+        self.assertEqual(
+            signature, expected_signature(url, "POST", timestamp, nonce, CONTENT_HASH)
+        )
+
+    def test_api_key_is_decoded_once(self):
+        with mock.patch("alfred.http.signer.base64.b64decode") as b64decode:
+            for _ in range(3):
+                self.signer.sign("GET", "https://api.example.com/")
+
+        b64decode.assert_not_called()
+
+    def test_empty_bodies_have_no_hash(self):
+        for body in (None, b"", "", io.BytesIO(b""), iter([])):
+            self.assertEqual(self.signer.hash_body(body)[1], "")
+
+    def test_bodies_are_hashed_incrementally(self):
+        chunks = [CONTENT[i:i + 1000] for i in range(0, len(CONTENT), 1000)]
+        bodies = [CONTENT, bytearray(CONTENT), io.BytesIO(CONTENT), chunks, tuple(chunks)]
+
+        for body in bodies:
+            sent, content_hash = self.signer.hash_body(body)
+            self.assertIs(sent, body)
+            self.assertEqual(content_hash, CONTENT_HASH)
+
+        self.assertEqual(
+            self.signer.hash_body("payload")[1],
+            self.signer.hash_body(b"payload")[1],
+        )
+
+    def test_file_bodies_are_rewound_to_their_position(self):
+        file = io.BytesIO(b"header" + CONTENT)
+        file.seek(6)
+
+        _, content_hash = self.signer.hash_body(file)
+
+        self.assertEqual(content_hash, CONTENT_HASH)
+        self.assertEqual(file.tell(), 6)
+
+    def test_multipart_bodies_are_hashed_chunk_by_chunk(self):
+        encoder = MultipartEncoder({"a": "1"}, {"file": ("a.bin", io.BytesIO(CONTENT), None)})
+
+        _, content_hash = self.signer.hash_body(encoder)
+
+        expected = base64.b64encode(hashlib.md5(b"".join(encoder)).digest()).decode("utf-8")
+        self.assertEqual(content_hash, expected)
+
+    def test_one_shot_bodies_are_replaced_by_a_copy(self):
+        def generate():
+            for i in range(0, len(CONTENT), 1000):
+                yield CONTENT[i:i + 1000]
+
+        small, content_hash = self.signer.hash_body(generate())
+        self.assertEqual((small, content_hash), (CONTENT, CONTENT_HASH))
+
+        signer = HmacSigner(API_KEY, "public", spool_max_size=1024)
+        for body in (generate(), NonSeekable(CONTENT)):
+            spooled, content_hash = signer.hash_body(body)
+            self.assertEqual(content_hash, CONTENT_HASH)
+            self.assertEqual(spooled.read(), CONTENT)
+            spooled.close()
+
+    def test_unsupported_bodies_are_rejected(self):
+        with self.assertRaises(TypeError):
+            self.signer.hash_body({"a": 1})
+
+    def test_missing_or_malformed_keys_are_rejected(self):
+        for api_key, secret_key, setting in [
+            (None, "public", "api_key"),
+            (API_KEY, "", "secret_key"),
+            ("not base64!", "public", "api_key"),
+        ]:
+            with self.assertRaisesRegex(ValueError, rf'\["hmac"\]\["{setting}"\]'):
+                HmacSigner(api_key, secret_key)
+
+
+class TestHttpClientHmac(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), UploadHandler)
+        self.server.uploads = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.client = HttpClient(
+            self.base_url, {"hmac": {"api_key": API_KEY, "secret_key": "public"}}
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def assert_signed_upload(self, body):
+        headers, received = self.server.uploads[-1]
+        _, value = headers.get("Authorization").split(" ")
+        _, signature, nonce, timestamp = value.split(":")
+        url = f"{self.base_url}/upload"
+
+        self.assertEqual(received, body)
+        self.assertEqual(
+            signature,
+            expected_signature(url, "POST", timestamp, nonce, CONTENT_HASH),
+        )
+
+    def test_generator_bodies_are_signed_and_sent(self):
+        def generate():
+            for i in range(0, len(CONTENT), 4096):
+                yield CONTENT[i:i + 4096]
+
+        self.client.hmac_signer.spool_max_size = 1024
+        parsed, _ = self.client.post("/upload", data=generate())
+
+        self.assertEqual(parsed, {"ok": True})
+        self.assert_signed_upload(CONTENT)
+
+    def test_file_bodies_are_signed_and_streamed(self):
+        parsed, _ = self.client.post(
+            "/upload",
+            data=io.BytesIO(CONTENT),
+            headers={"Content-Type": "application/octet-stream"},
+        )
+
+        self.assertEqual(parsed, {"ok": True})
+        self.assert_signed_upload(CONTENT)
+
+
+if __name__ == "__main__":
+    unittest.main()
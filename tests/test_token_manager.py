@@ -0,0 +1,204 @@
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from alfred.http.http_client import HttpClient
+from alfred.http.token_manager import AsyncTokenManager, TokenManager
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenManager(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.fetches = 0
+
+    def fetch(self):
+        self.fetches += 1
+        return {"access_token": f"token-{self.fetches}", "expires_in": 3600}
+
+    def test_reuses_token_until_refresh_margin(self):
+        manager = TokenManager(self.fetch, refresh_margin=60, clock=self.clock)
+
+        self.assertEqual(manager.get_token(), "token-1")
+        self.clock.now += 3500
+        self.assertEqual(manager.get_token(), "token-1")
+
+        self.clock.now += 100
+        self.assertEqual(manager.get_token(), "token-2")
+        self.assertEqual(manager.expires_at, self.clock.now + 3600)
+
+    def test_keeps_valid_token_when_refresh_ahead_fails(self):
+        def fetch():
+            if self.fetches:
+                raise ConnectionError("token endpoint unavailable")
+            return self.fetch()
+
+        manager = TokenManager(fetch, refresh_margin=60, clock=self.clock)
+        manager.get_token()
+
+        self.clock.now += 3570
+        self.assertEqual(manager.get_token(), "token-1")
+
+        self.clock.now += 30
+        with self.assertRaises(ConnectionError):
+            manager.get_token()
+
+    def test_invalidate_ignores_stale_tokens(self):
+        manager = TokenManager(self.fetch, clock=self.clock)
+        manager.get_token()
+        manager.invalidate("token-1")
+        manager.get_token()
+
+        manager.invalidate("token-1")
+
+        self.assertEqual(manager.get_token(), "token-2")
+        self.assertEqual(self.fetches, 2)
+
+    def test_uses_a_token_set_from_elsewhere(self):
+        manager = TokenManager(self.fetch, refresh_margin=60, clock=self.clock)
+
+        manager.set_token("external", expires_in=120)
+        self.assertEqual(manager.get_token(), "external")
+        self.clock.now += 60
+        self.assertEqual(manager.get_token(), "token-1")
+
+        manager.set_token(None)
+        self.assertEqual(manager.get_token(), "token-2")
+
+    def test_concurrent_callers_share_a_single_fetch(self):
+        started = threading.Event()
+
+        def slow_fetch():
+            started.set()
+            threading.Event().wait(0.1)
+            return self.fetch()
+
+        manager = TokenManager(slow_fetch)
+        tokens = []
+        threads = [
+            threading.Thread(target=lambda: tokens.append(manager.get_token()))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(tokens, ["token-1"] * 10)
+        self.assertEqual(self.fetches, 1)
+
+    def test_async_concurrent_callers_share_a_single_fetch(self):
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return self.fetch()
+
+        manager = AsyncTokenManager(fetch)
+
+        async def main():
+            return await asyncio.gather(*[manager.get_token() for _ in range(10)])
+
+        self.assertEqual(asyncio.run(main()), ["token-1"] * 10)
+        self.assertEqual(self.fetches, 1)
+
+
+class OAuthHandler(BaseHTTPRequestHandler):
+    """
+    Issues tokens from /token and only accepts the latest one.
+    """
+    def log_message(self, *_args):
+        pass
+
+    def _send(self, status, payload):
+        content = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):  # pylint: disable=C0103
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with self.server.lock:
+            self.server.token_requests += 1
+            self.server.current_token = f"token-{self.server.token_requests}"
+            token = self.server.current_token
+        threading.Event().wait(0.05)
+        self._send(200, {"access_token": token, "token_type": "bearer", "expires_in": 3600})
+
+    def do_GET(self):  # pylint: disable=C0103
+        if self.headers.get("Authorization") != f"Bearer {self.server.current_token}":
+            self._send(401, {"message": "Unauthorized"})
+            return
+        self._send(200, {"ok": True})
+
+
+class TestHttpClientOAuth(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), OAuthHandler)
+        self.server.lock = threading.Lock()
+        self.server.token_requests = 0
+        self.server.current_token = None
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = HttpClient(
+            f"http://127.0.0.1:{self.server.server_address[1]}",
+            {"oauth": {"username": "user", "password": "secret"}},
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get_concurrently(self, count):
+        results = []
+
+        def get():
+            results.append(self.client.get("/api/job/detail/job-1")[0])
+
+        threads = [threading.Thread(target=get) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_requests_fetch_a_single_token(self):
+        results = self.get_concurrently(8)
+
+        self.assertEqual(results, [{"ok": True}] * 8)
+        self.assertEqual(self.server.token_requests, 1)
+        self.assertEqual(self.client.token, "token-1")
+
+    def test_concurrent_401s_trigger_a_single_refresh(self):
+        self.client.get("/api/job/detail/job-1")
+        # The server revokes the token, e.g. after a restart.
+        self.server.current_token = "revoked"
+
+        results = self.get_concurrently(8)
+
+        self.assertEqual(results, [{"ok": True}] * 8)
+        self.assertEqual(self.server.token_requests, 2)
+
+    def test_assigned_token_is_used_until_rejected(self):
+        self.server.current_token = "external"
+        self.client.token = "external"
+
+        self.assertEqual(self.client.get("/api/job/detail/job-1")[0], {"ok": True})
+        self.assertEqual(self.server.token_requests, 0)
+
+        self.client.token = None
+        self.assertIsNone(self.client.token)
+        self.client.get("/api/job/detail/job-1")
+        self.assertEqual(self.client.token, "token-1")
+
+
+if __name__ == "__main__":
+    unittest.main()